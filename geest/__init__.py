@@ -35,7 +35,6 @@ __revision__ = "$Format:%H$"
 import cProfile
 import datetime
 import io
-import logging
 import os
 import pstats
 import subprocess  # nosec B404
@@ -64,7 +63,13 @@ from qgis.PyQt.QtWidgets import (
 from .core import setting
 from .gui import GeoE3Dock, GeoE3OptionsFactory
 from .gui.overlays import LayerDescriptionItem, PieChartItem
-from .utilities import log_message, resources_path, version
+from .utilities import (
+    log_message,
+    resources_path,
+    start_file_logging,
+    stop_file_logging,
+    version,
+)
 
 # Set up logging - see utilites.py log_message for usage
 # use log_message instead of QgsMessageLog.logMessage everywhere please....
@@ -78,12 +83,7 @@ else:
     log_file_path = os.path.join(temp_dir, f"geoe3_logfile_{datestamp}.log")
 # truncate the log
 
-logging.basicConfig(
-    filename=log_file_path,
-    filemode="a",  # Append mode
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    level=logging.DEBUG,
-)
+start_file_logging(log_file_path)
 date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 log_message("»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»»", force=True)
 log_message(f"GeoE3 started at {date}", force=True)
@@ -757,10 +757,15 @@ for module_name in list(sys.modules.keys()):
 
         # Remove dock widget if it exists
         if self.dock_widget:
+            # Write any pending model.json save before the tree is destroyed
+            self.dock_widget.tree_widget.flush_json_to_working_directory()
             self.iface.removeDockWidget(self.dock_widget)
             self.dock_widget.deleteLater()
             self.dock_widget = None
 
+        # Flush queued log records and release the log file
+        stop_file_logging()
+
     def kill_debug(self):
         """Kill any running debugpy debugging sessions.
 
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""📦 Adaptive Pool module.
+
+This module contains the policy used to size worker pools from the current
+memory and CPU pressure instead of a fixed number of workers.
+
+The worker limit follows the number of cores not busy with work outside the
+pool, taken from the system load average where the platform provides one.
+Each job is also admitted only if its estimated peak memory fits in the free
+memory left after a reserve, counting jobs that started recently but may not
+have allocated their memory yet. At least one job is always admitted so the
+queue cannot stall.
+"""
+
+import os
+import time
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from qgis.core import Qgis
+from qgis.PyQt.QtCore import QThread
+
+from geest.core.settings import setting
+from geest.utilities import get_free_memory_mb, log_message
+
+# Rough peak memory of a workflow in MB, keyed on analysis mode
+WORKFLOW_MEMORY_MB = {
+    "use_csv_to_point_layer": 2048.0,  # ACLED event buffers are unioned in memory
+    "use_index_score_with_ghsl": 2048.0,  # GHSL settlements are polygonised
+    "use_index_score_with_ookla": 2048.0,  # Ookla tiles are extracted from large parquet files
+    "use_multi_buffer_point": 1024.0,
+    "use_nighttime_lights": 1024.0,
+    "use_environmental_hazards": 1024.0,
+}
+DEFAULT_WORKFLOW_MEMORY_MB = 512.0
+
+
+def estimate_workflow_memory_mb(analysis_mode: str) -> float:
+    """
+    Estimate the peak memory of a workflow.
+
+    Args:
+        analysis_mode: The analysis mode of the item the workflow runs for.
+
+    Returns:
+        float: Estimated peak memory in MB.
+    """
+    return WORKFLOW_MEMORY_MB.get(analysis_mode, DEFAULT_WORKFLOW_MEMORY_MB)
+
+
+class AdaptivePoolSizer:
+    """
+    Decides how many workers may run, and which jobs may start, from the
+    machine's memory and CPU pressure.
+
+    Example usage:
+
+        ```python
+        sizer = AdaptivePoolSizer()
+        if running < sizer.worker_limit(running) and sizer.admit(memory_mb, running):
+            sizer.job_started(memory_mb)
+            start(job)
+        ```
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        reserve_mb: Optional[float] = None,
+        ramp_seconds: Optional[float] = None,
+    ):
+        """🏗️ Initialize the instance.
+
+        Args:
+            max_workers: Upper bound on the number of workers. Defaults to the
+                number of cores.
+            reserve_mb: Free memory to leave for QGIS and the system. Defaults to
+                the adaptive_memory_reserve_mb setting.
+            ramp_seconds: How long a started job's memory estimate is counted
+                against the free memory. Defaults to 30 seconds.
+        """
+        self.cpu_count = max(1, QThread.idealThreadCount())
+        self.max_workers = max(1, max_workers or self.cpu_count)
+        if reserve_mb is None:
+            reserve_mb = float(setting(key="adaptive_memory_reserve_mb", default=1024))
+        self.reserve_mb = reserve_mb
+        self.ramp_seconds = 30.0 if ramp_seconds is None else ramp_seconds
+        self._started: List[Tuple[float, float]] = []  # (start time, memory estimate) of recent jobs
+        self._lock = Lock()
+        self._last_decision = None
+
+    def cpu_load(self) -> Optional[float]:
+        """
+        The one minute system load average.
+
+        Returns:
+            float: The load average, or None where the platform does not provide it.
+        """
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return None
+
+    def worker_limit(self, running: int) -> int:
+        """
+        The number of workers that may run now.
+
+        Args:
+            running: Number of jobs of this pool that are running.
+
+        Returns:
+            int: Between 1 and max_workers.
+        """
+        limit = self.max_workers
+        load = self.cpu_load()
+        if load is not None:
+            # Load caused by the pool's own running jobs does not count against it
+            external_load = max(0.0, load - running)
+            limit = min(limit, int(self.cpu_count - external_load + 0.5))
+        limit = max(1, limit)
+        load_text = "unknown" if load is None else f"{load:.1f}"
+        self._log_decision(("limit", limit), f"Adaptive pool: {limit} workers (load {load_text}, {running} running)")
+        return limit
+
+    def _ramping_memory_mb(self) -> float:
+        """
+        Memory estimates of the jobs started within the ramp period.
+
+        Returns:
+            float: Memory in MB that recently started jobs may still allocate.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._started = [entry for entry in self._started if now - entry[0] < self.ramp_seconds]
+            return sum(memory_mb for _, memory_mb in self._started)
+
+    def admit(self, memory_mb: float, running: int) -> bool:
+        """
+        Decide whether a job may start given the free memory.
+
+        Args:
+            memory_mb: The job's estimated peak memory.
+            running: Number of jobs of this pool that are running.
+
+        Returns:
+            bool: True if the job may start.
+        """
+        if running == 0:
+            return True
+        free_mb = get_free_memory_mb()
+        if free_mb <= 0:
+            # Free memory is unknown on this platform
+            return True
+        headroom_mb = free_mb - self.reserve_mb - self._ramping_memory_mb()
+        admitted = memory_mb <= headroom_mb
+        if not admitted:
+            self._log_decision(
+                ("hold", memory_mb, running),
+                f"Adaptive pool: holding a {memory_mb:.0f} MB job, {headroom_mb:.0f} MB headroom "
+                f"({free_mb:.0f} MB free, {running} running)",
+            )
+        return admitted
+
+    def job_started(self, memory_mb: float) -> None:
+        """
+        Record a started job so its memory counts until it has had time to allocate it.
+
+        Args:
+            memory_mb: The job's estimated peak memory.
+        """
+        with self._lock:
+            self._started.append((time.monotonic(), memory_mb))
+
+    def recommended_workers(self, requested: int, memory_per_worker_mb: float) -> int:
+        """
+        The number of workers to use for a batch of similar jobs.
+
+        Args:
+            requested: The configured number of workers.
+            memory_per_worker_mb: Estimated peak memory of each worker.
+
+        Returns:
+            int: Between 1 and requested.
+        """
+        workers = min(max(1, requested), self.worker_limit(0))
+        free_mb = get_free_memory_mb()
+        if free_mb > 0 and memory_per_worker_mb > 0:
+            workers = min(workers, int((free_mb - self.reserve_mb) // memory_per_worker_mb))
+        workers = max(1, workers)
+        log_message(
+            f"Adaptive pool: {workers} of {requested} requested workers ({free_mb:.0f} MB free)",
+            tag="GeoE3",
+            level=Qgis.Info,
+        )
+        return workers
+
+    def _log_decision(self, decision: tuple, message: str) -> None:
+        """
+        Log a sizing decision when it differs from the previous one.
+
+        Args:
+            decision: The values the decision was made on, compared with the previous one.
+            message: Description of the decision.
+        """
+        if decision != self._last_decision:
+            self._last_decision = decision
+            log_message(message, tag="GeoE3", level=Qgis.Info)
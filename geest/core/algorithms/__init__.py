@@ -7,8 +7,12 @@
 This module contains functionality for algorithms.
 """
 
-from .area_iterator import AreaIterator
+from .area_iterator import AreaIterator, AreaRecord
+from .buffer_overlap_scorer import BufferOverlapScorer
+from .grid_index_cache import GridIndexCache
+from .implicit_grid import ImplicitGrid
 from .native_network_analysis_processor import NativeNetworkAnalysisProcessingTask
+from .network_distance import NetworkGraph, NetworkGraphCache
 from .opportunities_by_wee_score_population_processor import (
     OpportunitiesByWeeScorePopulationProcessingTask,
 )
@@ -3,15 +3,31 @@
 """📦 Area Iterator module.
 
 This module contains functionality for area iterator.
+
+The polygon, clip polygon and bbox layers are read once per GeoPackage into an
+in-memory table keyed on area_name. The table is cached at class level and
+keyed on the GeoPackage modification time, so every workflow in a run shares
+it and regenerating the study area automatically invalidates it.
 """
 
-from typing import Iterator, Tuple
+import os
+from threading import Lock
+from typing import Iterator, List, NamedTuple, Optional, Tuple
 
 from qgis.core import Qgis, QgsFeatureRequest, QgsGeometry, QgsVectorLayer
 
 from geest.utilities import log_message
 
 
+class AreaRecord(NamedTuple):
+    """The geometries of one study area, matched on area_name."""
+
+    area_name: str
+    geometry: QgsGeometry
+    clip_geometry: QgsGeometry
+    bbox_geometry: QgsGeometry
+
+
 class AreaIterator:
     """
     An iterator to yield sets of geometries from polygon, study_area_clip_polygons and bbox layers
@@ -50,8 +66,14 @@ class AreaIterator:
             log_message(f"BBox Geometry: {bbox_geometry.asWkt()}")
             log_message(f"Progress: {progress_percent:.2f}%")
         ```
+
+        Callers that do not need copies of the geometries can iterate the
+        shared AreaRecord table directly with ``area_iterator.records()``.
     """
 
+    _lock = Lock()
+    _tables = {}  # gpkg_path -> (mtime, List[AreaRecord])
+
     def __init__(self, gpkg_path: str) -> None:
         """
         Initialize the AreaIterator with the path to the GeoPackage.
@@ -140,14 +162,119 @@ class AreaIterator:
         """
         return self.total_features
 
-    def __iter__(self) -> Iterator[Tuple[QgsGeometry, QgsGeometry, float]]:
+    @classmethod
+    def invalidate(cls, gpkg_path: Optional[str] = None) -> None:
+        """
+        Drop cached area tables.
+
+        Args:
+            gpkg_path (str): Only drop the table for this GeoPackage. If None, drop all tables.
+        """
+        with cls._lock:
+            if gpkg_path is None:
+                cls._tables.clear()
+            else:
+                cls._tables.pop(os.path.abspath(gpkg_path), None)
+
+    def records(self) -> List[AreaRecord]:
+        """
+        Return the area table for the GeoPackage, sorted by ascending area.
+
+        The table is built on first use and then shared by every AreaIterator
+        over the same, unchanged, GeoPackage. Treat it as read only.
+
+        Returns:
+            List[AreaRecord]: One record per area with a matching bbox.
+        """
+        key = os.path.abspath(self.gpkg_path)
+        mtime = os.path.getmtime(key)
+        wal_path = f"{key}-wal"
+        if os.path.exists(wal_path):
+            mtime = max(mtime, os.path.getmtime(wal_path))
+        # Hold the lock while loading so concurrent workflows wait for a single load
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            records = self._load_records()
+            self._tables[key] = (mtime, records)
+            return records
+
+    def _geometries_by_area_name(self, layer: QgsVectorLayer) -> dict:
+        """
+        Read a layer once into a dict of area_name to geometry.
+
+        Args:
+            layer (QgsVectorLayer): Layer with an 'area_name' field.
+
+        Returns:
+            dict: The first geometry found for each area_name.
+        """
+        request = QgsFeatureRequest().setSubsetOfAttributes(["area_name"], layer.fields())
+        geometries = {}
+        for feature in layer.getFeatures(request):
+            geometries.setdefault(feature["area_name"], feature.geometry())
+        return geometries
+
+    def _load_records(self) -> List[AreaRecord]:
+        """
+        Join the three study area layers on area_name in a single pass over each.
+
+        Returns:
+            List[AreaRecord]: Records sorted by ascending area.
+        """
+        clip_geometries = self._geometries_by_area_name(self.clip_polygon_layer)
+        bbox_geometries = self._geometries_by_area_name(self.bbox_layer)
+
+        # Use stored area attribute if available, otherwise compute it
+        # (for backwards compatibility with older data)
+        has_area_field = "geom_area" in [f.name() for f in self.polygon_layer.fields()]
+        polygons = []
+        for feature in self.polygon_layer.getFeatures():
+            geom = feature.geometry()
+            if geom and not geom.isEmpty():
+                if has_area_field:
+                    area = feature["geom_area"]
+                    if area is None or area == 0:
+                        area = geom.area()
+                else:
+                    area = geom.area()
+                polygons.append((area, feature["area_name"], geom))
+
+        # Sort by area (ascending)
+        polygons.sort(key=lambda x: x[0])
+
+        records = []
+        for _area, area_name, geom in polygons:
+            bbox_geom = bbox_geometries.get(area_name)
+            if bbox_geom is None:
+                log_message(
+                    f"Warning: No matching bbox feature found for area '{area_name}'",
+                    tag="GeoE3",
+                    level=Qgis.Warning,
+                )
+                continue
+            clip_geom = clip_geometries.get(area_name)
+            if clip_geom is None:
+                log_message(
+                    f"Info: No clip_polygon found for area '{area_name}', using polygon geometry as fallback",
+                    tag="GeoE3",
+                    level=Qgis.Info,
+                )
+                clip_geom = geom
+            records.append(AreaRecord(area_name, geom, clip_geom, bbox_geom))
+        log_message(f"Loaded {len(records)} study areas from {self.gpkg_path}")
+        return records
+
+    def __iter__(self) -> Iterator[Tuple[QgsGeometry, QgsGeometry, QgsGeometry, float]]:
         """
-        Iterator that yields pairs of geometries from the polygon layer and the corresponding bbox layer,
+        Iterator that yields the polygon, clip polygon and bbox geometries for each area,
         along with a progress percentage.
 
         Yields:
-            Iterator[Tuple[QgsGeometry, QgsGeometry, float]]: Yields a tuple of polygon and bbox geometries,
-            along with a progress value representing the percentage of the iteration completed.
+            Iterator[Tuple[QgsGeometry, QgsGeometry, QgsGeometry, float]]: Copies of the polygon,
+            clip and bbox geometries, along with a progress value representing the percentage
+            of the iteration completed.
         """
         try:
             # Ensure all  layers have the same CRS
@@ -167,72 +294,16 @@ class AreaIterator:
                 )
                 return
 
-            # Iterate over each polygon feature and calculate progress
-
-            # Memory-efficient approach: use stored area attribute if available,
-            # otherwise compute it (for backwards compatibility with older data)
-            feature_areas = []
-            has_area_field = "geom_area" in [f.name() for f in self.polygon_layer.fields()]
-
-            for feature in self.polygon_layer.getFeatures():
-                geom = feature.geometry()
-                if geom and not geom.isEmpty():
-                    # Use stored area if available (faster), otherwise compute
-                    if has_area_field:
-                        area = feature["geom_area"]
-                        if area is None or area == 0:
-                            area = geom.area()
-                    else:
-                        area = geom.area()
-                    feature_areas.append((feature.id(), area))
-
-            # Sort by area (ascending) - only IDs and areas in memory, not full features
-            feature_areas.sort(key=lambda x: x[1])
-
-            # Now iterate in sorted order, fetching features one at a time
-            for index, (fid, _area) in enumerate(feature_areas):
-                # Fetch the polygon feature by ID
-                request = QgsFeatureRequest().setFilterFid(fid)
-                polygon_feature = next(self.polygon_layer.getFeatures(request), None)
-                if polygon_feature is None:
-                    continue
-
-                # Get the area_name from the polygon feature for matching
-                # This is more reliable than FID matching
-                area_name = polygon_feature["area_name"]
-
-                # Query clip_polygon and bbox by area_name instead of FID
-                # This ensures correct matching even when feature IDs don't align
-                clip_request = QgsFeatureRequest().setFilterExpression(f"area_name = '{area_name}'")
-                bbox_request = QgsFeatureRequest().setFilterExpression(f"area_name = '{area_name}'")
-
-                clip_feature = next(self.clip_polygon_layer.getFeatures(clip_request), None)
-                bbox_feature = next(self.bbox_layer.getFeatures(bbox_request), None)
-
-                # Require bbox_feature but allow clip_feature to be missing
-                if bbox_feature:
-                    # Calculate the progress as the percentage of features processed
-                    progress_percent: float = ((index + 1) / self.total_features) * 100
-
-                    # Use clip_feature geometry if available, otherwise fall back to polygon geometry
-                    clip_geom = clip_feature.geometry() if clip_feature else polygon_feature.geometry()
-
-                    if not clip_feature:
-                        log_message(
-                            f"Info: No clip_polygon found for area '{area_name}', using polygon geometry as fallback",
-                            tag="GeoE3",
-                            level=Qgis.Info,
-                        )
-
-                    # Yield a tuple with polygon geometry, clip geometry, bbox geometry, and progress percentage
-                    yield polygon_feature.geometry(), clip_geom, bbox_feature.geometry(), progress_percent
-
-                else:
-                    log_message(
-                        f"Warning: No matching bbox feature found for area '{area_name}'",
-                        tag="GeoE3",
-                        level=Qgis.Warning,
-                    )
+            for index, record in enumerate(self.records()):
+                # Calculate the progress as the percentage of features processed
+                progress_percent: float = ((index + 1) / self.total_features) * 100
+                # Yield copies so callers cannot modify the shared table
+                yield (
+                    QgsGeometry(record.geometry),
+                    QgsGeometry(record.clip_geometry),
+                    QgsGeometry(record.bbox_geometry),
+                    progress_percent,
+                )
 
         except Exception as e:
             log_message(
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""📦 Buffer Overlap Scorer module.
+
+This module contains the shared grid-cell scoring engine used by the buffer
+based workflows (street lights, single point buffer and the native multi
+buffer workflow at regional scale).
+
+Performance optimizations:
+- Buffers are bulk loaded into a spatial index once, so each grid cell is only
+  tested against the buffers whose bounding boxes it touches
+- Buffer geometries are prepared once and reused for every intersects test
+- Cells completely inside a buffer skip the GEOS overlay entirely
+- Scores are written back with a single bulk attribute update
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from qgis.core import (
+    Qgis,
+    QgsFeatureRequest,
+    QgsField,
+    QgsGeometry,
+    QgsSpatialIndex,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtCore import QVariant
+
+from geest.utilities import log_message
+
+
+class BufferOverlapScorer:
+    """
+    Compute overlaps between grid cells and a layer of buffer polygons.
+
+    Example usage:
+
+        ```python
+        scorer = BufferOverlapScorer(buffered_layer)
+        scorer.score_cells(grid_layer, "value", lambda cell_area, overlaps: len(overlaps))
+        ```
+    """
+
+    def __init__(self, buffered_layer: QgsVectorLayer):
+        """
+        Index the buffer polygons.
+
+        Args:
+            buffered_layer (QgsVectorLayer): Layer of buffer polygons.
+        """
+        self._geometries: Dict[int, QgsGeometry] = {}
+        self._areas: Dict[int, float] = {}
+        self._engines = {}
+        for feature in buffered_layer.getFeatures():
+            geometry = feature.geometry()
+            if geometry.isNull() or geometry.isEmpty():
+                continue
+            self._geometries[feature.id()] = geometry
+            self._areas[feature.id()] = geometry.area()
+        # Bulk loading from an iterator is much faster than inserting one by one
+        self._index = QgsSpatialIndex(buffered_layer.getFeatures())
+
+    def _engine(self, fid: int):
+        """
+        Return the prepared geometry engine for a buffer, creating it on first use.
+
+        Args:
+            fid (int): Feature id of the buffer.
+
+        Returns:
+            QgsGeometryEngine: Prepared engine for the buffer geometry.
+        """
+        engine = self._engines.get(fid)
+        if engine is None:
+            engine = QgsGeometry.createGeometryEngine(self._geometries[fid].constGet())
+            engine.prepareGeometry()
+            self._engines[fid] = engine
+        return engine
+
+    def overlaps(self, cell_geometry: QgsGeometry) -> List[Tuple[float, float]]:
+        """
+        Return the overlap of a cell with every buffer it intersects.
+
+        Buffers that only touch the cell are included with an intersection area of 0,
+        matching a non-empty GEOS intersection.
+
+        Args:
+            cell_geometry (QgsGeometry): The grid cell geometry.
+
+        Returns:
+            List of (intersection area, buffer area) tuples.
+        """
+        result = []
+        cell = cell_geometry.constGet()
+        cell_area = None
+        for fid in self._index.intersects(cell_geometry.boundingBox()):
+            if fid not in self._geometries:
+                continue
+            engine = self._engine(fid)
+            if not engine.intersects(cell):
+                continue
+            if engine.contains(cell):
+                if cell_area is None:
+                    cell_area = cell_geometry.area()
+                intersection_area = cell_area
+            else:
+                intersection_area = cell_geometry.intersection(self._geometries[fid]).area()
+            result.append((intersection_area, self._areas[fid]))
+        return result
+
+    def score_cells(
+        self,
+        grid_layer: QgsVectorLayer,
+        field_name: str,
+        score_function: Callable[[float, List[Tuple[float, float]]], Optional[int]],
+    ) -> int:
+        """
+        Score every cell of a grid layer and write the scores in one bulk update.
+
+        Cells with a null or zero-area geometry are left untouched.
+
+        Args:
+            grid_layer (QgsVectorLayer): The grid layer to score.
+            field_name (str): Integer field to write scores to. Created if missing.
+            score_function: Callable(cell_area, overlaps) returning the score for a cell,
+                or None to leave the cell untouched.
+
+        Returns:
+            int: The number of cells that were scored.
+        """
+        provider = grid_layer.dataProvider()
+        if grid_layer.fields().indexFromName(field_name) < 0:
+            provider.addAttributes([QgsField(field_name, QVariant.Int)])
+            grid_layer.updateFields()
+        field_index = grid_layer.fields().indexFromName(field_name)
+
+        request = QgsFeatureRequest().setNoAttributes()
+        changes = {}
+        score_counts = {}
+        for grid_feature in grid_layer.getFeatures(request):
+            grid_geom = grid_feature.geometry()
+            if grid_geom.isNull():
+                continue
+            cell_area = grid_geom.area()
+            if cell_area == 0:
+                continue
+            score = score_function(cell_area, self.overlaps(grid_geom))
+            if score is None:
+                continue
+            changes[grid_feature.id()] = {field_index: score}
+            score_counts[score] = score_counts.get(score, 0) + 1
+
+        if changes and not provider.changeAttributeValues(changes):
+            log_message(
+                f"Failed to write scores to {grid_layer.source()}",
+                tag="GeoE3",
+                level=Qgis.Critical,
+            )
+        grid_layer.reload()
+        log_message(f"{len(changes)} grid cells scored. Distribution: {score_counts}")
+        return len(changes)
+
+
+def max_buffer_overlap_percent(overlaps: List[Tuple[float, float]]) -> float:
+    """
+    Return the largest percentage of a buffer that falls within a cell.
+
+    Args:
+        overlaps: (intersection area, buffer area) tuples from BufferOverlapScorer.overlaps.
+
+    Returns:
+        float: The maximum overlap percentage, or 0 if nothing overlaps.
+    """
+    max_overlap_percent = 0
+    for intersection_area, buffer_area in overlaps:
+        if intersection_area == 0 or buffer_area <= 0:
+            continue
+        overlap_percent = (intersection_area / buffer_area) * 100
+        if overlap_percent > max_overlap_percent:
+            max_overlap_percent = overlap_percent
+    return max_overlap_percent
+
+
+def percentage_band_score(percentage_scores: Dict, overlap_percent: float) -> int:
+    """
+    Look up the score for an overlap percentage in a regional percentage table.
+
+    Table ranges: Score 0: 0%, Score 1: 0.01-6%, Score 2: 6.01-12%, etc.
+
+    Args:
+        percentage_scores (dict): Mapping of threshold percentage to score.
+        overlap_percent (float): The overlap percentage to score.
+
+    Returns:
+        int: The assigned score.
+    """
+    sorted_items = sorted(percentage_scores.items())
+    max_score = 0
+    for i, (min_pct, score) in enumerate(sorted_items):
+        if score == 0:
+            if overlap_percent == 0:
+                max_score = 0
+        elif i == len(sorted_items) - 1:
+            # Last score: prev_pct < overlap
+            prev_pct = sorted_items[i - 1][0]
+            if prev_pct < overlap_percent:
+                max_score = score
+        else:
+            # Middle scores: prev_pct < overlap <= min_pct
+            prev_pct = sorted_items[i - 1][0]
+            if prev_pct < overlap_percent <= min_pct:
+                max_score = score
+    return max_score
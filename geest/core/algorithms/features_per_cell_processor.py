@@ -7,8 +7,12 @@ Performance optimizations:
 - Caches grid geometries upfront to avoid repeated getFeature() calls
 - Uses prepared geometries for faster intersection tests
 - Reduces logging overhead in inner loops
+- Shares one grid spatial index across areas and workflows (see GridIndexCache)
+- Study areas with an implicit grid find cells arithmetically (see ImplicitGrid)
 """
 
+from typing import Dict, Optional
+
 from qgis import processing  # noqa: F401
 from qgis.core import (
     Qgis,
@@ -20,13 +24,14 @@ from qgis.core import (
     QgsFields,
     QgsGeometry,
     QgsRectangle,
-    QgsSpatialIndex,
     QgsVectorFileWriter,
     QgsVectorLayer,
     QgsWkbTypes,
 )
 from qgis.PyQt.QtCore import QVariant
 
+from geest.core.algorithms.grid_index_cache import GridIndexCache
+from geest.core.algorithms.implicit_grid import ImplicitGrid
 from geest.core.osm_downloaders import OSMDownloadType
 from geest.core.workflows.mappings import CYCLEWAY_CLASSIFICATION, HIGHWAY_CLASSIFICATION
 from geest.utilities import log_message, setting
@@ -37,6 +42,7 @@ def select_grid_cells_and_count_features(
     features_layer: QgsVectorLayer,
     output_path: str,
     feedback: QgsFeedback = None,
+    implicit_grid: Optional[ImplicitGrid] = None,
 ) -> QgsVectorLayer:
     """
     Select grid cells that intersect with features, count the number of intersecting features for each cell,
@@ -47,6 +53,8 @@ def select_grid_cells_and_count_features(
         features_layer (QgsVectorLayer): The input layer containing features (e.g., points, lines, polygons).
         output_path (str): The output path for the new grid layer with feature counts.
         feedback (QgsFeedback): Optional feedback object for progress reporting.
+        implicit_grid (ImplicitGrid): When the study area has an implicit grid, cells are
+            found arithmetically from it and grid_layer is not read.
 
     Returns:
         QgsVectorLayer: A new layer with grid cells containing a count of intersecting features.
@@ -59,6 +67,8 @@ def select_grid_cells_and_count_features(
         tag="GeoE3",
         level=Qgis.Info,
     )
+    if implicit_grid is not None:
+        return _count_features_on_implicit_grid(implicit_grid, features_layer, output_path, feedback)
 
     # Initialize variables for cleanup
     grid_index = None
@@ -66,8 +76,8 @@ def select_grid_cells_and_count_features(
     writer = None
 
     try:
-        # Create a spatial index for the grid layer to optimize intersection queries
-        grid_index = QgsSpatialIndex(grid_layer.getFeatures())
+        # Use the shared spatial index for the grid layer to optimize intersection queries
+        grid_index = GridIndexCache.index_for_layer(grid_layer)
 
         # Create a dictionary to hold the count of intersecting features for each grid cell ID
         grid_feature_counts = {}
@@ -86,6 +96,15 @@ def select_grid_cells_and_count_features(
             if feature_geom.type() == QgsWkbTypes.PointGeometry:
                 # For point geometries, use bounding box to find intersecting grid cells
                 intersecting_ids = grid_index.intersects(feature_geom.boundingBox())
+                if len(intersecting_ids) > 1:
+                    # Cached indexes may hold slightly padded cell bounds, so
+                    # resolve points near cell edges against the real cells
+                    request = QgsFeatureRequest().setFilterFids(intersecting_ids)
+                    intersecting_ids = [
+                        grid_feature.id()
+                        for grid_feature in grid_layer.getFeatures(request)
+                        if grid_feature.geometry().intersects(feature_geom)
+                    ]
             else:
                 # For line and polygon geometries, check actual geometry against grid cells
                 intersecting_ids = grid_index.intersects(feature_geom.boundingBox())  # Initial rough filter
@@ -219,13 +238,111 @@ def select_grid_cells_and_count_features(
         # Explicit cleanup to release memory
         if writer:
             del writer
-        if grid_index:
-            del grid_index
+        # grid_index is shared through GridIndexCache so only drop our reference
+        grid_index = None
         if grid_feature_counts:
             grid_feature_counts.clear()
             del grid_feature_counts
 
 
+def _count_features_on_implicit_grid(
+    implicit_grid: ImplicitGrid,
+    features_layer: QgsVectorLayer,
+    output_path: str,
+    feedback: QgsFeedback = None,
+) -> QgsVectorLayer:
+    """
+    Count the features intersecting each cell of an implicit grid.
+
+    Args:
+        implicit_grid (ImplicitGrid): The study area grid.
+        features_layer (QgsVectorLayer): The features to count.
+        output_path (str): The output path for the grid layer with feature counts.
+        feedback (QgsFeedback): Optional feedback object for progress reporting.
+
+    Returns:
+        QgsVectorLayer: A new layer with grid cells containing a count of intersecting features.
+    """
+    grid_feature_counts = {}
+    counter = 0
+    feature_count = features_layer.featureCount()
+    for feature in features_layer.getFeatures():
+        for cell_id in implicit_grid.cells_intersecting(feature.geometry()):
+            grid_feature_counts[cell_id] = grid_feature_counts.get(cell_id, 0) + 1
+        counter += 1
+        if feedback:
+            feedback.setProgress((counter / max(1, feature_count)) * 100.0)
+    log_message(f"{len(grid_feature_counts)} intersections found.")
+
+    fields = QgsFields()
+    fields.append(QgsField("id", QVariant.Int))
+    fields.append(QgsField("intersecting_features", QVariant.Int))
+    # Will be used to hold the scaled value from 0-5
+    fields.append(QgsField("value", QVariant.Int))
+    cell_attributes = {cell_id: [cell_id, count, None] for cell_id, count in grid_feature_counts.items()}
+    _write_implicit_grid_cells(implicit_grid, fields, cell_attributes, output_path, feedback)
+    return QgsVectorLayer(
+        f"{output_path}|layername=grid_with_feature_counts",
+        "grid_with_feature_counts",
+        "ogr",
+    )
+
+
+def _write_implicit_grid_cells(
+    implicit_grid: ImplicitGrid,
+    fields: QgsFields,
+    cell_attributes: Dict[int, list],
+    output_path: str,
+    feedback: QgsFeedback = None,
+) -> None:
+    """
+    Write implicit grid cells and their attributes to the grid_with_feature_counts layer of a GeoPackage.
+
+    Args:
+        implicit_grid (ImplicitGrid): The study area grid.
+        fields (QgsFields): Fields of the output layer.
+        cell_attributes (dict): Mapping of cell id to the attribute list for fields.
+        output_path (str): The output GeoPackage.
+        feedback (QgsFeedback): Optional feedback object for progress reporting.
+
+    Raises:
+        Exception: If the output layer cannot be created.
+    """
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = "GPKG"
+    options.fileEncoding = "UTF-8"
+    options.layerName = "grid_with_feature_counts"
+    writer = QgsVectorFileWriter.create(
+        fileName=output_path,
+        fields=fields,
+        geometryType=QgsWkbTypes.Polygon,
+        srs=implicit_grid.crs(),
+        transformContext=QgsCoordinateTransformContext(),
+        options=options,
+    )
+    if writer.hasError() != QgsVectorFileWriter.NoError:
+        raise Exception(f"Failed to create output layer: {writer.errorMessage()}")
+
+    batch_size = 10000
+    cell_ids = list(cell_attributes.keys())
+    for start in range(0, len(cell_ids), batch_size):
+        feature_batch = []
+        for cell_id in cell_ids[start : start + batch_size]:
+            new_feature = QgsFeature(fields)
+            new_feature.setGeometry(implicit_grid.cell_geometry(cell_id))
+            new_feature.setAttributes(cell_attributes[cell_id])
+            feature_batch.append(new_feature)
+        writer.addFeatures(feature_batch)
+        if feedback:
+            feedback.setProgress(min(100.0, (start + batch_size) / len(cell_ids) * 100))
+    del writer
+    log_message(
+        f"Wrote {len(cell_ids)} implicit grid cells to {output_path}",
+        tag="GeoE3",
+        level=Qgis.Info,
+    )
+
+
 def assign_values_to_grid(grid_layer: QgsVectorLayer, feedback: QgsFeedback = None) -> QgsVectorLayer:
     """
     Assign values to grid cells based on the number of intersecting features.
@@ -309,6 +426,7 @@ def select_grid_cells_and_assign_transport_score(
     output_path: str,
     feedback: QgsFeedback = None,
     analysis_scale: str = None,
+    implicit_grid: Optional[ImplicitGrid] = None,
 ) -> QgsVectorLayer:
     """
     Select grid cells that intersect with features, and assign a value
@@ -323,6 +441,9 @@ def select_grid_cells_and_assign_transport_score(
         features_layer (QgsVectorLayer): The input OSM layer containing features with highway and/or cycleway attributes.
         output_path (str): The output path for the new grid layer with transport scores.
         feedback (QgsFeedback): Optional feedback object for progress reporting.
+        analysis_scale (str): Analysis scale used to pick the cycleway classification.
+        implicit_grid (ImplicitGrid): When the study area has an implicit grid, cells are
+            found arithmetically from it and grid_layer is not read.
 
     Returns:
         QgsVectorLayer: A new layer with grid cells containing the highest score from the intersecting features.
@@ -337,8 +458,8 @@ def select_grid_cells_and_assign_transport_score(
         level=Qgis.Info,
     )
 
-    # Create a spatial index for the grid layer to optimize intersection queries
-    grid_index = QgsSpatialIndex(grid_layer.getFeatures())
+    # Use the shared spatial index for the grid layer to optimize intersection queries
+    grid_index = GridIndexCache.index_for_layer(grid_layer) if implicit_grid is None else None
 
     # Create dictionaries to hold the best scores and their source types for each grid cell ID
     grid_most_beneficial_road_scores = {}
@@ -431,6 +552,21 @@ def select_grid_cells_and_assign_transport_score(
                 )
             continue
 
+        if implicit_grid is not None:
+            # Cells are found arithmetically; only keep those the score can improve
+            intersecting_ids = [
+                grid_id
+                for grid_id in implicit_grid.cells_intersecting(feature_geom)
+                if grid_most_beneficial_road_scores.get(grid_id, 0) < road_score
+            ]
+            for grid_id in intersecting_ids:
+                grid_most_beneficial_road_scores[grid_id] = road_score
+                grid_most_beneficial_road_types[grid_id] = road_type
+            counter += 1
+            if feedback:
+                feedback.setProgress((counter / feature_count) * 100.0)
+            continue
+
         # OPTIMIZATION: Segment-based spatial index query for linestrings
         # Instead of one huge bbox for the whole line, query smaller bboxes per segment
         # This dramatically reduces false positives for long diagonal roads
@@ -531,6 +667,18 @@ def select_grid_cells_and_assign_transport_score(
         level=Qgis.Info,
     )
 
+    if implicit_grid is not None:
+        fields = QgsFields()
+        fields.append(QgsField("id", QVariant.Int))
+        fields.append(QgsField("value", QVariant.Int))
+        fields.append(QgsField("road_type", QVariant.String))
+        cell_attributes = {
+            grid_id: [grid_id, score, grid_most_beneficial_road_types.get(grid_id, "unknown")]
+            for grid_id, score in grid_most_beneficial_road_scores.items()
+        }
+        _write_implicit_grid_cells(implicit_grid, fields, cell_attributes, output_path, feedback)
+        return QgsVectorLayer(f"{output_path}", "grid_with_feature_scores", "ogr")
+
     # OPTIMIZATION: Use batch writing for much faster GeoPackage creation
     len_grid_ids = len(grid_most_beneficial_road_scores)
     log_message(
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""📦 Grid Index Cache module.
+
+This module contains a process-wide cache of spatial indexes over the
+study area grid so that per-cell workflows do not rebuild the index for
+every area they process.
+
+Indexes are keyed on the GeoPackage path, layer name and modification time,
+so regenerating the study area automatically invalidates any cached index.
+When a GeoPackage is available the index is bulk loaded from the R-tree that
+GDAL persists alongside the layer, avoiding geometry parsing entirely.
+"""
+
+import os
+import sqlite3
+from threading import Lock
+from typing import Optional, Tuple
+
+from qgis.core import Qgis, QgsRectangle, QgsSpatialIndex, QgsVectorLayer
+
+from geest.utilities import log_message
+
+
+class GridIndexCache:
+    """
+    Process-wide cache of QgsSpatialIndex objects for grid layers.
+
+    The cache is shared by all areas and all concurrently running WorkflowJobs.
+    QgsSpatialIndex is safe for concurrent read access so a single instance can
+    be handed to every caller.
+
+    Example usage:
+
+        ```python
+        grid_index = GridIndexCache.index_for_layer(grid_layer)
+        intersecting_ids = grid_index.intersects(feature_geom.boundingBox())
+        ```
+    """
+
+    _lock = Lock()
+    _indexes = {}  # (gpkg_path, layer_name) -> (mtime, QgsSpatialIndex)
+
+    @classmethod
+    def index_for_layer(cls, grid_layer: QgsVectorLayer) -> QgsSpatialIndex:
+        """
+        Return a spatial index for the grid layer, building it only if needed.
+
+        Layers that are not backed by a file (e.g. memory layers) are not cached
+        and a fresh index is built for every call.
+
+        Args:
+            grid_layer (QgsVectorLayer): The grid layer to index.
+
+        Returns:
+            QgsSpatialIndex: The spatial index over the grid layer features.
+        """
+        gpkg_path, layer_name = cls._layer_location(grid_layer)
+        if gpkg_path is None:
+            return QgsSpatialIndex(grid_layer.getFeatures())
+
+        key = (gpkg_path, layer_name)
+        mtime = cls._modification_time(gpkg_path)
+        # Hold the lock while building so concurrent jobs wait for a single build
+        with cls._lock:
+            entry = cls._indexes.get(key)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            grid_index = cls._load_persisted_index(gpkg_path, layer_name)
+            if grid_index is None:
+                log_message(f"Building grid spatial index for {gpkg_path}|{layer_name}")
+                grid_index = QgsSpatialIndex(grid_layer.getFeatures())
+            cls._indexes[key] = (mtime, grid_index)
+            return grid_index
+
+    @classmethod
+    def invalidate(cls, gpkg_path: Optional[str] = None) -> None:
+        """
+        Drop cached indexes.
+
+        Args:
+            gpkg_path (str): Only drop indexes for this GeoPackage. If None, drop all indexes.
+        """
+        with cls._lock:
+            if gpkg_path is None:
+                cls._indexes.clear()
+                return
+            gpkg_path = os.path.abspath(gpkg_path)
+            for key in [key for key in cls._indexes if key[0] == gpkg_path]:
+                del cls._indexes[key]
+        log_message(f"Grid spatial index cache invalidated for {gpkg_path}")
+
+    @staticmethod
+    def _layer_location(grid_layer: QgsVectorLayer) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve the file path and layer name backing a layer.
+
+        Args:
+            grid_layer (QgsVectorLayer): The layer to resolve.
+
+        Returns:
+            Tuple of (absolute file path, layer name) or (None, None) if the layer is not file based.
+        """
+        if grid_layer.providerType() != "ogr":
+            return None, None
+        source = grid_layer.source()
+        path = source.split("|")[0]
+        if not os.path.exists(path):
+            return None, None
+        layer_name = None
+        for part in source.split("|")[1:]:
+            if part.startswith("layername="):
+                layer_name = part[len("layername=") :]
+        return os.path.abspath(path), layer_name
+
+    @staticmethod
+    def _modification_time(gpkg_path: str) -> float:
+        """
+        Return the latest modification time of a GeoPackage including its WAL file.
+
+        Args:
+            gpkg_path (str): Path to the GeoPackage.
+
+        Returns:
+            float: Modification time in seconds since the epoch.
+        """
+        mtime = os.path.getmtime(gpkg_path)
+        wal_path = f"{gpkg_path}-wal"
+        if os.path.exists(wal_path):
+            mtime = max(mtime, os.path.getmtime(wal_path))
+        return mtime
+
+    @staticmethod
+    def _load_persisted_index(gpkg_path: str, layer_name: Optional[str]) -> Optional[QgsSpatialIndex]:
+        """
+        Load a spatial index from the R-tree GDAL stores in a GeoPackage.
+
+        Only the bounding boxes are read, so this is much cheaper than iterating
+        the layer and parsing every cell geometry.
+
+        Args:
+            gpkg_path (str): Path to the GeoPackage.
+            layer_name (str): Name of the grid layer in the GeoPackage.
+
+        Returns:
+            QgsSpatialIndex or None if the GeoPackage has no usable R-tree for the layer.
+        """
+        if not gpkg_path.lower().endswith(".gpkg") or not layer_name:
+            return None
+        connection = None
+        try:
+            connection = sqlite3.connect(f"file:{gpkg_path}?mode=ro", uri=True)
+            row = connection.execute(
+                "SELECT column_name FROM gpkg_geometry_columns WHERE table_name = ?",
+                (layer_name,),
+            ).fetchone()
+            if row is None:
+                return None
+            rtree_table = f"rtree_{layer_name}_{row[0]}"
+            exists = connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (rtree_table,),
+            ).fetchone()
+            if exists is None:
+                return None
+
+            grid_index = QgsSpatialIndex()
+            count = 0
+            cursor = connection.execute(f'SELECT id, minx, miny, maxx, maxy FROM "{rtree_table}"')  # nosec B608
+            for fid, xmin, ymin, xmax, ymax in cursor:
+                grid_index.addFeature(fid, QgsRectangle(xmin, ymin, xmax, ymax))
+                count += 1
+            log_message(f"Loaded grid spatial index with {count} cells from {rtree_table}")
+            return grid_index
+        except sqlite3.Error as e:
+            log_message(
+                f"Could not load persisted grid index from {gpkg_path}: {e}",
+                tag="GeoE3",
+                level=Qgis.Warning,
+            )
+            return None
+        finally:
+            if connection is not None:
+                connection.close()
@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""📦 Implicit Grid module.
+
+This module contains an arithmetic representation of the regular study area
+grid.
+
+Instead of materialising every cell as a polygon in study_area_grid, the grid
+is stored as its origin, cell size, dimensions and CRS (study_area_grid.json)
+plus a 1-bit coverage raster marking the cells that touch a study area polygon
+(study_area_grid_coverage.tif). Cell ids, extents and geometries are derived
+from the row and column of a cell, and the cells a feature intersects are
+found by arithmetic on its bounding box instead of a spatial index query.
+
+Cell ids are row * columns + column, with row 0 at the top of the grid.
+"""
+
+import json
+import math
+import os
+from threading import Lock
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from osgeo import gdal
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsGeometry,
+    QgsRectangle,
+    QgsWkbTypes,
+)
+
+from geest.utilities import log_message
+
+DEFINITION_FILENAME = "study_area_grid.json"
+COVERAGE_FILENAME = "study_area_grid_coverage.tif"
+
+# Tolerance, in cells, for coordinates that fall on a cell edge
+EDGE_TOLERANCE = 1e-9
+
+# Rows read at a time when loading or writing the coverage raster
+COVERAGE_BLOCK_ROWS = 1024
+
+
+class ImplicitGrid:
+    """
+    A regular grid described by its origin, cell size and dimensions.
+
+    Example usage:
+
+        ```python
+        grid = ImplicitGrid.for_study_area(gpkg_path)
+        if grid is not None:
+            for cell_id in grid.cells_intersecting(feature.geometry()):
+                cell_polygon = grid.cell_geometry(cell_id)
+        ```
+    """
+
+    _lock = Lock()
+    _grids = {}  # definition path -> (mtime, ImplicitGrid)
+
+    def __init__(
+        self,
+        origin_x: float,
+        origin_y: float,
+        cell_size: float,
+        columns: int,
+        rows: int,
+        crs_wkt: str,
+        coverage_path: Optional[str] = None,
+    ):
+        """
+        Initialize the grid.
+
+        Args:
+            origin_x (float): X coordinate of the left edge of the grid.
+            origin_y (float): Y coordinate of the top edge of the grid.
+            cell_size (float): Width and height of a cell in CRS units.
+            columns (int): Number of columns.
+            rows (int): Number of rows.
+            crs_wkt (str): WKT of the grid CRS.
+            coverage_path (str): Optional 1-bit raster marking the cells in the study area.
+        """
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.cell_size = cell_size
+        self.columns = columns
+        self.rows = rows
+        self.crs_wkt = crs_wkt
+        self.coverage_path = coverage_path
+        self._coverage = None
+        self._coverage_lock = Lock()
+
+    @classmethod
+    def from_extent(
+        cls,
+        extent: Tuple[float, float, float, float],
+        cell_size: float,
+        crs_wkt: str,
+        coverage_path: Optional[str] = None,
+    ) -> "ImplicitGrid":
+        """
+        Create a grid covering an extent that is aligned to the cell size.
+
+        Args:
+            extent: (xmin, xmax, ymin, ymax) of the grid, as used by StudyAreaProcessingTask.
+            cell_size (float): Width and height of a cell.
+            crs_wkt (str): WKT of the grid CRS.
+            coverage_path (str): Optional coverage raster path.
+
+        Returns:
+            ImplicitGrid: The grid.
+        """
+        xmin, xmax, ymin, ymax = extent
+        columns = int(round((xmax - xmin) / cell_size))
+        rows = int(round((ymax - ymin) / cell_size))
+        return cls(xmin, ymax, cell_size, columns, rows, crs_wkt, coverage_path)
+
+    @staticmethod
+    def definition_path(gpkg_path: str) -> str:
+        """
+        Return the path of the grid definition for a study area.
+
+        Args:
+            gpkg_path (str): Path to study_area.gpkg.
+
+        Returns:
+            str: Path to study_area_grid.json next to the GeoPackage.
+        """
+        return os.path.join(os.path.dirname(gpkg_path), DEFINITION_FILENAME)
+
+    @classmethod
+    def for_study_area(cls, gpkg_path: str) -> Optional["ImplicitGrid"]:
+        """
+        Return the implicit grid of a study area, if it was created with one.
+
+        Grids are cached per definition file and reloaded when the file changes.
+
+        Args:
+            gpkg_path (str): Path to study_area.gpkg.
+
+        Returns:
+            ImplicitGrid: The grid, or None if the study area has a polygon grid only.
+        """
+        path = cls.definition_path(gpkg_path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        with cls._lock:
+            entry = cls._grids.get(path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            grid = cls.load(path)
+            cls._grids[path] = (mtime, grid)
+            return grid
+
+    @classmethod
+    def invalidate(cls, gpkg_path: Optional[str] = None) -> None:
+        """
+        Drop cached grids.
+
+        Args:
+            gpkg_path (str): Only drop the grid of this study area. Drops all grids if None.
+        """
+        with cls._lock:
+            if gpkg_path is None:
+                cls._grids.clear()
+            else:
+                cls._grids.pop(cls.definition_path(gpkg_path), None)
+
+    @classmethod
+    def load(cls, path: str) -> "ImplicitGrid":
+        """
+        Load a grid definition.
+
+        Args:
+            path (str): Path to a definition written by save.
+
+        Returns:
+            ImplicitGrid: The grid.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            definition = json.load(f)
+        coverage = definition.get("coverage")
+        if coverage and not os.path.isabs(coverage):
+            coverage = os.path.join(os.path.dirname(path), coverage)
+        return cls(
+            definition["origin_x"],
+            definition["origin_y"],
+            definition["cell_size"],
+            definition["columns"],
+            definition["rows"],
+            definition["crs_wkt"],
+            coverage,
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the grid definition atomically.
+
+        Args:
+            path (str): Destination JSON file. The coverage path is stored relative to it.
+        """
+        coverage = None
+        if self.coverage_path:
+            coverage = os.path.relpath(self.coverage_path, os.path.dirname(path))
+        definition = {
+            "origin_x": self.origin_x,
+            "origin_y": self.origin_y,
+            "cell_size": self.cell_size,
+            "columns": self.columns,
+            "rows": self.rows,
+            "crs_wkt": self.crs_wkt,
+            "coverage": coverage,
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(definition, f, indent=2)
+        os.replace(temp_path, path)
+
+    @property
+    def cell_count(self) -> int:
+        """Total number of cells, covered or not."""
+        return self.columns * self.rows
+
+    def crs(self) -> QgsCoordinateReferenceSystem:
+        """
+        Return the grid CRS.
+
+        Returns:
+            QgsCoordinateReferenceSystem: The CRS.
+        """
+        return QgsCoordinateReferenceSystem.fromWkt(self.crs_wkt)
+
+    def cell_id(self, row: int, column: int) -> int:
+        """
+        Return the id of a cell.
+
+        Args:
+            row (int): Row, 0 at the top.
+            column (int): Column, 0 at the left.
+
+        Returns:
+            int: The cell id.
+        """
+        return row * self.columns + column
+
+    def row_column(self, cell_id: int) -> Tuple[int, int]:
+        """
+        Return the row and column of a cell.
+
+        Args:
+            cell_id (int): The cell id.
+
+        Returns:
+            Tuple of (row, column).
+        """
+        return divmod(cell_id, self.columns)
+
+    def cell_rectangle(self, cell_id: int) -> QgsRectangle:
+        """
+        Return the extent of a cell.
+
+        Args:
+            cell_id (int): The cell id.
+
+        Returns:
+            QgsRectangle: The cell extent.
+        """
+        row, column = self.row_column(cell_id)
+        xmin = self.origin_x + column * self.cell_size
+        ymax = self.origin_y - row * self.cell_size
+        return QgsRectangle(xmin, ymax - self.cell_size, xmin + self.cell_size, ymax)
+
+    def cell_geometry(self, cell_id: int) -> QgsGeometry:
+        """
+        Return the polygon of a cell.
+
+        Args:
+            cell_id (int): The cell id.
+
+        Returns:
+            QgsGeometry: The cell polygon.
+        """
+        return QgsGeometry.fromRect(self.cell_rectangle(cell_id))
+
+    def cell_range(self, rectangle: QgsRectangle) -> Tuple[int, int, int, int]:
+        """
+        Return the cells whose closed extent intersects a rectangle.
+
+        A rectangle edge lying on a cell edge touches the cells on both sides,
+        matching a spatial index query over cell polygons.
+
+        Args:
+            rectangle (QgsRectangle): The query rectangle.
+
+        Returns:
+            Tuple of (row_start, row_end, column_start, column_end), end exclusive.
+            The range is empty when the rectangle is outside the grid.
+        """
+        column_start = math.ceil((rectangle.xMinimum() - self.origin_x) / self.cell_size - EDGE_TOLERANCE) - 1
+        column_end = math.floor((rectangle.xMaximum() - self.origin_x) / self.cell_size + EDGE_TOLERANCE) + 1
+        row_start = math.ceil((self.origin_y - rectangle.yMaximum()) / self.cell_size - EDGE_TOLERANCE) - 1
+        row_end = math.floor((self.origin_y - rectangle.yMinimum()) / self.cell_size + EDGE_TOLERANCE) + 1
+        return (
+            max(0, row_start),
+            min(self.rows, row_end),
+            max(0, column_start),
+            min(self.columns, column_end),
+        )
+
+    def _cells_in_range(self, row_start: int, row_end: int, column_start: int, column_end: int) -> Iterable[int]:
+        """
+        Yield the ids of the cells in a row and column range.
+
+        Args:
+            row_start (int): First row.
+            row_end (int): Row after the last.
+            column_start (int): First column.
+            column_end (int): Column after the last.
+
+        Yields:
+            int: Cell ids.
+        """
+        for row in range(row_start, row_end):
+            base = row * self.columns
+            for column in range(column_start, column_end):
+                yield base + column
+
+    def cells_intersecting(self, geometry: QgsGeometry, covered_only: bool = True) -> List[int]:
+        """
+        Return the ids of the cells a geometry intersects.
+
+        Cells are selected arithmetically from the geometry's bounding box (per
+        segment for lines) and refined with a prepared geometry only when the
+        geometry spans more than one cell.
+
+        Args:
+            geometry (QgsGeometry): The geometry, in the grid CRS.
+            covered_only (bool): Only return cells inside the study area coverage.
+
+        Returns:
+            list: Cell ids.
+        """
+        if geometry.isNull() or geometry.isEmpty():
+            return []
+        candidates = set()
+        if geometry.type() == QgsWkbTypes.LineGeometry:
+            vertices = list(geometry.constGet().vertices())
+            for first, second in zip(vertices, vertices[1:]):
+                segment = QgsRectangle(
+                    min(first.x(), second.x()),
+                    min(first.y(), second.y()),
+                    max(first.x(), second.x()),
+                    max(first.y(), second.y()),
+                )
+                candidates.update(self._cells_in_range(*self.cell_range(segment)))
+        else:
+            candidates.update(self._cells_in_range(*self.cell_range(geometry.boundingBox())))
+
+        # Every candidate of a single point touches it; anything else needs a real test
+        if len(candidates) > 1 and (geometry.type() != QgsWkbTypes.PointGeometry or geometry.isMultipart()):
+            engine = QgsGeometry.createGeometryEngine(geometry.constGet())
+            engine.prepareGeometry()
+            candidates = {
+                cell_id for cell_id in candidates if engine.intersects(self.cell_geometry(cell_id).constGet())
+            }
+        if covered_only and self.coverage_path:
+            return sorted(cell_id for cell_id in candidates if self.is_covered(cell_id))
+        return sorted(candidates)
+
+    def _load_coverage(self) -> Optional[np.ndarray]:
+        """
+        Load the coverage raster as a bit packed array, once.
+
+        Returns:
+            numpy.ndarray: rows x ceil(columns / 8) packed coverage bits, or None without coverage.
+        """
+        with self._coverage_lock:
+            if self._coverage is not None or not self.coverage_path:
+                return self._coverage
+            dataset = gdal.Open(self.coverage_path, gdal.GA_ReadOnly)
+            if dataset is None:
+                log_message(f"Could not open grid coverage {self.coverage_path}")
+                return None
+            band = dataset.GetRasterBand(1)
+            packed = np.zeros((self.rows, (self.columns + 7) // 8), dtype=np.uint8)
+            for row in range(0, self.rows, COVERAGE_BLOCK_ROWS):
+                block_rows = min(COVERAGE_BLOCK_ROWS, self.rows - row)
+                block = band.ReadAsArray(0, row, self.columns, block_rows)
+                packed[row : row + block_rows] = np.packbits(block > 0, axis=1)
+            dataset = None
+            self._coverage = packed
+            return self._coverage
+
+    def is_covered(self, cell_id: int) -> bool:
+        """
+        Whether a cell touches a study area polygon.
+
+        Args:
+            cell_id (int): The cell id.
+
+        Returns:
+            bool: True if the cell is part of the study area grid, or if there is no coverage raster.
+        """
+        coverage = self._load_coverage()
+        if coverage is None:
+            return True
+        row, column = self.row_column(cell_id)
+        return bool((coverage[row, column >> 3] >> (7 - (column & 7))) & 1)
+
+    def write_coverage(self, mask_paths: List[str], coverage_path: str) -> int:
+        """
+        Combine per-area masks into the coverage raster of the grid.
+
+        Masks must be aligned to the grid. A cell is covered if it is set in any mask.
+
+        Args:
+            mask_paths (list): Per-area 1-bit mask rasters.
+            coverage_path (str): Destination GeoTIFF.
+
+        Returns:
+            int: The number of covered cells.
+        """
+        coverage = gdal.GetDriverByName("GTiff").Create(
+            coverage_path,
+            self.columns,
+            self.rows,
+            1,
+            gdal.GDT_Byte,
+            options=["NBITS=1", "COMPRESS=DEFLATE", "TILED=YES", "SPARSE_OK=TRUE"],
+        )
+        coverage.SetGeoTransform((self.origin_x, self.cell_size, 0.0, self.origin_y, 0.0, -self.cell_size))
+        coverage.SetProjection(self.crs_wkt)
+        band = coverage.GetRasterBand(1)
+        for mask_path in mask_paths:
+            mask = gdal.Open(mask_path, gdal.GA_ReadOnly)
+            if mask is None:
+                log_message(f"Skipping missing area mask {mask_path}")
+                continue
+            mask_origin_x, _, _, mask_origin_y, _, _ = mask.GetGeoTransform()
+            column = int(round((mask_origin_x - self.origin_x) / self.cell_size))
+            row = int(round((self.origin_y - mask_origin_y) / self.cell_size))
+            # Clip the mask window to the grid
+            mask_column = max(0, -column)
+            mask_row = max(0, -row)
+            width = min(mask.RasterXSize - mask_column, self.columns - (column + mask_column))
+            height = min(mask.RasterYSize - mask_row, self.rows - (row + mask_row))
+            if width <= 0 or height <= 0:
+                mask = None
+                continue
+            data = mask.GetRasterBand(1).ReadAsArray(mask_column, mask_row, width, height)
+            window = band.ReadAsArray(column + mask_column, row + mask_row, width, height)
+            band.WriteArray(np.maximum(window, (data > 0).astype(np.uint8)), column + mask_column, row + mask_row)
+            mask = None
+        band.FlushCache()
+
+        covered = 0
+        for block_row in range(0, self.rows, COVERAGE_BLOCK_ROWS):
+            block_rows = min(COVERAGE_BLOCK_ROWS, self.rows - block_row)
+            covered += int(np.count_nonzero(band.ReadAsArray(0, block_row, self.columns, block_rows)))
+        coverage = None
+        self.coverage_path = coverage_path
+        with self._coverage_lock:
+            self._coverage = None
+        return covered
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""📦 Isochrone Banding module.
+
+This module contains the raster banding of overlapping isochrones used by the
+multi-buffer workflows.
+
+Instead of dissolving the isochrones of each range and cutting each range
+out of the next larger one to get non overlapping rings, the isochrones are
+scored and ordered from the largest range to the smallest. Rasterizing that
+layer burns the smaller ranges last, so every pixel keeps the score of the
+smallest range that reaches it, which is what the vector rings gave, without
+any polygon overlay.
+"""
+
+from typing import Dict, List
+
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsFeatureRequest,
+    QgsField,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtCore import QVariant
+
+from geest.utilities import log_message
+
+
+def distance_band_scores(distances: List[float]) -> Dict[float, int]:
+    """
+    Return the score of each travel distance.
+
+    The first distance scores 5, the next 4 and so on, never below 0, as
+    assigned to the vector bands by the multi-buffer workflows.
+
+    Args:
+        distances (list): Travel distances, closest first.
+
+    Returns:
+        dict: Distance -> score.
+    """
+    scores = {}
+    for index, distance in enumerate(distances):
+        # First occurrence wins, as with list.index
+        scores.setdefault(distance, 5 - min(index, 5))
+    return scores
+
+
+def band_burn_layer(
+    isochrone_layer: QgsVectorLayer,
+    scores: Dict[float, int],
+    crs: QgsCoordinateReferenceSystem,
+    range_field: str = "value",
+) -> QgsVectorLayer:
+    """
+    Return the isochrones scored and ordered for burning, largest range first.
+
+    Isochrones whose range has no score are left out, so they are not burned.
+
+    Args:
+        isochrone_layer (QgsVectorLayer): Possibly overlapping isochrone polygons, in crs.
+        scores (dict): Range -> score, see distance_band_scores.
+        crs (QgsCoordinateReferenceSystem): The CRS of the isochrones.
+        range_field (str): The field holding each isochrone's range.
+
+    Returns:
+        QgsVectorLayer: A memory layer with a "value" field holding the scores.
+
+    Raises:
+        KeyError: If the range field does not exist.
+    """
+    if isochrone_layer.fields().indexFromName(range_field) == -1:
+        raise KeyError(f"Field '{range_field}' does not exist in isochrones layer: {isochrone_layer.source()}")
+
+    request = QgsFeatureRequest().setSubsetOfAttributes([range_field], isochrone_layer.fields())
+    isochrones = []
+    skipped = 0
+    for feature in isochrone_layer.getFeatures(request):
+        geometry = feature.geometry()
+        if geometry.isNull() or geometry.isEmpty():
+            continue
+        try:
+            distance = float(feature[range_field])
+        except (TypeError, ValueError):
+            distance = None
+        # Float and int ranges compare and hash equal, so 400 finds 400.0
+        score = scores.get(distance)
+        if score is None:
+            skipped += 1
+            continue
+        geometry.convertToMultiType()
+        isochrones.append((distance, score, geometry))
+    if skipped:
+        log_message(
+            f"{skipped} isochrones have a range that is not a travel distance and were not burned",
+            tag="GeoE3",
+            level=Qgis.Warning,
+        )
+
+    burn_layer = QgsVectorLayer("MultiPolygon", "isochrone_bands", "memory")
+    burn_layer.setCrs(crs)
+    provider = burn_layer.dataProvider()
+    provider.addAttributes([QgsField("distance", QVariant.Int), QgsField("value", QVariant.Int)])
+    burn_layer.updateFields()
+    features = []
+    # Stable sort keeps the input order within a range
+    for distance, score, geometry in sorted(isochrones, key=lambda isochrone: isochrone[0], reverse=True):
+        feature = QgsFeature(burn_layer.fields())
+        feature.setGeometry(geometry)
+        feature.setAttributes([int(round(distance)), score])
+        features.append(feature)
+    provider.addFeatures(features)
+    burn_layer.updateExtents()
+    log_message(f"Ordered {len(features)} isochrones for raster banding")
+    return burn_layer
@@ -2,10 +2,9 @@
 """Batch network analysis using QGIS native algorithms."""
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from osgeo import ogr, osr
-from qgis import processing
 from qgis.core import (
     Qgis,
     QgsCoordinateReferenceSystem,
@@ -15,11 +14,15 @@ from qgis.core import (
 
 from geest.utilities import log_message
 
+from .network_distance import NetworkGraph
+
 
 class NativeNetworkAnalysisProcessingTask(QgsTask):
     """Batch network analysis task for generating isochrones.
 
-    Processes all points simultaneously per distance value for performance.
+    Builds the road network graph once (cached per network file and CRS) and
+    runs a single multi-source shortest path pass from all points, from which
+    every distance band is derived.
     Outputs concave hull polygons to GeoPackage with spatial indexing.
 
     Attributes:
@@ -28,13 +31,14 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
         road_network_path: Path to road network.
         output_gpkg_path: Output GeoPackage path.
         target_crs: Coordinate reference system.
+        graph_cache_directory: Folder for persisted road network graphs.
         result_path: Created GeoPackage path (set after run).
     """
 
     # Network analysis configuration (hardcoded for consistency)
     POINT_TOLERANCE = 50  # Maximum distance from point to network (meters)
     NETWORK_TOLERANCE = 50  # Network topology tolerance (meters)
-    STRATEGY = 0  # 0=Shortest path, 1=Fastest path
+    STRATEGY = 0  # 0=Shortest path, 1=Fastest path (only shortest path is supported)
     DEFAULT_DIRECTION = 2  # 0=Forward, 1=Backward, 2=Both
     DEFAULT_SPEED = 50  # Default road speed (km/h)
     INCLUDE_BOUNDS = False  # Whether to include unreachable boundary
@@ -47,6 +51,7 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
         road_network_path: str,
         output_gpkg_path: str,
         target_crs: QgsCoordinateReferenceSystem,
+        graph_cache_directory: Optional[str] = None,
     ):
         """Initialize the task.
 
@@ -56,6 +61,7 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
             road_network_path: Path to road network.
             output_gpkg_path: Output path.
             target_crs: Coordinate reference system.
+            graph_cache_directory: Optional folder for persisted road network graphs.
         """
         super().__init__("Native Network Analysis (Batch Isochrones)", QgsTask.CanCancel)
 
@@ -71,6 +77,7 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
         self.road_network_path = road_network_path
         self.output_gpkg_path = output_gpkg_path
         self.target_crs = target_crs
+        self.graph_cache_directory = graph_cache_directory
         self.result_path: Optional[str] = None
         self.error_message: Optional[str] = None
 
@@ -122,17 +129,31 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
             # Initialize GeoPackage structure
             self._initialize_gpkg()
 
-            # Process each distance value with ALL points simultaneously
+            graph = NetworkGraph.for_road_network(
+                self.road_network_path, self.target_crs, self.NETWORK_TOLERANCE, self.graph_cache_directory
+            )
+            if self.isCanceled():
+                log_message("Task cancelled by user.", level=Qgis.Warning)
+                return False
+            self.setProgress(10.0)
+
+            snapped = self._snap_points(graph)
+            if not snapped:
+                log_message(
+                    f"Warning: No points are within {self.POINT_TOLERANCE}m of the road network.",
+                    level=Qgis.Warning,
+                )
+
+            # One shortest path pass from all points serves every distance band
+            distances, origins = graph.shortest_distances(snapped, cutoff=max(self.distances))
+            self.setProgress(30.0)
+
             total_distances = len(self.distances)
             for distance_idx, distance_value in enumerate(self.distances):
                 if self.isCanceled():
                     log_message("Task cancelled by user.", level=Qgis.Warning)
                     return False
 
-                # Calculate base progress for this distance
-                base_progress = (distance_idx / total_distances) * 100.0
-                self.setProgress(base_progress)
-
                 log_message(
                     f"\nProcessing distance {distance_idx + 1}/{total_distances}: "
                     f"{distance_value}m for {total_features} points (batch mode)",
@@ -140,30 +161,8 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
                 )
 
                 try:
-                    service_area_result = processing.run(
-                        "native:serviceareafromlayer",
-                        {
-                            "INPUT": self.road_network_path,
-                            "START_POINTS": self.point_layer,
-                            "STRATEGY": self.STRATEGY,
-                            "DIRECTION_FIELD": "",
-                            "VALUE_FORWARD": "",
-                            "VALUE_BACKWARD": "",
-                            "VALUE_BOTH": "",
-                            "DEFAULT_DIRECTION": self.DEFAULT_DIRECTION,
-                            "SPEED_FIELD": "",
-                            "DEFAULT_SPEED": self.DEFAULT_SPEED,
-                            "TOLERANCE": self.NETWORK_TOLERANCE,
-                            "TRAVEL_COST2": distance_value,
-                            "POINT_TOLERANCE": self.POINT_TOLERANCE,
-                            "INCLUDE_BOUNDS": self.INCLUDE_BOUNDS,
-                            "OUTPUT_LINES": "TEMPORARY_OUTPUT",
-                        },
-                    )
-
-                    service_area_layer = service_area_result["OUTPUT_LINES"]
-
-                    if service_area_layer.featureCount() == 0:
+                    pieces = graph.reachable_pieces(distances, origins, snapped, distance_value)
+                    if not pieces:
                         log_message(
                             f"Warning: No service areas generated for distance {distance_value}m. "
                             f"Points may be unreachable from road network (>{self.POINT_TOLERANCE}m away).",
@@ -171,11 +170,10 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
                         )
                         continue
 
-                    self._process_service_areas(service_area_layer, distance_value)
+                    self._process_service_areas(pieces, distance_value)
 
                     log_message(
-                        f"Completed distance {distance_value}m: "
-                        f"{service_area_layer.featureCount()} service areas processed",
+                        f"Completed distance {distance_value}m: {len(pieces)} service areas processed",
                         level=Qgis.Info,
                     )
 
@@ -186,7 +184,7 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
                     )
                     continue
 
-                progress = ((distance_idx + 1) / total_distances) * 100.0
+                progress = 30.0 + ((distance_idx + 1) / total_distances) * 70.0
                 self.setProgress(progress)
 
             log_message(
@@ -268,21 +266,56 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
             level=Qgis.Info,
         )
 
+    def _snap_points(self, graph: NetworkGraph) -> Dict[int, List[Tuple[int, float]]]:
+        """
+        📍 Snap the start points onto the road network.
+
+        Points further than POINT_TOLERANCE from the network are skipped.
+
+        Args:
+            graph: The road network graph.
+
+        Returns:
+            Feature id -> snapped positions of the feature's points.
+        """
+        snapped = {}
+        skipped = 0
+        for feature in self.point_layer.getFeatures():
+            geometry = feature.geometry()
+            if geometry.isEmpty():
+                continue
+            points = geometry.asMultiPoint() if geometry.isMultipart() else [geometry.asPoint()]
+            positions = []
+            for point in points:
+                position = graph.snap((point.x(), point.y()), self.POINT_TOLERANCE)
+                if position is not None:
+                    positions.append(position)
+            if positions:
+                snapped[feature.id()] = positions
+            else:
+                skipped += 1
+        if skipped:
+            log_message(
+                f"⚠️ {skipped} points are more than {self.POINT_TOLERANCE}m from the road network and were skipped",
+                level=Qgis.Warning,
+            )
+        return snapped
+
     def _process_service_areas(
         self,
-        service_area_layer: QgsVectorLayer,
+        pieces: Dict[int, List[Tuple[Tuple[float, float], Tuple[float, float]]]],
         distance_value: int,
     ) -> None:
         """
-        🔄 Process service area line results and compute concave hull polygons.
+        🔄 Process reachable road pieces and compute concave hull polygons.
 
-        Takes the service area line geometries (roads within travel distance) and
+        Takes the road pieces within travel distance of each point and
         computes concave hull polygons around them to create isochrone boundaries.
         Results are written to the GeoPackage.
 
         Args:
-            service_area_layer: Result layer from native:serviceareafromlayer containing
-                               line geometries representing reachable road segments.
+            pieces: Point feature id -> straight road pieces reachable from it, as
+                returned by NetworkGraph.reachable_pieces.
             distance_value: The distance value (meters) for this batch of service areas.
 
         Raises:
@@ -305,19 +338,21 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
         processed_count = 0
         failed_count = 0
 
-        for feature in service_area_layer.getFeatures():
+        isochrone_layer.StartTransaction()
+        for point_pieces in pieces.values():
             if self.isCanceled():
+                isochrone_layer.RollbackTransaction()
                 ds = None
                 return
 
-            geometry = feature.geometry()
-
-            if geometry.isEmpty():
-                continue
-
             try:
                 # Compute concave hull using GDAL/OGR
-                ogr_geometry = ogr.CreateGeometryFromWkt(geometry.asWkt())
+                ogr_geometry = ogr.Geometry(ogr.wkbMultiLineString)
+                for (x1, y1), (x2, y2) in point_pieces:
+                    line = ogr.Geometry(ogr.wkbLineString)
+                    line.AddPoint_2D(x1, y1)
+                    line.AddPoint_2D(x2, y2)
+                    ogr_geometry.AddGeometry(line)
                 concave_hull_geometry = ogr_geometry.ConcaveHull(self.CONCAVE_HULL_ALPHA, False)
 
                 if concave_hull_geometry:
@@ -342,6 +377,7 @@ class NativeNetworkAnalysisProcessingTask(QgsTask):
                 continue
 
         # Close and flush to disk
+        isochrone_layer.CommitTransaction()
         ds = None
 
         log_message(
@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+"""📦 Network Distance module.
+
+This module contains a network distance engine for isochrone generation.
+
+The road network is turned into a graph once per road network file, CRS and
+topology tolerance. The graph is stored as NumPy arrays: vertex coordinates,
+the two vertices and cost of each segment, and a compressed sparse row (CSR)
+adjacency. It is kept in a process-wide cache and, when a cache directory is
+given, persisted as an uncompressed .npz file that later runs load directly
+instead of rebuilding the graph.
+
+Facilities are snapped onto the nearest road segment and a single
+multi-source Dijkstra pass records, for every vertex it reaches, the network
+distance to the nearest facility and which facility that is. Every distance
+band is then derived from that one traversal, so five bands cost one graph
+build and one shortest path pass instead of five of each.
+"""
+
+import glob
+import heapq
+import math
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from qgis.analysis import (
+    QgsGraphBuilder,
+    QgsNetworkDistanceStrategy,
+    QgsVectorLayerDirector,
+)
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsRectangle,
+    QgsSpatialIndex,
+    QgsVectorLayer,
+)
+
+from geest.utilities import log_message
+
+from .reprojected_layer_cache import ReprojectedLayerCache
+
+# Number of road network graphs kept in memory
+MAX_CACHED_GRAPHS = 4
+# Bump when the layout of persisted graphs changes
+GRAPH_FORMAT_VERSION = 1
+
+Point = Tuple[float, float]
+Piece = Tuple[Point, Point]
+
+
+class NetworkGraph:
+    """
+    Undirected road network graph with multi-source shortest path search.
+
+    Every segment is a straight line between two vertices, as produced by
+    QgsGraphBuilder, so positions along a segment are linear in its cost.
+
+    Example usage:
+
+        ```python
+        graph = NetworkGraph.for_road_network(road_network_path, target_crs, 50, cache_directory)
+        snapped = {fid: [graph.snap(point, 50)] for fid, point in facilities.items()}
+        distances, origins = graph.shortest_distances(snapped, cutoff=max(bands))
+        for band in bands:
+            pieces = graph.reachable_pieces(distances, origins, snapped, band)
+        ```
+    """
+
+    def __init__(
+        self,
+        coordinates: Sequence[Point],
+        segment_vertices: Sequence[Tuple[int, int]],
+        segment_costs: Sequence[float],
+        offsets: Optional[np.ndarray] = None,
+        neighbour_segments: Optional[np.ndarray] = None,
+    ):
+        """🏗️ Initialize the instance.
+
+        Args:
+            coordinates: Vertex coordinates.
+            segment_vertices: The two vertices of each undirected segment.
+            segment_costs: The cost of each segment.
+            offsets: CSR row offsets, computed when not given.
+            neighbour_segments: CSR segment of each adjacency entry, computed when not given.
+        """
+        self.coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        self.segment_vertices = np.asarray(segment_vertices, dtype=np.int64).reshape(-1, 2)
+        self.segment_costs = np.asarray(segment_costs, dtype=np.float64)
+        if offsets is None or neighbour_segments is None:
+            offsets, neighbour_segments = self._build_adjacency()
+        self.offsets = offsets
+        self.neighbour_segments = neighbour_segments
+        # Other end and cost of each adjacency entry, so Dijkstra reads one row slice
+        ends = self.segment_vertices[neighbour_segments]
+        owners = np.repeat(np.arange(len(self.coordinates)), np.diff(offsets))
+        self.neighbours = np.where(ends[:, 0] == owners, ends[:, 1], ends[:, 0])
+        self.neighbour_costs = self.segment_costs[neighbour_segments]
+        self._index: Optional[QgsSpatialIndex] = None
+        self._index_lock = Lock()
+
+    def _build_adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return CSR offsets and segment ids listing the segments at each vertex."""
+        vertex_count = len(self.coordinates)
+        segment_ids = np.arange(len(self.segment_vertices))
+        owners = self.segment_vertices.T.ravel()
+        entries = np.concatenate([segment_ids, segment_ids])
+        order = np.argsort(owners, kind="stable")
+        offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=vertex_count), out=offsets[1:])
+        return offsets, entries[order]
+
+    @property
+    def vertex_count(self) -> int:
+        """Number of vertices."""
+        return len(self.coordinates)
+
+    @property
+    def segment_count(self) -> int:
+        """Number of segments."""
+        return len(self.segment_vertices)
+
+    @classmethod
+    def from_layer(
+        cls,
+        network_layer: QgsVectorLayer,
+        crs: QgsCoordinateReferenceSystem,
+        tolerance: float,
+    ) -> "NetworkGraph":
+        """
+        Build the graph of a line layer with QGIS' graph builder.
+
+        Roads are treated as two way, features are transformed to crs and
+        costs are lengths in the units of crs.
+
+        Args:
+            network_layer (QgsVectorLayer): The road network.
+            crs (QgsCoordinateReferenceSystem): The CRS of the graph.
+            tolerance (float): Topology tolerance for joining road ends.
+
+        Returns:
+            NetworkGraph: The graph.
+        """
+        director = QgsVectorLayerDirector(network_layer, -1, "", "", "", QgsVectorLayerDirector.DirectionBoth)
+        director.addStrategy(QgsNetworkDistanceStrategy())
+        builder = QgsGraphBuilder(crs, True, tolerance, "NONE")
+        director.makeGraph(builder, [])
+        graph = builder.graph()
+
+        coordinates = []
+        for i in range(graph.vertexCount()):
+            point = graph.vertex(i).point()
+            coordinates.append((point.x(), point.y()))
+        # Two way roads appear as one edge per direction, keep each segment once
+        segments = {}
+        for i in range(graph.edgeCount()):
+            edge = graph.edge(i)
+            a, b = edge.fromVertex(), edge.toVertex()
+            if a == b:
+                continue
+            key = (a, b) if a < b else (b, a)
+            cost = float(edge.cost(0))
+            if key not in segments or cost < segments[key]:
+                segments[key] = cost
+        return cls(coordinates, list(segments.keys()), list(segments.values()))
+
+    @classmethod
+    def load(cls, path: str) -> "NetworkGraph":
+        """
+        Load a graph written by save.
+
+        Args:
+            path (str): The .npz file.
+
+        Returns:
+            NetworkGraph: The graph.
+
+        Raises:
+            ValueError: If the file was written in another format version.
+        """
+        with np.load(path) as arrays:
+            if int(arrays["version"]) != GRAPH_FORMAT_VERSION:
+                raise ValueError(f"Unsupported network graph format in {path}")
+            return cls(
+                arrays["coordinates"],
+                arrays["segment_vertices"],
+                arrays["segment_costs"],
+                offsets=arrays["offsets"],
+                neighbour_segments=arrays["neighbour_segments"],
+            )
+
+    def save(self, path: str) -> None:
+        """
+        Write the graph to an uncompressed .npz file, atomically.
+
+        Args:
+            path (str): Destination file.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            np.savez(
+                file,
+                version=np.array(GRAPH_FORMAT_VERSION),
+                coordinates=self.coordinates,
+                segment_vertices=self.segment_vertices,
+                segment_costs=self.segment_costs,
+                offsets=self.offsets,
+                neighbour_segments=self.neighbour_segments,
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def for_road_network(
+        cls,
+        road_network_path: str,
+        crs: QgsCoordinateReferenceSystem,
+        tolerance: float,
+        cache_directory: Optional[str] = None,
+    ) -> "NetworkGraph":
+        """
+        Return the graph of a road network file, building it only if needed.
+
+        Args:
+            road_network_path (str): Path of the road network.
+            crs (QgsCoordinateReferenceSystem): The CRS of the graph.
+            tolerance (float): Topology tolerance for joining road ends.
+            cache_directory (str): Optional folder for persisted graphs.
+
+        Returns:
+            NetworkGraph: The graph.
+        """
+        return NetworkGraphCache.graph_for(road_network_path, crs, tolerance, cache_directory)
+
+    def _spatial_index(self) -> QgsSpatialIndex:
+        """Return a spatial index over the segment bounding boxes, building it once."""
+        with self._index_lock:
+            if self._index is None:
+                ends = self.coordinates[self.segment_vertices]
+                lower = ends.min(axis=1).tolist()
+                upper = ends.max(axis=1).tolist()
+                index = QgsSpatialIndex()
+                for i, ((xmin, ymin), (xmax, ymax)) in enumerate(zip(lower, upper)):
+                    index.addFeature(i, QgsRectangle(xmin, ymin, xmax, ymax))
+                self._index = index
+            return self._index
+
+    def snap(self, point: Point, tolerance: float) -> Optional[Tuple[int, float]]:
+        """
+        Snap a point onto the nearest segment.
+
+        Args:
+            point: The point coordinates.
+            tolerance: Largest distance between the point and the network.
+
+        Returns:
+            (segment index, cost from the segment's first vertex) or None if no
+            segment is within tolerance.
+        """
+        x, y = point
+        candidates = self._spatial_index().intersects(
+            QgsRectangle(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        )
+        best = None
+        best_distance = tolerance
+        for i in candidates:
+            (ax, ay), (bx, by) = self._segment_ends(i)
+            dx, dy = bx - ax, by - ay
+            length_squared = dx * dx + dy * dy
+            fraction = 0.0
+            if length_squared > 0:
+                fraction = min(1.0, max(0.0, ((x - ax) * dx + (y - ay) * dy) / length_squared))
+            distance = math.hypot(ax + fraction * dx - x, ay + fraction * dy - y)
+            if distance <= best_distance:
+                best = (i, fraction * float(self.segment_costs[i]))
+                best_distance = distance
+        return best
+
+    def shortest_distances(
+        self,
+        snapped: Dict[Hashable, Iterable[Tuple[int, float]]],
+        cutoff: float,
+    ) -> Tuple[Dict[int, float], Dict[int, Hashable]]:
+        """
+        Run one multi-source Dijkstra pass from every snapped facility.
+
+        Only vertices within cutoff are visited, so the cost depends on the
+        part of the network near the facilities, not on the whole network.
+
+        Args:
+            snapped: Facility id -> snapped positions, as returned by snap.
+            cutoff: Distance beyond which vertices are not explored.
+
+        Returns:
+            For each reached vertex, the distance to its nearest facility and
+            the id of that facility.
+        """
+        distances: Dict[int, float] = {}
+        origins: Dict[int, Hashable] = {}
+        queue = []
+        for order, (source, positions) in enumerate(snapped.items()):
+            for segment, offset in positions:
+                a, b = self.segment_vertices[segment].tolist()
+                cost = float(self.segment_costs[segment])
+                for vertex, start in ((a, offset), (b, cost - offset)):
+                    if start <= cutoff and start < distances.get(vertex, math.inf):
+                        distances[vertex] = start
+                        origins[vertex] = source
+                        heapq.heappush(queue, (start, order, vertex))
+
+        offsets, neighbours, costs = self.offsets, self.neighbours, self.neighbour_costs
+        while queue:
+            distance, order, vertex = heapq.heappop(queue)
+            if distance > distances[vertex]:
+                continue
+            source = origins[vertex]
+            start, end = int(offsets[vertex]), int(offsets[vertex + 1])
+            for neighbour, cost in zip(neighbours[start:end].tolist(), costs[start:end].tolist()):
+                candidate = distance + cost
+                if candidate <= cutoff and candidate < distances.get(neighbour, math.inf):
+                    distances[neighbour] = candidate
+                    origins[neighbour] = source
+                    heapq.heappush(queue, (candidate, order, neighbour))
+        return distances, origins
+
+    def reachable_pieces(
+        self,
+        distances: Dict[int, float],
+        origins: Dict[int, Hashable],
+        snapped: Dict[Hashable, Iterable[Tuple[int, float]]],
+        distance: float,
+    ) -> Dict[Hashable, List[Piece]]:
+        """
+        Return the parts of the network within distance of a facility.
+
+        Segments whose ends are reached from different facilities are split
+        where the two network distances are equal, so each part belongs to the
+        facility nearest to it.
+
+        Args:
+            distances: Vertex distances from shortest_distances.
+            origins: Vertex facilities from shortest_distances.
+            snapped: The facility positions passed to shortest_distances.
+            distance: The band distance, at most the cutoff used.
+
+        Returns:
+            Facility id -> list of straight line pieces.
+        """
+        # The segment a facility sits on is also reached directly, not only via its ends
+        direct: Dict[int, List[Tuple[Hashable, float, float]]] = {}
+        for source, positions in snapped.items():
+            for segment, offset in positions:
+                cost = float(self.segment_costs[segment])
+                direct.setdefault(segment, []).append(
+                    (source, max(0.0, offset - distance), min(cost, offset + distance))
+                )
+
+        # Only segments touching a vertex within the band can be reached
+        segments = set(direct)
+        for vertex, vertex_distance in distances.items():
+            if vertex_distance <= distance:
+                segments.update(self.neighbour_segments[self.offsets[vertex] : self.offsets[vertex + 1]].tolist())
+
+        pieces: Dict[Hashable, List[Piece]] = {}
+        for i in sorted(segments):
+            a, b = self.segment_vertices[i].tolist()
+            cost = float(self.segment_costs[i])
+            if cost <= 0:
+                continue
+            distance_a, distance_b = distances.get(a, math.inf), distances.get(b, math.inf)
+            reach_a = min(cost, distance - distance_a) if distance_a <= distance else 0.0
+            reach_b = min(cost, distance - distance_b) if distance_b <= distance else 0.0
+            if reach_a + reach_b >= cost:
+                # Fully covered, split where both ends are equally far
+                split = min(cost, max(0.0, (cost + distance_b - distance_a) / 2.0))
+                if split > 0:
+                    self._add_piece(pieces, origins[a], i, cost, 0.0, split)
+                if split < cost:
+                    self._add_piece(pieces, origins[b], i, cost, split, cost)
+                continue
+            if reach_a > 0:
+                self._add_piece(pieces, origins[a], i, cost, 0.0, reach_a)
+            if reach_b > 0:
+                self._add_piece(pieces, origins[b], i, cost, cost - reach_b, cost)
+            for source, start, end in direct.get(i, ()):
+                # Only the part not already reached from either end
+                start, end = max(start, reach_a), min(end, cost - reach_b)
+                if end > start:
+                    self._add_piece(pieces, source, i, cost, start, end)
+        return pieces
+
+    def _segment_ends(self, segment: int) -> Tuple[Point, Point]:
+        """Return the coordinates of a segment's two vertices."""
+        a, b = self.coordinates[self.segment_vertices[segment]].tolist()
+        return (a[0], a[1]), (b[0], b[1])
+
+    def _add_piece(
+        self,
+        pieces: Dict[Hashable, List[Piece]],
+        source: Hashable,
+        segment: int,
+        cost: float,
+        start: float,
+        end: float,
+    ) -> None:
+        """Append the part of a segment between two costs to a facility's pieces."""
+        (ax, ay), (bx, by) = self._segment_ends(segment)
+        start_fraction, end_fraction = start / cost, end / cost
+        pieces.setdefault(source, []).append(
+            (
+                (ax + (bx - ax) * start_fraction, ay + (by - ay) * start_fraction),
+                (ax + (bx - ax) * end_fraction, ay + (by - ay) * end_fraction),
+            )
+        )
+
+
+class NetworkGraphCache:
+    """
+    Process-wide cache of road network graphs, optionally persisted to disk.
+
+    Graphs are keyed on the road network path, the size and modification time
+    of its files, the CRS and the topology tolerance, the same key the
+    reprojected layer cache uses, so replacing the network builds a new graph.
+    Concurrent callers asking for the same graph wait for a single build or load.
+    """
+
+    _lock = Lock()
+    _key_locks = {}  # key -> Lock
+    _graphs = OrderedDict()  # key -> NetworkGraph, least recently used first
+
+    @staticmethod
+    def cache_path(
+        network_layer: QgsVectorLayer,
+        crs: QgsCoordinateReferenceSystem,
+        tolerance: float,
+        cache_directory: str,
+    ) -> Optional[str]:
+        """
+        Return the path of the persisted graph of a road network.
+
+        Args:
+            network_layer (QgsVectorLayer): The road network.
+            crs (QgsCoordinateReferenceSystem): The CRS of the graph.
+            tolerance (float): Topology tolerance for joining road ends.
+            cache_directory (str): Folder holding persisted graphs.
+
+        Returns:
+            str: The .npz path, or None if the network is not file based.
+        """
+        layer_path = ReprojectedLayerCache.cache_path(network_layer, crs, cache_directory)
+        if layer_path is None:
+            return None
+        return f"{os.path.splitext(layer_path)[0]}_graph_{tolerance:g}.npz"
+
+    @classmethod
+    def graph_for(
+        cls,
+        road_network_path: str,
+        crs: QgsCoordinateReferenceSystem,
+        tolerance: float,
+        cache_directory: Optional[str] = None,
+    ) -> NetworkGraph:
+        """
+        Return the graph of a road network file, building it only if needed.
+
+        Args:
+            road_network_path (str): Path of the road network.
+            crs (QgsCoordinateReferenceSystem): The CRS of the graph.
+            tolerance (float): Topology tolerance for joining road ends.
+            cache_directory (str): Optional folder for persisted graphs.
+
+        Returns:
+            NetworkGraph: The graph.
+
+        Raises:
+            ValueError: If the road network cannot be loaded.
+        """
+        network_layer = QgsVectorLayer(road_network_path, "road_network", "ogr")
+        if not network_layer.isValid():
+            raise ValueError(f"Failed to load road network from {road_network_path}")
+
+        persisted_path = None
+        if cache_directory:
+            persisted_path = cls.cache_path(network_layer, crs, tolerance, cache_directory)
+            key = persisted_path
+        if persisted_path is None:
+            file_path = road_network_path.split("|")[0]
+            stat = os.stat(file_path)
+            key = (os.path.abspath(road_network_path), stat.st_size, stat.st_mtime_ns, crs.toWkt(), float(tolerance))
+
+        with cls._lock:
+            graph = cls._graphs.get(key)
+            if graph is not None:
+                cls._graphs.move_to_end(key)
+                return graph
+            key_lock = cls._key_locks.setdefault(key, Lock())
+
+        with key_lock:
+            with cls._lock:
+                graph = cls._graphs.get(key)
+            if graph is None:
+                graph = cls._load(persisted_path) if persisted_path else None
+                if graph is None:
+                    graph = cls._build(network_layer, road_network_path, crs, tolerance, persisted_path)
+                with cls._lock:
+                    cls._graphs[key] = graph
+                    while len(cls._graphs) > MAX_CACHED_GRAPHS:
+                        cls._graphs.popitem(last=False)
+                    cls._key_locks.pop(key, None)
+        return graph
+
+    @staticmethod
+    def _load(persisted_path: str) -> Optional[NetworkGraph]:
+        """Load a persisted graph, or return None if there is no usable one."""
+        if not os.path.exists(persisted_path):
+            return None
+        try:
+            graph = NetworkGraph.load(persisted_path)
+        except Exception as e:
+            log_message(
+                f"Ignoring unreadable road network graph {persisted_path}: {e}",
+                level=Qgis.Warning,
+            )
+            return None
+        log_message(f"Loaded road network graph from {persisted_path}")
+        return graph
+
+    @staticmethod
+    def _build(
+        network_layer: QgsVectorLayer,
+        road_network_path: str,
+        crs: QgsCoordinateReferenceSystem,
+        tolerance: float,
+        persisted_path: Optional[str],
+    ) -> NetworkGraph:
+        """Build a graph and persist it when a path is given."""
+        log_message(f"Building road network graph for {road_network_path}")
+        graph = NetworkGraph.from_layer(network_layer, crs, tolerance)
+        log_message(
+            f"Road network graph has {graph.vertex_count} vertices and {graph.segment_count} segments",
+            level=Qgis.Info,
+        )
+        if persisted_path:
+            try:
+                graph.save(persisted_path)
+                NetworkGraphCache._remove_stale(persisted_path)
+                log_message(f"Cached road network graph to {persisted_path}")
+            except OSError as e:
+                log_message(
+                    f"Could not cache road network graph to {persisted_path}: {e}",
+                    level=Qgis.Warning,
+                )
+        return graph
+
+    @staticmethod
+    def _remove_stale(persisted_path: str) -> None:
+        """
+        Remove older persisted graphs of the same network and tolerance, which can no longer be hit.
+
+        Graph names follow the reprojected layer cache, {name}_{source}_{version}_graph_{tolerance}.npz,
+        and only graphs with the same {name}_{source} prefix are removed, so networks sharing a file
+        name but differing in layer, subset string, folder or CRS keep their graphs.
+
+        Args:
+            persisted_path (str): The graph path that was just written.
+        """
+        name, _, suffix = os.path.basename(persisted_path).rpartition("_graph_")
+        # {name}_{source}, the version hash is the last part
+        prefix = name.rsplit("_", 1)[0]
+        pattern = re.compile(rf"^{re.escape(prefix)}_[0-9a-f]{{16}}_graph_{re.escape(suffix)}$")
+        directory = os.path.dirname(persisted_path)
+        for path in glob.glob(os.path.join(directory, f"{glob.escape(prefix)}_*_graph_{glob.escape(suffix)}")):
+            if os.path.normpath(path) == os.path.normpath(persisted_path) or not pattern.match(os.path.basename(path)):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # Still open elsewhere; it will be removed on a later build
+                pass
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop all graphs held in memory."""
+        with cls._lock:
+            cls._graphs.clear()
@@ -3,6 +3,12 @@
 """📦 Ookla Downloader module.
 
 This module contains functionality for ookla downloader.
+
+When GDAL provides the Arrow stream interface the filtered Parquet rows are
+read as NumPy record batches holding only the columns needed, the tile
+polygons are built from the quadkeys in bulk and the GeoPackage is written in
+transactions of one batch each. Older GDAL builds fall back to reading the
+rows one by one.
 """
 
 import os
@@ -10,6 +16,7 @@ import timeit
 import urllib.request
 from typing import Optional
 
+import numpy as np
 from osgeo import gdal, ogr, osr
 from qgis.core import (
     QgsApplication,
@@ -29,6 +36,86 @@ gdal.SetConfigOption("AWS_REGION", "eu-west-1")
 gdal.SetConfigOption("GDAL_DISABLE_READDIR_ON_OPEN", "EMPTY_DIR")
 gdal.SetConfigOption("CPL_VSIL_CURL_ALLOWED_EXTENSIONS", "parquet")
 
+# Parquet columns read by the Arrow extraction, all others are ignored
+ARROW_COLUMNS = ("quadkey", "tile_x", "tile_y", "avg_u_kbps", "avg_d_kbps")
+# Features per Arrow batch and per GeoPackage transaction
+WRITE_BATCH_SIZE = 65536
+# Little endian WKB polygon with one ring of five points
+POLYGON_WKB_DTYPE = np.dtype(
+    [("order", "u1"), ("type", "<u4"), ("rings", "<u4"), ("points", "<u4"), ("coordinates", "<f8", (10,))]
+)
+
+
+def quadkey_tile_bounds(quadkeys) -> tuple:
+    """
+    Return the WGS84 bounds of quadkey tiles, in bulk.
+
+    Each quadkey digit holds one bit of the tile column (bit 0) and row
+    (bit 1), most significant first, and the zoom level is the quadkey
+    length, so keys of different lengths may be mixed.
+
+    Args:
+        quadkeys: Sequence or array of quadkeys, as str or bytes.
+
+    Returns:
+        Tuple of (west, south, east, north) arrays in degrees.
+    """
+    keys = np.asarray(quadkeys).astype("S")
+    if keys.size == 0:
+        empty = np.empty(0, dtype=np.float64)
+        return empty, empty, empty, empty
+    width = keys.dtype.itemsize
+    # Shorter keys are padded with NUL bytes, which get a weight of 0
+    digits = np.frombuffer(keys.tobytes(), dtype=np.uint8).reshape(len(keys), width).astype(np.int64) - ord("0")
+    zoom = np.char.str_len(keys).astype(np.int64)
+    exponents = zoom[:, None] - 1 - np.arange(width)
+    weights = np.where(exponents >= 0, np.left_shift(1, np.maximum(exponents, 0)), 0)
+    column = ((digits & 1) * weights).sum(axis=1)
+    row = (((digits >> 1) & 1) * weights).sum(axis=1)
+    tiles = np.power(2.0, zoom)
+    west = column / tiles * 360.0 - 180.0
+    east = (column + 1) / tiles * 360.0 - 180.0
+    north = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * row / tiles))))
+    south = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * (row + 1) / tiles))))
+    return west, south, east, north
+
+
+def tile_rings(west, south, east, north) -> np.ndarray:
+    """
+    Return the closed rings of rectangular tiles.
+
+    The vertices follow the order of the Ookla tile WKT: north west, north
+    east, south east, south west and north west again.
+
+    Args:
+        west, south, east, north: Arrays of tile bounds.
+
+    Returns:
+        numpy.ndarray: Array of shape (tiles, 5, 2) holding x, y vertices.
+    """
+    return np.stack([west, north, east, north, east, south, west, south, west, north], axis=1).reshape(-1, 5, 2)
+
+
+def polygon_wkb(rings: np.ndarray) -> list:
+    """
+    Return the WKB polygons of closed five point rings, encoded in bulk.
+
+    Args:
+        rings (numpy.ndarray): Array of shape (polygons, 5, 2), see tile_rings.
+
+    Returns:
+        list: One WKB bytes object per polygon.
+    """
+    records = np.empty(len(rings), dtype=POLYGON_WKB_DTYPE)
+    records["order"] = 1
+    records["type"] = ogr.wkbPolygon
+    records["rings"] = 1
+    records["points"] = 5
+    records["coordinates"] = rings.reshape(-1, 10)
+    data = records.tobytes()
+    size = POLYGON_WKB_DTYPE.itemsize
+    return [data[offset : offset + size] for offset in range(0, len(data), size)]
+
 
 class OoklaException(Exception):
     """Custom exception class for OoklaDownloader errors."""
@@ -298,7 +385,8 @@ class OoklaDownloader:
         to only fetch records within our bbox and with sufficient upload and download speeds.
 
         Because it is a parquet file, GDAL will still efficiently fetch only the required row groups
-        using HTTP range requests. The output is saved as GeoPackage for better Windows performance.
+        using HTTP range requests, skipping row groups whose tile_x / tile_y statistics fall outside
+        the bbox. The output is saved as GeoPackage for better Windows performance.
 
         Args:
             input_uri (str): The URI of the input Parquet file (can be a local path or S3 path).
@@ -374,8 +462,6 @@ class OoklaDownloader:
         out_layer.CreateField(ogr.FieldDefn("quadkey", ogr.OFTString))
 
         min_x, min_y, max_x, max_y = bbox_4326
-        count = 0
-        kept_count = 0
 
         # Apply attribute filter for speed and extent directly at the layer level
         # Use the passed speed_threshold_kbps for both upload and download filtering
@@ -394,9 +480,125 @@ class OoklaDownloader:
         except RuntimeError:
             feature_count = 0  # Process without knowing total count
 
+        if hasattr(layer, "GetArrowStreamAsNumPy"):
+            kept_count, found_bbox = self._write_tile_batches(layer, out_layer, transform, feature_count)
+        else:
+            kept_count, found_bbox = self._write_tile_rows(layer, out_layer, transform, feature_count)
+
+        # Clean up
+        dataset = None
+        out_dataset = None
+
+        log_message("OOKLA processing finished")
+        log_message(
+            f"✅ Filtering complete!\n"
+            f"Kept {kept_count} of {feature_count} features.\n"
+            f"Filtered data saved to:{output_file}"
+            f"Found BBOX: {found_bbox}"
+        )
+        self.print_timings(
+            start_time, title="GeoPackage file generation", message=f"Wrote {kept_count} features to {output_file}."
+        )
+
+    def _report_progress(self, count: int, feature_count: int):
+        """Set the extraction progress and stop if the feedback was canceled."""
+        if self.feedback is None:
+            return
+        if self.feedback.isCanceled():
+            raise OoklaException("Ookla extraction canceled.")
+        if feature_count > 0:
+            self.feedback.setProgress(int((count / feature_count) * 100))
+
+    def _write_tile_batches(self, layer, out_layer, transform, feature_count: int) -> tuple:
+        """
+        Write the filtered rows of the Parquet layer from Arrow record batches.
+
+        Only the ARROW_COLUMNS are read, the tile polygons are rebuilt from the
+        quadkeys instead of parsing the tile WKT, transformed with one call per
+        batch and each batch is written in a single transaction.
+
+        Args:
+            layer (ogr.Layer): The filtered Ookla Parquet layer.
+            out_layer (ogr.Layer): The GeoPackage layer to write.
+            transform (osr.CoordinateTransformation): Transform to the output CRS, or None.
+            feature_count (int): Number of filtered rows, 0 if unknown.
+
+        Returns:
+            Tuple of (kept_count, found_bbox).
+        """
+        layer_defn = layer.GetLayerDefn()
+        ignored = [
+            layer_defn.GetFieldDefn(index).GetName()
+            for index in range(layer_defn.GetFieldCount())
+            if layer_defn.GetFieldDefn(index).GetName() not in ARROW_COLUMNS
+        ]
+        layer.SetIgnoredFields(ignored)
         out_layer_defn = out_layer.GetLayerDefn()
 
+        stream = layer.GetArrowStreamAsNumPy(
+            options=["USE_MASKED_ARRAYS=NO", "INCLUDE_FID=NO", f"MAX_FEATURES_IN_BATCH={WRITE_BATCH_SIZE}"]
+        )
+        kept_count = 0
+        found_min_x = found_min_y = found_max_x = found_max_y = None
+        for batch in stream:
+            quadkeys = np.asarray(batch["quadkey"]).astype("S")
+            if quadkeys.size == 0:
+                continue
+            tile_x = np.asarray(batch["tile_x"], dtype=np.float64)
+            tile_y = np.asarray(batch["tile_y"], dtype=np.float64)
+            batch_bbox = (float(tile_x.min()), float(tile_y.min()), float(tile_x.max()), float(tile_y.max()))
+            if found_min_x is None:
+                found_min_x, found_min_y, found_max_x, found_max_y = batch_bbox
+            else:
+                found_min_x = min(found_min_x, batch_bbox[0])
+                found_min_y = min(found_min_y, batch_bbox[1])
+                found_max_x = max(found_max_x, batch_bbox[2])
+                found_max_y = max(found_max_y, batch_bbox[3])
+
+            rings = tile_rings(*quadkey_tile_bounds(quadkeys))
+            if transform:
+                points = transform.TransformPoints(rings.reshape(-1, 2).tolist())
+                rings = np.asarray(points, dtype=np.float64)[:, :2].reshape(-1, 5, 2)
+                valid = np.isfinite(rings).all(axis=(1, 2))
+                if not valid.all():
+                    log_message(f"Geometry transformation failed for {int((~valid).sum())} features, skipping them")
+                    rings = rings[valid]
+                    quadkeys = quadkeys[valid]
+
+            out_layer.StartTransaction()
+            for wkb, quadkey in zip(polygon_wkb(rings), quadkeys.astype("U").tolist()):
+                out_feature = ogr.Feature(out_layer_defn)
+                out_feature.SetGeometryDirectly(ogr.CreateGeometryFromWkb(wkb))
+                out_feature.SetField("quadkey", quadkey)
+                out_layer.CreateFeature(out_feature)
+            out_layer.CommitTransaction()
+
+            kept_count += len(rings)
+            self._report_progress(kept_count, feature_count)
+            log_message(f"Wrote {kept_count} of {feature_count} features...")
+        stream = None
+        return kept_count, (found_min_x, found_min_y, found_max_x, found_max_y)
+
+    def _write_tile_rows(self, layer, out_layer, transform, feature_count: int) -> tuple:
+        """
+        Write the filtered rows of the Parquet layer one feature at a time.
+
+        Used when GDAL has no Arrow stream interface. Features are still
+        committed in transactions of WRITE_BATCH_SIZE.
+
+        Args:
+            layer (ogr.Layer): The filtered Ookla Parquet layer.
+            out_layer (ogr.Layer): The GeoPackage layer to write.
+            transform (osr.CoordinateTransformation): Transform to the output CRS, or None.
+            feature_count (int): Number of filtered rows, 0 if unknown.
+
+        Returns:
+            Tuple of (kept_count, found_bbox).
+        """
+        out_layer_defn = out_layer.GetLayerDefn()
+        kept_count = 0
         found_min_x = found_min_y = found_max_x = found_max_y = None
+        out_layer.StartTransaction()
         for feature in layer:
             x = feature.GetField("tile_x")
             y = feature.GetField("tile_y")
@@ -411,45 +613,28 @@ class OoklaDownloader:
             if found_max_y is None or y > found_max_y:
                 found_max_y = y
 
-            kept_count += 1
             geom = ogr.CreateGeometryFromWkt(feature.GetField("tile"))
             if transform:
                 result = geom.Transform(transform)
                 if result != 0:
                     log_message(f"Geometry transformation failed for feature {feature.GetField('quadkey')}")
             out_feature = ogr.Feature(out_layer_defn)
-            out_feature.SetGeometry(geom.Clone())
+            out_feature.SetGeometryDirectly(geom)
             out_feature.SetField("quadkey", feature.GetField("quadkey"))
             out_layer.CreateFeature(out_feature)
-            out_feature.Destroy()
 
-            count += 1
+            kept_count += 1
+            if kept_count % WRITE_BATCH_SIZE == 0:
+                out_layer.CommitTransaction()
+                out_layer.StartTransaction()
             # Update progress every 100 features
-            if count % 100 == 0:
-                if feature_count > 0:
-                    progress = int((count / feature_count) * 100)
-                    if self.feedback is not None:
-                        self.feedback.setProgress(progress)
+            if kept_count % 100 == 0:
+                self._report_progress(kept_count, feature_count)
                 # Log every 1000 features to avoid log spam
-                if count % 1000 == 0:
-                    log_message(f"Processed {count} of {feature_count} features...")
-                    log_message(f"Kept {kept_count} features so far...")
-
-        # Clean up
-        dataset = None
-        out_dataset = None
-
-        found_bbox = (found_min_x, found_min_y, found_max_x, found_max_y)
-        log_message("OOKLA processing finished")
-        log_message(
-            f"✅ Filtering complete!\n"
-            f"Kept {kept_count} of {feature_count} features.\n"
-            f"Filtered data saved to:{output_file}"
-            f"Found BBOX: {found_bbox}"
-        )
-        self.print_timings(
-            start_time, title="GeoPackage file generation", message=f"Wrote {kept_count} features to {output_file}."
-        )
+                if kept_count % 1000 == 0:
+                    log_message(f"Processed {kept_count} of {feature_count} features...")
+        out_layer.CommitTransaction()
+        return kept_count, (found_min_x, found_min_y, found_max_x, found_max_y)
 
     def print_timings(self, start_time, title, message):
         """
@@ -536,6 +721,8 @@ class OoklaDownloader:
 
         out_layer_defn = out_layer.GetLayerDefn()
 
+        written = 0
+        out_layer.StartTransaction()
         for input_file in input_files:
             # Open input GeoPackage
             dataset = gpkg_driver.Open(input_file, 0)
@@ -558,8 +745,13 @@ class OoklaDownloader:
                 out_feature.SetField("quadkey", quadkey)
                 out_layer.CreateFeature(out_feature)
                 out_feature.Destroy()
+                written += 1
+                if written % WRITE_BATCH_SIZE == 0:
+                    out_layer.CommitTransaction()
+                    out_layer.StartTransaction()
 
             dataset = None
+        out_layer.CommitTransaction()
 
         out_dataset = None
         dataset = None
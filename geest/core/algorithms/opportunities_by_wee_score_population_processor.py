@@ -17,7 +17,7 @@ from qgis.core import (
     QgsVectorLayer,
 )
 
-from geest.core import JsonTreeItem
+from geest.core import JsonTreeItem, gdal_ops
 from geest.core.algorithms import AreaIterator
 from geest.core.constants import GDAL_OUTPUT_DATA_TYPE
 from geest.utilities import log_message, resources_path
@@ -197,6 +197,17 @@ class OpportunitiesByWeeScorePopulationProcessingTask(QgsTask):
 
             log_message(f"Calculating Mask by SCORE by Population for area {index}")
 
+            if gdal_ops.use_gdal_ops():
+                gdal_ops.calculate(
+                    "A * B",
+                    {"A": mask_path, "B": geoe3_score_by_population_path},
+                    output_path,
+                    output_type=gdal_ops.CALCULATOR_TYPES[GDAL_OUTPUT_DATA_TYPE],
+                )
+                self.output_rasters.append(output_path)
+                log_message(f"Score raster saved to {output_path}")
+                continue
+
             params = {
                 "INPUT_A": mask_layer,
                 "BAND_A": 1,
@@ -228,14 +239,17 @@ class OpportunitiesByWeeScorePopulationProcessingTask(QgsTask):
         qml_path = os.path.join(self.output_dir, "geoe3_score_by_population_ghsl_masked.qml")
         source_qml = resources_path("resources", "qml", "geoe3_by_population_score.qml")
 
-        params = {
-            "INPUT": self.output_rasters,
-            "RESOLUTION": 0,  # Use highest resolution
-            "SEPARATE": False,  # Combine into a single band
-            "OUTPUT": vrt_path,
-        }
+        if gdal_ops.use_gdal_ops():
+            gdal_ops.build_vrt(vrt_path, self.output_rasters, resolution="highest")
+        else:
+            params = {
+                "INPUT": self.output_rasters,
+                "RESOLUTION": 0,  # Use highest resolution
+                "SEPARATE": False,  # Combine into a single band
+                "OUTPUT": vrt_path,
+            }
 
-        processing.run("gdal:buildvirtualraster", params)
+            processing.run("gdal:buildvirtualraster", params)
         log_message(f"Generated VRT at {vrt_path}")
 
         # Apply QML Style
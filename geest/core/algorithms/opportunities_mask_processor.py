@@ -151,7 +151,9 @@ class OpportunitiesMaskProcessor(QgsTask):
                 raise Exception(f"{self.mask_mode}_mask_shapefile not valid")
 
             # Check the geometries and reproject if necessary
-            self.features_layer = check_and_reproject_layer(self.features_layer, self.target_crs)
+            self.features_layer = check_and_reproject_layer(
+                self.features_layer, self.target_crs, os.path.join(working_directory, "cache")
+            )
 
         elif self.mask_mode == "raster":
             # Check the input raster is ok. The raster itself does not need to be a mask
@@ -221,11 +223,11 @@ class OpportunitiesMaskProcessor(QgsTask):
             # Check the crs of the layer, if it is not in the target crs, reproject it
             if self.features_layer.crs() != self.target_crs:
                 log_message("Reprojecting features layer to match target crs")
-                # Note that the layer returned will be a memory layer
-                # which may be inefficiecy here.
                 log_message(f"Layer CRS: {self.features_layer.crs().authid()}")
                 log_message(f"Target CRS: {self.target_crs.authid()}")
-                self.features_layer = check_and_reproject_layer(self.features_layer, self.target_crs)
+                self.features_layer = check_and_reproject_layer(
+                    self.features_layer, self.target_crs, os.path.join(working_directory, "cache")
+                )
 
         # Workflow directory is the subdir under working_directory
         self.workflow_directory = os.path.join(working_directory, "opportunity_masks")
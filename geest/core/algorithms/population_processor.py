@@ -22,6 +22,7 @@ from qgis.core import (
     QgsVectorLayer,
 )
 
+from geest.core import gdal_ops
 from geest.core.algorithms import AreaIterator
 from geest.utilities import log_message, resources_path
 
@@ -395,35 +396,44 @@ class PopulationRasterProcessingTask(QgsTask):
 
         # Generate VRT for clipped rasters
         if self.clipped_rasters:
-            params = {
-                "INPUT": self.clipped_rasters,
-                "RESOLUTION": 0,  # Use highest resolution among input files
-                "SEPARATE": False,  # Combine into a single band
-                "OUTPUT": clipped_vrt_path,
-            }
-            processing.run("gdal:buildvirtualraster", params)
+            if gdal_ops.use_gdal_ops():
+                gdal_ops.build_vrt(clipped_vrt_path, self.clipped_rasters, resolution="highest")
+            else:
+                params = {
+                    "INPUT": self.clipped_rasters,
+                    "RESOLUTION": 0,  # Use highest resolution among input files
+                    "SEPARATE": False,  # Combine into a single band
+                    "OUTPUT": clipped_vrt_path,
+                }
+                processing.run("gdal:buildvirtualraster", params)
             log_message(f"Generated VRT for clipped rasters: {clipped_vrt_path}")
 
         # Generate VRT for resampled rasters
         if self.resampled_rasters:
-            params = {
-                "INPUT": self.resampled_rasters,
-                "RESOLUTION": 0,  # Use highest resolution among input files
-                "SEPARATE": False,  # Combine into a single band
-                "OUTPUT": resampled_vrt_path,
-            }
-            processing.run("gdal:buildvirtualraster", params)
+            if gdal_ops.use_gdal_ops():
+                gdal_ops.build_vrt(resampled_vrt_path, self.resampled_rasters, resolution="highest")
+            else:
+                params = {
+                    "INPUT": self.resampled_rasters,
+                    "RESOLUTION": 0,  # Use highest resolution among input files
+                    "SEPARATE": False,  # Combine into a single band
+                    "OUTPUT": resampled_vrt_path,
+                }
+                processing.run("gdal:buildvirtualraster", params)
             log_message(f"Generated VRT for resampled rasters: {resampled_vrt_path}")
 
         # Generate VRT for reclassified rasters
         if self.reclassified_rasters:
-            params = {
-                "INPUT": self.reclassified_rasters,
-                "RESOLUTION": 0,  # Use highest resolution among input files
-                "SEPARATE": False,  # Combine into a single band
-                "OUTPUT": reclassified_vrt_path,
-            }
-            processing.run("gdal:buildvirtualraster", params)
+            if gdal_ops.use_gdal_ops():
+                gdal_ops.build_vrt(reclassified_vrt_path, self.reclassified_rasters, resolution="highest")
+            else:
+                params = {
+                    "INPUT": self.reclassified_rasters,
+                    "RESOLUTION": 0,  # Use highest resolution among input files
+                    "SEPARATE": False,  # Combine into a single band
+                    "OUTPUT": reclassified_vrt_path,
+                }
+                processing.run("gdal:buildvirtualraster", params)
             log_message(f"Generated VRT for reclassified rasters: {reclassified_vrt_path}")
             source_qml = resources_path("resources", "qml", "population_3_classes.qml")
 
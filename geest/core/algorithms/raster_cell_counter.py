@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""📦 Raster Cell Counter module.
+
+This module contains a raster-native replacement for counting features per
+grid cell with select_grid_cells_and_count_features, scoring the cells with
+assign_values_to_grid and rasterizing the scored grid.
+
+On a regular grid every cell is a pixel of the area's output tile, so the
+counts are built directly in raster space. Points are binned with index
+arithmetic, and lines and polygons are burned with gdal.RasterizeLayer in ADD
+mode with ALL_TOUCHED, so each feature adds one to every cell it touches. No
+grid polygons are read and no intermediate GeoPackage is written.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsRectangle,
+    QgsVectorLayer,
+    QgsWkbTypes,
+)
+
+from geest.core.algorithms.rasterize_and_mask import burn_mask, mask_window, write_tile
+from geest.utilities import log_message
+
+# Scores given by assign_values_to_grid
+SINGLE_FEATURE_SCORE = 3
+MULTIPLE_FEATURES_SCORE = 5
+
+# Tolerance, in cells, for treating a point as lying on a cell edge
+EDGE_TOLERANCE = 1e-9
+
+
+def _point_cells(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    feature_index: np.ndarray,
+    geotransform: Tuple[float, float, float, float, float, float],
+    columns: int,
+    rows: int,
+) -> np.ndarray:
+    """
+    Return the cells touched by points, once per feature.
+
+    A point on a cell edge touches the cells on both sides, as it intersects
+    both grid polygons.
+
+    Args:
+        xs (np.ndarray): Point x coordinates.
+        ys (np.ndarray): Point y coordinates.
+        feature_index (np.ndarray): Index of the feature each point belongs to.
+        geotransform: Geotransform of the window.
+        columns (int): Width of the window in cells.
+        rows (int): Height of the window in cells.
+
+    Returns:
+        np.ndarray: Flat cell indices, one entry per feature and cell.
+    """
+    fx = (xs - geotransform[0]) / geotransform[1]
+    fy = (geotransform[3] - ys) / -geotransform[5]
+    column = np.floor(fx + EDGE_TOLERANCE).astype(np.int64)
+    row = np.floor(fy + EDGE_TOLERANCE).astype(np.int64)
+    on_column_edge = np.abs(fx - column) <= EDGE_TOLERANCE
+    on_row_edge = np.abs(fy - row) <= EDGE_TOLERANCE
+
+    candidate_columns = [column, (column - 1)[on_column_edge], column[on_row_edge]]
+    candidate_rows = [row, row[on_column_edge], (row - 1)[on_row_edge]]
+    candidate_features = [feature_index, feature_index[on_column_edge], feature_index[on_row_edge]]
+    on_corner = on_column_edge & on_row_edge
+    candidate_columns.append((column - 1)[on_corner])
+    candidate_rows.append((row - 1)[on_corner])
+    candidate_features.append(feature_index[on_corner])
+
+    column = np.concatenate(candidate_columns)
+    row = np.concatenate(candidate_rows)
+    feature_index = np.concatenate(candidate_features)
+    inside = (column >= 0) & (column < columns) & (row >= 0) & (row < rows)
+    cells = row[inside] * columns + column[inside]
+    cell_count = columns * rows
+    # A multipoint with several points in a cell still counts as one feature
+    keys = np.unique(feature_index[inside] * cell_count + cells)
+    return keys % cell_count
+
+
+def count_features_per_cell(
+    features_layer: QgsVectorLayer,
+    geotransform: Tuple[float, float, float, float, float, float],
+    columns: int,
+    rows: int,
+    srs: osr.SpatialReference,
+) -> np.ndarray:
+    """
+    Count the features touching each cell of a window.
+
+    Args:
+        features_layer (QgsVectorLayer): Points, lines or polygons in the window CRS.
+        geotransform: Geotransform of the window; pixels are grid cells.
+        columns (int): Width of the window in cells.
+        rows (int): Height of the window in cells.
+        srs (osr.SpatialReference): The CRS of the window.
+
+    Returns:
+        np.ndarray: Feature counts of shape (rows, columns).
+    """
+    window_rect = QgsRectangle(
+        geotransform[0],
+        geotransform[3] + rows * geotransform[5],
+        geotransform[0] + columns * geotransform[1],
+        geotransform[3],
+    )
+    xs, ys, point_features = [], [], []
+    # GDAL 3.11 renamed the "Memory" vector driver to "MEM"
+    driver = ogr.GetDriverByName("MEM") or ogr.GetDriverByName("Memory")
+    datasource = driver.CreateDataSource("cell_counts")
+    layer = datasource.CreateLayer("features", srs=srs, geom_type=ogr.wkbUnknown)
+    definition = layer.GetLayerDefn()
+    burned = 0
+    request = QgsFeatureRequest().setFilterRect(window_rect).setNoAttributes()
+    for index, feature in enumerate(features_layer.getFeatures(request)):
+        geometry = feature.geometry()
+        if geometry.isNull() or geometry.isEmpty():
+            continue
+        if geometry.type() == QgsWkbTypes.PointGeometry:
+            points = geometry.asMultiPoint() if geometry.isMultipart() else [geometry.asPoint()]
+            for point in points:
+                xs.append(point.x())
+                ys.append(point.y())
+                point_features.append(index)
+            continue
+        ogr_feature = ogr.Feature(definition)
+        ogr_feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(geometry.asWkb())))
+        layer.CreateFeature(ogr_feature)
+        burned += 1
+
+    counts = np.zeros((rows, columns), dtype=np.uint32)
+    if burned:
+        dataset = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, gdal.GDT_UInt32)
+        dataset.SetGeoTransform(geotransform)
+        dataset.SetProjection(srs.ExportToWkt())
+        dataset.GetRasterBand(1).Fill(0)
+        gdal.RasterizeLayer(dataset, [1], layer, burn_values=[1], options=["ALL_TOUCHED=TRUE", "MERGE_ALG=ADD"])
+        counts += dataset.GetRasterBand(1).ReadAsArray().astype(np.uint32)
+        dataset = None
+    layer = None
+    datasource = None
+
+    if xs:
+        cells = _point_cells(
+            np.array(xs, dtype=np.float64),
+            np.array(ys, dtype=np.float64),
+            np.array(point_features, dtype=np.int64),
+            geotransform,
+            columns,
+            rows,
+        )
+        touched, per_cell = np.unique(cells, return_counts=True)
+        counts.ravel()[touched] += per_cell.astype(np.uint32)
+    return counts
+
+
+def score_counts(counts: np.ndarray, default_value: float = 0) -> np.ndarray:
+    """
+    Score feature counts the way assign_values_to_grid does.
+
+    Args:
+        counts (np.ndarray): Feature counts per cell.
+        default_value (float): Score of cells no feature touches.
+
+    Returns:
+        np.ndarray: Float32 scores, 3 for one feature and 5 for more than one.
+    """
+    scores = np.full(counts.shape, default_value, dtype=np.float32)
+    scores[counts == 1] = SINGLE_FEATURE_SCORE
+    scores[counts > 1] = MULTIPLE_FEATURES_SCORE
+    return scores
+
+
+def count_score_and_mask(
+    features_layer: QgsVectorLayer,
+    mask_geometry: QgsGeometry,
+    extent: QgsRectangle,
+    cell_size: float,
+    crs: QgsCoordinateReferenceSystem,
+    output_path: str,
+    default_value: float = 0,
+    nodata: float = 255,
+) -> Optional[str]:
+    """
+    Count features per cell, score the cells and mask them to an area in one pass.
+
+    The output matches select_grid_cells_and_count_features, assign_values_to_grid
+    and rasterize_and_mask run in sequence on a regular grid.
+
+    Args:
+        features_layer (QgsVectorLayer): The area's features, in the target CRS.
+        mask_geometry (QgsGeometry): Cells whose centre is outside this polygon become nodata.
+        extent (QgsRectangle): The area's grid aligned extent, defining the cell origin.
+        cell_size (float): Width and height of a cell in CRS units.
+        crs (QgsCoordinateReferenceSystem): The CRS of the output.
+        output_path (str): Path of the masked GeoTIFF to write.
+        default_value (float): Score of cells no feature touches.
+        nodata (float): Nodata value for cells outside the mask.
+
+    Returns:
+        str: The output path, or None if the mask does not overlap the extent or
+        the tile could not be written.
+    """
+    window = mask_window(extent, cell_size, cell_size, mask_geometry)
+    if window is None:
+        log_message(
+            f"Mask does not overlap the counting extent for {output_path}",
+            tag="GeoE3",
+            level=Qgis.Warning,
+        )
+        return None
+    geotransform, columns, rows = window
+    srs = osr.SpatialReference()
+    srs.ImportFromWkt(crs.toWkt())
+
+    counts = count_features_per_cell(features_layer, geotransform, columns, rows, srs)
+    scores = score_counts(counts, default_value)
+    scores[~burn_mask(mask_geometry, geotransform, columns, rows, srs)] = nodata
+    log_message(
+        f"Counted features in {int(np.count_nonzero(counts))} of {columns * rows} cells",
+        tag="GeoE3",
+        level=Qgis.Info,
+    )
+
+    values = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, gdal.GDT_Float32)
+    values.SetGeoTransform(geotransform)
+    values.SetProjection(srs.ExportToWkt())
+    band = values.GetRasterBand(1)
+    band.SetNoDataValue(nodata)
+    band.WriteArray(scores)
+    return write_tile(values, output_path)
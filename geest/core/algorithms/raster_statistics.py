@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""📦 Raster Statistics module.
+
+This module contains a streaming statistics engine for raster bands.
+
+The band is read in strips of whole blocks, so memory is bounded by the strip
+size, a histogram and a fixed size sample, however large the raster is. The
+histogram spans the band's minimum to maximum; integer bands whose range fits
+in the histogram get one bin per value and exact quantiles, other bands get
+quantiles accurate to one bin width. A reservoir sample of the valid values is
+kept for classifications such as Jenks Natural Breaks that need the values
+themselves.
+"""
+
+from typing import Optional
+
+import numpy as np
+from osgeo import gdal
+from qgis.core import Qgis
+
+from geest.core.jenks import ReservoirSampler
+from geest.utilities import log_message
+
+# Number of histogram bins for float bands and integer bands with a wide range
+HISTOGRAM_BINS = 65536
+# Values kept for classification
+DEFAULT_SAMPLE_SIZE = 100000
+# Approximate number of pixels read at a time
+STRIP_PIXELS = 1 << 20
+
+
+class RasterStatistics:
+    """
+    Statistics of the valid values of a raster band, accumulated block by block.
+
+    Example usage:
+
+        ```python
+        stats = RasterStatistics.from_raster(path)
+        if stats is not None:
+            median = stats.quantile(0.5)
+            breaks = jenks_natural_breaks(stats.sample, n_classes=6)
+        ```
+    """
+
+    def __init__(
+        self,
+        minimum: float,
+        maximum: float,
+        integer_values: bool,
+        bins: int = HISTOGRAM_BINS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        seed: Optional[int] = 0,
+    ):
+        """🏗️ Initialize the instance.
+
+        Args:
+            minimum: Smallest valid value of the band.
+            maximum: Largest valid value of the band.
+            integer_values: Whether the band holds integers, allowing one bin per value.
+            bins: Number of histogram bins when values are not binned exactly.
+            sample_size: Number of values kept in the sample.
+            seed: Seed for the sample, for reproducible classifications.
+        """
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.exact = integer_values and (self.maximum - self.minimum + 1) <= bins
+        if self.exact:
+            self._bin_count = int(self.maximum - self.minimum) + 1
+            self._bin_width = 1.0
+        else:
+            self._bin_count = bins
+            self._bin_width = (self.maximum - self.minimum) / bins or 1.0
+        self.histogram = np.zeros(self._bin_count, dtype=np.int64)
+        self._sampler = ReservoirSampler(sample_size, seed=seed)
+
+    @classmethod
+    def from_raster(
+        cls,
+        raster_path: str,
+        band_number: int = 1,
+        bins: int = HISTOGRAM_BINS,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ) -> Optional["RasterStatistics"]:
+        """
+        Compute the statistics of a raster band.
+
+        Args:
+            raster_path: Path to a GDAL readable raster.
+            band_number: Band to read (1 based).
+            bins: Number of histogram bins when values are not binned exactly.
+            sample_size: Number of values kept in the sample.
+
+        Returns:
+            The statistics, or None if the raster cannot be read or has no valid values.
+        """
+        dataset = gdal.Open(raster_path)
+        if dataset is None:
+            log_message(f"Cannot open raster {raster_path}", tag="GeoE3", level=Qgis.Warning)
+            return None
+        band = dataset.GetRasterBand(band_number)
+        try:
+            # Exact minimum and maximum, computed by GDAL without loading the band
+            minimum, maximum = band.ComputeRasterMinMax(False)
+        except (RuntimeError, TypeError):
+            minimum = maximum = None
+        if minimum is None or not np.isfinite(minimum) or not np.isfinite(maximum):
+            return None
+
+        integer_values = band.DataType in (
+            gdal.GDT_Byte,
+            gdal.GDT_UInt16,
+            gdal.GDT_Int16,
+            gdal.GDT_UInt32,
+            gdal.GDT_Int32,
+        )
+        stats = cls(minimum, maximum, integer_values, bins=bins, sample_size=sample_size)
+        nodata = band.GetNoDataValue()
+        block_height = max(1, band.GetBlockSize()[1])
+        rows_per_read = block_height * max(1, STRIP_PIXELS // max(1, band.XSize * block_height))
+        for row in range(0, band.YSize, rows_per_read):
+            rows = min(rows_per_read, band.YSize - row)
+            stats.update(band.ReadAsArray(0, row, band.XSize, rows), nodata)
+        dataset = None
+        if stats.count == 0:
+            return None
+        return stats
+
+    def update(self, values: np.ndarray, nodata: Optional[float] = None) -> None:
+        """
+        Add a block of values.
+
+        Args:
+            values: Values of any shape.
+            nodata: Value to ignore; NaN and infinite values are always ignored.
+        """
+        values = values.ravel()
+        valid = np.isfinite(values) if values.dtype.kind == "f" else np.ones(values.shape, dtype=bool)
+        if nodata is not None:
+            valid &= values != nodata
+        values = values[valid]
+        if len(values) == 0:
+            return
+        bins = np.floor((values.astype(np.float64) - self.minimum) / self._bin_width).astype(np.int64)
+        np.clip(bins, 0, self._bin_count - 1, out=bins)
+        self.histogram += np.bincount(bins, minlength=self._bin_count)
+        self._sampler.update(values)
+
+    @property
+    def count(self) -> int:
+        """Number of valid values."""
+        return int(self._sampler.seen)
+
+    @property
+    def sample(self) -> np.ndarray:
+        """Uniform random sample of the valid values, all of them if there are few."""
+        return self._sampler.sample()
+
+    def _value_at_rank(self, rank: int) -> float:
+        """
+        Value at a position in the sorted valid values.
+
+        Args:
+            rank: Zero based position.
+
+        Returns:
+            The exact value for exactly binned bands, otherwise the value
+            interpolated within its bin assuming the bin's values are evenly spread.
+        """
+        if rank <= 0:
+            return self.minimum
+        if rank >= self.count - 1:
+            return self.maximum
+        cumulative = np.cumsum(self.histogram)
+        bin_index = int(np.searchsorted(cumulative, rank, side="right"))
+        lower = self.minimum + bin_index * self._bin_width
+        if self.exact:
+            return lower
+        before = cumulative[bin_index - 1] if bin_index else 0
+        fraction = (rank - before + 0.5) / self.histogram[bin_index]
+        return float(min(lower + fraction * self._bin_width, self.maximum))
+
+    def quantile(self, q: float) -> float:
+        """
+        Quantile of the valid values, with linear interpolation like np.quantile.
+
+        Args:
+            q: Quantile between 0 and 1.
+
+        Returns:
+            The quantile.
+        """
+        position = q * (self.count - 1)
+        below = int(np.floor(position))
+        low = self._value_at_rank(below)
+        if position == below:
+            return low
+        return float(low + (self._value_at_rank(below + 1) - low) * (position - below))
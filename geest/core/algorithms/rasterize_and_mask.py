@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""📦 Rasterize And Mask module.
+
+This module contains a single pass replacement for the gdal:rasterize followed
+by gdal:cliprasterbymasklayer sequence used by the vector workflows.
+
+Values are burned into an in-memory (MEM) GDAL dataset covering the mask
+polygon's extent, the mask polygon is burned into a second MEM dataset, and
+pixels outside the mask are set to nodata before the tile is written. Only the
+final masked GeoTIFF touches the disk.
+
+The output grid matches the two step approach: pixels are aligned to the
+rasterization extent and resolution, all touched pixels receive a feature's
+value and a pixel is kept when its centre falls inside the mask polygon.
+"""
+
+import math
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsRectangle,
+    QgsVectorLayer,
+)
+
+from geest.utilities import log_message
+
+# Tolerance, in pixels, when snapping the mask extent to the raster grid
+SNAP_TOLERANCE = 1e-6
+
+
+def _memory_vector_driver():
+    """
+    Return the OGR in-memory vector driver.
+
+    GDAL 3.11 renamed the "Memory" driver to "MEM".
+
+    Returns:
+        ogr.Driver: The in-memory vector driver.
+    """
+    return ogr.GetDriverByName("MEM") or ogr.GetDriverByName("Memory")
+
+
+def _ogr_layer(input_layer: QgsVectorLayer, value_field: str) -> Tuple[ogr.DataSource, ogr.Layer]:
+    """
+    Return an OGR layer with the features of a QGIS vector layer.
+
+    File based layers without a subset string are opened directly. Anything
+    else (memory layers, filtered layers) is copied into an in-memory OGR layer
+    holding only the geometry and the value field.
+
+    Args:
+        input_layer (QgsVectorLayer): The layer to read.
+        value_field (str): The attribute to burn.
+
+    Returns:
+        Tuple of (datasource, layer). Keep the datasource referenced while the layer is used.
+    """
+    if input_layer.providerType() == "ogr" and not input_layer.subsetString():
+        parts = input_layer.source().split("|")
+        datasource = ogr.Open(parts[0], 0)
+        if datasource is not None:
+            layer = None
+            for part in parts[1:]:
+                if part.startswith("layername="):
+                    layer = datasource.GetLayerByName(part[len("layername=") :])
+                elif part.startswith("layerid="):
+                    layer = datasource.GetLayer(int(part[len("layerid=") :]))
+            if layer is None and len(parts) == 1:
+                layer = datasource.GetLayer(0)
+            if layer is not None and layer.GetLayerDefn().GetFieldIndex(value_field) >= 0:
+                return datasource, layer
+
+    datasource = _memory_vector_driver().CreateDataSource("rasterize_input")
+    layer = datasource.CreateLayer("features", geom_type=ogr.wkbUnknown)
+    layer.CreateField(ogr.FieldDefn(value_field, ogr.OFTReal))
+    definition = layer.GetLayerDefn()
+    request = QgsFeatureRequest().setSubsetOfAttributes([value_field], input_layer.fields())
+    for feature in input_layer.getFeatures(request):
+        geometry = feature.geometry()
+        if geometry.isNull() or geometry.isEmpty():
+            continue
+        ogr_feature = ogr.Feature(definition)
+        ogr_feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(geometry.asWkb())))
+        value = feature[value_field]
+        if value is not None and not (hasattr(value, "isNull") and value.isNull()):
+            ogr_feature.SetField(value_field, float(value))
+        layer.CreateFeature(ogr_feature)
+    return datasource, layer
+
+
+def rasterize_and_mask(
+    input_layer: QgsVectorLayer,
+    value_field: str,
+    mask_geometry: QgsGeometry,
+    extent: QgsRectangle,
+    x_res: float,
+    y_res: float,
+    crs: QgsCoordinateReferenceSystem,
+    output_path: str,
+    default_value: float = 0,
+    nodata: float = 255,
+    data_type: int = gdal.GDT_Float32,
+) -> Optional[str]:
+    """
+    Rasterize a vector layer and mask it to a polygon in one in-memory pass.
+
+    Args:
+        input_layer (QgsVectorLayer): The layer to rasterize, in the target CRS.
+        value_field (str): The attribute whose values are burned.
+        mask_geometry (QgsGeometry): Pixels whose centre is outside this polygon become nodata.
+        extent (QgsRectangle): The rasterization extent, defining the pixel grid origin.
+        x_res (float): Pixel width in CRS units.
+        y_res (float): Pixel height in CRS units.
+        crs (QgsCoordinateReferenceSystem): The CRS of the output.
+        output_path (str): Path of the masked GeoTIFF to write.
+        default_value (float): Value of pixels that no feature touches.
+        nodata (float): Nodata value for pixels outside the mask.
+        data_type (int): GDAL data type of the output.
+
+    Returns:
+        str: The output path, or None if the mask does not overlap the extent or
+        rasterization failed.
+    """
+    window = mask_window(extent, x_res, y_res, mask_geometry)
+    if window is None:
+        log_message(
+            f"Mask does not overlap the rasterization extent for {output_path}",
+            tag="GeoE3",
+            level=Qgis.Warning,
+        )
+        return None
+    geotransform, columns, rows = window
+    srs = osr.SpatialReference()
+    srs.ImportFromWkt(crs.toWkt())
+
+    values = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, data_type)
+    values.SetGeoTransform(geotransform)
+    values.SetProjection(srs.ExportToWkt())
+    band = values.GetRasterBand(1)
+    band.SetNoDataValue(nodata)
+    band.Fill(default_value)
+
+    datasource, layer = _ogr_layer(input_layer, value_field)
+    error = gdal.RasterizeLayer(values, [1], layer, options=[f"ATTRIBUTE={value_field}", "ALL_TOUCHED=TRUE"])
+    # The layer belongs to the datasource, which has to outlive it
+    del layer, datasource
+    if error != gdal.CE_None:
+        log_message(
+            f"Rasterizing {input_layer.source()} failed: {gdal.GetLastErrorMsg()}",
+            tag="GeoE3",
+            level=Qgis.Critical,
+        )
+        return None
+
+    data = band.ReadAsArray()
+    data[~burn_mask(mask_geometry, geotransform, columns, rows, srs)] = nodata
+    band.WriteArray(data)
+    return write_tile(values, output_path)
+
+
+def mask_window(
+    extent: QgsRectangle, x_res: float, y_res: float, mask_geometry: QgsGeometry
+) -> Optional[Tuple[Tuple[float, float, float, float, float, float], int, int]]:
+    """
+    Return the pixels of a rasterization extent that cover a mask polygon.
+
+    Args:
+        extent (QgsRectangle): The rasterization extent, defining the pixel grid origin.
+        x_res (float): Pixel width in CRS units.
+        y_res (float): Pixel height in CRS units.
+        mask_geometry (QgsGeometry): The mask polygon.
+
+    Returns:
+        Tuple of (geotransform, columns, rows) of the window, or None if the mask
+        does not overlap the extent.
+    """
+    # Same pixel grid gdal_rasterize builds for -te/-tr
+    width = int((extent.width() + x_res / 2.0) / x_res)
+    height = int((extent.height() + y_res / 2.0) / y_res)
+
+    # Crop to the mask extent, snapped outwards to whole pixels
+    mask_box = mask_geometry.boundingBox()
+    col_start = max(0, math.floor((mask_box.xMinimum() - extent.xMinimum()) / x_res + SNAP_TOLERANCE))
+    col_end = min(width, math.ceil((mask_box.xMaximum() - extent.xMinimum()) / x_res - SNAP_TOLERANCE))
+    row_start = max(0, math.floor((extent.yMaximum() - mask_box.yMaximum()) / y_res + SNAP_TOLERANCE))
+    row_end = min(height, math.ceil((extent.yMaximum() - mask_box.yMinimum()) / y_res - SNAP_TOLERANCE))
+    columns = col_end - col_start
+    rows = row_end - row_start
+    if columns <= 0 or rows <= 0:
+        return None
+
+    geotransform = (
+        extent.xMinimum() + col_start * x_res,
+        x_res,
+        0.0,
+        extent.yMaximum() - row_start * y_res,
+        0.0,
+        -y_res,
+    )
+    return geotransform, columns, rows
+
+
+def burn_mask(
+    mask_geometry: QgsGeometry,
+    geotransform: Tuple[float, float, float, float, float, float],
+    columns: int,
+    rows: int,
+    srs: osr.SpatialReference,
+) -> np.ndarray:
+    """
+    Return which pixels of a window have their centre inside a mask polygon.
+
+    Args:
+        mask_geometry (QgsGeometry): The mask polygon.
+        geotransform: Geotransform of the window.
+        columns (int): Width of the window in pixels.
+        rows (int): Height of the window in pixels.
+        srs (osr.SpatialReference): The CRS of the window.
+
+    Returns:
+        np.ndarray: Boolean array of shape (rows, columns), True inside the mask.
+    """
+    mask = gdal.GetDriverByName("MEM").Create("", columns, rows, 1, gdal.GDT_Byte)
+    mask.SetGeoTransform(geotransform)
+    mask.SetProjection(srs.ExportToWkt())
+    mask_datasource = _memory_vector_driver().CreateDataSource("mask")
+    mask_layer = mask_datasource.CreateLayer("mask", srs=srs, geom_type=ogr.wkbUnknown)
+    mask_feature = ogr.Feature(mask_layer.GetLayerDefn())
+    mask_feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(mask_geometry.asWkb())))
+    mask_layer.CreateFeature(mask_feature)
+    gdal.RasterizeLayer(mask, [1], mask_layer, burn_values=[1])
+    mask_layer = None
+    mask_datasource = None
+    inside = mask.GetRasterBand(1).ReadAsArray() != 0
+    mask = None
+    return inside
+
+
+def write_tile(dataset: gdal.Dataset, output_path: str) -> Optional[str]:
+    """
+    Write an in-memory tile to a GeoTIFF, replacing any previous output.
+
+    Args:
+        dataset (gdal.Dataset): The MEM dataset to write.
+        output_path (str): Path of the GeoTIFF.
+
+    Returns:
+        str: The output path, or None if it could not be written.
+    """
+    if os.path.exists(output_path):
+        gdal.GetDriverByName("GTiff").Delete(output_path)
+    output = gdal.GetDriverByName("GTiff").CreateCopy(output_path, dataset)
+    if output is None:
+        log_message(
+            f"Could not write masked raster {output_path}",
+            tag="GeoE3",
+            level=Qgis.Critical,
+        )
+        return None
+    output.FlushCache()
+    output = None
+    return output_path
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""📦 Reprojected Layer Cache module.
+
+This module contains an on-disk cache of input vector layers that have had
+their geometries fixed and been reprojected to the analysis CRS.
+
+Each cached copy is a GeoPackage, so it carries an R-tree spatial index and
+per-area subsetting becomes an indexed bounding box query. Cached copies are
+keyed on the source path, subset string, size and modification time of the
+source files and the target CRS, so editing or replacing an input layer
+automatically produces a new copy.
+
+Cache file names are {name}_{source}_{version}.gpkg, where source hashes the
+identity of the layer (path, layer, subset string and target CRS) and version
+hashes the size and modification time of its files. Only copies with the same
+source hash are ever replaced, so other layers of one GeoPackage, other
+subsets of a layer or same named files in other folders keep their copies.
+"""
+
+import glob
+import hashlib
+import os
+import re
+from threading import Lock
+from typing import Callable, Optional
+
+from qgis.core import (
+    Qgis,
+    QgsCoordinateReferenceSystem,
+    QgsCoordinateTransformContext,
+    QgsVectorFileWriter,
+    QgsVectorLayer,
+)
+
+from geest.utilities import log_message
+
+CACHE_LAYER_NAME = "features"
+
+# Sidecar files that are part of a shapefile's content
+SHAPEFILE_SIDECARS = (".dbf", ".shx", ".prj", ".cpg")
+
+
+class ReprojectedLayerCache:
+    """
+    Process-wide cache of fixed and reprojected copies of input vector layers.
+
+    Concurrent WorkflowJobs asking for the same layer wait for a single build
+    and then share the cached GeoPackage.
+
+    Example usage:
+
+        ```python
+        layer = ReprojectedLayerCache.layer_for(features_layer, target_crs, cache_directory, build)
+        ```
+    """
+
+    _lock = Lock()
+    _key_locks = {}  # cache path -> Lock
+
+    @staticmethod
+    def _source_path(layer: QgsVectorLayer) -> Optional[str]:
+        """
+        Return the file backing a layer, or None if it is not file based.
+
+        Args:
+            layer (QgsVectorLayer): The layer.
+
+        Returns:
+            str: The path of the data source file.
+        """
+        if layer.providerType() != "ogr":
+            return None
+        path = layer.source().split("|")[0]
+        if not os.path.isfile(path):
+            return None
+        return path
+
+    @classmethod
+    def cache_path(
+        cls,
+        layer: QgsVectorLayer,
+        target_crs: QgsCoordinateReferenceSystem,
+        cache_directory: str,
+    ) -> Optional[str]:
+        """
+        Return the path of the cached copy of a layer.
+
+        Args:
+            layer (QgsVectorLayer): The source layer.
+            target_crs (QgsCoordinateReferenceSystem): The CRS of the cached copy.
+            cache_directory (str): Folder holding cached copies.
+
+        Returns:
+            str: The cache path, or None if the layer cannot be cached.
+        """
+        path = cls._source_path(layer)
+        if path is None:
+            return None
+        files = [path]
+        base, extension = os.path.splitext(path)
+        if extension.lower() == ".shp":
+            files += [base + sidecar for sidecar in SHAPEFILE_SIDECARS if os.path.exists(base + sidecar)]
+        elif extension.lower() == ".gpkg" and os.path.exists(f"{path}-wal"):
+            files.append(f"{path}-wal")
+        identity = hashlib.sha256()
+        identity.update(os.path.abspath(layer.source()).encode("utf-8"))
+        identity.update(layer.subsetString().encode("utf-8"))
+        identity.update(target_crs.toWkt().encode("utf-8"))
+        version = hashlib.sha256()
+        for file in files:
+            stat = os.stat(file)
+            version.update(f"{file}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(cache_directory, f"{name}_{identity.hexdigest()[:8]}_{version.hexdigest()[:16]}.gpkg")
+
+    @classmethod
+    def layer_for(
+        cls,
+        layer: QgsVectorLayer,
+        target_crs: QgsCoordinateReferenceSystem,
+        cache_directory: str,
+        build: Callable[[QgsVectorLayer, QgsCoordinateReferenceSystem], QgsVectorLayer],
+    ) -> QgsVectorLayer:
+        """
+        Return the cached copy of a layer, building it if needed.
+
+        Layers that are not file based are not cached and are passed to build directly.
+
+        Args:
+            layer (QgsVectorLayer): The source layer.
+            target_crs (QgsCoordinateReferenceSystem): The CRS of the cached copy.
+            cache_directory (str): Folder holding cached copies.
+            build: Callable(layer, target_crs) returning the fixed, reprojected layer.
+
+        Returns:
+            QgsVectorLayer: A layer in the target CRS.
+        """
+        cache_path = cls.cache_path(layer, target_crs, cache_directory)
+        if cache_path is None:
+            return build(layer, target_crs)
+
+        with cls._lock:
+            key_lock = cls._key_locks.setdefault(cache_path, Lock())
+        with key_lock:
+            if not os.path.exists(cache_path):
+                prepared = build(layer, target_crs)
+                if not cls._write(prepared, cache_path):
+                    return prepared
+                cls._remove_stale(cache_path)
+            else:
+                log_message(f"Reusing reprojected copy of {layer.source()} from {cache_path}")
+
+        cached = QgsVectorLayer(f"{cache_path}|layername={CACHE_LAYER_NAME}", layer.name(), "ogr")
+        if not cached.isValid():
+            log_message(
+                f"Cached layer {cache_path} is invalid, using an uncached copy",
+                tag="GeoE3",
+                level=Qgis.Warning,
+            )
+            with key_lock:
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+            return build(layer, target_crs)
+        return cached
+
+    @staticmethod
+    def _write(layer: QgsVectorLayer, cache_path: str) -> bool:
+        """
+        Write a layer to a GeoPackage with a spatial index, atomically.
+
+        Args:
+            layer (QgsVectorLayer): The layer to write.
+            cache_path (str): Destination GeoPackage.
+
+        Returns:
+            bool: True if the GeoPackage was written.
+        """
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f"{os.path.splitext(cache_path)[0]}_tmp.gpkg"
+        options = QgsVectorFileWriter.SaveVectorOptions()
+        options.driverName = "GPKG"
+        options.layerName = CACHE_LAYER_NAME
+        options.layerOptions = ["SPATIAL_INDEX=YES"]
+        error, message, _, _ = QgsVectorFileWriter.writeAsVectorFormatV3(
+            layer, temp_path, QgsCoordinateTransformContext(), options
+        )
+        if error != QgsVectorFileWriter.NoError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            log_message(
+                f"Could not cache reprojected layer to {cache_path}: {message}",
+                tag="GeoE3",
+                level=Qgis.Warning,
+            )
+            return False
+        os.replace(temp_path, cache_path)
+        log_message(f"Cached reprojected layer to {cache_path}")
+        return True
+
+    @staticmethod
+    def _remove_stale(cache_path: str) -> None:
+        """
+        Remove older cached copies of the same source, which can no longer be hit.
+
+        Only copies sharing the source hash of cache_path are removed.
+
+        Args:
+            cache_path (str): The cache path that was just written.
+        """
+        # {name}_{source}, the version hash is the last part
+        prefix = os.path.basename(cache_path).rsplit("_", 1)[0]
+        pattern = re.compile(rf"^{re.escape(prefix)}_[0-9a-f]{{16}}\.gpkg$")
+        for path in glob.glob(os.path.join(os.path.dirname(cache_path), f"{glob.escape(prefix)}_*.gpkg")):
+            if os.path.normpath(path) == os.path.normpath(cache_path) or not pattern.match(os.path.basename(path)):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                # Still open elsewhere; it will be removed on a later build
+                pass
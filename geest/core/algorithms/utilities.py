@@ -13,15 +13,21 @@ from qgis.core import (  # QgsWkbTypes,
     Qgis,
     QgsCoordinateReferenceSystem,
     QgsFeature,
+    QgsFeatureRequest,
     QgsGeometry,
+    QgsMemoryProviderUtils,
     QgsProcessingException,
     QgsProcessingFeedback,
     QgsRasterLayer,
     QgsVectorLayer,
 )
 
+from geest.core import gdal_ops
+from geest.core.settings import setting
 from geest.utilities import log_message
 
+from .reprojected_layer_cache import ReprojectedLayerCache
+
 
 # Call QGIS process to assign a CRS to a layer
 def assign_crs_to_raster_layer(layer: QgsRasterLayer, crs: QgsCoordinateReferenceSystem) -> QgsRasterLayer:
@@ -64,44 +70,34 @@ def subset_vector_layer(
     output_prefix: str,
 ) -> QgsVectorLayer:
     """
-    Select features from the features layer that intersect with the given area geometry.
+    Select features from the features layer that intersect with the bounding box of the given area geometry.
+
+    Features are streamed from the layer with a spatial filter, so providers with a
+    spatial index (GeoPackage R-tree, the reprojected layer cache) only read the
+    candidates around the area. The selection is returned as a memory layer rather
+    than written to a shapefile.
 
     Args:
-        workflow_directory (str): Directory to save output files.
+        workflow_directory (str): Directory of the calling workflow. Kept for compatibility, nothing is written.
         features_layer (QgsVectorLayer): The input features layer.
         area_geom (QgsGeometry): The current area geometry for which intersections are evaluated.
         output_prefix (str): A name for the output temporary layer to store selected features.
 
     Returns:
-        QgsVectorLayer: A new temporary layer containing features that intersect with the given area geometry, or None if input layer is invalid.
+        QgsVectorLayer: A new memory layer containing features that intersect with the given area geometry, or None if input layer is invalid.
     """
     if type(features_layer) is not QgsVectorLayer:
         return None
     log_message("subset_vector_layer Select Features Started")
-    output_path = os.path.join(workflow_directory, f"{output_prefix}.shp")
-
-    # Get the WKB type (geometry type) of the input layer (e.g., Point, LineString, Polygon)
-    # geometry_type = features_layer.wkbType()
-
-    # # Determine geometry type name based on input layer's geometry
-    # if QgsWkbTypes.geometryType(geometry_type) == QgsWkbTypes.PointGeometry:
-    #     geometry_name = "Point"
-    # elif QgsWkbTypes.geometryType(geometry_type) == QgsWkbTypes.LineGeometry:
-    #     geometry_name = "LineString"
-    # elif QgsWkbTypes.geometryType(geometry_type) == QgsWkbTypes.PolygonGeometry:
-    #     geometry_name = "Polygon"
-    # else:
-    #     raise QgsProcessingException(f"Unsupported geometry type: {geometry_type}")
-
-    params = {
-        "INPUT": features_layer,
-        "PREDICATE": [0],  # Intersects predicate
-        "GEOMETRY": area_geom,
-        "EXTENT": area_geom.boundingBox(),
-        "OUTPUT": output_path,
-    }
-    result = processing.run("native:extractbyextent", params)
-    return QgsVectorLayer(result["OUTPUT"], output_prefix, "ogr")
+    # Same selection as native:extractbyextent: exact intersection with the area's extent
+    request = QgsFeatureRequest().setFilterRect(area_geom.boundingBox())
+    request.setFlags(QgsFeatureRequest.ExactIntersect)
+    subset_layer = QgsMemoryProviderUtils.createMemoryLayer(
+        output_prefix, features_layer.fields(), features_layer.wkbType(), features_layer.crs()
+    )
+    subset_layer.dataProvider().addFeatures(list(features_layer.getFeatures(request)))
+    subset_layer.updateExtents()
+    return subset_layer
 
 
 def geometry_to_memory_layer(
@@ -144,7 +140,9 @@ def geometry_to_memory_layer(
 
 
 def check_and_reproject_layer(
-    features_layer: QgsVectorLayer, target_crs: QgsCoordinateReferenceSystem
+    features_layer: QgsVectorLayer,
+    target_crs: QgsCoordinateReferenceSystem,
+    cache_directory: Optional[str] = None,
 ) -> QgsVectorLayer:
     """
     Checks if the features layer has valid geometries and the expected CRS.
@@ -153,9 +151,13 @@ def check_and_reproject_layer(
     If the layer's CRS does not match the target CRS, it is reprojected using the
     native:reprojectlayer algorithm.
 
+    When a cache directory is given, the result for file based layers is stored
+    there as a spatially indexed GeoPackage and reused until the source changes.
+
     Args:
         features_layer (QgsVectorLayer): The input features layer.
         target_crs (QgsCoordinateReferenceSystem): The target CRS for the layer.
+        cache_directory (str): Optional folder for cached reprojected copies.
 
     Returns:
         QgsVectorLayer: The input layer, either reprojected or unchanged.
@@ -167,6 +169,28 @@ def check_and_reproject_layer(
     if not features_layer.crs().isValid():
         raise QgsProcessingException("Layer has no CRS.")
 
+    if cache_directory and int(setting(key="cache_reprojected_layers", default=1)):
+        return ReprojectedLayerCache.layer_for(features_layer, target_crs, cache_directory, _fix_and_reproject_layer)
+    return _fix_and_reproject_layer(features_layer, target_crs)
+
+
+def _fix_and_reproject_layer(
+    features_layer: QgsVectorLayer, target_crs: QgsCoordinateReferenceSystem
+) -> QgsVectorLayer:
+    """
+    Fix the geometries of a layer and reproject it to the target CRS, in memory.
+
+    Args:
+        features_layer (QgsVectorLayer): The input features layer.
+        target_crs (QgsCoordinateReferenceSystem): The target CRS for the layer.
+
+    Returns:
+        QgsVectorLayer: The fixed layer in the target CRS.
+
+    Raises:
+        QgsProcessingException: If the reprojected layer is invalid.
+    """
+
     params = {
         "INPUT": features_layer,
         "METHOD": 1,  # Structure method
@@ -246,22 +270,25 @@ def combine_rasters_to_vrt(
         )
         return
 
-    # Define the VRT parameters
-    params = {
-        "INPUT": checked_rasters,
-        "RESOLUTION": 0,  # Use highest resolution among input files
-        "SEPARATE": False,  # Combine all input rasters as a single band
-        "OUTPUT": vrt_filepath,
-        "PROJ_DIFFERENCE": False,
-        "ADD_ALPHA": False,
-        "ASSIGN_CRS": target_crs,
-        "RESAMPLING": 0,
-        # "SRC_NODATA": "255",
-        "EXTRA": "",
-    }
-
-    # Run the gdal:buildvrt processing algorithm to create the VRT
-    processing.run("gdal:buildvirtualraster", params)
+    if gdal_ops.use_gdal_ops():
+        gdal_ops.build_vrt(vrt_filepath, checked_rasters, resolution="highest", output_crs=target_crs)
+    else:
+        # Define the VRT parameters
+        params = {
+            "INPUT": checked_rasters,
+            "RESOLUTION": 0,  # Use highest resolution among input files
+            "SEPARATE": False,  # Combine all input rasters as a single band
+            "OUTPUT": vrt_filepath,
+            "PROJ_DIFFERENCE": False,
+            "ADD_ALPHA": False,
+            "ASSIGN_CRS": target_crs,
+            "RESAMPLING": 0,
+            # "SRC_NODATA": "255",
+            "EXTRA": "",
+        }
+
+        # Run the gdal:buildvrt processing algorithm to create the VRT
+        processing.run("gdal:buildvirtualraster", params)
     log_message(f"Created VRT: {vrt_filepath}")
 
     # Copy the appropriate QML over too
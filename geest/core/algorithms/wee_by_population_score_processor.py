@@ -9,6 +9,7 @@ import shutil
 import traceback
 from typing import List, Optional
 
+from osgeo import gdal
 from qgis import processing
 from qgis.core import (
     QgsCoordinateReferenceSystem,
@@ -17,6 +18,7 @@ from qgis.core import (
     QgsVectorLayer,
 )
 
+from geest.core import gdal_ops
 from geest.core.algorithms import AreaIterator
 from geest.utilities import log_message, resources_path
 
@@ -208,6 +210,17 @@ class WEEByPopulationScoreProcessingTask(QgsTask):
 
             log_message(f"Calculating GeoE3 by POP SCORE for area {index}")
 
+            if gdal_ops.use_gdal_ops():
+                gdal_ops.calculate(
+                    "((A - 1) * 3) + B",
+                    {"A": geoe3_path, "B": population_path},
+                    output_path,
+                    output_type=gdal.GDT_Byte,
+                )
+                self.output_rasters.append(output_path)
+                log_message(f"Score raster saved to {output_path}")
+                continue
+
             params = {
                 "INPUT_A": geoe3_layer,
                 "BAND_A": 1,
@@ -236,14 +249,17 @@ class WEEByPopulationScoreProcessingTask(QgsTask):
         qml_path = os.path.join(self.output_dir, "geoe3_by_population_score.qml")
         source_qml = resources_path("resources", "qml", "geoe3_by_population_score.qml")
 
-        params = {
-            "INPUT": self.output_rasters,
-            "RESOLUTION": 0,  # Use highest resolution
-            "SEPARATE": False,  # Combine into a single band
-            "OUTPUT": vrt_path,
-        }
+        if gdal_ops.use_gdal_ops():
+            gdal_ops.build_vrt(vrt_path, self.output_rasters, resolution="highest")
+        else:
+            params = {
+                "INPUT": self.output_rasters,
+                "RESOLUTION": 0,  # Use highest resolution
+                "SEPARATE": False,  # Combine into a single band
+                "OUTPUT": vrt_path,
+            }
 
-        processing.run("gdal:buildvirtualraster", params)
+            processing.run("gdal:buildvirtualraster", params)
         log_message(f"Generated VRT at {vrt_path}")
 
         # Apply QML Style
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""📦 Weighted Raster Aggregator module.
+
+This module contains a block-windowed GDAL/NumPy implementation of the
+weighted sum used by the factor, dimension and analysis aggregations.
+
+It replaces the QgsRasterCalculator expression path: rather than parsing an
+expression and interpreting it per pixel, aligned windows are streamed from
+every input raster and combined with vectorised NumPy arithmetic. Any pixel
+that is nodata in one of the inputs is nodata in the output, matching the
+behaviour of the raster calculator.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+from osgeo import gdal
+
+from geest.utilities import log_message
+
+# Same output nodata value QgsRasterCalculator writes for Float32 outputs
+AGGREGATION_NODATA = float(np.finfo(np.float32).min)
+
+# Number of rows read from every input per window
+DEFAULT_WINDOW_ROWS = 256
+
+GTIFF_CREATION_OPTIONS = [
+    "TILED=YES",
+    "BLOCKXSIZE=256",
+    "BLOCKYSIZE=256",
+    "COMPRESS=DEFLATE",
+    "PREDICTOR=3",
+    "NUM_THREADS=ALL_CPUS",
+    "BIGTIFF=IF_SAFER",
+]
+
+
+def _aligned_dataset(path: str, reference: gdal.Dataset) -> gdal.Dataset:
+    """
+    Open a raster on the same grid as the reference dataset.
+
+    Rasters that already share the reference geotransform and size are opened
+    directly. Anything else is wrapped in a nearest-neighbour warped VRT so
+    that windows can be read with identical offsets.
+
+    Args:
+        path (str): Path to the raster to open.
+        reference (gdal.Dataset): Dataset defining the output grid.
+
+    Returns:
+        gdal.Dataset: A dataset aligned with the reference.
+
+    Raises:
+        RuntimeError: If the raster cannot be opened.
+    """
+    dataset = gdal.Open(path, gdal.GA_ReadOnly)
+    if dataset is None:
+        raise RuntimeError(f"Could not open raster for aggregation: {path}")
+    if (
+        dataset.RasterXSize == reference.RasterXSize
+        and dataset.RasterYSize == reference.RasterYSize  # noqa W503
+        and np.allclose(dataset.GetGeoTransform(), reference.GetGeoTransform())  # noqa W503
+    ):
+        return dataset
+
+    gt = reference.GetGeoTransform()
+    xmin = gt[0]
+    ymax = gt[3]
+    xmax = xmin + gt[1] * reference.RasterXSize
+    ymin = ymax + gt[5] * reference.RasterYSize
+    log_message(f"Aligning {path} to the aggregation grid")
+    return gdal.Warp(
+        "",
+        dataset,
+        format="VRT",
+        outputBounds=(xmin, ymin, xmax, ymax),
+        width=reference.RasterXSize,
+        height=reference.RasterYSize,
+        dstSRS=reference.GetProjection() or None,
+        resampleAlg="near",
+        dstNodata=dataset.GetRasterBand(1).GetNoDataValue(),
+    )
+
+
+def aggregate_weighted_rasters(
+    input_files: Dict[str, float],
+    output_path: str,
+    window_rows: int = DEFAULT_WINDOW_ROWS,
+    feedback=None,
+) -> Optional[str]:
+    """
+    Compute the weighted sum of a set of rasters, window by window.
+
+    The first raster defines the output extent, resolution and CRS, as it does
+    for the QgsRasterCalculator path.
+
+    Args:
+        input_files (dict): Mapping of raster path to weight.
+        output_path (str): Path of the tiled, compressed GeoTIFF to write.
+        window_rows (int): Number of rows to process per window.
+        feedback (QgsFeedback): Optional feedback for progress and cancellation.
+
+    Returns:
+        str: The output path, or None if there was nothing to aggregate or the
+        operation was canceled.
+    """
+    paths: List[str] = list(input_files.keys())
+    if not paths:
+        return None
+    weights = np.array([float(input_files[path]) for path in paths], dtype=np.float64)
+
+    reference = gdal.Open(paths[0], gdal.GA_ReadOnly)
+    if reference is None:
+        raise RuntimeError(f"Could not open raster for aggregation: {paths[0]}")
+    width = reference.RasterXSize
+    height = reference.RasterYSize
+
+    datasets = [reference] + [_aligned_dataset(path, reference) for path in paths[1:]]
+    bands = [dataset.GetRasterBand(1) for dataset in datasets]
+    nodata_values = [band.GetNoDataValue() for band in bands]
+
+    driver = gdal.GetDriverByName("GTiff")
+    output = driver.Create(output_path, width, height, 1, gdal.GDT_Float32, options=GTIFF_CREATION_OPTIONS)
+    if output is None:
+        raise RuntimeError(f"Could not create aggregation output: {output_path}")
+    output.SetGeoTransform(reference.GetGeoTransform())
+    output.SetProjection(reference.GetProjection())
+    output_band = output.GetRasterBand(1)
+    output_band.SetNoDataValue(AGGREGATION_NODATA)
+
+    window_rows = max(1, int(window_rows))
+    try:
+        for yoff in range(0, height, window_rows):
+            if feedback is not None and feedback.isCanceled():
+                log_message("Aggregation canceled")
+                return None
+            rows = min(window_rows, height - yoff)
+            total = np.zeros((rows, width), dtype=np.float64)
+            invalid = np.zeros((rows, width), dtype=bool)
+            for band, nodata, weight in zip(bands, nodata_values, weights):
+                block = band.ReadAsArray(0, yoff, width, rows).astype(np.float64, copy=False)
+                invalid |= np.isnan(block)
+                if nodata is not None:
+                    invalid |= block == nodata
+                total += weight * block
+            total[invalid] = AGGREGATION_NODATA
+            output_band.WriteArray(total.astype(np.float32), 0, yoff)
+            if feedback is not None:
+                feedback.setProgress(((yoff + rows) / height) * 100.0)
+        output_band.FlushCache()
+    finally:
+        output_band = None
+        output = None
+        bands = None
+        datasets = None
+        reference = None
+
+    return output_path
@@ -18,7 +18,24 @@ __revision__ = "$Format:%H$"
 # ---------------------------------------------------------------------
 
 default_settings = {
+    "adaptive_concurrency": 0,  # Size the workflow queue and grid workers from CPU load and free memory
+    "adaptive_memory_reserve_mb": 1024,  # Free memory adaptive concurrency leaves for QGIS and the system
+    "cache_network_graphs": 1,  # Build one road network graph per project, kept as NumPy arrays in <working dir>/cache
+    "cache_reprojected_layers": 1,  # Keep fixed, reprojected input layers as indexed GeoPackages in <working dir>/cache
+    "combined_rasterize_mask": 1,  # Burn vector values and the area mask in one in-memory GDAL pass
     "filter_study_areas_by_ghsl": True,  # Ignore study area polygons that do not intersect with GHSL settlements
+    "aggregation_backend": "numpy",  # Weighted aggregation engine: "numpy" (block windowed) or "calculator" (QgsRasterCalculator)
+    "area_workers": 1,  # Number of study areas a workflow processes concurrently (1=sequential)
+    "async_logging": True,  # Write the log file from a background thread via a queue
+    "gdal_backend": "api",  # Run hot path GDAL operations in-process ("api") or via processing.run ("processing")
     "grid_creation_workers": 4,  # Number of parallel workers for grid creation (1=sequential, 2-8=parallel)
+    "implicit_grid": 0,  # Store regular grids as origin, size and a coverage raster, not cell polygons (not H3)
+    "model_save_debounce_ms": 500,  # Quiet period before tree changes are written to model.json (coalesces saves)
+    "ors_max_concurrent_requests": 2,  # ORS isochrone requests sent at once
+    "ors_requests_per_minute": 20,  # ORS isochrone request rate, matching the free plan quota
+    "raster_isochrone_banding": 1,  # Burn isochrones largest range first instead of dissolve/difference vector bands
+    "raster_cell_counting": 1,  # Count point and line features per cell in raster space on regular grids
+    "reuse_workflow_results": 1,  # Reuse indicator outputs when inputs are unchanged since the last run
     "use_ors_for_accessibility": False,  # Use ORS instead of native routing for accessibility
+    "workflow_dag_scheduling": 1,  # Start each aggregation as soon as its own inputs finish, longest chains first
 }
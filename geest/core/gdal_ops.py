@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+"""📦 GDAL Ops module.
+
+This module contains thin, in-process wrappers around the GDAL utilities used
+on the hot paths of the workflows and processors.
+
+Each function mirrors the options the equivalent QGIS processing algorithm
+passes to the GDAL command line tools, but calls gdal.Warp, gdal.Rasterize,
+gdal.BuildVRT and gdal.Translate directly. This avoids the processing
+framework's algorithm lookup, parameter validation, command line round trip
+and temporary file churn for every area.
+
+Callers choose between these functions and processing.run with
+``use_gdal_ops()``, which reads the 'gdal_backend' setting.
+"""
+
+import math
+import uuid
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from osgeo import gdal, gdal_array, ogr, osr
+from qgis.core import QgsCoordinateReferenceSystem, QgsGeometry, QgsVectorLayer
+
+from geest.core.settings import setting
+
+# gdal:rastercalculator RTYPE enum values
+CALCULATOR_TYPES = {
+    0: gdal.GDT_Byte,
+    1: gdal.GDT_Int16,
+    2: gdal.GDT_UInt16,
+    3: gdal.GDT_UInt32,
+    4: gdal.GDT_Int32,
+    5: gdal.GDT_Float32,
+    6: gdal.GDT_Float64,
+}
+
+# gdal_calc's default output nodata for each data type
+DEFAULT_CALC_NODATA = {
+    gdal.GDT_Byte: 255,
+    gdal.GDT_UInt16: 65535,
+    gdal.GDT_Int16: -32767,
+    gdal.GDT_UInt32: 4294967293,
+    gdal.GDT_Int32: -2147483647,
+    gdal.GDT_Float32: 3.402823466e38,
+    gdal.GDT_Float64: 1.7976931348623158e308,
+}
+
+
+def use_gdal_ops() -> bool:
+    """
+    Whether hot paths should call GDAL directly rather than via processing.run.
+
+    Returns:
+        bool: True if the 'gdal_backend' setting is "api".
+    """
+    return setting(key="gdal_backend", default="api") == "api"
+
+
+def _srs_wkt(crs) -> str:
+    """
+    Return the WKT for a QgsCoordinateReferenceSystem, osr.SpatialReference or WKT/authid string.
+
+    Args:
+        crs: The coordinate reference system.
+
+    Returns:
+        str: The WKT definition.
+    """
+    if isinstance(crs, QgsCoordinateReferenceSystem):
+        return crs.toWkt()
+    if isinstance(crs, osr.SpatialReference):
+        return crs.ExportToWkt()
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(str(crs))
+    return srs.ExportToWkt()
+
+
+def _check(dataset, operation: str, output_path: str) -> str:
+    """
+    Close a GDAL output dataset and raise if the operation failed.
+
+    Args:
+        dataset: The dataset returned by the GDAL utility.
+        operation (str): Name of the operation, for the error message.
+        output_path (str): The output path.
+
+    Returns:
+        str: The output path.
+
+    Raises:
+        RuntimeError: If the dataset is None.
+    """
+    if dataset is None:
+        raise RuntimeError(f"{operation} failed for {output_path}: {gdal.GetLastErrorMsg()}")
+    dataset.FlushCache()
+    dataset = None
+    return output_path
+
+
+def vector_source(layer: QgsVectorLayer) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Return the file path and layer name GDAL can read a vector layer from.
+
+    Args:
+        layer (QgsVectorLayer): The layer.
+
+    Returns:
+        Tuple of (path, layer name), or None for memory or filtered layers.
+    """
+    if layer.providerType() != "ogr" or layer.subsetString():
+        return None
+    parts = layer.source().split("|")
+    layer_name = None
+    for part in parts[1:]:
+        if part.startswith("layername="):
+            layer_name = part[len("layername=") :]
+        elif part.startswith("layerid="):
+            return None
+    return parts[0], layer_name
+
+
+def warp_reproject(
+    input_path: str,
+    output_path: str,
+    target_crs,
+    resolution: float,
+    extent: Tuple[float, float, float, float],
+    resampling: str = "near",
+    dst_nodata: Optional[float] = None,
+    output_format: str = "GTiff",
+) -> str:
+    """
+    Reproject and resample a raster onto an extent, like gdal:warpreproject.
+
+    Args:
+        input_path (str): Source raster.
+        output_path (str): Destination raster. Use an empty string with output_format="VRT" for an in-memory result.
+        target_crs: Target CRS, also the CRS of the extent.
+        resolution (float): Target pixel size.
+        extent: (xmin, ymin, xmax, ymax) in the target CRS.
+        resampling (str): GDAL resampling method name.
+        dst_nodata (float): Nodata value for the output.
+        output_format (str): GDAL driver name.
+
+    Returns:
+        str: The output path.
+    """
+    target_wkt = _srs_wkt(target_crs)
+    options = gdal.WarpOptions(
+        format=output_format,
+        dstSRS=target_wkt,
+        xRes=resolution,
+        yRes=resolution,
+        outputBounds=extent,
+        outputBoundsSRS=target_wkt,
+        resampleAlg=resampling,
+        dstNodata=dst_nodata,
+    )
+    return _check(gdal.Warp(output_path, input_path, options=options), "Warp", output_path)
+
+
+def fill_nodata(input_path: str, output_path: str, fill_value: float = 0, band: int = 1) -> str:
+    """
+    Replace nodata pixels with a value, like native:fillnodata.
+
+    The output has the input's size, data type and georeferencing and no nodata value.
+
+    Args:
+        input_path (str): Source raster.
+        output_path (str): Destination GeoTIFF.
+        fill_value (float): Value written where the input is nodata.
+        band (int): Band to fill.
+
+    Returns:
+        str: The output path.
+    """
+    source = gdal.Open(input_path, gdal.GA_ReadOnly)
+    if source is None:
+        raise RuntimeError(f"Could not open raster {input_path}")
+    source_band = source.GetRasterBand(band)
+    nodata = source_band.GetNoDataValue()
+    data = source_band.ReadAsArray()
+    if nodata is not None:
+        if np.isnan(nodata):
+            data[np.isnan(data)] = fill_value
+        else:
+            data[data == nodata] = fill_value
+    output = gdal.GetDriverByName("GTiff").Create(
+        output_path, source.RasterXSize, source.RasterYSize, 1, source_band.DataType
+    )
+    output.SetGeoTransform(source.GetGeoTransform())
+    output.SetProjection(source.GetProjection())
+    output.GetRasterBand(1).WriteArray(data)
+    source = None
+    return _check(output, "Fill nodata", output_path)
+
+
+def rasterize(
+    vector_path: str,
+    output_path: str,
+    attribute: str,
+    extent: Tuple[float, float, float, float],
+    x_res: float,
+    y_res: float,
+    target_crs,
+    init_value: float = 0,
+    nodata: float = 255,
+    all_touched: bool = True,
+    output_type: int = gdal.GDT_Float32,
+    layer_name: Optional[str] = None,
+) -> str:
+    """
+    Burn an attribute into a raster, like gdal:rasterize with georeferenced units.
+
+    Args:
+        vector_path (str): Source vector dataset.
+        output_path (str): Destination GeoTIFF.
+        attribute (str): Attribute to burn.
+        extent: (xmin, ymin, xmax, ymax) of the output.
+        x_res (float): Pixel width.
+        y_res (float): Pixel height.
+        target_crs: CRS assigned to the output.
+        init_value (float): Value of pixels no feature touches.
+        nodata (float): Output nodata value.
+        all_touched (bool): Burn every pixel a feature touches.
+        output_type (int): GDAL data type of the output.
+        layer_name (str): Layer to burn from a multi-layer dataset.
+
+    Returns:
+        str: The output path.
+    """
+    options = gdal.RasterizeOptions(
+        format="GTiff",
+        outputType=output_type,
+        outputSRS=_srs_wkt(target_crs),
+        outputBounds=extent,
+        xRes=x_res,
+        yRes=y_res,
+        noData=nodata,
+        initValues=[init_value],
+        attribute=attribute,
+        allTouched=all_touched,
+        layers=[layer_name] if layer_name else None,
+    )
+    return _check(gdal.Rasterize(output_path, vector_path, options=options), "Rasterize", output_path)
+
+
+def clip_raster_by_mask(
+    input_path: str,
+    output_path: str,
+    mask_geometry: QgsGeometry,
+    mask_crs,
+    nodata: Optional[float] = None,
+    crop_to_cutline: bool = True,
+    output_type: Optional[int] = None,
+    resolution: Optional[float] = None,
+    extent: Optional[Tuple[float, float, float, float]] = None,
+) -> str:
+    """
+    Clip a raster to a polygon, like gdal:cliprasterbymasklayer.
+
+    The mask polygon is written to /vsimem so no temporary file touches the disk.
+
+    Args:
+        input_path (str): Source raster.
+        output_path (str): Destination GeoTIFF.
+        mask_geometry (QgsGeometry): The clip polygon.
+        mask_crs: CRS of the clip polygon.
+        nodata (float): Nodata value for pixels outside the mask.
+        crop_to_cutline (bool): Crop the output extent to the polygon.
+        output_type (int): GDAL data type of the output, or None to keep the input type.
+        resolution (float): Output pixel size, or None to keep the input resolution.
+        extent: Optional (xmin, ymin, xmax, ymax) of the output.
+
+    Returns:
+        str: The output path.
+    """
+    cutline_path = f"/vsimem/geoe3_cutline_{uuid.uuid4().hex}.geojson"
+    srs = osr.SpatialReference()
+    srs.ImportFromWkt(_srs_wkt(mask_crs))
+    srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    cutline = ogr.GetDriverByName("GeoJSON").CreateDataSource(cutline_path)
+    layer = cutline.CreateLayer("mask", srs=srs, geom_type=ogr.wkbUnknown)
+    feature = ogr.Feature(layer.GetLayerDefn())
+    feature.SetGeometry(ogr.CreateGeometryFromWkb(bytes(mask_geometry.asWkb())))
+    layer.CreateFeature(feature)
+    feature = None
+    layer = None
+    cutline = None
+    try:
+        options = gdal.WarpOptions(
+            format="GTiff",
+            cutlineDSName=cutline_path,
+            cropToCutline=crop_to_cutline,
+            dstNodata=nodata,
+            outputType=output_type if output_type is not None else gdal.GDT_Unknown,
+            xRes=resolution,
+            yRes=resolution,
+            outputBounds=extent,
+        )
+        return _check(gdal.Warp(output_path, input_path, options=options), "Clip", output_path)
+    finally:
+        gdal.Unlink(cutline_path)
+
+
+def build_vrt(
+    output_path: str,
+    input_paths: Sequence[str],
+    resolution: str = "highest",
+    separate: bool = False,
+    output_crs=None,
+) -> str:
+    """
+    Mosaic rasters into a VRT, like gdal:buildvirtualraster.
+
+    Args:
+        output_path (str): Destination VRT.
+        input_paths: Source rasters.
+        resolution (str): "highest", "lowest" or "average".
+        separate (bool): Put each input in its own band.
+        output_crs: CRS assigned to the VRT, or None to keep the inputs' CRS.
+
+    Returns:
+        str: The output path.
+    """
+    options = gdal.BuildVRTOptions(
+        resolution=resolution,
+        separate=separate,
+        outputSRS=_srs_wkt(output_crs) if output_crs is not None else None,
+    )
+    return _check(gdal.BuildVRT(output_path, list(input_paths), options=options), "BuildVRT", output_path)
+
+
+def translate(input_path: str, output_path: str, output_format: str = "GTiff", **kwargs) -> str:
+    """
+    Convert a raster, like gdal:translate.
+
+    Args:
+        input_path (str): Source raster.
+        output_path (str): Destination raster.
+        output_format (str): GDAL driver name.
+        **kwargs: Additional gdal.TranslateOptions keyword arguments.
+
+    Returns:
+        str: The output path.
+    """
+    options = gdal.TranslateOptions(format=output_format, **kwargs)
+    return _check(gdal.Translate(output_path, input_path, options=options), "Translate", output_path)
+
+
+def calculate(
+    formula: str,
+    inputs: Dict[str, str],
+    output_path: str,
+    output_type: int = gdal.GDT_Byte,
+    nodata: Optional[float] = None,
+) -> str:
+    """
+    Evaluate a NumPy formula over rasters, like gdal:rastercalculator with EXTENT_OPT intersect.
+
+    Inputs must share a pixel size; the output covers the intersection of their
+    extents. As with gdal_calc, pixels that are nodata in any input are nodata in
+    the output, and the output nodata defaults to gdal_calc's default for the data type.
+
+    Args:
+        formula (str): Expression using the input names, e.g. "((A - 1) * 3) + B".
+        inputs (dict): Mapping of input name to raster path.
+        output_path (str): Destination GeoTIFF.
+        output_type (int): GDAL data type of the output.
+        nodata (float): Output nodata value, or None for the gdal_calc default.
+
+    Returns:
+        str: The output path.
+
+    Raises:
+        RuntimeError: If an input cannot be opened or the extents do not intersect.
+    """
+    if nodata is None:
+        nodata = DEFAULT_CALC_NODATA.get(output_type, 0)
+    datasets = {}
+    for name, path in inputs.items():
+        dataset = gdal.Open(path, gdal.GA_ReadOnly)
+        if dataset is None:
+            raise RuntimeError(f"Could not open raster {path}")
+        datasets[name] = dataset
+
+    reference = next(iter(datasets.values()))
+    geotransform = reference.GetGeoTransform()
+    pixel_width, pixel_height = geotransform[1], abs(geotransform[5])
+    xmin, ymax = -math.inf, math.inf
+    xmax, ymin = math.inf, -math.inf
+    for dataset in datasets.values():
+        origin_x, _, _, origin_y, _, _ = dataset.GetGeoTransform()
+        xmin = max(xmin, origin_x)
+        ymax = min(ymax, origin_y)
+        xmax = min(xmax, origin_x + dataset.RasterXSize * pixel_width)
+        ymin = max(ymin, origin_y - dataset.RasterYSize * pixel_height)
+    columns = int(round((xmax - xmin) / pixel_width))
+    rows = int(round((ymax - ymin) / pixel_height))
+    if columns <= 0 or rows <= 0:
+        raise RuntimeError(f"Inputs for {output_path} do not intersect")
+
+    arrays = {}
+    invalid = np.zeros((rows, columns), dtype=bool)
+    for name, dataset in datasets.items():
+        origin_x, _, _, origin_y, _, _ = dataset.GetGeoTransform()
+        column_offset = int(round((xmin - origin_x) / pixel_width))
+        row_offset = int(round((origin_y - ymax) / pixel_height))
+        band = dataset.GetRasterBand(1)
+        data = band.ReadAsArray(column_offset, row_offset, columns, rows).astype(np.float64)
+        band_nodata = band.GetNoDataValue()
+        if band_nodata is not None:
+            invalid |= data == band_nodata
+        arrays[name] = data
+    # Formulas are fixed strings defined in the processors, never user input
+    result = eval(compile(formula, "<formula>", "eval"), {"__builtins__": {}, "numpy": np}, arrays)  # nosec B307
+    result = np.where(invalid, nodata, result)
+
+    output = gdal.GetDriverByName("GTiff").Create(output_path, columns, rows, 1, output_type)
+    output.SetGeoTransform((xmin, pixel_width, 0.0, ymax, 0.0, -pixel_height))
+    output.SetProjection(reference.GetProjection())
+    output_band = output.GetRasterBand(1)
+    output_band.SetNoDataValue(nodata)
+    output_band.WriteArray(result.astype(gdal_array.GDALTypeCodeToNumericTypeCode(output_type)))
+    datasets = None
+    reference = None
+    return _check(output, "Raster calculator", output_path)
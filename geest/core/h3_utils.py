@@ -6,15 +6,28 @@ used specifically for Regional scale analysis.
 
 H3 Resolution Reference:
 - Resolution 6: ~3.2km edge, ~36 km² area (Regional scale)
+
+Coordinate transformations are cached per thread, and cells are converted to
+geometries in batches: the boundaries of all cells are transformed with one
+TransformPoints call and each polygon is built directly from the coordinate
+arrays as WKB.
 """
 
-from typing import List, Optional, Tuple
+import struct
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from osgeo import ogr, osr
 from qgis.core import Qgis
 
 from geest.utilities import log_message
 
+WGS84_EPSG = 4326
+
+# osr transformations are not thread safe, so each thread keeps its own
+_thread_local = threading.local()
+
 
 def get_h3_resolution_for_scale(analysis_scale: str) -> Optional[int]:
     """Get H3 resolution for a given analysis scale.
@@ -30,6 +43,59 @@ def get_h3_resolution_for_scale(analysis_scale: str) -> Optional[int]:
     return None
 
 
+def coordinate_transform(source_epsg: int, target_epsg: int) -> osr.CoordinateTransformation:
+    """Get a cached coordinate transformation for the calling thread.
+
+    Both CRSs use the traditional GIS axis order, so geographic coordinates
+    are (longitude, latitude).
+
+    Args:
+        source_epsg: EPSG code of source CRS
+        target_epsg: EPSG code of target CRS
+
+    Returns:
+        The transformation from source to target CRS
+    """
+    transforms: Dict[Tuple[int, int], osr.CoordinateTransformation] = getattr(_thread_local, "transforms", None)
+    if transforms is None:
+        transforms = _thread_local.transforms = {}
+    key = (int(source_epsg), int(target_epsg))
+    transform = transforms.get(key)
+    if transform is None:
+        source_srs = osr.SpatialReference()
+        source_srs.ImportFromEPSG(key[0])
+        source_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        target_srs = osr.SpatialReference()
+        target_srs.ImportFromEPSG(key[1])
+        target_srs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+        transform = transforms[key] = osr.CoordinateTransformation(source_srs, target_srs)
+    return transform
+
+
+def transform_points(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    source_epsg: int,
+    target_epsg: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Transform arrays of points with a single TransformPoints call.
+
+    Args:
+        xs: X coordinates (longitudes in WGS84)
+        ys: Y coordinates (latitudes in WGS84)
+        source_epsg: EPSG code of source CRS
+        target_epsg: EPSG code of target CRS
+
+    Returns:
+        Tuple of (xs, ys) arrays in target CRS
+    """
+    if len(xs) == 0:
+        return np.empty(0), np.empty(0)
+    points = np.column_stack([xs, ys]).astype(np.float64)
+    transformed = np.array(coordinate_transform(source_epsg, target_epsg).TransformPoints(points.tolist()))
+    return transformed[:, 0], transformed[:, 1]
+
+
 def bbox_to_wgs84(
     xmin: float,
     xmax: float,
@@ -49,33 +115,14 @@ def bbox_to_wgs84(
     Returns:
         Tuple of (xmin, xmax, ymin, ymax) in WGS84
     """
-    source_srs = osr.SpatialReference()
-    source_srs.ImportFromEPSG(source_epsg)
-
-    target_srs = osr.SpatialReference()
-    target_srs.ImportFromEPSG(4326)
-
-    transform = osr.CoordinateTransformation(source_srs, target_srs)
-
     # Transform all four corners
-    points = [
-        (xmin, ymin),
-        (xmax, ymin),
-        (xmax, ymax),
-        (xmin, ymax),
-    ]
-
-    wgs84_points = []
-    for px, py in points:
-        lat, lon, _ = transform.TransformPoint(px, py)
-        wgs84_points.append((lon, lat))
-
-    wgs84_xmin = min(p[0] for p in wgs84_points)
-    wgs84_xmax = max(p[0] for p in wgs84_points)
-    wgs84_ymin = min(p[1] for p in wgs84_points)
-    wgs84_ymax = max(p[1] for p in wgs84_points)
-
-    return wgs84_xmin, wgs84_xmax, wgs84_ymin, wgs84_ymax
+    lons, lats = transform_points(
+        np.array([xmin, xmax, xmax, xmin]),
+        np.array([ymin, ymin, ymax, ymax]),
+        source_epsg,
+        WGS84_EPSG,
+    )
+    return float(lons.min()), float(lons.max()), float(lats.min()), float(lats.max())
 
 
 def transform_wgs84_to_target(
@@ -93,14 +140,7 @@ def transform_wgs84_to_target(
     Returns:
         Tuple of (x, y) in target CRS
     """
-    source_srs = osr.SpatialReference()
-    source_srs.ImportFromEPSG(4326)
-
-    target_srs = osr.SpatialReference()
-    target_srs.ImportFromEPSG(target_epsg)
-
-    transform = osr.CoordinateTransformation(source_srs, target_srs)
-    tx, ty, _ = transform.TransformPoint(x, y)
+    tx, ty, _ = coordinate_transform(WGS84_EPSG, target_epsg).TransformPoint(x, y)
     return tx, ty
 
 
@@ -124,21 +164,102 @@ def h3_cell_to_polygon_wkt(h3_index: str, target_epsg: int) -> str:
         return ""
 
     # Get H3 boundary in WGS84 (lat/lon)
-    boundary = h3.cell_to_boundary(h3_index)
-
-    # Transform each point to target CRS
-    transformed_points = []
-    for lon, lat in boundary:
-        tx, ty = transform_wgs84_to_target(lon, lat, target_epsg)
-        transformed_points.append((tx, ty))
+    lats, lons = np.array(h3.cell_to_boundary(h3_index)).T
+    xs, ys = transform_points(lons, lats, WGS84_EPSG, target_epsg)
 
     # Create polygon WKT
-    coords_str = ", ".join([f"{x} {y}" for x, y in transformed_points])
+    coords_str = ", ".join([f"{x} {y}" for x, y in zip(xs, ys)])
     wkt = f"POLYGON (({coords_str}))"
 
     return wkt
 
 
+def h3_cell_boundaries(h3_indexes: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Get the WGS84 boundaries of H3 cells as flat coordinate arrays.
+
+    Args:
+        h3_indexes: H3 cell indexes
+
+    Returns:
+        Tuple of (lons, lats, offsets), where the vertices of cell i are
+        lons[offsets[i]:offsets[i + 1]] (boundaries are not closed)
+    """
+    import h3
+
+    boundaries = [h3.cell_to_boundary(h3_index) for h3_index in h3_indexes]
+    counts = np.fromiter((len(boundary) for boundary in boundaries), dtype=np.int64, count=len(boundaries))
+    offsets = np.zeros(len(boundaries) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    if not boundaries:
+        return np.empty(0), np.empty(0), offsets
+    # h3-py v4 returns (lat, lng) pairs
+    lat_lngs = np.array([vertex for boundary in boundaries for vertex in boundary], dtype=np.float64)
+    return lat_lngs[:, 1], lat_lngs[:, 0], offsets
+
+
+def polygon_from_coordinates(xs: np.ndarray, ys: np.ndarray) -> ogr.Geometry:
+    """Create an OGR polygon from the vertices of its exterior ring.
+
+    The geometry is built from WKB, without formatting or parsing WKT.
+
+    Args:
+        xs: X coordinates of the ring vertices, not closed
+        ys: Y coordinates of the ring vertices, not closed
+
+    Returns:
+        OGR polygon geometry
+    """
+    ring = np.empty((len(xs) + 1, 2), dtype="<f8")
+    ring[:-1, 0] = xs
+    ring[:-1, 1] = ys
+    ring[-1] = ring[0]
+    # Little endian polygon with one ring
+    header = struct.pack("<BIII", 1, ogr.wkbPolygon, 1, len(ring))
+    return ogr.CreateGeometryFromWkb(header + ring.tobytes())
+
+
+def h3_cells_to_polygons(
+    h3_indexes: Sequence[str],
+    target_epsg: int,
+    envelope: Optional[Tuple[float, float, float, float]] = None,
+) -> List[Tuple[str, ogr.Geometry]]:
+    """Convert H3 cells to polygons in the target CRS in one batch.
+
+    All boundary vertices are transformed together and cells whose extent
+    misses the envelope are dropped before any geometry is built.
+
+    Args:
+        h3_indexes: H3 cell indexes
+        target_epsg: EPSG code of target CRS
+        envelope: Optional (xmin, xmax, ymin, ymax) in target CRS, as returned
+            by ogr.Geometry.GetEnvelope()
+
+    Returns:
+        List of (h3_index, polygon) tuples
+    """
+    lons, lats, offsets = h3_cell_boundaries(h3_indexes)
+    if len(lons) == 0:
+        return []
+    xs, ys = transform_points(lons, lats, WGS84_EPSG, target_epsg)
+
+    keep = np.ones(len(h3_indexes), dtype=bool)
+    if envelope is not None:
+        starts = offsets[:-1]
+        env_xmin, env_xmax, env_ymin, env_ymax = envelope
+        keep = (
+            (np.maximum.reduceat(xs, starts) >= env_xmin)
+            & (np.minimum.reduceat(xs, starts) <= env_xmax)
+            & (np.maximum.reduceat(ys, starts) >= env_ymin)
+            & (np.minimum.reduceat(ys, starts) <= env_ymax)
+        )
+
+    polygons = []
+    for index in np.flatnonzero(keep):
+        start, end = offsets[index], offsets[index + 1]
+        polygons.append((h3_indexes[index], polygon_from_coordinates(xs[start:end], ys[start:end])))
+    return polygons
+
+
 def generate_h3_indexes(
     bbox_wgs84: Tuple[float, float, float, float],
     h3_resolution: int,
@@ -232,19 +353,8 @@ def create_h3_polygon_from_boundary(
         OGR polygon geometry in target CRS
     """
     # Transform coordinates to target CRS
-    transformed_coords = []
-    for lon, lat in boundary_coords:
-        tx, ty = transform_wgs84_to_target(lon, lat, target_epsg)
-        transformed_coords.append((tx, ty))
-
-    # Create ring
-    ring = ogr.Geometry(ogr.wkbLinearRing)
-    for x, y in transformed_coords:
-        ring.AddPoint(x, y)
-    ring.CloseRings()
-
-    # Create polygon
-    polygon = ogr.Geometry(ogr.wkbPolygon)
-    polygon.AddGeometry(ring)
-
-    return polygon
+    coords = np.array(boundary_coords, dtype=np.float64)
+    xs, ys = transform_points(coords[:, 0], coords[:, 1], WGS84_EPSG, target_epsg)
+    if (xs[0], ys[0]) == (xs[-1], ys[-1]):
+        xs, ys = xs[:-1], ys[:-1]
+    return polygon_from_coordinates(xs, ys)
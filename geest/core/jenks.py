@@ -10,6 +10,15 @@ variance, producing statistically optimal class boundaries.
 This implementation is mathematically equivalent to the jenkspy library but
 uses only NumPy (already available in QGIS) to avoid external dependencies.
 
+Each step of the dynamic programme is solved with a divide-and-conquer
+optimisation, vectorised over every subproblem at the same recursion depth.
+Class costs are sums of squared deviations computed on the fly from
+cumulative sums, so time is O(k × n log n) and memory is O(k × n).
+
+Values from large rasters can be reduced to a uniform sample first with
+ReservoirSampler or sample_raster_values, which stream the raster block by
+block instead of reading it into memory.
+
 Example:
     >>> import numpy as np
     >>> from geest.core.jenks import jenks_natural_breaks
@@ -25,9 +34,10 @@ __license__ = "GPL version 3"
 __email__ = "tim@kartoza.com"
 __revision__ = "$Format:%H$"
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
+from osgeo import gdal
 
 from geest.utilities import log_message
 
@@ -69,7 +79,7 @@ def jenks_natural_breaks(
         [3.0, 12.0, 22.0]
 
     Note:
-        Time complexity: O(k × n²) where k=n_classes, n=unique values
+        Time complexity: O(k × n log n) where k=n_classes, n=unique values
         For datasets with >50K unique values, automatic sampling is used
     """
     if n_classes < 2:
@@ -147,8 +157,10 @@ def _compute_jenks_breaks(data: np.ndarray, n_classes: int) -> List[float]:
     """
     Core Fisher-Jenks algorithm using dynamic programming.
 
-    Computes optimal class boundaries by minimizing within-class variance
-    using a dynamic programming approach with O(k × n²) complexity.
+    Computes optimal class boundaries by minimizing the within-class sum of
+    squared deviations. Each row of the DP table is filled with a
+    divide-and-conquer optimisation, which holds because the optimal start of
+    the last class never moves left as the range grows.
 
     Args:
         data: Sorted array of unique values
@@ -158,8 +170,8 @@ def _compute_jenks_breaks(data: np.ndarray, n_classes: int) -> List[float]:
         List of break points (upper boundaries of each class)
 
     Algorithm:
-        1. Build variance matrix V[i,j] for all possible ranges
-        2. Use DP to find optimal k-class partition
+        1. Precompute cumulative sums for O(1) class costs
+        2. Use DP to find optimal k-class partition, one row per class count
         3. Backtrack to extract break points
     """
     n = len(data)
@@ -168,28 +180,20 @@ def _compute_jenks_breaks(data: np.ndarray, n_classes: int) -> List[float]:
     if n == n_classes:
         return data.tolist()
 
-    # Precompute variance matrix: V[i][j] = variance of data[i:j+1]
-    variance_matrix = _build_variance_matrix(data)
-
-    # DP table: dp[k][j] = minimum variance for k classes using data[0:j+1]
-    dp = np.full((n_classes + 1, n), np.inf)
-    backtrack = np.zeros((n_classes + 1, n), dtype=int)
+    # Centre the values so the cumulative sums keep their precision
+    values = data.astype(np.float64)
+    values = values - values.mean()
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    cumsum2 = np.concatenate(([0.0], np.cumsum(values**2)))
 
-    # Base case: 1 class, j elements = variance of data[0:j+1]
-    for j in range(n):
-        dp[1][j] = variance_matrix[0][j]
+    # previous[j] = minimum cost for (k-1) classes using data[0:j+1]
+    ends = np.arange(n)
+    previous = _range_sum_of_squares(cumsum, cumsum2, np.zeros(n, dtype=np.int64), ends)
+    # backtrack[k][j] = last index of the (k-1)th class in the optimal k-class partition of data[0:j+1]
+    backtrack = np.zeros((n_classes + 1, n), dtype=np.int64)
 
-    # Fill DP table for k=2 to n_classes
     for k in range(2, n_classes + 1):
-        for j in range(k - 1, n):  # Need at least k elements for k classes
-            # Try all possible positions for the (k-1)th break
-            for i in range(k - 2, j):
-                # Cost = variance of previous (k-1) classes + variance of [i+1:j+1]
-                cost = dp[k - 1][i] + variance_matrix[i + 1][j]
-
-                if cost < dp[k][j]:
-                    dp[k][j] = cost
-                    backtrack[k][j] = i
+        previous = _solve_dp_row(previous, cumsum, cumsum2, k, backtrack[k])
 
     # Extract break points by backtracking
     breaks = _extract_breaks(data, backtrack, n_classes, n - 1)
@@ -197,83 +201,100 @@ def _compute_jenks_breaks(data: np.ndarray, n_classes: int) -> List[float]:
     return breaks
 
 
-def _build_variance_matrix(data: np.ndarray) -> np.ndarray:
+def _range_sum_of_squares(
+    cumsum: np.ndarray,
+    cumsum2: np.ndarray,
+    start: np.ndarray,
+    end: np.ndarray,
+) -> np.ndarray:
     """
-    Build matrix of variances for all possible data ranges.
-
-    Computes V[i][j] = variance of data[i:j+1] for all i <= j.
-    Uses an optimized O(n²) algorithm with cumulative sums.
+    Sum of squared deviations from the mean for the ranges data[start:end+1].
 
     Args:
-        data: Sorted array of unique values
+        cumsum: Cumulative sums of the values, with a leading zero
+        cumsum2: Cumulative sums of the squared values, with a leading zero
+        start: Start indices (inclusive)
+        end: End indices (inclusive)
 
     Returns:
-        2D array where V[i][j] = variance of data[i:j+1]
+        Array of sums of squared deviations, one per range
 
-    Note:
-        Uses the formula: Var(X) = E[X²] - E[X]²
-        Cumulative sums allow O(1) calculation per range
+    Formula:
+        SSD = Σx² - (Σx)² / n
     """
-    n = len(data)
-    variance_matrix = np.zeros((n, n))
-
-    # Precompute cumulative sums for O(1) range queries
-    cumsum = np.cumsum(data)
-    cumsum2 = np.cumsum(data**2)
-
-    for i in range(n):
-        for j in range(i, n):
-            variance_matrix[i][j] = _calculate_variance(data, i, j, cumsum, cumsum2)
-
-    return variance_matrix
+    count = end - start + 1
+    sum_vals = cumsum[end + 1] - cumsum[start]
+    sum_sq = cumsum2[end + 1] - cumsum2[start]
+    # Handle numerical precision issues
+    return np.maximum(sum_sq - sum_vals**2 / count, 0.0)
 
 
-def _calculate_variance(
-    data: np.ndarray,
-    start: int,
-    end: int,
+def _solve_dp_row(
+    previous: np.ndarray,
     cumsum: np.ndarray,
     cumsum2: np.ndarray,
-) -> float:
+    k: int,
+    backtrack_row: np.ndarray,
+) -> np.ndarray:
     """
-    Calculate variance for data[start:end+1] in O(1) time.
+    Fill one row of the DP table with a vectorised divide-and-conquer pass.
 
-    Uses precomputed cumulative sums to avoid recalculating for each range.
+    For each end j the best split i minimises previous[i] + SSD(i+1, j), and
+    the best i is non-decreasing in j. Solving the middle end of a range of
+    ends bounds the candidate splits of both halves, so every recursion depth
+    touches O(n) candidates. All ranges at the same depth are solved together.
 
     Args:
-        data: Original data array (not used, kept for clarity)
-        start: Start index (inclusive)
-        end: End index (inclusive)
-        cumsum: Cumulative sum array
-        cumsum2: Cumulative sum of squares array
+        previous: Minimum costs for k-1 classes, indexed by end
+        cumsum: Cumulative sums of the values, with a leading zero
+        cumsum2: Cumulative sums of the squared values, with a leading zero
+        k: Number of classes of this row
+        backtrack_row: Output, the best split for each end
 
     Returns:
-        Variance of the specified range
-
-    Formula:
-        Var(X) = E[X²] - E[X]²
-               = (Σx²/n) - (Σx/n)²
+        Minimum costs for k classes, indexed by end
     """
-    n = end - start + 1
-
-    if n == 1:
-        return 0.0
-
-    # Get sum and sum of squares for range [start:end+1]
-    if start == 0:
-        sum_vals = cumsum[end]
-        sum_sq = cumsum2[end]
-    else:
-        sum_vals = cumsum[end] - cumsum[start - 1]
-        sum_sq = cumsum2[end] - cumsum2[start - 1]
-
-    # Var(X) = E[X²] - E[X]²
-    mean = sum_vals / n
-    mean_sq = sum_sq / n
-    variance = mean_sq - mean**2
+    n = len(previous)
+    current = np.full(n, np.inf)
+    # Ranges of ends [low, high] with candidate splits [split_low, split_high]
+    low = np.array([k - 1], dtype=np.int64)
+    high = np.array([n - 1], dtype=np.int64)
+    split_low = np.array([k - 2], dtype=np.int64)
+    split_high = np.array([n - 2], dtype=np.int64)
+
+    while len(low):
+        middle = (low + high) // 2
+        first = split_low
+        last = np.minimum(middle - 1, split_high)
+        counts = last - first + 1
+        offsets = np.cumsum(counts) - counts
+
+        # Flatten every candidate split of every range
+        range_ids = np.repeat(np.arange(len(low)), counts)
+        splits = first[range_ids] + np.arange(counts.sum()) - offsets[range_ids]
+        range_ends = middle[range_ids]
+        costs = previous[splits] + _range_sum_of_squares(cumsum, cumsum2, splits + 1, range_ends)
+
+        # Lowest cost per range, taking the first split on ties
+        best_costs = np.minimum.reduceat(costs, offsets)
+        is_best = np.flatnonzero(costs == best_costs[range_ids])
+        _, first_best = np.unique(range_ids[is_best], return_index=True)
+        best_splits = splits[is_best[first_best]]
+
+        current[middle] = best_costs
+        backtrack_row[middle] = best_splits
+
+        # Split each range around its middle end
+        left = middle - 1 >= low
+        right = middle + 1 <= high
+        low = np.concatenate((low[left], middle[right] + 1))
+        high = np.concatenate((middle[left] - 1, high[right]))
+        split_low, split_high = (
+            np.concatenate((split_low[left], best_splits[right])),
+            np.concatenate((best_splits[left], split_high[right])),
+        )
 
-    # Handle numerical precision issues
-    return max(0.0, variance)
+    return current
 
 
 def _extract_breaks(
@@ -314,6 +335,117 @@ def _extract_breaks(
     return breaks
 
 
+class ReservoirSampler:
+    """
+    Uniform random sample of a stream of values, fed in blocks.
+
+    Implements reservoir sampling (Algorithm R) vectorised per block: after
+    any number of updates every value seen so far is in the sample with the
+    same probability, and memory is bounded by the sample size.
+
+    Example:
+        >>> sampler = ReservoirSampler(sample_size=10000, seed=0)
+        >>> for block in blocks:
+        ...     sampler.update(block)
+        >>> breaks = jenks_natural_breaks(sampler.sample(), n_classes=6)
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE, seed: Optional[int] = None):
+        """🏗️ Initialize the instance.
+
+        Args:
+            sample_size: Maximum number of values kept
+            seed: Seed for the random generator, for reproducible samples
+        """
+        if sample_size < 1:
+            raise ValueError(f"sample_size must be >= 1, got {sample_size}")
+        self.sample_size = sample_size
+        self.seen = 0
+        self._reservoir = np.empty(sample_size, dtype=np.float64)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Add a block of values to the stream.
+
+        Args:
+            values: Values of any shape; NaN and infinite values are ignored
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+
+        # Fill the reservoir first
+        filled = min(self.seen, self.sample_size)
+        take = min(self.sample_size - filled, len(values))
+        self._reservoir[filled : filled + take] = values[:take]
+        self.seen += take
+        values = values[take:]
+        if len(values) == 0:
+            return
+
+        # Value number t (1 based) replaces a random slot with probability size / t
+        positions = self.seen + np.arange(1, len(values) + 1)
+        slots = (self._rng.random(len(values)) * positions).astype(np.int64)
+        replace = slots < self.sample_size
+        # Later values win on repeated slots, as they would one at a time
+        self._reservoir[slots[replace]] = values[replace]
+        self.seen += len(values)
+
+    def sample(self) -> np.ndarray:
+        """
+        The current sample.
+
+        Returns:
+            Copy of the sampled values, all values seen if fewer than sample_size
+        """
+        return self._reservoir[: min(self.seen, self.sample_size)].copy()
+
+
+def sample_raster_values(
+    raster_path: str,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    band_number: int = 1,
+    nodata: Optional[float] = None,
+    seed: Optional[int] = 0,
+) -> Tuple[np.ndarray, int]:
+    """
+    Sample the valid values of a raster band, reading it block by block.
+
+    Args:
+        raster_path: Path to a GDAL readable raster
+        sample_size: Maximum number of values in the sample
+        band_number: Band to read (1 based)
+        nodata: Value to ignore, defaults to the band's nodata value
+        seed: Seed for the random generator, for reproducible samples
+
+    Returns:
+        Tuple of (sample, valid_count), the sampled values and the number of
+        valid values in the band
+
+    Raises:
+        ValueError: If the raster cannot be opened
+    """
+    dataset = gdal.Open(raster_path)
+    if dataset is None:
+        raise ValueError(f"Cannot open raster {raster_path}")
+    band = dataset.GetRasterBand(band_number)
+    if nodata is None:
+        nodata = band.GetNoDataValue()
+    # Read whole rows of blocks to keep the number of reads low for tiled rasters
+    rows_per_read = max(1, band.GetBlockSize()[1])
+    sampler = ReservoirSampler(sample_size, seed=seed)
+    for row in range(0, band.YSize, rows_per_read):
+        rows = min(rows_per_read, band.YSize - row)
+        block = band.ReadAsArray(0, row, band.XSize, rows)
+        if nodata is not None:
+            block = block[block != nodata]
+        sampler.update(block)
+    dataset = None
+    return sampler.sample(), sampler.seen
+
+
 def calculate_goodness_of_variance_fit(
     data: np.ndarray,
     breaks: List[float],
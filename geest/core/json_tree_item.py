@@ -4,19 +4,103 @@
 This module contains functionality for json tree item.
 """
 
+import copy
 import traceback
 import uuid
 from contextlib import contextmanager
 from typing import Optional
 
 from qgis.core import Qgis
-from qgis.PyQt.QtCore import Qt, QReadWriteLock, QReadLocker, QWriteLocker
+from qgis.PyQt.QtCore import QMutex, Qt, QReadWriteLock, QReadLocker, QWriteLocker
 from qgis.PyQt.QtGui import QColor, QFont, QIcon
 
 from geest.core.settings import setting
 from geest.utilities import is_qgis_dark_theme_active, log_message, resources_path
 
 
+# Guards the guid indexes while subtrees are added to or removed from a tree.
+_guid_index_mutex = QMutex()
+
+# Guards the cached status of every item. Only held for short reads and writes
+# of the cache, never while a status is being computed.
+_status_mutex = QMutex()
+
+
+class _AttributeDict(dict):
+    """Attribute dict that marks the cached status of its items stale when it changes.
+
+    Attributes are also changed in place through the dict returned by
+    JsonTreeItem.attributes(), so invalidation has to happen on the dict itself.
+    Copies are plain dicts.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """🏗️ Initialize the instance."""
+        super().__init__(*args, **kwargs)
+        self._owners = []
+
+    def _changed(self):
+        """Invalidate the cached status of the items using this dict."""
+        for owner in list(self._owners):
+            owner.invalidateStatus()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        super().update(other)
+        self._changed()
+        return self
+
+    def update(self, *args, **kwargs):
+        """⚙️ Update the attributes and invalidate the cached status."""
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        """⚙️ Set an attribute if it is missing and invalidate the cached status."""
+        if key in self:
+            return self[key]
+        super().__setitem__(key, default)
+        self._changed()
+        return default
+
+    def pop(self, key, *args):
+        """⚙️ Remove an attribute and invalidate the cached status."""
+        value = super().pop(key, *args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        """⚙️ Remove the last attribute and invalidate the cached status."""
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        """⚙️ Remove all attributes and invalidate the cached status."""
+        super().clear()
+        self._changed()
+
+    def copy(self):
+        """⚙️ Return a plain dict copy of the attributes."""
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
 class JsonTreeItem:
     """A class representing a node in the tree.
 
@@ -37,9 +121,14 @@ class JsonTreeItem:
             guid: Guid.
             parent: Parent.
         """
-        self.parentItem = parent
+        # Cached getStatus() result, None when stale. The version changes on every
+        # invalidation so a status computed from older attributes is not stored.
+        self._status = None
+        self._status_version = 0
+        self._parentItem = parent
         self.itemData = data  # name, status, weighting, attributes(dict)
         self.childItems = []
+        self._trackAttributes()
         self.role = role  # Stores whether an item is a dimension, factor, or layer
         self.font_color = QColor(Qt.GlobalColor.black)  # Default font color
         # Add a unique guid for each item
@@ -47,6 +136,9 @@ class JsonTreeItem:
             self.guid = guid
         else:
             self.guid = str(uuid.uuid4())  # Generate a unique identifier for this item
+        # guid -> item for every item in the tree this item belongs to. The dict
+        # is shared by all items of a tree and maintained by appendChild and removeChild.
+        self._guid_index = {self.guid: self}
 
         # Thread safety: Read-write lock for protecting mutable state
         # Multiple threads can read simultaneously, but writes are exclusive
@@ -73,6 +165,51 @@ class JsonTreeItem:
         self._visible = True
         self._enabled = True
 
+    @property
+    def parentItem(self):
+        """The parent item, or None for the root."""
+        return self._parentItem
+
+    @parentItem.setter
+    def parentItem(self, parent):
+        self._parentItem = parent
+        self.invalidateStatus()
+
+    def _trackAttributes(self):
+        """Make the attributes dict invalidate this item's cached status when it changes."""
+        if not isinstance(self.itemData, list) or len(self.itemData) < 4 or not isinstance(self.itemData[3], dict):
+            return
+        attributes = self.itemData[3]
+        if not isinstance(attributes, _AttributeDict):
+            attributes = _AttributeDict(attributes)
+            self.itemData[3] = attributes
+        if self not in attributes._owners:
+            attributes._owners.append(self)
+
+    def invalidateStatus(self):
+        """
+        Mark the cached status of this item, and of every item whose status depends on it, as stale.
+
+        Ancestors aggregate the weightings and statuses of their children, and
+        descendants read the weightings of their parent and grandparent, so both
+        directions are invalidated. Call this after changing childItems directly.
+        """
+        _status_mutex.lock()
+        try:
+            item = self
+            while item is not None:
+                item._status = None
+                item._status_version += 1
+                item = item._parentItem
+            pending = list(self.childItems)
+            while pending:
+                item = pending.pop()
+                item._status = None
+                item._status_version += 1
+                pending.extend(item.childItems)
+        finally:
+            _status_mutex.unlock()
+
     @contextmanager
     def atomicAttributeUpdate(self):
         """
@@ -162,6 +299,51 @@ class JsonTreeItem:
             self.childItems.append(item)
         finally:
             self._lock.unlock()
+        _guid_index_mutex.lock()
+        try:
+            for member in item._subtree():
+                self._guid_index[member.guid] = member
+                member._guid_index = self._guid_index
+        finally:
+            _guid_index_mutex.unlock()
+        item.invalidateStatus()
+
+    def removeChild(self, item):
+        """Remove a child item, and its descendants, from this item and the guid index.
+
+        Args:
+            item: The child item to remove.
+        """
+        self._lock.lockForWrite()
+        try:
+            self.childItems.remove(item)
+        finally:
+            self._lock.unlock()
+        detached_index = {}
+        _guid_index_mutex.lock()
+        try:
+            for member in item._subtree():
+                if self._guid_index.get(member.guid) is member:
+                    del self._guid_index[member.guid]
+                detached_index[member.guid] = member
+                member._guid_index = detached_index
+        finally:
+            _guid_index_mutex.unlock()
+        self.invalidateStatus()
+
+    def _subtree(self):
+        """Return this item and all of its descendants.
+
+        Returns:
+            list: The items of the subtree.
+        """
+        items = [self]
+        pending = list(self.childItems)
+        while pending:
+            item = pending.pop()
+            items.append(item)
+            pending.extend(item.childItems)
+        return items
 
     def child(self, row):
         """⚙️ Child.
@@ -228,6 +410,9 @@ class JsonTreeItem:
         try:
             if column < len(self.itemData):
                 self.itemData[column] = value
+                if column == 3:
+                    self._trackAttributes()
+                    self.invalidateStatus()
                 return True
             return False
         finally:
@@ -406,7 +591,32 @@ class JsonTreeItem:
             return QIcon(resources_path("resources", "icons", "unspecified.svg"))
 
     def getStatus(self):
-        """Return the status of the item as single character."""
+        """Return the status of the item.
+
+        The status is computed once and reused until the attributes of the item
+        or of an ancestor or descendant change (see invalidateStatus).
+        """
+        _status_mutex.lock()
+        try:
+            status = self._status
+            version = self._status_version
+        finally:
+            _status_mutex.unlock()
+        if status is not None:
+            return status
+
+        status = self._computeStatus()
+        if not status.startswith("Status Failed"):
+            _status_mutex.lock()
+            try:
+                if self._status_version == version:
+                    self._status = status
+            finally:
+                _status_mutex.unlock()
+        return status
+
+    def _computeStatus(self):
+        """Compute the status of the item from its attributes and relatives."""
         try:
             if not isinstance(self.itemData, list):
                 return ""
@@ -604,6 +814,8 @@ class JsonTreeItem:
     def setAttributes(self, attributes):
         """Set the attributes of the item."""
         self.itemData[3] = attributes
+        self._trackAttributes()
+        self.invalidateStatus()
 
     def setAttribute(self, attribute_name, attribute_value):
         """Set the attribute of the item."""
@@ -766,13 +978,14 @@ class JsonTreeItem:
         # attributes["analysis_mode"] = "dimension_aggregation"
 
     def getItemByGuid(self, guid) -> Optional["JsonTreeItem"]:
-        """Return the item with the specified guid."""
-        if self.guid == guid:
-            return self
-        for child in self.childItems:
-            item = child.getItemByGuid(guid)
-            if item:
+        """Return the item with the specified guid if it is this item or one of its descendants."""
+        item = self._guid_index.get(guid)
+        # The index covers the whole tree, so check the item is under this one
+        ancestor = item
+        while ancestor is not None:
+            if ancestor is self:
                 return item
+            ancestor = ancestor.parentItem
         return None
 
     def updateIndicatorWeighting(self, indicator_guid, new_weighting):
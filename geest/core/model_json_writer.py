@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""📦 Model Json Writer module.
+
+This module contains the debounced writer that persists the tree model to
+model.json in the working directory.
+
+Running workflows change item attributes many times a second and every change
+used to serialise and rewrite the whole model. Save requests are now
+coalesced by a single shot timer. When it fires the model is serialised once
+and, if the content differs from what was last written to that path, handed
+to a background thread that writes a temporary file and renames it over
+model.json, so readers never see a partially written file.
+
+Code reading model.json directly, outside the tree, calls
+ModelJsonWriter.flush_all first so it does not read a file that a pending save
+is about to replace.
+"""
+
+import hashlib
+import json
+import os
+import weakref
+from threading import Lock
+from typing import Callable, Optional
+
+from qgis.core import Qgis
+from qgis.PyQt.QtCore import QObject, QRunnable, QThreadPool, QTimer
+
+from geest.core.settings import setting
+from geest.utilities import log_message
+
+
+class _WriteRunnable(QRunnable):
+    """QRunnable writing serialised model content to a file atomically."""
+
+    def __init__(self, writer: "ModelJsonWriter", path: str, content: str, content_hash: str):
+        """🏗️ Initialize the instance.
+
+        Args:
+            writer: The ModelJsonWriter that queued the write.
+            path: Destination model.json path.
+            content: Serialised JSON.
+            content_hash: Hash of the content.
+        """
+        super().__init__()
+        self.writer = writer
+        self.path = path
+        self.content = content
+        self.content_hash = content_hash
+
+    def run(self):
+        """Write the content to a temporary file and rename it over the destination."""
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                f.write(self.content)
+            os.replace(temp_path, self.path)
+            log_message(f"Saved JSON model to {self.path}")
+        except Exception as e:
+            self.writer._forget(self.path, self.content_hash)
+            log_message(f"Error saving JSON: {str(e)}", level=Qgis.Critical)
+
+
+class ModelJsonWriter(QObject):
+    """
+    Debounced, atomic writer for model.json.
+
+    Example usage:
+
+        ```python
+        writer = ModelJsonWriter(model.to_json, parent=self)
+        writer.schedule(os.path.join(working_directory, "model.json"))  # coalesced
+        writer.flush()  # before reading model.json back
+        ```
+    """
+
+    _instances = weakref.WeakSet()  # live writers, see flush_all
+
+    def __init__(self, to_json: Callable[[], dict], debounce_ms: Optional[int] = None, parent: QObject = None):
+        """🏗️ Initialize the instance.
+
+        Args:
+            to_json: Callable returning the model as a JSON serialisable dict.
+            debounce_ms: Quiet period before a scheduled save is written. Defaults
+                to the model_save_debounce_ms setting.
+            parent: Parent QObject.
+        """
+        super().__init__(parent)
+        self.to_json = to_json
+        if debounce_ms is None:
+            debounce_ms = int(setting(key="model_save_debounce_ms", default=500))
+        self._path = None
+        self._hash_lock = Lock()
+        self._written_hashes = {}  # path -> hash of the content last queued for writing
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, debounce_ms))
+        self._timer.timeout.connect(self._write_pending)
+        # One thread so writes to the same file land in the order they were queued
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        ModelJsonWriter._instances.add(self)
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """Flush every live writer, call from the UI thread before reading model.json directly."""
+        for writer in list(cls._instances):
+            writer.flush()
+
+    def schedule(self, path: str) -> None:
+        """
+        Request a save, restarting the debounce period.
+
+        A pending save for a different path is written first.
+
+        Args:
+            path: Destination model.json path.
+        """
+        if self._path is not None and self._path != path:
+            self._write_pending()
+        self._path = path
+        self._timer.start()
+
+    def flush(self) -> None:
+        """Write any pending save now and wait until all queued writes are on disk."""
+        self._timer.stop()
+        self._write_pending()
+        self._pool.waitForDone()
+
+    def _write_pending(self) -> None:
+        """Serialise the model and queue it for writing if it changed."""
+        self._timer.stop()
+        path = self._path
+        self._path = None
+        if path is None:
+            return
+        try:
+            content = json.dumps(self.to_json(), indent=4)
+        except Exception as e:
+            log_message(f"Error saving JSON: {str(e)}", level=Qgis.Critical)
+            return
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        with self._hash_lock:
+            if self._written_hashes.get(path) == content_hash and os.path.exists(path):
+                return
+            self._written_hashes[path] = content_hash
+        self._pool.start(_WriteRunnable(self, path, content, content_hash))
+
+    def _forget(self, path: str, content_hash: str) -> None:
+        """
+        Drop the recorded hash of a write that failed so the next save retries it.
+
+        Args:
+            path: Destination model.json path.
+            content_hash: Hash of the content that was not written.
+        """
+        with self._hash_lock:
+            if self._written_hashes.get(path) == content_hash:
+                del self._written_hashes[path]
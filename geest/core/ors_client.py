@@ -6,6 +6,7 @@ This module contains functionality for ors client.
 
 import json
 import os
+from typing import Optional
 
 from qgis.core import QgsNetworkAccessManager
 from qgis.PyQt.QtCore import QObject, QUrl, pyqtSignal
@@ -15,6 +16,32 @@ from geest.core.settings import setting
 from geest.utilities import log_message
 
 
+class ORSRequestError(RuntimeError):
+    """Raised when an ORS request fails with an HTTP error or no response.
+
+    Attributes:
+        status_code: HTTP status code, or None if no response was received.
+        retry_after: Seconds the server asked to wait before retrying, if given.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        """🏗️ Initialize the instance.
+
+        Args:
+            message: Error message.
+            status_code: HTTP status code, or None if no response was received.
+            retry_after: Seconds the server asked to wait before retrying.
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        """Whether sending the same request again may succeed."""
+        return self.status_code is None or self.status_code == 429 or self.status_code >= 500
+
+
 class ORSClient(QObject):
     """🎯 O R S Client.
 
@@ -91,17 +118,24 @@ class ORSClient(QObject):
         # Check HTTP status code
         status_code = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
         if status_code is None:
-            raise RuntimeError("No status code received. Network issue?")
+            raise ORSRequestError("No status code received. Network issue?")
+
+        retry_after = None
+        if reply.hasRawHeader(b"Retry-After"):
+            try:
+                retry_after = float(bytes(reply.rawHeader(b"Retry-After")).decode())
+            except ValueError:
+                retry_after = None
 
         if status_code == 404:
-            raise RuntimeError(f"Error 404: Endpoint {endpoint} not found.")
+            raise ORSRequestError(f"Error 404: Endpoint {endpoint} not found.", status_code)
         elif status_code == 401:
             raise ValueError("Invalid API token. Please check your credentials.")
         elif status_code == 429:
-            raise RuntimeError("API quota exceeded. Please try again later.")
+            raise ORSRequestError("API quota exceeded. Please try again later.", status_code, retry_after)
         elif status_code >= 400:
             # Generic error handling for other client/server errors
-            raise RuntimeError(f"HTTP Error {status_code}: {reply.content()}")
+            raise ORSRequestError(f"HTTP Error {status_code}: {reply.content()}", status_code, retry_after)
 
         # Parse JSON response
         try:
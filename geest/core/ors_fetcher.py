@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""📦 Ors Fetcher module.
+
+This module contains a concurrent, rate limited fetcher for ORS isochrone
+requests with an on-disk response cache.
+
+Requests run on a private QThreadPool. Every attempt first takes one of the
+concurrent request slots and a token from a token bucket sized to the ORS
+quota. The slots and the bucket are shared by all fetchers using the same ORS
+endpoint and API key, so parallel areas and workflows stay within the quota
+together. Requests rejected with 429 or a 5xx error (or no response at all)
+are retried with exponential backoff, honouring Retry-After when the server
+sends it.
+
+Successful responses are stored as JSON files keyed on the profile, range
+type, ranges and the request coordinates rounded to COORDINATE_DECIMALS, so
+re-running a workflow on the same points does not call ORS again.
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+import traceback
+from threading import Lock, Semaphore
+from typing import Callable, List, Optional
+
+from qgis.core import Qgis, QgsFeedback
+from qgis.PyQt.QtCore import QRunnable, QThreadPool
+
+from geest.core.ors_client import ORSClient, ORSRequestError
+from geest.core.settings import setting
+from geest.utilities import log_message
+
+# Decimal places of the coordinates in cache keys (about 1cm in degrees)
+COORDINATE_DECIMALS = 7
+# Delay before the first retry, doubled for each further retry
+BACKOFF_SECONDS = 2.0
+# Longest wait between two attempts
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket rate limiter.
+
+    The bucket holds up to capacity tokens and refills at rate tokens per
+    second; acquire blocks until a token is available.
+
+    Example usage:
+
+        ```python
+        bucket = TokenBucket.per_minute(20)
+        bucket.acquire()
+        send_request()
+        ```
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """🏗️ Initialize the instance.
+
+        Args:
+            rate: Tokens added per second.
+            capacity: Largest number of tokens held, i.e. the burst size.
+            clock: Monotonic clock in seconds.
+            sleep: Function used to wait for tokens.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: float = 1.0) -> "TokenBucket":
+        """
+        Return a bucket allowing a number of requests per minute.
+
+        Args:
+            requests_per_minute: Sustained request rate.
+            burst: Requests that may be sent at once after a quiet period.
+
+        Returns:
+            TokenBucket: The bucket.
+        """
+        return cls(requests_per_minute / 60.0, burst)
+
+    def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class ORSRequestLimits:
+    """
+    Request rate and concurrency limits shared by every fetcher of one ORS endpoint and API key.
+
+    Example usage:
+
+        ```python
+        limits = ORSRequestLimits.for_client(ors_client, requests_per_minute=20, max_concurrent=2)
+        with limits.slots:
+            limits.rate_limiter.acquire()
+            send_request()
+        ```
+    """
+
+    _lock = Lock()
+    _limits = {}  # (base url, api key) -> ORSRequestLimits
+
+    def __init__(self, requests_per_minute: float, max_concurrent: int):
+        """🏗️ Initialize the instance.
+
+        Args:
+            requests_per_minute: Sustained request rate.
+            max_concurrent: Requests that may be in flight at once.
+        """
+        self.requests_per_minute = requests_per_minute
+        self.max_concurrent = max(1, max_concurrent)
+        self.rate_limiter = TokenBucket.per_minute(requests_per_minute, burst=self.max_concurrent)
+        self.slots = Semaphore(self.max_concurrent)
+
+    @classmethod
+    def for_client(cls, client: ORSClient, requests_per_minute: float, max_concurrent: int) -> "ORSRequestLimits":
+        """
+        Return the limits shared by all requests made with a client's endpoint and API key.
+
+        The limits are replaced when the configured rate or concurrency changes.
+
+        Args:
+            client: The client sending the requests.
+            requests_per_minute: Sustained request rate.
+            max_concurrent: Requests that may be in flight at once.
+
+        Returns:
+            ORSRequestLimits: The shared limits.
+        """
+        key = (client.base_url, client.api_key or "")
+        with cls._lock:
+            limits = cls._limits.get(key)
+            configured = (requests_per_minute, max(1, max_concurrent))
+            if limits is None or (limits.requests_per_minute, limits.max_concurrent) != configured:
+                limits = cls(requests_per_minute, max_concurrent)
+                cls._limits[key] = limits
+            return limits
+
+
+class ORSResponseCache:
+    """
+    On-disk cache of ORS isochrone responses, one JSON file per request.
+
+    Example usage:
+
+        ```python
+        cache = ORSResponseCache(os.path.join(working_directory, "cache", "ors"))
+        key = ORSResponseCache.key("foot-walking", params)
+        response = cache.get(key)
+        ```
+    """
+
+    def __init__(self, directory: str):
+        """🏗️ Initialize the instance.
+
+        Args:
+            directory: Folder holding the cached responses.
+        """
+        self.directory = directory
+
+    @staticmethod
+    def key(profile: str, params: dict) -> str:
+        """
+        Return the cache key of a request.
+
+        Args:
+            profile: ORS profile, e.g. foot-walking.
+            params: Request parameters with locations, range and range_type.
+
+        Returns:
+            str: A hex digest identifying the request.
+        """
+        locations = [
+            [round(float(value), COORDINATE_DECIMALS) for value in location] for location in params["locations"]
+        ]
+        identity = {
+            "profile": profile,
+            "range_type": params.get("range_type"),
+            "range": [float(value) for value in params.get("range", [])],
+            "locations": locations,
+        }
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the file holding a cached response."""
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return a cached response.
+
+        Args:
+            key: Cache key from key().
+
+        Returns:
+            dict: The response, or None if it is not cached or unreadable.
+        """
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, response: dict) -> None:
+        """
+        Store a response, atomically.
+
+        Args:
+            key: Cache key from key().
+            response: The response to store.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{id(response)}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(response, file)
+        os.replace(temp_path, path)
+
+
+class ORSFetchRunnable(QRunnable):
+    """QRunnable fetching one ORS request.
+
+    Attributes:
+        index: Position of the request in the batch.
+        result: The response after run completes, None if it failed.
+        error: Exception if the request failed.
+        traceback: Formatted traceback if the request failed.
+    """
+
+    def __init__(self, fetcher: "ORSIsochroneFetcher", index: int, profile: str, params: dict):
+        """Initialize the fetch runnable.
+
+        Args:
+            fetcher: The fetcher whose fetch method is called.
+            index: Position of the request in the batch.
+            profile: ORS profile, e.g. foot-walking.
+            params: Request parameters.
+        """
+        super().__init__()
+        self.fetcher = fetcher
+        self.index = index
+        self.profile = profile
+        self.params = params
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.setAutoDelete(False)  # We manage lifecycle manually
+
+    def run(self):
+        """Fetch the response, recording any error."""
+        try:
+            self.result = self.fetcher.fetch(self.profile, self.params)
+        except Exception as e:
+            self.error = e
+            self.traceback = traceback.format_exc()
+
+
+class ORSIsochroneFetcher:
+    """
+    Fetches batches of ORS isochrone requests concurrently.
+
+    Example usage:
+
+        ```python
+        fetcher = ORSIsochroneFetcher(ors_client, cache_directory=os.path.join(working_directory, "cache", "ors"))
+        responses, errors = fetcher.fetch_all("foot-walking", [params_1, params_2])
+        ```
+    """
+
+    def __init__(
+        self,
+        client: ORSClient,
+        cache_directory: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        requests_per_minute: Optional[float] = None,
+        max_retries: int = 4,
+        feedback: Optional[QgsFeedback] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """🏗️ Initialize the instance.
+
+        Args:
+            client: The client sending the requests.
+            cache_directory: Optional folder for cached responses.
+            max_workers: Requests in flight at once, across all fetchers of the client's endpoint
+                and API key. Defaults to the ors_max_concurrent_requests setting.
+            requests_per_minute: Request rate, across all fetchers of the client's endpoint and
+                API key. Defaults to the ors_requests_per_minute setting.
+            max_retries: Retries of a request rejected with 429, 5xx or no response.
+            feedback: Optional feedback whose cancellation stops requests not yet sent.
+            rate_limiter: Token bucket to use instead of the shared limits. Concurrency is then
+                only limited within this fetcher.
+            sleep: Function used to wait between retries.
+        """
+        self.client = client
+        self.cache = ORSResponseCache(cache_directory) if cache_directory else None
+        if max_workers is None:
+            max_workers = int(setting(key="ors_max_concurrent_requests", default=2))
+        self.max_workers = max(1, max_workers)
+        if rate_limiter is None:
+            if requests_per_minute is None:
+                requests_per_minute = float(setting(key="ors_requests_per_minute", default=20))
+            limits = ORSRequestLimits.for_client(client, requests_per_minute, self.max_workers)
+            rate_limiter = limits.rate_limiter
+            self._slots = limits.slots
+        else:
+            self._slots = Semaphore(self.max_workers)
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.feedback = feedback
+        self._sleep = sleep
+
+    def _canceled(self) -> bool:
+        """Whether the feedback has been canceled."""
+        return self.feedback is not None and self.feedback.isCanceled()
+
+    def fetch(self, profile: str, params: dict) -> Optional[dict]:
+        """
+        Fetch one request, from the cache if possible.
+
+        Args:
+            profile: ORS profile, e.g. foot-walking.
+            params: Request parameters with locations, range and range_type.
+
+        Returns:
+            dict: The response, or None if canceled before it was sent.
+
+        Raises:
+            ORSRequestError: If the request still fails after the retries.
+            ValueError: If the API key is rejected.
+        """
+        key = ORSResponseCache.key(profile, params) if self.cache else None
+        if key is not None:
+            response = self.cache.get(key)
+            if response is not None:
+                log_message(f"Using cached ORS response {key[:12]}")
+                return response
+
+        attempt = 0
+        while True:
+            if self._canceled():
+                return None
+            try:
+                with self._slots:
+                    self.rate_limiter.acquire()
+                    response = self.client.make_request(profile, params)
+                break
+            except ORSRequestError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                delay = min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * (2**attempt))
+                delay = max(delay * random.uniform(0.5, 1.0), e.retry_after or 0.0)
+                attempt += 1
+                log_message(
+                    f"ORS request failed ({e}), retry {attempt}/{self.max_retries} in {delay:.1f}s",
+                    tag="GeoE3",
+                    level=Qgis.Warning,
+                )
+                self._sleep(delay)
+
+        if key is not None and isinstance(response, dict) and "features" in response:
+            try:
+                self.cache.put(key, response)
+            except OSError as e:
+                log_message(f"Could not cache ORS response: {e}", tag="GeoE3", level=Qgis.Warning)
+        return response
+
+    def fetch_all(self, profile: str, requests: List[dict]) -> tuple:
+        """
+        Fetch a batch of requests concurrently.
+
+        Args:
+            profile: ORS profile, e.g. foot-walking.
+            requests: Request parameters, one dict per request.
+
+        Returns:
+            Tuple of (responses, errors), both in request order. A failed
+            request has a None response and its exception in errors.
+        """
+        pool = QThreadPool()
+        pool.setMaxThreadCount(self.max_workers)
+        runnables = []
+        for index, params in enumerate(requests):
+            runnable = ORSFetchRunnable(self, index, profile, params)
+            runnables.append(runnable)
+            pool.start(runnable)
+        pool.waitForDone()
+
+        responses = [runnable.result for runnable in runnables]
+        errors = [runnable.error for runnable in runnables]
+        return responses, errors
@@ -7,6 +7,10 @@ for Regional scale analysis.
 The task transforms bounding boxes from target CRS to WGS84,
 generates H3 hexagonal cells using h3.h3shape_to_cells() (h3-py v4 API),
 and returns the cell indexes along with geometries in the target CRS.
+
+Cell boundaries are transformed to the target CRS in one batch per chunk and
+the polygons are built directly from the transformed coordinates. Chunks are
+independent, so several tasks can run in parallel.
 """
 
 __copyright__ = "Copyright 2024, Tim Sutton"
@@ -23,7 +27,7 @@ from qgis.core import Qgis, QgsFeedback, QgsTask
 from geest.core.h3_utils import (
     bbox_to_wgs84,
     generate_h3_indexes,
-    transform_wgs84_to_target,
+    h3_cells_to_polygons,
 )
 from geest.utilities import log_message
 
@@ -35,7 +39,7 @@ class GridFromBboxH3Task(QgsTask):
     1. Takes a bounding box chunk in target CRS
     2. Transforms to WGS84 for H3 operations
     3. Uses h3.h3shape_to_cells() to generate hexagonal cell indexes (h3-py v4)
-    4. Converts H3 boundaries to polygon geometries in target CRS
+    4. Converts H3 boundaries to polygon geometries in target CRS in one batch
     5. Returns list of (h3_index, geometry) tuples
 
     Used specifically for Regional scale analysis (H3 Resolution 6).
@@ -105,14 +109,9 @@ class GridFromBboxH3Task(QgsTask):
 
         # Get total count for progress reporting
         total_cells = len(h3_indexes)
-        processed = 0
-
-        # Get study area geometry envelope for quick filtering
-        geom_env = self.geom.GetEnvelope()
-        geom_min_x, geom_max_x, geom_min_y, geom_max_y = geom_env
 
         try:
-            import h3
+            import h3  # noqa F401
         except ImportError:
             log_message(
                 "H3 library not available. Install with: pip install h3",
@@ -120,41 +119,14 @@ class GridFromBboxH3Task(QgsTask):
             )
             return False
 
-        # Process each H3 index
-        for h3_index in h3_indexes:
+        # Transform all boundaries at once, dropping cells outside the study area envelope
+        polygons = h3_cells_to_polygons(h3_indexes, self.target_epsg, self.geom.GetEnvelope())
+
+        for processed, (h3_index, polygon) in enumerate(polygons, start=1):
             # Check for cancellation
             if self.feedback and self.feedback.isCanceled():
                 break
 
-            # Get H3 boundary in WGS84
-            boundary = h3.cell_to_boundary(h3_index)
-
-            # Transform boundary coordinates to target CRS
-            transformed_coords = []
-            for lon, lat in boundary:
-                tx, ty = transform_wgs84_to_target(lon, lat, self.target_epsg)
-                transformed_coords.append((tx, ty))
-
-            # Create OGR polygon
-            ring = ogr.Geometry(ogr.wkbLinearRing)
-            for x, y in transformed_coords:
-                ring.AddPoint(x, y)
-            ring.CloseRings()
-
-            polygon = ogr.Geometry(ogr.wkbPolygon)
-            polygon.AddGeometry(ring)
-
-            # Quick bounding box filter before expensive intersection check
-            poly_env = polygon.GetEnvelope()
-            poly_min_x, poly_max_x, poly_min_y, poly_max_y = poly_env
-
-            # Skip if clearly outside geometry envelope
-            if poly_max_x < geom_min_x or poly_min_x > geom_max_x or poly_max_y < geom_min_y or poly_min_y > geom_max_y:
-                processed += 1
-                if self.feedback:
-                    self.feedback.setProgress(int(processed / total_cells * 100))
-                continue
-
             # Check precise intersection with study area geometry
             if self.geom.Intersects(polygon):
                 # Clip hexagon to study area boundary for exact alignment
@@ -162,11 +134,9 @@ class GridFromBboxH3Task(QgsTask):
                 if clipped_polygon and not clipped_polygon.IsEmpty():
                     self.features_out.append((h3_index, clipped_polygon))
 
-            processed += 1
-
             # Update progress
             if self.feedback:
-                self.feedback.setProgress(int(processed / total_cells * 100))
+                self.feedback.setProgress(int(processed / len(polygons) * 100))
 
         end_time = time.time()
         self.run_time = end_time - start_time
@@ -30,7 +30,9 @@ from qgis.PyQt.QtCore import (
     pyqtSignal,
 )
 
-from geest.core.algorithms import GHSLDownloader, GHSLProcessor
+from geest.core.adaptive_pool import AdaptivePoolSizer
+from geest.core.algorithms import AreaIterator, GHSLDownloader, GHSLProcessor, GridIndexCache, ImplicitGrid
+from geest.core.algorithms.implicit_grid import COVERAGE_FILENAME
 from geest.core.settings import setting
 from geest.core.h3_utils import get_h3_resolution_for_scale
 from geest.utilities import calculate_utm_zone, log_message
@@ -39,6 +41,9 @@ from .grid_chunker_task import GridChunkerTask
 from .grid_from_bbox_task import GridFromBboxTask
 from .grid_from_bbox_h3_task import GridFromBboxH3Task
 
+# Rough peak memory of a grid creation worker in MB, used with adaptive concurrency
+GRID_WORKER_MEMORY_MB = 256.0
+
 
 class QtQueue:
     """Thread-safe queue using Qt primitives.
@@ -901,6 +906,21 @@ class StudyAreaProcessingTask(QgsTask):
         self._writer_flush_token = object()
         self.create_study_area_directory(self.working_dir)
 
+        # Regular grids can be kept implicit (origin, cell size, dimensions and a
+        # coverage raster) instead of writing every cell to study_area_grid
+        self.implicit_grid_mode = bool(int(setting(key="implicit_grid", default=0))) and analysis_scale != "regional"
+        self.area_mask_paths = []
+
+        # Any grid index, area table or grid definition built for the previous study area is now stale
+        GridIndexCache.invalidate(self.gpkg_path)
+        AreaIterator.invalidate(self.gpkg_path)
+        ImplicitGrid.invalidate(self.gpkg_path)
+        for stale_path in (
+            ImplicitGrid.definition_path(self.gpkg_path),
+            os.path.join(os.path.dirname(self.gpkg_path), COVERAGE_FILENAME),
+        ):
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
         if os.path.exists(self.gpkg_path):
             try:
                 os.remove(self.gpkg_path)
@@ -1238,6 +1258,10 @@ class StudyAreaProcessingTask(QgsTask):
             # 2) Create the status tracking table
             self.create_status_tracking_table()
 
+            if self.implicit_grid_mode:
+                # Keep the layer so the GeoPackage schema is unchanged; cells stay implicit
+                self.create_grid_layer_if_not_exists("study_area_grid")
+
             # 2.5) Download and process GHSL data
             self.setProgress(1)  # Trigger UI update for GHSL download
             ghsl_layer_name = self.download_and_process_ghsl()
@@ -1358,6 +1382,8 @@ class StudyAreaProcessingTask(QgsTask):
                 f"Processing complete. Valid: {self.valid_feature_count}, Fixed: {fixed_feature_count}, Invalid: {invalid_feature_count}"
             )
             log_message(f"Areas that could not be processed due to errors: {self.error_count}")
+            if self.implicit_grid_mode:
+                self.create_implicit_grid()
             log_message(f"Total cells generated: {self.total_cells}")
 
             # 4) Create a VRT of all generated raster masks
@@ -1627,6 +1653,31 @@ class StudyAreaProcessingTask(QgsTask):
             log_message(f"XXXXXXXXXXXX   Progress: {progress}% XXXXXXXXXXXXXXXXXXXXXXX")
             return
 
+        if self.implicit_grid_mode:
+            self._process_implicit_grid_geometry(geom, aligned_bbox, normalized_name)
+        else:
+            self._process_polygon_grid_geometry(geom, aligned_bbox, normalized_name, shared_layer)
+        now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.set_status_tracking_table_value(normalized_name, "timestamp_end", now_str)
+        self.set_status_tracking_table_value(
+            normalized_name,
+            "geom_total_duration_secs",
+            time.time() - geometry_start_time,
+        )
+        self.counter += 1
+        progress = int((self.counter / self.parts_count) * 100)
+        self.setProgress(progress)
+        log_message(f"XXXXXXXXXXXX   Progress: {progress}% XXXXXXXXXXXXXXXXXXXXXXX")
+
+    def _process_polygon_grid_geometry(self, geom, aligned_bbox, normalized_name, shared_layer=None):
+        """Write the grid cells, clip polygon and raster mask of a geometry.
+
+        Args:
+            geom: OGR geometry in the target CRS.
+            aligned_bbox: Aligned bounding box (xmin, xmax, ymin, ymax).
+            normalized_name: Name of the area.
+            shared_layer: Optional pre-opened layer for grid writing.
+        """
         # Create the grid
         log_message(f"Creating vector grid for {normalized_name}.")
         start_time = time.time()
@@ -1655,17 +1706,35 @@ class StudyAreaProcessingTask(QgsTask):
         log_message(f"Creating raster mask for {normalized_name}.")
         self.create_raster_mask(geom, aligned_bbox, normalized_name)
         self.set_status_tracking_table_value(normalized_name, "mask_processed", 1)
-        now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.set_status_tracking_table_value(normalized_name, "timestamp_end", now_str)
+
+    def _process_implicit_grid_geometry(self, geom, aligned_bbox, normalized_name):
+        """Write the raster mask and clip polygon of a geometry without grid polygons.
+
+        The mask marks every cell the geometry touches, so it is both the area's
+        contribution to the implicit grid coverage and the source of its clip polygon.
+
+        Args:
+            geom: OGR geometry in the target CRS.
+            aligned_bbox: Aligned bounding box (xmin, xmax, ymin, ymax).
+            normalized_name: Name of the area.
+        """
+        log_message(f"Creating raster mask for {normalized_name} (implicit grid).")
+        mask_path = self.create_raster_mask(geom, aligned_bbox, normalized_name)
+        self.set_status_tracking_table_value(normalized_name, "grid_processed", 1)
+        self.set_status_tracking_table_value(normalized_name, "mask_processed", 1)
+
+        start_time = time.time()
+        if mask_path:
+            self.area_mask_paths.append(mask_path)
+            self.create_clip_polygon_from_mask(geom, mask_path, normalized_name)
+        else:
+            self.save_geometry_to_geopackage("study_area_clip_polygons", geom, normalized_name)
+        self.set_status_tracking_table_value(normalized_name, "clip_geometry_processed", 1)
         self.set_status_tracking_table_value(
             normalized_name,
-            "geom_total_duration_secs",
-            time.time() - geometry_start_time,
+            "clip_geom_creation_duration_secs",
+            time.time() - start_time,
         )
-        self.counter += 1
-        progress = int((self.counter / self.parts_count) * 100)
-        self.setProgress(progress)
-        log_message(f"XXXXXXXXXXXX   Progress: {progress}% XXXXXXXXXXXXXXXXXXXXXXX")
 
     def process_multipart_geometry(self, geom, normalized_name, area_name):
         """Process each part of a multi-part geometry with unified writer thread.
@@ -2185,7 +2254,11 @@ class StudyAreaProcessingTask(QgsTask):
         log_message(f"Valid chunks to process: {valid_chunk_count}")
 
         worker_count = int(setting(key="grid_creation_workers", default=4))
-        worker_count = max(1, min(8, worker_count))
+        if int(setting(key="adaptive_concurrency", default=0)):
+            # Reduce the configured workers when cores are busy or memory is short
+            worker_count = AdaptivePoolSizer().recommended_workers(worker_count, GRID_WORKER_MEMORY_MB)
+        else:
+            worker_count = max(1, min(8, worker_count))
 
         self.feedback.setProgress(0)
 
@@ -2627,6 +2700,58 @@ class StudyAreaProcessingTask(QgsTask):
             if grid_ds:
                 grid_ds = None
 
+    def create_clip_polygon_from_mask(self, geom, mask_path, normalized_name):
+        """Create the clip polygon of an area from its all-touched raster mask.
+
+        The union of the cells the geometry touches is the geometry expanded to
+        the grid cells on its boundary, which is what create_clip_polygon builds
+        from the grid polygons.
+
+        Args:
+            geom: OGR geometry of the area in the target CRS.
+            mask_path: Path of the area's raster mask.
+            normalized_name: Name of the area.
+        """
+        mask_ds = gdal.Open(mask_path, gdal.GA_ReadOnly)
+        mem_ds = ogr.GetDriverByName("MEM").CreateDataSource("clip_cells")
+        try:
+            mem_layer = mem_ds.CreateLayer("cells", self.target_spatial_ref, geom_type=ogr.wkbPolygon)
+            mem_layer.CreateField(ogr.FieldDefn("value", ogr.OFTInteger))
+            band = mask_ds.GetRasterBand(1)
+            # The band is its own mask so only covered cells are polygonized
+            gdal.Polygonize(band, band, mem_layer, 0, [], callback=None)
+            cells = [feature.GetGeometryRef().Clone() for feature in mem_layer]
+            dissolved_geom = self._union_geometries(cells) if cells else None
+            if dissolved_geom is None or dissolved_geom.IsEmpty():
+                log_message(
+                    "Clip polygon result empty; falling back to original geometry.",
+                    level="WARNING",
+                )
+                dissolved_geom = geom.Clone()
+            else:
+                dissolved_geom = dissolved_geom.Union(geom)
+            self.save_geometry_to_geopackage("study_area_clip_polygons", dissolved_geom, normalized_name)
+            log_message(f"Created clip polygon from mask: {normalized_name}")
+        finally:
+            mem_ds = None
+            mask_ds = None
+
+    def create_implicit_grid(self):
+        """Write the implicit grid definition and its coverage raster for the study area."""
+        study_area_dir = os.path.dirname(self.gpkg_path)
+        grid = ImplicitGrid.from_extent(
+            self.transformed_layer_bbox,
+            self.cell_size_m,
+            self.target_spatial_ref.ExportToWkt(),
+        )
+        coverage_path = os.path.join(study_area_dir, COVERAGE_FILENAME)
+        self.total_cells = grid.write_coverage(self.area_mask_paths, coverage_path)
+        grid.save(ImplicitGrid.definition_path(self.gpkg_path))
+        log_message(
+            f"Created implicit grid of {grid.columns} x {grid.rows} cells, "
+            f"{self.total_cells} covered by study areas"
+        )
+
     def _union_geometries(self, geometries):
         """
         Union a list of geometries efficiently using UnionCascaded.
@@ -2814,7 +2939,9 @@ class StudyAreaProcessingTask(QgsTask):
             output_vrt_name: Name for the output VRT file.
         """
         raster_dir = os.path.join(self.working_dir, "study_area")
-        raster_files = glob.glob(os.path.join(raster_dir, "*.tif"))
+        raster_files = [
+            path for path in glob.glob(os.path.join(raster_dir, "*.tif")) if os.path.basename(path) != COVERAGE_FILENAME
+        ]
 
         if not raster_files:
             log_message("No raster masks found to build VRT.")
@@ -19,6 +19,7 @@ from geest.utilities import log_message
 
 from .json_tree_item import JsonTreeItem
 from .workflow_factory import WorkflowFactory
+from .workflow_result_cache import WorkflowResultCache
 
 
 # Utility functions for caching support
@@ -367,7 +368,24 @@ class WorkflowJob(QgsTask):
 
             # Emit the 'started' signal before running the workflow
             self.job_started.emit()
+
+            # Reuse the outputs of a previous run with identical inputs
+            result_cache = None
+            content_hash = None
+            if int(setting(key="reuse_workflow_results", default=1)):
+                result_cache = WorkflowResultCache(self._workflow)
+                if result_cache.is_applicable():
+                    content_hash = result_cache.content_hash()
+                    if result_cache.restore(content_hash):
+                        self.setProgress(100.0)
+                        return True
+                    result_cache.clear()
+                else:
+                    result_cache = None
+
             result = self._workflow.execute()
+            if result and result_cache is not None:
+                result_cache.store(content_hash)
             log_message(
                 f"WorkflowJob {self.description()} attributes.",
                 tag="GeoE3",
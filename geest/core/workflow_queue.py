@@ -2,17 +2,28 @@
 """📦 Workflow Queue module.
 
 This module contains functionality for workflow queue.
+
+Jobs may declare the jobs they depend on. A job is only started once all of
+its dependencies have finished, and among the jobs that are ready the ones on
+the longest remaining chain of estimated work are started first, so long
+running indicators start early and each aggregation starts as soon as its own
+inputs are done.
+
+With the adaptive_concurrency setting the number of concurrent jobs follows
+the CPU load, and jobs are held back while their estimated memory does not
+fit in the free memory (see AdaptivePoolSizer).
 """
 
 from functools import partial
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
 
-from qgis.core import QgsApplication
+from qgis.core import Qgis, QgsApplication, QgsTask
 from qgis.PyQt.QtCore import QMutex, QMutexLocker, QObject, pyqtSignal
 
 from geest.core import setting
 from geest.utilities import log_message
 
+from .adaptive_pool import DEFAULT_WORKFLOW_MEMORY_MB, AdaptivePoolSizer
 from .workflow_job import WorkflowJob
 
 
@@ -42,6 +53,13 @@ class WorkflowQueue(QObject):
         # cannot be because the job queue is full.
         self.job_queue: List[WorkflowJob] = []
         self.active_tasks = {}
+        # Unfinished dependencies of each queued job, and the jobs waiting on each job
+        self._pending_dependencies: Dict[QgsTask, Set[QgsTask]] = {}
+        self._dependents: Dict[QgsTask, List[QgsTask]] = {}
+        self._costs: Dict[QgsTask, float] = {}
+        self._priorities: Dict[QgsTask, float] = {}
+        self._memory_mb: Dict[QgsTask, float] = {}
+        self._pool_sizer: Optional[AdaptivePoolSizer] = None
         # Mutex to protect active_tasks dictionary from concurrent access
         self._active_tasks_mutex = QMutex()
 
@@ -55,15 +73,32 @@ class WorkflowQueue(QObject):
 
         This allows the pool size to be changed dynamically without restarting QGIS.
         If thread_pool_size was set during initialization, that value is used.
-        Otherwise, reads from the 'concurrent_tasks' setting.
+        Otherwise, with the 'adaptive_concurrency' setting enabled the size follows
+        the CPU load, else it is read from the 'concurrent_tasks' setting.
 
         Returns:
             The pool size to use for concurrent tasks.
         """
         if self.thread_pool_size is None:
+            pool_sizer = self._adaptive_pool_sizer()
+            if pool_sizer is not None:
+                return pool_sizer.worker_limit(self.active_queue_size())
             return int(setting(key="concurrent_tasks", default=1))
         return self.thread_pool_size
 
+    def _adaptive_pool_sizer(self) -> Optional[AdaptivePoolSizer]:
+        """
+        The pool sizer used when adaptive concurrency is enabled.
+
+        Returns:
+            The AdaptivePoolSizer, or None if the pool size is fixed.
+        """
+        if self.thread_pool_size is not None or not int(setting(key="adaptive_concurrency", default=0)):
+            return None
+        if self._pool_sizer is None:
+            self._pool_sizer = AdaptivePoolSizer()
+        return self._pool_sizer
+
     def active_queue_size(self) -> int:
         """
         Returns the number of currently active tasks (thread-safe).
@@ -81,11 +116,63 @@ class WorkflowQueue(QObject):
         """
         return len(self.active_tasks)
 
+    def _clear_dependencies(self):
+        """Forget the dependency graph of the queued jobs."""
+        self._pending_dependencies.clear()
+        self._dependents.clear()
+        self._costs.clear()
+        self._priorities.clear()
+        self._memory_mb.clear()
+
+    def _priority(self, job: QgsTask) -> float:
+        """
+        Estimated cost of the longest chain of work starting with a job.
+
+        Args:
+            job: A queued or running job.
+
+        Returns:
+            The job's cost plus the highest priority of the jobs waiting on it.
+        """
+        if job not in self._priorities:
+            dependents = self._dependents.get(job, [])
+            self._priorities[job] = self._costs.get(job, 1.0) + max(
+                (self._priority(dependent) for dependent in dependents), default=0.0
+            )
+        return self._priorities[job]
+
+    def _ready_jobs(self) -> List[QgsTask]:
+        """
+        Queued jobs whose dependencies have all finished, highest priority first.
+
+        Returns:
+            The jobs that can be started now.
+        """
+        ready = [job for job in self.job_queue if not self._pending_dependencies.get(job)]
+        return sorted(ready, key=self._priority, reverse=True)
+
+    def _release_dependents(self, job: QgsTask):
+        """
+        Mark a job as finished for the jobs waiting on it.
+
+        Dependents are released whether the job succeeded or not, matching the
+        phased processing where aggregations ran after failed indicators too.
+
+        Args:
+            job: The job that finished.
+        """
+        for dependent in self._dependents.pop(job, []):
+            self._pending_dependencies.get(dependent, set()).discard(job)
+        self._pending_dependencies.pop(job, None)
+        self._costs.pop(job, None)
+        self._memory_mb.pop(job, None)
+
     def reset(self):
         """
         Resets the queue
         """
         self.job_queue.clear()
+        self._clear_dependencies()
         locker = QMutexLocker(self._active_tasks_mutex)
         self.active_tasks.clear()
         locker = None  # Release lock
@@ -100,6 +187,7 @@ class WorkflowQueue(QObject):
         Best practice: Copy task list while locked, cancel outside lock.
         """
         self.job_queue.clear()
+        self._clear_dependencies()
         self.total_queue_size = 0
         self.total_completed = 0
 
@@ -154,12 +242,31 @@ class WorkflowQueue(QObject):
         # Step 3: Calculate free threads (no locks held)
         pool_size = self.get_effective_pool_size()
         free_threads = pool_size - active_count
-
-        # Step 4: Process jobs (acquire lock only when modifying active_tasks)
-        for _ in range(free_threads):
-            if not self.job_queue:
+        pool_sizer = self._adaptive_pool_sizer()
+
+        # Step 4: Start the ready jobs on the longest chains (acquire lock only when modifying active_tasks)
+        ready_jobs = self._ready_jobs()
+        if not ready_jobs and active_count == 0:
+            # Nothing running can release the waiting jobs, so run them in queue order
+            log_message(
+                "Queued workflow jobs are waiting on jobs that are not queued, ignoring their dependencies.",
+                tag="GeoE3",
+                level=Qgis.Warning,
+            )
+            self._clear_dependencies()
+            ready_jobs = list(self.job_queue)
+        started = 0
+        for job in ready_jobs:
+            if started >= free_threads:
                 break
-            job = self.job_queue.pop(0)
+            memory_mb = self._memory_mb.get(job, DEFAULT_WORKFLOW_MEMORY_MB)
+            if pool_sizer is not None:
+                if not pool_sizer.admit(memory_mb, active_count + started):
+                    # Leave it queued, a lighter ready job may still fit
+                    continue
+                pool_sizer.job_started(memory_mb)
+            started += 1
+            self.job_queue.remove(job)
 
             # Emit signal before acquiring lock
             self.status_message.emit(f"Starting workflow task: {job.description()}")
@@ -195,22 +302,50 @@ class WorkflowQueue(QObject):
         Finalizes a task -- called for both successful and non-successful tasks
         """
         locker = QMutexLocker(self._active_tasks_mutex)
-        if job_name in self.active_tasks:
-            del self.active_tasks[job_name]
+        job = self.active_tasks.pop(job_name, None)
         locker = None  # Release lock
+        if job is not None:
+            self._release_dependents(job)
 
         self.total_completed += 1
 
         self.status_changed.emit()
         self.process_queue()
 
-    def add_job(self, job):
+    def add_job(
+        self,
+        job,
+        dependencies: Optional[Iterable[QgsTask]] = None,
+        cost: float = 1.0,
+        memory_mb: float = DEFAULT_WORKFLOW_MEMORY_MB,
+    ):
         """
         Adds a job to the queue
+
+        Args:
+            job: The job to queue.
+            dependencies: Jobs that must finish before this job starts. Jobs that
+                are not queued or running are treated as finished.
+            cost: Estimated relative run time, used to start the longest chains first.
+            memory_mb: Estimated peak memory, used with adaptive concurrency.
         """
         if job not in self.job_queue:
             # Check if the job is already in the queue
             self.status_message.emit(f"Adding workflow task: {job.description()}")
+            locker = QMutexLocker(self._active_tasks_mutex)
+            active_jobs = list(self.active_tasks.values())
+            locker = None  # Release lock
+            pending = {
+                dependency
+                for dependency in dependencies or []
+                if dependency in self.job_queue or dependency in active_jobs
+            }
+            self._pending_dependencies[job] = pending
+            for dependency in pending:
+                self._dependents.setdefault(dependency, []).append(job)
+            self._costs[job] = cost
+            self._memory_mb[job] = memory_mb
+            self._priorities.clear()
             self.job_queue.append(job)
             self.total_queue_size += 1
         else:
@@ -4,16 +4,46 @@
 This module contains functionality for workflow queue manager.
 """
 
-from qgis.PyQt.QtCore import QObject, pyqtSignal
+import datetime
+from functools import partial
+from threading import Lock
+from typing import Iterable, Optional
+
 from qgis.core import Qgis, QgsProcessingContext, QgsProject, QgsTask
-from typing import Optional
+from qgis.PyQt.QtCore import QObject, pyqtSignal
 
 from geest.utilities import log_message
 
+from .adaptive_pool import estimate_workflow_memory_mb
 from .json_tree_item import JsonTreeItem
 from .workflow_job import WorkflowJob
 from .workflow_queue import WorkflowQueue
 
+# Rough relative run times of workflows that have not run yet, keyed on analysis mode
+DEFAULT_WORKFLOW_COSTS = {
+    "use_multi_buffer_point": 60.0,
+    "use_index_score_with_ookla": 30.0,
+    "use_osm_transport_polyline_per_cell": 20.0,
+    "use_nighttime_lights": 20.0,
+    "use_environmental_hazards": 20.0,
+    "use_classify_polygon_into_classes": 15.0,
+    "use_classify_safety_polygon_into_classes": 15.0,
+    "use_csv_to_point_layer": 15.0,
+    "use_point_per_cell": 15.0,
+    "use_polyline_per_cell": 15.0,
+    "use_polygon_per_cell": 15.0,
+    "use_street_lights": 15.0,
+    "use_single_buffer_point": 10.0,
+    "use_index_score_with_ghsl": 10.0,
+    "use_index_score": 5.0,
+    "use_contextual_index_score": 5.0,
+    "use_eplex_score": 5.0,
+    "factor_aggregation": 3.0,
+    "dimension_aggregation": 3.0,
+    "analysis_aggregation": 3.0,
+}
+DEFAULT_WORKFLOW_COST = 10.0
+
 
 class WorkflowQueueManager(QObject):
     """
@@ -25,6 +55,14 @@ class WorkflowQueueManager(QObject):
     processing_completed = pyqtSignal()
     processing_error = pyqtSignal(str)  # error message as payload
 
+    # Measured run times in seconds, keyed on item guid, shared by all managers
+    _durations = {}
+    # Moving average of the measured run times, keyed on analysis mode
+    _mode_durations = {}
+    _durations_lock = Lock()
+    # Weight of the latest run in the per analysis mode average
+    MODE_DURATION_SMOOTHING = 0.3
+
     def __init__(self, pool_size: Optional[int] = None, parent=None):
         """
         Initialize the WorkflowQueueManager with a thread pool size and a workflow factory.
@@ -68,7 +106,88 @@ class WorkflowQueueManager(QObject):
         log_message("Task added")
         return task
 
-    def add_workflow(self, item: JsonTreeItem, cell_size_m: float, analysis_scale: str) -> None:
+    @staticmethod
+    def _item_duration(item: JsonTreeItem) -> Optional[float]:
+        """
+        Run time of the item's last workflow, from its execution times.
+
+        Args:
+            item: The tree item.
+
+        Returns:
+            The run time in seconds, or None if the item has no complete run recorded.
+        """
+        start = item.attribute("execution_start_time", None)
+        end = item.attribute("execution_end_time", None)
+        if not start or not end:
+            return None
+        try:
+            elapsed = datetime.datetime.fromisoformat(end) - datetime.datetime.fromisoformat(start)
+        except (TypeError, ValueError):
+            return None
+        return max(elapsed.total_seconds(), 0.0)
+
+    def estimate_cost(self, item: JsonTreeItem) -> float:
+        """
+        Estimate the relative run time of an item's workflow.
+
+        The last measured run time of the item is used when known, then the
+        average run time of workflows with the same analysis mode, falling back
+        to a rough cost per analysis mode.
+
+        Args:
+            item: The tree item.
+
+        Returns:
+            The estimated cost, in seconds where a run time is known.
+        """
+        with self._durations_lock:
+            duration = self._durations.get(item.guid)
+        if duration is None:
+            duration = self._item_duration(item)
+        if duration is not None:
+            return duration
+        analysis_mode = item.attribute("analysis_mode", "")
+        with self._durations_lock:
+            duration = self._mode_durations.get(analysis_mode)
+        if duration is not None:
+            return duration
+        return DEFAULT_WORKFLOW_COSTS.get(analysis_mode, DEFAULT_WORKFLOW_COST)
+
+    def _record_duration(self, item: JsonTreeItem) -> None:
+        """
+        Remember the run time of a completed workflow for later cost estimates.
+
+        Args:
+            item: The tree item whose workflow completed.
+        """
+        duration = self._item_duration(item)
+        if duration is None:
+            return
+        analysis_mode = item.attribute("analysis_mode", "")
+        with self._durations_lock:
+            self._durations[item.guid] = duration
+            average = self._mode_durations.get(analysis_mode)
+            if average is not None:
+                smoothing = self.MODE_DURATION_SMOOTHING
+                average = smoothing * duration + (1 - smoothing) * average
+            else:
+                average = duration
+            self._mode_durations[analysis_mode] = average
+        log_message(
+            f"Workflow {item.attribute('id', item.guid)} ({analysis_mode}) ran for "
+            f"{duration:.1f}s, {analysis_mode} average {average:.1f}s",
+            tag="GeoE3",
+            level=Qgis.Info,
+        )
+
+    def add_workflow(
+        self,
+        item: JsonTreeItem,
+        cell_size_m: float,
+        analysis_scale: str,
+        dependencies: Optional[Iterable[QgsTask]] = None,
+    ) -> None:
         """
         Add a task to the WorkflowQueue for QgsProcessingContext using the item provided.
 
@@ -78,10 +197,15 @@ class WorkflowQueueManager(QObject):
             item: A reference to a JsonTreeItem object representing the task.
             cell_size_m: Cell size in meters for raster operations.
             analysis_scale: Analysis scale string to determine the workflow e.g. local, national.
+            dependencies: Queued jobs that must finish before this workflow starts,
+                e.g. the indicator jobs of a factor aggregation.
 
         Returns:
             WorkflowJob: The workflow job that was added to the queue.
         """
+        # Estimate before the workflow is created, as it clears the execution times
+        cost = self.estimate_cost(item)
+        memory_mb = estimate_workflow_memory_mb(item.attribute("analysis_mode", ""))
         # Create a new QgsProcessingContext so we can pass the QgsProject instance
         # to the threads in a thread safe manner
         context = QgsProcessingContext()
@@ -98,7 +222,8 @@ class WorkflowQueueManager(QObject):
             analysis_scale=analysis_scale,
             context=context,
         )
-        self.workflow_queue.add_job(task)
+        task.taskCompleted.connect(partial(self._record_duration, item))
+        self.workflow_queue.add_job(task, dependencies=dependencies, cost=cost, memory_mb=memory_mb)
         log_message(f"Task added: {task.description()}")
         return task
 
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""📦 Workflow Result Cache module.
+
+This module contains a persistent, content addressed cache of indicator
+workflow outputs.
+
+A hash is computed over everything that determines an indicator's output: the
+item's configuration attributes, the size and modification time of every input
+file they reference, the cell size, the analysis scale, the state of
+study_area.gpkg and the plugin settings listed in the workflow's
+cache_settings. After a successful run the hash is written to a manifest next
+to the outputs. When a later run produces the same hash and the recorded
+masked rasters and VRT are still intact on disk, the outputs are reused
+instead of recomputed.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from typing import Optional
+from urllib.parse import unquote
+
+from qgis.core import Qgis
+
+from geest.core.settings import setting
+from geest.utilities import log_message
+
+MANIFEST_FILENAME = "result_manifest.json"
+
+# Bump when workflow outputs change in a way older manifests cannot detect
+MANIFEST_VERSION = 2
+
+# Attributes written by workflows rather than configured by the user
+OUTPUT_ATTRIBUTES = {
+    "result",
+    "result_file",
+    "execution_start_time",
+    "execution_end_time",
+    "error",
+    "error_file",
+}
+
+# Sidecar files that are part of a shapefile's content
+SHAPEFILE_SIDECARS = (".dbf", ".shx", ".prj", ".cpg")
+
+
+class WorkflowResultCache:
+    """
+    Persistent result cache for a single indicator workflow.
+
+    Example usage:
+
+        ```python
+        cache = WorkflowResultCache(workflow)
+        content_hash = cache.content_hash()
+        if not cache.restore(content_hash):
+            workflow.execute()
+            cache.store(content_hash)
+        ```
+    """
+
+    def __init__(self, workflow):
+        """
+        Initialize the cache for a workflow.
+
+        Args:
+            workflow (WorkflowBase): The workflow whose outputs are cached.
+        """
+        self.workflow = workflow
+        self.item = workflow.item
+        self.manifest_path = os.path.join(workflow.workflow_directory, MANIFEST_FILENAME)
+
+    def is_applicable(self) -> bool:
+        """
+        Whether this workflow's outputs can be cached.
+
+        Only indicators are cached: aggregations are cheap and depend on weights
+        and the outputs of other items.
+
+        Returns:
+            bool: True if the workflow is an indicator workflow.
+        """
+        return self.item.isIndicator() and not self.workflow.aggregation
+
+    def _relevant_attributes(self) -> dict:
+        """
+        Return the attributes that determine the workflow output.
+
+        Returns:
+            dict: Attributes without outputs and weights.
+        """
+        excluded = OUTPUT_ATTRIBUTES | {self.workflow.result_key, self.workflow.result_file_key}
+        return {
+            key: value
+            for key, value in self.item.attributesSnapshot().items()
+            if key not in excluded and not key.endswith("_weighting")
+        }
+
+    def _relevant_settings(self) -> dict:
+        """
+        Return the current values of the settings that change the workflow output.
+
+        Returns:
+            dict: Setting key -> value, for the keys in the workflow's cache_settings.
+        """
+        return {key: setting(key=key) for key in getattr(self.workflow, "cache_settings", ())}
+
+    @staticmethod
+    def _file_state(path: str) -> Optional[list]:
+        """
+        Return the size and modification time of a file, or None if it does not exist.
+
+        Args:
+            path (str): The file path.
+
+        Returns:
+            list: [size, mtime_ns] or None.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _input_files(self, value, files: dict) -> None:
+        """
+        Collect the state of every existing file referenced by an attribute value.
+
+        Args:
+            value: Attribute value; strings, lists and dicts are searched.
+            files (dict): Mapping of path to file state to add to.
+        """
+        if isinstance(value, dict):
+            for item in value.values():
+                self._input_files(item, files)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self._input_files(item, files)
+        elif isinstance(value, str) and value:
+            # Layer sources may be url quoted and carry |layername= style options
+            path = unquote(value).split("|")[0]
+            if not os.path.isfile(path):
+                return
+            files[path] = self._file_state(path)
+            base, extension = os.path.splitext(path)
+            if extension.lower() == ".shp":
+                for sidecar in SHAPEFILE_SIDECARS:
+                    state = self._file_state(base + sidecar)
+                    if state is not None:
+                        files[base + sidecar] = state
+
+    def content_hash(self) -> str:
+        """
+        Compute the content hash of the workflow inputs.
+
+        Returns:
+            str: Hex digest identifying the inputs.
+        """
+        attributes = self._relevant_attributes()
+        files = {}
+        self._input_files(attributes, files)
+        payload = {
+            "version": MANIFEST_VERSION,
+            "workflow": type(self.workflow).__name__,
+            "cell_size_m": self.workflow.cell_size_m,
+            "analysis_scale": self.workflow.analysis_scale,
+            "attributes": attributes,
+            "input_files": files,
+            "study_area": self._file_state(self.workflow.gpkg_path),
+            "settings": self._relevant_settings(),
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _read_manifest(self) -> Optional[dict]:
+        """
+        Read the manifest for this workflow.
+
+        Returns:
+            dict: The manifest, or None if it is missing or unreadable.
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def restore(self, content_hash: str) -> bool:
+        """
+        Reuse the previous outputs if they were produced from the same inputs.
+
+        Args:
+            content_hash (str): Hash returned by content_hash.
+
+        Returns:
+            bool: True if the outputs were restored onto the item.
+        """
+        manifest = self._read_manifest()
+        if not manifest or manifest.get("hash") != content_hash:
+            return False
+        outputs = manifest.get("outputs", {})
+        if not outputs:
+            return False
+        for path, state in outputs.items():
+            if self._file_state(path) != state:
+                log_message(f"Cached output {path} changed on disk, recomputing")
+                return False
+        with self.item.atomicAttributeUpdate() as attrs:
+            for key, value in manifest.get("attributes", {}).items():
+                attrs[key] = value
+            attrs["error"] = None
+            attrs["error_file"] = None
+        log_message(
+            f"Reusing cached outputs for {self.workflow.workflow_name} from {self.manifest_path}",
+            tag="GeoE3",
+            level=Qgis.Info,
+        )
+        return True
+
+    def store(self, content_hash: str) -> None:
+        """
+        Write the manifest for the outputs of a successful run.
+
+        Args:
+            content_hash (str): Hash computed before the run started.
+        """
+        attributes = self.item.attributesSnapshot()
+        result_file = attributes.get(self.workflow.result_file_key)
+        if not result_file or not os.path.exists(result_file):
+            return
+        outputs = {result_file: self._file_state(result_file)}
+        pattern = os.path.join(self.workflow.workflow_directory, f"{self.workflow.layer_id}_masked_*.tif")
+        for path in glob.glob(pattern):
+            outputs[path] = self._file_state(path)
+        manifest = {
+            "hash": content_hash,
+            "outputs": outputs,
+            "attributes": {
+                key: attributes.get(key)
+                for key in (
+                    self.workflow.result_key,
+                    self.workflow.result_file_key,
+                    "execution_start_time",
+                    "execution_end_time",
+                )
+            },
+        }
+        temp_path = f"{self.manifest_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            log_message(
+                f"Could not write result manifest {self.manifest_path}: {e}",
+                tag="GeoE3",
+                level=Qgis.Warning,
+            )
+
+    def clear(self) -> None:
+        """Remove the manifest so stale outputs are never reused."""
+        if os.path.exists(self.manifest_path):
+            try:
+                os.remove(self.manifest_path)
+            except OSError as e:
+                log_message(
+                    f"Could not remove result manifest {self.manifest_path}: {e}",
+                    tag="GeoE3",
+                    level=Qgis.Warning,
+                )
@@ -15,7 +15,8 @@ from qgis.core import (
     QgsRasterLayer,
 )
 
-from geest.core import JsonTreeItem
+from geest.core import JsonTreeItem, setting
+from geest.core.algorithms.weighted_raster_aggregator import aggregate_weighted_rasters
 from geest.utilities import log_message
 
 from .workflow_base import WorkflowBase
@@ -81,6 +82,47 @@ class AggregationWorkflowBase(WorkflowBase):
                 tag="GeoE3",
                 level=Qgis.Critical,
             )
+        aggregation_output = os.path.join(self.workflow_directory, f"{self.id}_aggregated_{index}.tif")
+
+        log_message(
+            f"Aggregating {len(input_files)} raster layers to {aggregation_output}",
+            tag="GeoE3",
+            level=Qgis.Info,
+        )
+        backend = setting(key="aggregation_backend", default="numpy")
+        if backend == "numpy":
+            valid_files = {
+                raster_layer.source(): input_files[raster_layer.source()]
+                for raster_layer in raster_layers
+                if raster_layer.source() not in invalid_layers
+            }
+            del raster_layers
+            result_file = aggregate_weighted_rasters(valid_files, aggregation_output, feedback=self.feedback)
+            if result_file is None:
+                return None
+            # Write the output path to the attributes
+            # That will get passed back to the json model
+            self.attributes[self.result_file_key] = aggregation_output
+            return aggregation_output
+
+        return self._aggregate_with_raster_calculator(raster_layers, invalid_layers, input_files, aggregation_output)
+
+    def _aggregate_with_raster_calculator(
+        self, raster_layers: list, invalid_layers: list, input_files: dict, aggregation_output: str
+    ) -> str:
+        """
+        Perform weighted raster aggregation using QgsRasterCalculator.
+
+        This is the legacy aggregation backend, used when the 'aggregation_backend'
+        setting is 'calculator'.
+
+        :param raster_layers: list of QgsRasterLayers to aggregate.
+        :param invalid_layers: list of sources of layers that failed to load.
+        :param input_files: dict of raster file paths to aggregate and their weights.
+        :param aggregation_output: Path to write the aggregated raster to.
+
+        :return: Path to the aggregated raster file.
+        """
         layer_count = len(raster_layers) - len(invalid_layers)
         # Create QgsRasterCalculatorEntries for each raster layer
         entries = []
@@ -121,13 +163,6 @@ class AggregationWorkflowBase(WorkflowBase):
         # Wrap the weighted sum and divide by the sum of weights
         # expression = f"({expression}) / {layer_count}"
 
-        aggregation_output = os.path.join(self.workflow_directory, f"{self.id}_aggregated_{index}.tif")
-
-        log_message(
-            f"Aggregating {len(input_files)} raster layers to {aggregation_output}",
-            tag="GeoE3",
-            level=Qgis.Info,
-        )
         log_message(f"Aggregation Expression: {expression}")
         # Set up the raster calculator
         calc = QgsRasterCalculator(
@@ -64,6 +64,15 @@ class IndexScoreWithOoklaWorkflow(WorkflowBase):
     that have Ookla data are included in the final output.
     """
 
+    # The Ookla download is triggered lazily by the first area processed
+    supports_parallel_areas = False
+    # The Ookla extraction filters tiles on these thresholds
+    cache_settings = WorkflowBase.cache_settings + (
+        "ookla_use_thresholds",
+        "ookla_mobile_threshold",
+        "ookla_fixed_threshold",
+    )
+
     def __init__(
         self,
         item: JsonTreeItem,
@@ -20,6 +20,13 @@ from qgis.PyQt.QtCore import QVariant
 
 from geest.core import JsonTreeItem
 from geest.core.algorithms import NativeNetworkAnalysisProcessingTask
+from geest.core.algorithms.buffer_overlap_scorer import (
+    BufferOverlapScorer,
+    max_buffer_overlap_percent,
+    percentage_band_score,
+)
+from geest.core.algorithms.isochrone_banding import band_burn_layer, distance_band_scores
+from geest.core.settings import setting
 from geest.core.workflows.mappings import MAPPING_REGISTRY
 from geest.utilities import log_message
 
@@ -33,6 +40,8 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
     Results are rasterized and combined into a VRT.
     """
 
+    cache_settings = WorkflowBase.cache_settings + ("raster_isochrone_banding",)
+
     def __init__(
         self,
         item: JsonTreeItem,
@@ -208,8 +217,16 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
             )
             return False
 
-        bands = self._create_bands(isochrones_gpkg_path=isochrones_gpkg, index=index)
-        scored_buffers = self._assign_scores(bands)
+        raster_banding = int(setting(key="raster_isochrone_banding", default=1))
+        if raster_banding and self.scoring_method != "percentage_intersection":
+            # Burn overlapping isochrones largest range first instead of cutting rings
+            isochrones = QgsVectorLayer(f"{isochrones_gpkg}|layername=isochrones", "isochrones", "ogr")
+            if not isochrones.isValid():
+                raise ValueError(f"Failed to load isochrone layer from {isochrones_gpkg}")
+            scored_buffers = band_burn_layer(isochrones, distance_band_scores(self.distances), self.target_crs)
+        else:
+            bands = self._create_bands(isochrones_gpkg_path=isochrones_gpkg, index=index)
+            scored_buffers = self._assign_scores(bands)
 
         if scored_buffers is False:
             log_message("No scored buffers were created.", level=Qgis.Warning)
@@ -393,12 +410,21 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
 
         isochrone_layer_path = os.path.join(self.workflow_directory, f"isochrones_area_{area_index}.gpkg")
 
-        clipped_network_path = self._clip_network_to_area(
-            clip_geometry=clip_geometry,
-            area_index=area_index,
-        )
+        graph_cache_directory = None
+        clipped_network_path = None
+        if int(setting(key="cache_network_graphs", default=1)):
+            # One graph of the whole network is shared by every area and
+            # accessibility workflow; the search cutoff keeps each area local
+            road_network_path = self.road_network_layer_path
+            graph_cache_directory = os.path.join(self.working_directory, "cache")
+        else:
+            clipped_network_path = self._clip_network_to_area(
+                clip_geometry=clip_geometry,
+                area_index=area_index,
+            )
+            road_network_path = clipped_network_path
 
-        if not clipped_network_path:
+        if not road_network_path:
             log_message(
                 f"No road network available for area {area_index}. Skipping network analysis.",
                 level=Qgis.Warning,
@@ -408,15 +434,16 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
         task = NativeNetworkAnalysisProcessingTask(
             point_layer=point_layer,
             distances=self.distances,
-            road_network_path=clipped_network_path,
+            road_network_path=road_network_path,
             output_gpkg_path=isochrone_layer_path,
             target_crs=self.target_crs,
+            graph_cache_directory=graph_cache_directory,
         )
 
         task.progressChanged.connect(lambda progress: self.feedback.setProgress(progress))
         success = task.run()
 
-        if os.path.exists(clipped_network_path):
+        if clipped_network_path and os.path.exists(clipped_network_path):
             try:
                 os.remove(clipped_network_path)
                 log_message(
@@ -543,8 +570,8 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
     ) -> "QgsVectorLayer":
         """Score grid cells based on percentage intersection with buffered features.
 
-        For Regional scale: calculates what percentage of each grid cell
-        is covered by the accessibility buffer and assigns score accordingly.
+        For Regional scale: calculates what percentage of each buffer falls
+        within the grid cell and assigns score accordingly.
 
         Args:
             grid_layer: The grid layer (H3 hexagons).
@@ -555,89 +582,10 @@ class MultiBufferDistancesNativeWorkflow(WorkflowBase):
         """
         log_message("Scoring grid cells based on percentage intersection")
 
-        field_names = [field.name() for field in grid_layer.fields()]
-        if "value" not in field_names:
-            grid_layer.dataProvider().addAttributes([QgsField("value", QVariant.Int)])
-            grid_layer.updateFields()
-
-        grid_layer.startEditing()
-        for grid_feature in grid_layer.getFeatures():
-            grid_geom = grid_feature.geometry()
-            if grid_geom.isNull():
-                continue
-
-            grid_area = grid_geom.area()
-            if grid_area == 0:
-                continue
-
-            max_score = 0
-            max_overlap_percent = 0
-
-            for buffered_feature in buffered_layer.getFeatures():
-                buffered_geom = buffered_feature.geometry()
-                if buffered_geom.isNull():
-                    continue
-
-                intersection = grid_geom.intersection(buffered_geom)
-                if intersection.isNull() or intersection.area() == 0:
-                    continue
-
-                # Calculate % of buffer within hexagon (not % of hexagon covered)
-                buffer_area = buffered_geom.area()
-                if buffer_area > 0:
-                    overlap_percent = (intersection.area() / buffer_area) * 100
-                else:
-                    overlap_percent = 0
-
-                if overlap_percent > max_overlap_percent:
-                    max_overlap_percent = overlap_percent
-
-            # Calculate score based on final max_overlap_percent after all buffers checked
-            # Table ranges: Score 0: 0%, Score 1: 0.01-6%, Score 2: 6.01-12%, etc.
-            sorted_items = sorted(self.percentage_scores.items())
-            log_message(
-                f"DEBUG: Feature {grid_feature.id()} - max_overlap: {max_overlap_percent:.4f}%, thresholds: {sorted_items}",
-                level=Qgis.Info,
-            )
-            max_score = 0
-            for i, (min_pct, score) in enumerate(sorted_items):
-                if score == 0:
-                    if max_overlap_percent == 0:
-                        max_score = 0
-                        log_message(
-                            f"DEBUG: Feature {grid_feature.id()} - Score 0 (overlap=0%)",
-                            level=Qgis.Info,
-                        )
-                elif i == len(sorted_items) - 1:
-                    # Last score: prev_pct < overlap (e.g., 24 < x <= 100, but use >= for float precision)
-                    prev_pct = sorted_items[i - 1][0]
-                    in_range = prev_pct < max_overlap_percent
-                    log_message(
-                        f"DEBUG: Feature {grid_feature.id()} - Checking Score {score}: {prev_pct} < {max_overlap_percent:.4f} = {in_range}",
-                        level=Qgis.Info,
-                    )
-                    if in_range:
-                        max_score = score
-                else:
-                    # Middle scores: prev_pct < overlap <= min_pct
-                    prev_pct = sorted_items[i - 1][0]
-                    in_range = prev_pct < max_overlap_percent <= min_pct
-                    log_message(
-                        f"DEBUG: Feature {grid_feature.id()} - Checking Score {score}: {prev_pct} < {max_overlap_percent:.4f} <= {min_pct} = {in_range}",
-                        level=Qgis.Info,
-                    )
-                    if in_range:
-                        max_score = score
-
-            log_message(
-                f"DEBUG: Feature {grid_feature.id()} - FINAL: max_overlap={max_overlap_percent:.4f}%, assigned_score={max_score}",
-                level=Qgis.Info,
-            )
-
-            grid_feature.setAttribute("value", max_score)
-            grid_layer.updateFeature(grid_feature)
+        def cell_score(cell_area, overlaps):
+            return percentage_band_score(self.percentage_scores, max_buffer_overlap_percent(overlaps))
 
-        grid_layer.commitChanges()
+        BufferOverlapScorer(buffered_layer).score_cells(grid_layer, "value", cell_score)
         return grid_layer
 
     def _create_bands(self, isochrones_gpkg_path, index):
@@ -26,7 +26,9 @@ from qgis.core import (
 from qgis.PyQt.QtCore import QVariant
 
 from geest.core import JsonTreeItem, setting
+from geest.core.algorithms.isochrone_banding import band_burn_layer, distance_band_scores
 from geest.core.ors_client import ORSClient
+from geest.core.ors_fetcher import ORSIsochroneFetcher
 from geest.core.workflows.mappings import MAPPING_REGISTRY
 from geest.utilities import log_message
 
@@ -51,6 +53,8 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
 
     """
 
+    cache_settings = WorkflowBase.cache_settings + ("raster_isochrone_banding",)
+
     def __init__(
         self,
         item: JsonTreeItem,
@@ -165,6 +169,8 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
         # Create the masked API key for logging
         self.masked_api_key = self._mask_api_key(self.api_key)
         self.temp_layers = []  # Store intermediate layers
+        # Burn isochrones onto the grid largest range first instead of overlaying vector bands
+        self.raster_isochrone_banding = bool(int(setting(key="raster_isochrone_banding", default=1)))
         # codeql[python/clear-text-logging-sensitive-data] - API key is properly masked before logging
         log_message(f"Using ORS API key: {self.masked_api_key}")
         log_message("Multi Buffer Distances Workflow initialized")
@@ -216,7 +222,11 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
             index=index,
         )
 
-        scored_buffers = self._assign_scores(buffers)
+        if self.raster_isochrone_banding:
+            # create_multibuffers already scored the isochrones for burning
+            scored_buffers = buffers
+        else:
+            scored_buffers = self._assign_scores(buffers)
 
         if scored_buffers is False:
             log_message("No scored buffers were created.", level=Qgis.Warning)
@@ -255,21 +265,35 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
         log_message(f"Creating buffers for {len(features)} points")
         total_features = len(features)
 
-        # Process features in subsets to handle large datasets
+        # Prepare one request per subset of features, ORS accepts a few locations per request
+        requests = []
         for i in range(0, total_features, self.subset_size):
             subset_features = features[i : i + self.subset_size]  # noqa E203
             subset_layer = self._create_subset_layer(subset_features, point_layer)
-
-            # Make API calls using ORSClient for the subset
-            json = self._fetch_isochrones(subset_layer)
-            layer = self._create_isochrone_layer(json)
+            requests.append(self._isochrone_params(subset_layer))
+
+        # Send the requests concurrently, within the ORS rate limit shared by every
+        # area and workflow using this key, reusing cached responses
+        fetcher = ORSIsochroneFetcher(
+            self.ors_client,
+            cache_directory=os.path.join(self.working_directory, "cache", "ors"),
+            feedback=self.feedback,
+        )
+        responses, errors = fetcher.fetch_all(self.mode, requests)
+        for error in errors:
+            if error is not None:
+                # Any exceptions will be propagated, as with a single request
+                self._record_fetch_error(error)
+                raise error
+        for response in responses:
+            layer = self._create_isochrone_layer(response)
             if layer:
                 self.temp_layers.append(layer)
-            log_message(
-                f"Processed subset {i + 1} to {min(i + self.subset_size, total_features)} of {total_features}",
-                tag="GeoE3",
-                level=Qgis.Info,
-            )
+        log_message(
+            f"Fetched isochrones for {len(requests)} subsets of {total_features} points",
+            tag="GeoE3",
+            level=Qgis.Info,
+        )
 
         # Merge all isochrone layers into one final output
         if self.temp_layers:
@@ -284,6 +308,8 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
                 tag="GeoE3",
                 level=Qgis.Info,
             )
+            if self.raster_isochrone_banding:
+                return band_burn_layer(merged_layer, distance_band_scores(self.distances), self.target_crs)
             log_message(
                 f"Removing overlaps between isochrones for {merged_layer.source()}",
                 tag="GeoE3",
@@ -336,19 +362,18 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
 
         return subset_layer
 
-    def _fetch_isochrones(self, layer: QgsVectorLayer) -> dict:
+    def _isochrone_params(self, layer: QgsVectorLayer) -> dict:
         """
-        Fetch isochrones for the given subset of features using ORSClient.
+        Build the ORS isochrone request parameters for a subset of features.
 
         Args:
             layer (QgsVectorLayer): A QgsVectorLayer containing the subset of features.
 
         Returns:
-            dict: A dict representing the JSON response from the ORS API.
+            dict: The request parameters.
 
         Raises:
             ValueError: If no valid coordinates are found in the layer.
-            Any exceptions raised by ORSClient.make_request will propagate.
         """
         # Prepare the coordinates for the API request
         coordinates = []
@@ -361,43 +386,40 @@ class MultiBufferDistancesORSWorkflow(WorkflowBase):
         if not coordinates:
             raise ValueError("No valid coordinates found in the layer")
 
-        # Prepare parameters for ORS API
-        params = {
+        return {
             "locations": coordinates,
             "range": self.distances,  # Distances or times in the list
             "range_type": self.measurement,
         }
 
-        # Make the request to ORS API using ORSClient
-        # Any exceptions will be propogated
-        try:
-            json = self.ors_client.make_request(self.mode, params)
-        except Exception as e:
-            error_file = os.path.join(self.workflow_directory, "error.txt")
-            if os.path.exists(error_file):
-                os.remove(error_file)
-            # Write the traceback to error.txt in the workflow_directory
-            error_path = os.path.join(self.workflow_directory, "error.txt")
-            with open(error_path, "w") as f:
-                f.write(f"Failed to process {self.workflow_name}: {e}\n")
-                f.write(traceback.format_exc())
+    def _record_fetch_error(self, error: Exception) -> None:
+        """
+        Record a failed ORS request in error.txt and the item attributes.
 
-            log_message(
-                f"Failed to fetch isochrones layer for {self.workflow_name}: {e}",
-                tag="GeoE3",
-                level=Qgis.Critical,
-            )
-            log_message(
-                traceback.format_exc(),
-                tag="GeoE3",
-                level=Qgis.Critical,
-            )
-            self.attributes[self.result_key] = f"{self.workflow_name} Workflow Error"
-            self.attributes[self.result_file_key] = ""
-            self.attributes["error_file"] = error_path
-            self.attributes["error"] = f"Failed to generate isochrones for {self.workflow_name}: {e}"
-            raise
-        return json
+        Args:
+            error (Exception): The exception raised by the request.
+        """
+        error_details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        # Write the traceback to error.txt in the workflow_directory
+        error_path = os.path.join(self.workflow_directory, "error.txt")
+        with open(error_path, "w") as f:
+            f.write(f"Failed to process {self.workflow_name}: {error}\n")
+            f.write(error_details)
+
+        log_message(
+            f"Failed to fetch isochrones layer for {self.workflow_name}: {error}",
+            tag="GeoE3",
+            level=Qgis.Critical,
+        )
+        log_message(
+            error_details,
+            tag="GeoE3",
+            level=Qgis.Critical,
+        )
+        self.attributes[self.result_key] = f"{self.workflow_name} Workflow Error"
+        self.attributes[self.result_file_key] = ""
+        self.attributes["error_file"] = error_path
+        self.attributes["error"] = f"Failed to generate isochrones for {self.workflow_name}: {error}"
 
     def _create_isochrone_layer(self, isochrone_data):
         """
@@ -119,6 +119,7 @@ class OsmTransportPolylinePerCellWorkflow(WorkflowBase):
             output_path,
             self.feedback,
             analysis_scale=self.analysis_scale,
+            implicit_grid=self.implicit_grid,
         )
 
         log_message(
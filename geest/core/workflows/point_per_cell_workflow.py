@@ -30,6 +30,8 @@ class PointPerCellWorkflow(WorkflowBase):
     Concrete implementation of a 'use_point_per_cell' workflow.
     """
 
+    cache_settings = WorkflowBase.cache_settings + ("raster_cell_counting",)
+
     def __init__(
         self,
         item: JsonTreeItem,
@@ -113,9 +115,16 @@ class PointPerCellWorkflow(WorkflowBase):
             tag="GeoE3",
             level=Qgis.Info,
         )
+        # Regular grids are counted, scored and masked directly in raster space
+        raster_output = self._score_features_per_cell(area_features, clip_area, current_bbox, index)
+        if raster_output is not None:
+            return raster_output
+
         # Step 1: Select grid cells that intersect with features
         output_path = os.path.join(self.workflow_directory, f"{self.layer_id}_grid_cells.gpkg")
-        area_grid = select_grid_cells_and_count_features(self.grid_layer, area_features, output_path, self.feedback)
+        area_grid = select_grid_cells_and_count_features(
+            self.grid_layer, area_features, output_path, self.feedback, implicit_grid=self.implicit_grid
+        )
 
         # Step 2: Assign values to grid cells
         grid = assign_values_to_grid(area_grid, self.feedback)
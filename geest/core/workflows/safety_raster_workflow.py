@@ -20,6 +20,7 @@ from qgis.core import (
 )
 
 from geest.core import JsonTreeItem
+from geest.core.algorithms.raster_statistics import RasterStatistics
 from geest.core.jenks import calculate_goodness_of_variance_fit, jenks_natural_breaks
 from geest.utilities import log_message
 
@@ -55,6 +56,7 @@ class SafetyRasterWorkflow(WorkflowBase):
             item, cell_size_m, analysis_scale, feedback, context, working_directory
         )  # ⭐️ Item is a reference - whatever you change in this item will directly update the tree
         self.workflow_name = "use_nighttime_lights"
+        self.valid_count = 0  # Valid pixels in the area last passed to calculate_raster_stats
         layer_name = unquote(self.attributes.get("nighttime_lights_raster", None))
 
         if not layer_name:
@@ -165,67 +167,32 @@ class SafetyRasterWorkflow(WorkflowBase):
 
     def calculate_raster_stats(self, raster_path):
         """
-        Calculate statistics from a QGIS raster layer using NumPy.
+        Calculate statistics of a raster, streaming it block by block.
+
+        The maximum is exact and the quantiles come from a histogram, so memory
+        does not grow with the raster size. Classification uses a uniform sample
+        of the valid values, which holds every value for rasters of up to
+        DEFAULT_SAMPLE_SIZE valid pixels.
 
         Returns:
-            Tuple of (max_value, median, percentile_75, valid_data)
+            Tuple of (max_value, median, percentile_75, valid_data) where valid_data
+            is the sample of valid values.
             Returns (None, None, None, None) if raster cannot be read
         """
-        raster_layer = QgsRasterLayer(raster_path, "Input Raster")
-
-        # Check if the raster layer loaded successfully
-        if not raster_layer.isValid():
-            log_message("Raster layer failed to load", tag="GeoE3", level=1)
-            return None, None, None, None
-
-        provider = raster_layer.dataProvider()
-        extent = raster_layer.extent()
-        width = raster_layer.width()
-        height = raster_layer.height()
-
-        # Fetch the raster data for band 1
-        block = provider.block(1, extent, width, height)
-        byte_array = block.data()  # This returns a QByteArray
-
-        # Determine the correct dtype based on the provider's data type
-        data_type = provider.dataType(1)
-        dtype = None
-        if data_type == 6:  # Float32
-            dtype = np.float32
-        elif data_type == 3:  # Int16
-            dtype = np.int16
-        elif data_type == 2:  # UInt16
-            dtype = np.uint16
-        elif data_type == 5:  # Int32
-            dtype = np.int32
-        elif data_type == 4:  # UInt32
-            dtype = np.uint32
-        elif data_type == 1:  # Byte
-            dtype = np.uint8
-
-        if dtype is None:
-            log_message("Unsupported data type", tag="GeoE3", level=1)
-            return None, None, None, None
-
-        # Convert QByteArray to a numpy array with the correct dtype
-        raster_array = np.frombuffer(byte_array, dtype=dtype).reshape((height, width))
-
-        # Filter out NoData values
-        no_data_value = provider.sourceNoDataValue(1)
-        valid_data = raster_array[raster_array != no_data_value]
-
-        if valid_data.size > 0:
-            # Compute statistics
-            max_value = np.max(valid_data).astype(dtype)
-            median = np.median(valid_data).astype(dtype)
-            percentile_75 = np.percentile(valid_data, 75).astype(dtype)
-
-            return max_value, median, percentile_75, valid_data
-        else:
-            # Handle case with no valid data
+        stats = RasterStatistics.from_raster(raster_path)
+        if stats is None:
             log_message("No valid data in the raster", tag="GeoE3", level=1)
             return None, None, None, None
 
+        self.valid_count = stats.count
+        log_message(
+            f"Raster statistics from {stats.count} valid values "
+            f"({'exact' if stats.exact else 'binned'} quantiles, {len(stats.sample)} sampled)",
+            tag="GeoE3",
+            level=0,
+        )
+        return stats.maximum, stats.quantile(0.5), stats.quantile(0.75), stats.sample
+
     def _build_binary_table(self, max_val: float) -> list:
         """
         Build binary classification table: non-positive vs positive.
@@ -259,7 +226,7 @@ class SafetyRasterWorkflow(WorkflowBase):
         Args:
             max_val: Maximum value in the raster
             median: Median value in the raster
-            valid_data: Array of all valid (non-NoData) raster values
+            valid_data: Array of valid (non-NoData) raster values, or a sample of them
 
         Returns:
             Reclassification table as list of [min, max, class, min, max, class, ...]
@@ -284,7 +251,7 @@ class SafetyRasterWorkflow(WorkflowBase):
 
         log_message(
             f"📊 Computing Jenks Natural Breaks classification (max={max_val:.6f}, "
-            f"median={median:.6f}, n={len(valid_data)})",
+            f"median={median:.6f}, n={len(valid_data)} of {self.valid_count or len(valid_data)})",
             tag="GeoE3",
             level=0,
         )
@@ -298,6 +265,9 @@ class SafetyRasterWorkflow(WorkflowBase):
             # Format: [min₁, max₁, class₁, min₂, max₂, class₂, ...]
             reclass_table = []
 
+            # A sample may miss the largest values, so the last class extends to the raster maximum
+            breaks[-1] = max(breaks[-1], max_val)
+
             # Class 0: From 0 to first break
             reclass_table.extend([0.0, breaks[0], 0])
 
@@ -335,7 +305,7 @@ class SafetyRasterWorkflow(WorkflowBase):
                 f"     - Maximum value: {max_val:.6f}\n"
                 f"     - Median value: {median:.6f}\n"
                 f"     - Unique values: {unique_count}\n"
-                f"     - Total values: {len(valid_data)}\n"
+                f"     - Total values: {self.valid_count or len(valid_data)}\n"
                 f"   This may indicate insufficient data variation for meaningful classification.\n"
                 f"   Please verify your nighttime lights raster has valid data with reasonable variation."
             )
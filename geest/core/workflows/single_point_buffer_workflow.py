@@ -19,6 +19,11 @@ from qgis.core import (
 from qgis.PyQt.QtCore import QVariant
 
 from geest.core import JsonTreeItem
+from geest.core.algorithms.buffer_overlap_scorer import (
+    BufferOverlapScorer,
+    max_buffer_overlap_percent,
+    percentage_band_score,
+)
 from geest.core.workflows.mappings import MAPPING_REGISTRY
 from geest.utilities import log_message
 
@@ -238,8 +243,8 @@ class SinglePointBufferWorkflow(WorkflowBase):
     ) -> "QgsVectorLayer":
         """Score grid cells based on percentage intersection with buffered features.
 
-        For Regional scale: calculates what percentage of each grid cell
-        is covered by the accessibility buffer and assigns score accordingly.
+        For Regional scale: calculates what percentage of each buffer falls
+        within the grid cell and assigns score accordingly.
 
         Args:
             grid_layer: The grid layer (H3 hexagons).
@@ -250,65 +255,10 @@ class SinglePointBufferWorkflow(WorkflowBase):
         """
         log_message("Scoring grid cells based on percentage intersection")
 
-        field_names = [field.name() for field in grid_layer.fields()]
-        if "value" not in field_names:
-            grid_layer.dataProvider().addAttributes([QgsField("value", QVariant.Int)])
-            grid_layer.updateFields()
-
-        grid_layer.startEditing()
-        for grid_feature in grid_layer.getFeatures():
-            grid_geom = grid_feature.geometry()
-            if grid_geom.isNull():
-                continue
-
-            grid_area = grid_geom.area()
-            if grid_area == 0:
-                continue
-
-            max_score = 0
-            max_overlap_percent = 0
-
-            for buffered_feature in buffered_layer.getFeatures():
-                buffered_geom = buffered_feature.geometry()
-                if buffered_geom.isNull():
-                    continue
-
-                intersection = grid_geom.intersection(buffered_geom)
-                if intersection.isNull() or intersection.area() == 0:
-                    continue
-
-                # Calculate % of buffer within hexagon
-                buffer_area = buffered_geom.area()
-                if buffer_area > 0:
-                    overlap_percent = (intersection.area() / buffer_area) * 100
-                else:
-                    overlap_percent = 0
-
-                if overlap_percent > max_overlap_percent:
-                    max_overlap_percent = overlap_percent
-
-            # Calculate score based on final max_overlap_percent after all buffers checked
-            sorted_items = sorted(self.percentage_scores.items())
-            max_score = 0
-            for i, (min_pct, score) in enumerate(sorted_items):
-                if score == 0:
-                    if max_overlap_percent == 0:
-                        max_score = 0
-                elif i == len(sorted_items) - 1:
-                    # Last score: prev_pct < overlap
-                    prev_pct = sorted_items[i - 1][0]
-                    if prev_pct < max_overlap_percent:
-                        max_score = score
-                else:
-                    # Middle scores: prev_pct < overlap <= min_pct
-                    prev_pct = sorted_items[i - 1][0]
-                    if prev_pct < max_overlap_percent <= min_pct:
-                        max_score = score
-
-            grid_feature.setAttribute("value", max_score)
-            grid_layer.updateFeature(grid_feature)
-
-        grid_layer.commitChanges()
+        def cell_score(cell_area, overlaps):
+            return percentage_band_score(self.percentage_scores, max_buffer_overlap_percent(overlaps))
+
+        BufferOverlapScorer(buffered_layer).score_cells(grid_layer, "value", cell_score)
         return grid_layer
 
         return raster_output
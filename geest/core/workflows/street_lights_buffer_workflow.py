@@ -11,14 +11,13 @@ from qgis import processing
 from qgis.core import (
     Qgis,
     QgsFeedback,
-    QgsField,
     QgsGeometry,
     QgsProcessingContext,
     QgsVectorLayer,
 )
-from qgis.PyQt.QtCore import QVariant
 
 from geest.core import JsonTreeItem
+from geest.core.algorithms.buffer_overlap_scorer import BufferOverlapScorer
 from geest.core.algorithms.features_per_cell_processor import select_grid_cells_and_count_features
 from geest.core.workflows.mappings import MAPPING_REGISTRY
 from geest.utilities import log_message
@@ -141,7 +140,9 @@ class StreetLightsBufferWorkflow(WorkflowBase):
         buffered_layer = self._buffer_features(area_features, f"{self.layer_id}_buffered_{index}")
         # Step 2: Select grid cells that intersect with features
         output_path = os.path.join(self.workflow_directory, f"{self.layer_id}_grid_cells.gpkg")
-        area_grid = select_grid_cells_and_count_features(self.grid_layer, area_features, output_path, self.feedback)
+        area_grid = select_grid_cells_and_count_features(
+            self.grid_layer, area_features, output_path, self.feedback, implicit_grid=self.implicit_grid
+        )
 
         # Step 3: Assign scores to the grid layer
         grid_layer = self._score_grid(area_grid, buffered_layer)
@@ -219,60 +220,37 @@ class StreetLightsBufferWorkflow(WorkflowBase):
 
     def _score_grid(self, grid_layer: QgsVectorLayer, buffered_layer: QgsVectorLayer) -> QgsVectorLayer:
         """
-        Assign scores to a grid layer and rasterize it.
+        Assign scores to a grid layer based on intersection with the buffered layer.
 
         Args:
             grid_layer (QgsVectorLayer): The grid layer representing the study area.
             buffered_layer (QgsVectorLayer): Buffered layer to evaluate intersections.
-            index (int): Index for output file naming.
 
         Returns:
-            str: Path to the output raster file.
+            QgsVectorLayer: The grid layer with a "score" field.
         """
         log_message(
             "Assigning scores to grid layer based on intersection with buffered layer",
             tag="GeoE3",
             level=Qgis.Info,
         )
+        thresholds = sorted(self.percentage_scores.items(), reverse=True)
+        intersects_score = self.scores.get("intersects_buffer", 5)
 
-        # Add a new attribute to the grid layer for storing the score
-        grid_layer.startEditing()
-        if not grid_layer.fields().indexFromName("score") >= 0:
-            grid_layer.dataProvider().addAttributes([QgsField("score", QVariant.Int)])
-            grid_layer.updateFields()
-
-        # Assign scores based on intersection with the buffered layer
-        for grid_feature in grid_layer.getFeatures():
-            grid_geom = grid_feature.geometry()
+        def cell_score(cell_area, overlaps):
             max_score = 0
-
-            for buffered_feature in buffered_layer.getFeatures():
-                buffered_geom = buffered_feature.geometry()
-                intersection = grid_geom.intersection(buffered_geom)
-                if intersection.isEmpty():
-                    continue
-
+            for intersection_area, _ in overlaps:
                 if self.scoring_method == "binary":
-                    max_score = max(max_score, self.scores.get("intersects_buffer", 5))
+                    max_score = max(max_score, intersects_score)
                     continue
-
-                overlap_percent = (intersection.area() / grid_geom.area()) * 100
-                log_message(
-                    f"Overlap percentage: {overlap_percent}",
-                    tag="GeoE3",
-                    level=Qgis.Info,
-                )
-
                 # Determine score based on overlap percentage thresholds
                 if self.scoring_method == "percentage_intersection":
-                    for min_pct, score in sorted(self.percentage_scores.items(), reverse=True):
+                    overlap_percent = (intersection_area / cell_area) * 100
+                    for min_pct, score in thresholds:
                         if overlap_percent >= min_pct:
                             max_score = max(max_score, score)
                             break
+            return max_score
 
-            # Update the "score" attribute for the feature
-            grid_feature.setAttribute("score", max_score)
-            grid_layer.updateFeature(grid_feature)
-
-        grid_layer.commitChanges()
+        BufferOverlapScorer(buffered_layer).score_cells(grid_layer, "score", cell_score)
         return grid_layer
@@ -6,10 +6,12 @@ This module contains functionality for workflow base.
 
 import datetime
 import os
+import threading
 import traceback
 from abc import abstractmethod
 from typing import Optional
 
+from osgeo import gdal
 from qgis import processing
 from qgis.core import (
     Qgis,
@@ -24,22 +26,86 @@ from qgis.core import (
     QgsRectangle,
     QgsVectorLayer,
 )
-from qgis.PyQt.QtCore import QObject, QSettings, pyqtSignal
+from qgis.PyQt.QtCore import QMutex, QObject, QRunnable, QSettings, QThread, QThreadPool, pyqtSignal
 
-from geest.core import JsonTreeItem, setting
+from geest.core import JsonTreeItem, gdal_ops, setting
 from geest.core.algorithms import (
     AreaIterator,
     GHSLDownloader,
     GHSLProcessor,
+    ImplicitGrid,
     check_and_reproject_layer,
     combine_rasters_to_vrt,
     geometry_to_memory_layer,
     subset_vector_layer,
 )
+from geest.core.algorithms.raster_cell_counter import count_score_and_mask
+from geest.core.algorithms.rasterize_and_mask import rasterize_and_mask
 from geest.core.constants import GDAL_OUTPUT_DATA_TYPE
 from geest.utilities import log_layer_count, log_message, resources_path
 
 
+class AreaRunnable(QRunnable):
+    """QRunnable for processing a single study area of a workflow.
+
+    Each run gets its own clones of the workflow's features and grid layers
+    and its own QgsProcessingContext, as none of them are thread safe.
+
+    Attributes:
+        workflow: The WorkflowBase instance whose _process_area is called.
+        index: Index of the area in the AreaIterator ordering.
+        result: Masked raster path, None or False after run completes.
+        error: Exception if processing failed.
+        traceback: Formatted traceback if processing failed.
+        skipped: True if the area was not processed because of cancellation.
+    """
+
+    def __init__(self, workflow, index, current_area, clip_area, current_bbox, done_callback=None):
+        """Initialize the area runnable.
+
+        Args:
+            workflow: The WorkflowBase instance to run the area for.
+            index: Index of the area in the AreaIterator ordering.
+            current_area: Current polygon from our study area.
+            clip_area: Current area but expanded to coincide with grid cell boundaries.
+            current_bbox: Bounding box of the above area.
+            done_callback: Optional callable(index) invoked when the area finishes.
+        """
+        super().__init__()
+        self.workflow = workflow
+        self.index = index
+        self.current_area = current_area
+        self.clip_area = clip_area
+        self.current_bbox = current_bbox
+        self.done_callback = done_callback
+        self.result = None
+        self.error = None
+        self.traceback = None
+        self.skipped = False
+        self.setAutoDelete(False)  # We manage lifecycle manually
+
+    def run(self):
+        """Process the area unless the workflow has been canceled."""
+        if self.workflow.feedback.isCanceled():
+            self.skipped = True
+            return
+        try:
+            self.workflow._begin_area_thread()
+            self.result = self.workflow._process_area(
+                index=self.index,
+                current_area=self.current_area,
+                clip_area=self.clip_area,
+                current_bbox=self.current_bbox,
+            )
+        except Exception as e:
+            self.error = e
+            self.traceback = traceback.format_exc()
+        finally:
+            self.workflow._end_area_thread()
+        if self.done_callback:
+            self.done_callback(self.index)
+
+
 class WorkflowBase(QObject):
     """
     Abstract base class for all workflows.
@@ -52,6 +118,11 @@ class WorkflowBase(QObject):
     statusChanged = pyqtSignal(str)
     # Signal emitted when the workflow fails - propagated to the UI as an error notification
     workflowError = pyqtSignal(str)
+    # Set to False in concrete classes whose per-area processing mutates shared state
+    supports_parallel_areas = True
+    # Settings whose values change the outputs, hashed by WorkflowResultCache.
+    # Concrete classes add the settings read by their own processing.
+    cache_settings = ("gdal_backend", "combined_rasterize_mask")
 
     def __init__(
         self,
@@ -77,6 +148,8 @@ class WorkflowBase(QObject):
             ValueError: If working directory is not set or study area geopackage is not found.
         """
         super().__init__()
+        # Per thread clones of features_layer, grid_layer and context used by area workers
+        self._area_state = threading.local()
         log_layer_count()  # For performance tuning, write the number of open layers to a log file
         # we will log the layer count again at then end of the workflow
         self.item = item  # ⭐️ This is a reference - whatever you change in this item will directly update the tree
@@ -114,6 +187,8 @@ class WorkflowBase(QObject):
             "ogr",
         )
         self.grid_layer = QgsVectorLayer(f"{self.gpkg_path}|layername=study_area_grid", "study_area_grid", "ogr")
+        # Set when the study area was created without materialising grid polygons
+        self.implicit_grid = ImplicitGrid.for_study_area(self.gpkg_path)
         self.features_layer = None  # set in concrete class if needed
         self.raster_layer = None  # set in concrete class if needed
         self.target_crs = self.bboxes_layer.crs()
@@ -130,6 +205,9 @@ class WorkflowBase(QObject):
             attrs["execution_end_time"] = None
         self.layer_id = self.attributes.get("id", "").lower().replace(" ", "_")
         self.aggregation = False
+        # Clip polygons of the areas currently being processed, keyed on area index,
+        # so _rasterize can burn and mask in a single pass
+        self._clip_areas = {}
         self.analysis_mode = self.item.attribute("analysis_mode", "")
         self.updateProgress(0.0)
         self.output_filename = self.attributes.get("output_filename", "")
@@ -446,7 +524,9 @@ class WorkflowBase(QObject):
             if self.features_layer and type(self.features_layer) is QgsVectorLayer:
                 self.updateStatus("Reprojecting features layer...")
                 log_message(f"Features layer for {self.workflow_name} is {self.features_layer.source()}")
-                self.features_layer = check_and_reproject_layer(self.features_layer, self.target_crs)
+                self.features_layer = check_and_reproject_layer(
+                    self.features_layer, self.target_crs, os.path.join(self.working_directory, "cache")
+                )
         except Exception as e:
             error_file = os.path.join(self.workflow_directory, "error.txt")
             if os.path.exists(error_file):
@@ -482,75 +562,39 @@ class WorkflowBase(QObject):
 
             try:
                 total_areas = area_iterator.area_count()
-                for index, (current_area, clip_area, current_bbox, progress) in enumerate(area_iterator):
-                    areas_processed += 1
-                    message = f"{self.workflow_name} Processing area {index} with progress {progress:.2f}%"  # noqa E231
-                    self.updateStatus(f"Processing area {index + 1}/{total_areas}")
-                    feedback.pushInfo(message)
-                    log_message(message)
-                    if self.feedback.isCanceled():
-                        log_message(
-                            f"{self.class_name} Processing was canceled by the user.",
-                            tag="GeoE3",
-                            level=Qgis.Warning,
-                        )
-                    raster_output = None
-                    # Step 1: Select features that intersect with the current area
-                    if self.features_layer:  # we are processing a vector input
-                        area_features = self._subset_vector_layer(
-                            current_area,
-                            output_prefix=f"{self.layer_id}_area_features_{index}",
+                area_workers = self._area_worker_count()
+                if area_workers > 1:
+                    log_message(f"{self.workflow_name} processing areas in parallel with {area_workers} workers")
+                    output_rasters, areas_processed = self._process_areas_parallel(
+                        area_iterator, total_areas, area_workers
+                    )
+                else:
+                    for index, (current_area, clip_area, current_bbox, progress) in enumerate(area_iterator):
+                        areas_processed += 1
+                        message = (
+                            f"{self.workflow_name} Processing area {index} with progress {progress:.2f}%"  # noqa E231
                         )
-                        # Some workflows do not take in vector data (a features layer)
-                        # but are not raster based. e.g. index_score_workflow
-                        # Logic below is a check for that
-                        if (
-                            not isinstance(self.features_layer, bool)  # noqa W503
-                            and area_features.featureCount() == 0  # noqa W503
-                        ):
+                        self.updateStatus(f"Processing area {index + 1}/{total_areas}")
+                        feedback.pushInfo(message)
+                        log_message(message)
+                        if self.feedback.isCanceled():
                             log_message(
-                                "No area features ... skipping",
+                                f"{self.workflow_name} Processing was canceled by the user.",
                                 tag="GeoE3",
                                 level=Qgis.Warning,
                             )
-                            continue
-
-                        # Step 2: Process the area features - work happens in concrete class
-                        raster_output = self._process_features_for_area(
-                            current_area=current_area,
-                            clip_area=clip_area,
-                            current_bbox=current_bbox,
-                            area_features=area_features,
-                            index=index,
-                        )
-                    elif not self.aggregation:  # assumes we are processing a raster input
-                        area_raster = self._subset_raster_layer(bbox=current_bbox, index=index)
-                        raster_output = self._process_raster_for_area(
-                            current_area=current_area,
-                            clip_area=clip_area,
-                            current_bbox=current_bbox,
-                            area_raster=area_raster,
+                        masked_layer = self._process_area(
                             index=index,
-                        )
-                    elif self.aggregation:  # we are processing an aggregate
-                        raster_output = self._process_aggregate_for_area(
                             current_area=current_area,
                             clip_area=clip_area,
                             current_bbox=current_bbox,
-                            index=index,
                         )
-
-                    # clip the area by its matching mask layer in study_area geopackage
-                    self.updateStatus(f"Masking area {index + 1}...")
-                    masked_layer = self._mask_raster(
-                        raster_path=raster_output,
-                        area_geometry=clip_area,
-                        index=index,
-                    )
-                    output_rasters.append(masked_layer)
-                    # Note: We don't emit area iterator progress here because it would
-                    # override the sub-task progress in the Task Progress bar.
-                    # The sub-task progress (0-100%) is more useful to the user.
+                        if masked_layer is False:
+                            continue
+                        output_rasters.append(masked_layer)
+                        # Note: We don't emit area iterator progress here because it would
+                        # override the sub-task progress in the Task Progress bar.
+                        # The sub-task progress (0-100%) is more useful to the user.
                 # Combine all area rasters into a VRT
                 self.updateStatus("Combining area rasters...")
                 vrt_filepath = self._combine_rasters_to_vrt(output_rasters)
@@ -610,6 +654,240 @@ class WorkflowBase(QObject):
                 self.workflowError.emit(f"Failed to process {self.workflow_name}: {e}")
                 return False
 
+    def _area_worker_count(self) -> int:
+        """
+        Determine how many areas may be processed concurrently.
+
+        Parallel area processing is opt-in via the 'area_workers' setting and is only
+        used by workflows that declare supports_parallel_areas.
+
+        Returns:
+            The number of area workers to use (1 means sequential processing).
+        """
+        if not self.supports_parallel_areas:
+            return 1
+        area_workers = int(setting(key="area_workers", default=1))
+        return max(1, min(QThread.idealThreadCount(), area_workers))
+
+    @property
+    def features_layer(self):
+        """The features layer, or the calling area worker's own clone of it."""
+        return getattr(self._area_state, "features_layer", self._features_layer)
+
+    @features_layer.setter
+    def features_layer(self, layer):
+        """Set the features layer shared by all areas."""
+        self._features_layer = layer
+
+    @property
+    def grid_layer(self) -> QgsVectorLayer:
+        """The study area grid layer, or the calling area worker's own clone of it."""
+        return getattr(self._area_state, "grid_layer", self._grid_layer)
+
+    @grid_layer.setter
+    def grid_layer(self, layer: QgsVectorLayer):
+        """Set the grid layer shared by all areas."""
+        self._grid_layer = layer
+
+    @property
+    def context(self) -> QgsProcessingContext:
+        """The processing context, or the calling area worker's own context."""
+        return getattr(self._area_state, "context", self._context)
+
+    @context.setter
+    def context(self, context: QgsProcessingContext):
+        """Set the processing context shared by all areas."""
+        self._context = context
+
+    def _begin_area_thread(self):
+        """
+        Give the calling area worker thread its own layers and processing context.
+
+        QgsVectorLayer and QgsProcessingContext are not thread safe, so concurrent
+        areas must not share them. Until _end_area_thread is called, features_layer,
+        grid_layer and context return the clones made here on this thread only.
+        """
+        state = self._area_state
+        features_layer = self._features_layer
+        state.features_layer = features_layer.clone() if isinstance(features_layer, QgsVectorLayer) else features_layer
+        state.grid_layer = self._grid_layer.clone() if self._grid_layer is not None else None
+        context = QgsProcessingContext()
+        if self._context is not None:
+            context.copyThreadSafeSettings(self._context)
+        state.context = context
+
+    def _end_area_thread(self):
+        """Release the layers and processing context made by _begin_area_thread."""
+        self._area_state.__dict__.clear()
+
+    def _process_area(
+        self,
+        index: int,
+        current_area: QgsGeometry,
+        clip_area: QgsGeometry,
+        current_bbox: QgsGeometry,
+    ):
+        """
+        Run subset -> process -> mask for a single area.
+
+        Args:
+            index: Index of the area in the AreaIterator ordering.
+            current_area: Current polygon from our study area.
+            clip_area: Current area but expanded to coincide with grid cell boundaries.
+            current_bbox: Bounding box of the above area.
+
+        Returns:
+            The path to the masked raster ({layer_id}_masked_{index}.tif), None if the
+            area produced no raster, or False if the area should be skipped.
+        """
+        self._clip_areas[index] = clip_area
+        try:
+            return self._process_area_steps(index, current_area, clip_area, current_bbox)
+        finally:
+            self._clip_areas.pop(index, None)
+
+    def _process_area_steps(
+        self,
+        index: int,
+        current_area: QgsGeometry,
+        clip_area: QgsGeometry,
+        current_bbox: QgsGeometry,
+    ):
+        """
+        The subset -> process -> mask steps of _process_area.
+
+        Args:
+            index: Index of the area in the AreaIterator ordering.
+            current_area: Current polygon from our study area.
+            clip_area: Current area but expanded to coincide with grid cell boundaries.
+            current_bbox: Bounding box of the above area.
+
+        Returns:
+            The path to the masked raster, None if the area produced no raster,
+            or False if the area should be skipped.
+        """
+        raster_output = None
+        # Step 1: Select features that intersect with the current area
+        if self.features_layer:  # we are processing a vector input
+            area_features = self._subset_vector_layer(
+                current_area,
+                output_prefix=f"{self.layer_id}_area_features_{index}",
+            )
+            # Some workflows do not take in vector data (a features layer)
+            # but are not raster based. e.g. index_score_workflow
+            # Logic below is a check for that
+            if (
+                not isinstance(self.features_layer, bool)  # noqa W503
+                and area_features.featureCount() == 0  # noqa W503
+            ):
+                log_message(
+                    "No area features ... skipping",
+                    tag="GeoE3",
+                    level=Qgis.Warning,
+                )
+                return False
+
+            # Step 2: Process the area features - work happens in concrete class
+            raster_output = self._process_features_for_area(
+                current_area=current_area,
+                clip_area=clip_area,
+                current_bbox=current_bbox,
+                area_features=area_features,
+                index=index,
+            )
+        elif not self.aggregation:  # assumes we are processing a raster input
+            area_raster = self._subset_raster_layer(bbox=current_bbox, index=index)
+            raster_output = self._process_raster_for_area(
+                current_area=current_area,
+                clip_area=clip_area,
+                current_bbox=current_bbox,
+                area_raster=area_raster,
+                index=index,
+            )
+        elif self.aggregation:  # we are processing an aggregate
+            raster_output = self._process_aggregate_for_area(
+                current_area=current_area,
+                clip_area=clip_area,
+                current_bbox=current_bbox,
+                index=index,
+            )
+
+        # clip the area by its matching mask layer in study_area geopackage
+        self.updateStatus(f"Masking area {index + 1}...")
+        return self._mask_raster(
+            raster_path=raster_output,
+            area_geometry=clip_area,
+            index=index,
+        )
+
+    def _process_areas_parallel(self, area_iterator: AreaIterator, total_areas: int, area_workers: int) -> tuple:
+        """
+        Process areas concurrently using a private QThreadPool.
+
+        A private pool is used rather than the global instance because the
+        QgsTaskManager already runs this workflow on a global pool thread.
+        Results are returned in area index order so the VRT is deterministic
+        regardless of the order in which areas complete.
+
+        Args:
+            area_iterator: The iterator providing the areas to process.
+            total_areas: Total number of areas, used for status messages.
+            area_workers: Maximum number of areas to process at once.
+
+        Returns:
+            Tuple of (ordered list of masked raster paths, number of areas processed).
+
+        Raises:
+            Exception: The first error raised while processing an area.
+        """
+        pool = QThreadPool()
+        pool.setMaxThreadCount(area_workers)
+        progress_lock = QMutex()
+        completed_count = 0
+
+        def _area_done(index: int):
+            """Called from worker threads when an area finishes.
+
+            Args:
+                index: Index of the area that finished.
+            """
+            nonlocal completed_count
+            progress_lock.lock()
+            try:
+                completed_count += 1
+                count = completed_count
+            finally:
+                progress_lock.unlock()
+            self.updateStatus(f"Processed area {count}/{total_areas}")
+
+        runnables = []
+        for index, (current_area, clip_area, current_bbox, _progress) in enumerate(area_iterator):
+            if self.feedback.isCanceled():
+                log_message(
+                    f"{self.workflow_name} Processing was canceled by the user.",
+                    tag="GeoE3",
+                    level=Qgis.Warning,
+                )
+                break
+            runnable = AreaRunnable(self, index, current_area, clip_area, current_bbox, done_callback=_area_done)
+            runnables.append(runnable)
+            pool.start(runnable)
+
+        pool.waitForDone()
+
+        output_rasters = []
+        areas_processed = 0
+        for runnable in sorted(runnables, key=lambda r: r.index):
+            if runnable.error is not None:
+                log_message(runnable.traceback, tag="GeoE3", level=Qgis.Critical)
+                raise runnable.error
+            if runnable.skipped:
+                continue
+            areas_processed += 1
+            if runnable.result is not False:
+                output_rasters.append(runnable.result)
+        return output_rasters, areas_processed
+
     def _create_workflow_directory(self) -> str:
         """
         Creates the directory for this workflow if it doesn't already exist.
@@ -691,6 +969,23 @@ class WorkflowBase(QObject):
             f"{self.layer_id}_clipped_and_reprojected_{index}.tif",
         )
 
+        if gdal_ops.use_gdal_ops():
+            source = self.raster_layer.source() if isinstance(self.raster_layer, QgsRasterLayer) else self.raster_layer
+            warped_path = f"/vsimem/{self.layer_id}_warped_{index}.tif"
+            try:
+                gdal_ops.warp_reproject(
+                    source,
+                    warped_path,
+                    self.target_crs,
+                    self.cell_size_m,
+                    (bbox.xMinimum(), bbox.yMinimum(), bbox.xMaximum(), bbox.yMaximum()),
+                    dst_nodata=-9999,
+                )
+                gdal_ops.fill_nodata(warped_path, reprojected_raster_path, fill_value=0)
+            finally:
+                gdal.Unlink(warped_path)
+            return reprojected_raster_path
+
         params = {
             "INPUT": self.raster_layer,
             "TARGET_CRS": self.target_crs,
@@ -777,6 +1072,43 @@ class WorkflowBase(QObject):
             x_res = self.cell_size_m  # pixel size in X direction
             y_res = self.cell_size_m  # pixel size in Y direction
         bbox = bbox.boundingBox()
+
+        # Burn and mask in one in-memory pass, writing only the final masked tile.
+        # _mask_raster recognises the masked output and passes it through.
+        clip_area = self._clip_areas.get(index)
+        if clip_area is not None and int(setting(key="combined_rasterize_mask", default=1)):
+            masked_path = rasterize_and_mask(
+                input_layer=input_layer,
+                value_field=value_field,
+                mask_geometry=clip_area,
+                extent=bbox,
+                x_res=float(x_res),
+                y_res=float(y_res),
+                crs=self.target_crs,
+                output_path=self._masked_raster_path(index),
+                default_value=default_value,
+                nodata=255,
+            )
+            log_message(f"Rasterized and masked: {masked_path}")
+            return masked_path or ""
+        vector_source = gdal_ops.vector_source(input_layer)
+        if vector_source is not None and gdal_ops.use_gdal_ops():
+            vector_path, layer_name = vector_source
+            gdal_ops.rasterize(
+                vector_path,
+                output_path,
+                value_field,
+                (bbox.xMinimum(), bbox.yMinimum(), bbox.xMaximum(), bbox.yMaximum()),
+                float(x_res),
+                float(y_res),
+                self.target_crs,
+                init_value=default_value,
+                nodata=255,
+                all_touched=True,
+                layer_name=layer_name,
+            )
+            log_message(f"Created raster: {output_path}")
+            return output_path
         # Define rasterization parameters for the temporary layer
         params = {
             "INPUT": input_layer,
@@ -810,6 +1142,60 @@ class WorkflowBase(QObject):
         log_message(f"Created raster: {output_path}")
         return output_path
 
+    def _score_features_per_cell(
+        self,
+        area_features: QgsVectorLayer,
+        clip_area: QgsGeometry,
+        bbox: QgsGeometry,
+        index: int,
+    ) -> Optional[str]:
+        """
+        Count and score features per cell directly in raster space.
+
+        Produces the same 3 (one feature) / 5 (several features) scores as
+        select_grid_cells_and_count_features followed by assign_values_to_grid
+        and _rasterize, without touching the grid polygons.
+
+        Args:
+            area_features (QgsVectorLayer): The area's features in the target CRS.
+            clip_area (QgsGeometry): The area expanded to grid cell boundaries.
+            bbox (QgsGeometry): The grid aligned bounding box of the area.
+            index (int): The index of the area.
+
+        Returns:
+            str: The masked raster path ("" if it could not be created), or None
+            if the grid is not regular or raster counting is disabled and the
+            vector path should be used.
+        """
+        if self.analysis_scale == "regional" or clip_area is None:
+            return None
+        if not int(setting(key="raster_cell_counting", default=1)):
+            return None
+        masked_path = count_score_and_mask(
+            features_layer=area_features,
+            mask_geometry=clip_area,
+            extent=bbox.boundingBox(),
+            cell_size=float(self.cell_size_m),
+            crs=self.target_crs,
+            output_path=self._masked_raster_path(index),
+            default_value=0,
+            nodata=255,
+        )
+        log_message(f"Counted and scored features per cell: {masked_path}")
+        return masked_path or ""
+
+    def _masked_raster_path(self, index: int) -> str:
+        """
+        Return the path of the masked raster for an area.
+
+        Args:
+            index: The index of the area.
+
+        Returns:
+            The path to {layer_id}_masked_{index}.tif in the workflow directory.
+        """
+        return os.path.join(self.workflow_directory, f"{self.layer_id}_masked_{index}.tif")
+
     def _mask_raster(self, raster_path: str, area_geometry: QgsGeometry, index: int) -> Optional[str]:
         """
         Multiply the raster by the area geometry to mask the raster to the area.
@@ -827,8 +1213,10 @@ class WorkflowBase(QObject):
         """
         if not raster_path:
             return None
-        output_name = f"{self.layer_id}_masked_{index}.tif"
-        output_path = os.path.join(self.workflow_directory, output_name)
+        output_path = self._masked_raster_path(index)
+        if os.path.normpath(raster_path) == os.path.normpath(output_path):
+            # Already masked by the combined rasterize and mask pass
+            return output_path
         log_message(
             f"Masking raster {raster_path} for area {index} to {output_path}",
             tag="GeoE3",
@@ -842,6 +1230,17 @@ class WorkflowBase(QObject):
                 level=Qgis.Warning,
             )
             raise QgsProcessingException(f"Raster file not found at {raster_path}")
+        if gdal_ops.use_gdal_ops():
+            gdal_ops.clip_raster_by_mask(
+                raster_path,
+                output_path,
+                area_geometry,
+                self.target_crs,
+                nodata=255,
+                output_type=gdal.GDT_Float32,
+            )
+            log_message(f"Masked raster created: {output_path}")
+            return output_path
         # Convert the geometry to a memory layer in the self.target_crs
         log_message(f"Creating mask layer for area from polygon {index}")
         mask_layer = geometry_to_memory_layer(area_geometry, self.target_crs, f"mask_layer_{index}")
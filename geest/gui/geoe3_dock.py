@@ -243,6 +243,10 @@ class GeoE3Dock(QDockWidget):
             self.road_network_widget.road_network_layer_path_changed.connect(
                 lambda: self.tree_widget.set_road_network_layer_path(self.road_network_widget.road_network_layer_path())
             )
+            # The boundary layer is stored through the tree so pending model saves cannot overwrite it
+            self.road_network_widget.admin_boundary_layer_source_changed.connect(
+                self.tree_widget.set_admin_boundary_layer_source
+            )
             self.open_project_widget.set_working_directory.connect(
                 # Switch to the previous tab when the button is clicked
                 lambda: self.tree_widget.set_working_directory(self.open_project_widget.working_dir)
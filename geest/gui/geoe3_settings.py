@@ -16,7 +16,7 @@ from qgis.PyQt.QtWidgets import QFileDialog
 
 from geest.core.constants import APPLICATION_NAME
 from geest.core.settings import set_setting, setting
-from geest.utilities import get_ui_class, log_message, resources_path
+from geest.utilities import get_ui_class, log_message, refresh_log_settings, resources_path
 
 FORM_CLASS = get_ui_class("geoe3_settings_base.ui")
 
@@ -42,6 +42,9 @@ class GeoE3Settings(FORM_CLASS, QgsOptionsPageWidget):
         cpu_count = QThread.idealThreadCount()
         self.spin_thread_pool_size.setMaximum(cpu_count)
         self.spin_thread_pool_size.setValue(int(setting(key="concurrent_tasks", default=1)))
+        # Number of study areas a single workflow processes concurrently
+        self.spin_area_workers.setMaximum(cpu_count)
+        self.spin_area_workers.setValue(int(setting(key="area_workers", default=1)))
 
         # This provides more verbose logging output
         # and keeps intermediate working files around
@@ -68,6 +71,9 @@ class GeoE3Settings(FORM_CLASS, QgsOptionsPageWidget):
         zero_default = bool(setting(key="default_raster_to_0", default=0))
         self.default_raster_to_0.setChecked(bool(zero_default))
 
+        reuse_workflow_results = int(setting(key="reuse_workflow_results", default=1))
+        self.reuse_workflow_results.setChecked(bool(reuse_workflow_results))
+
         show_layer_on_click = setting(key="show_layer_on_click", default=True)
         self.show_layer_on_click.setChecked(bool(show_layer_on_click))
 
@@ -125,6 +131,7 @@ class GeoE3Settings(FORM_CLASS, QgsOptionsPageWidget):
             key="concurrent_tasks",
             value=self.spin_thread_pool_size.value(),
         )
+        set_setting(key="area_workers", value=self.spin_area_workers.value())
 
         if self.developer_mode_checkbox.isChecked():
             set_setting(key="developer_mode", value=1)
@@ -135,10 +142,12 @@ class GeoE3Settings(FORM_CLASS, QgsOptionsPageWidget):
             set_setting(key="verbose_mode", value=1)
         else:
             set_setting(key="verbose_mode", value=0)
+        refresh_log_settings()
 
         set_setting(key="chunk_size", value=self.chunk_size.value())
         set_setting(key="grid_creation_workers", value=self.grid_creation_workers.value())
         set_setting(key="default_raster_to_0", value=self.default_raster_to_0.isChecked())
+        set_setting(key="reuse_workflow_results", value=int(self.reuse_workflow_results.isChecked()))
         set_setting(key="show_layer_on_click", value=self.show_layer_on_click.isChecked())
         set_setting(key="show_overlay", value=self.show_overlay.isChecked())
         set_setting(key="show_pie_overlay", value=self.show_pie_overlay.isChecked())
@@ -24,6 +24,7 @@ from qgis.PyQt.QtGui import QFont, QPixmap
 from qgis.PyQt.QtWidgets import QApplication, QFileDialog, QMessageBox, QWidget
 
 from geest.core import WorkflowQueueManager
+from geest.core.model_json_writer import ModelJsonWriter
 from geest.core.osm_downloaders.osm_download_type import OSMDownloadType
 from geest.core.tasks import OSMDownloaderTask
 from geest.gui.widgets import CustomBannerLabel
@@ -50,6 +51,7 @@ class RoadNetworkPanel(FORM_CLASS, QWidget):
     switch_to_previous_tab = pyqtSignal()  # Signal to notify the parent to switch tabs
 
     road_network_layer_path_changed = pyqtSignal(str)
+    admin_boundary_layer_source_changed = pyqtSignal(str)
 
     def __init__(self):
         """🏗️ Initialize the instance."""
@@ -128,6 +130,8 @@ class RoadNetworkPanel(FORM_CLASS, QWidget):
         """Restore reference layer from saved path in model.json."""
         if not self.working_directory:
             return
+        # Write any pending tree save first so we do not read a stale model.json
+        ModelJsonWriter.flush_all()
         model_path = os.path.join(self.working_directory, "model.json")
         if not os.path.exists(model_path):
             return
@@ -693,19 +697,8 @@ class RoadNetworkPanel(FORM_CLASS, QWidget):
         self._reference_layer = layer
         log_message(f"Loaded reference layer: {file_path}", level=Qgis.Info)
 
-        # Save to model.json
-        if self.working_directory:
-            model_path = os.path.join(self.working_directory, "model.json")
-            if os.path.exists(model_path):
-                try:
-                    with open(model_path, "r") as f:
-                        model = json.load(f)
-                    model["admin_boundary_layer_source"] = layer.source()
-                    with open(model_path, "w") as f:
-                        json.dump(model, f, indent=2)
-                    log_message("Saved reference layer path to model.json", level=Qgis.Info)
-                except Exception as e:
-                    log_message(f"Error saving reference layer to model.json: {e}", level=Qgis.Warning)
+        # Saved to model.json by the tree, through its debounced writer
+        self.admin_boundary_layer_source_changed.emit(layer.source())
 
     def disable_widgets(self):
         """Disable all widgets in the panel."""
@@ -56,6 +56,7 @@ from geest.core.algorithms import (
     SubnationalAggregationProcessingTask,
     WEEByPopulationScoreProcessingTask,
 )
+from geest.core.model_json_writer import ModelJsonWriter
 from geest.core.reports import StudyAreaReport
 from geest.core.tasks import AnalysisReportTask
 from geest.core.settings import set_setting, setting
@@ -195,6 +196,8 @@ class TreePanel(QWidget):
         self.model = JsonTreeModel(self.json_data)
         self.active_model = "default"  # or "promotion"
         self.treeView.setModel(self.model)  # Simple model where we allow single childred
+        # Coalesces the save requests below and writes model.json off the UI thread
+        self.model_json_writer = ModelJsonWriter(self.model.to_json, parent=self)
 
         # Connect signals to track changes in the model and save automatically
         self.model.dataChanged.connect(self.save_json_to_working_directory)
@@ -306,10 +309,12 @@ class TreePanel(QWidget):
         self.setLayout(layout)
 
         # Connect the working directory changed signal to the slot
-        # Workflows need to be run in batches: first indicators, then factors, then dimensions
-        # to prevent race conditions
+        # Workflows depend on each other: a factor needs its indicators, a dimension its factors
+        # and so on. They are queued together with these dependencies, or in batches when
+        # workflow_dag_scheduling is off, to prevent race conditions
         self.workflow_queue = []
         self.workflow_scope_item = None
+        self._queued_jobs = {}  # item guid -> queued WorkflowJob for the current run
         self.queue_manager.processing_completed.connect(self.run_next_workflow_queue)
         self.queue_manager.processing_error.connect(self.on_processing_error)
 
@@ -455,6 +460,8 @@ class TreePanel(QWidget):
             tag="GeoE3",
             level=Qgis.Info,
         )
+        # Write pending changes to the previous working directory before switching
+        self.flush_json_to_working_directory()
         self.working_directory = new_directory
         model_path = os.path.join(new_directory, "model.json")
 
@@ -554,6 +561,22 @@ class TreePanel(QWidget):
         else:
             log_message("No road network layer path provided.")
 
+    def set_admin_boundary_layer_source(self, admin_boundary_layer_source: str) -> None:
+        """Set the administrative boundary layer source in the analysis item.
+
+        Args:
+            admin_boundary_layer_source: The source of the boundary layer.
+        """
+        if admin_boundary_layer_source:
+            log_message(f"Setting admin_boundary_layer_source in model to {admin_boundary_layer_source}")
+            analysis_item = self.model.get_analysis_item()
+            if analysis_item:
+                try:
+                    analysis_item.setAttribute("admin_boundary_layer_source", admin_boundary_layer_source)
+                    self.save_json_to_working_directory()
+                except Exception as e:
+                    log_message(f"Error setting admin boundary layer source: {str(e)}", level=Qgis.Critical)
+
     def qgis_project_path(self) -> Optional[str]:
         """Get the associated QGIS project path from the analysis item.
 
@@ -600,22 +623,23 @@ class TreePanel(QWidget):
 
     @pyqtSlot()
     def save_json_to_working_directory(self):
-        """Automatically save the current JSON model to the working directory."""
+        """Automatically save the current JSON model to the working directory.
+
+        The save is debounced and written in the background, call
+        flush_json_to_working_directory before reading model.json back.
+        """
         if not self.working_directory:
             log_message(
                 "No working directory set, cannot save JSON.",
                 tag="GeoE3",
                 level=Qgis.Warning,
             )
-        try:
-            json_data = self.model.to_json()
+            return
+        self.model_json_writer.schedule(os.path.join(self.working_directory, "model.json"))
 
-            save_path = os.path.join(self.working_directory, "model.json")
-            with open(save_path, "w") as f:
-                json.dump(json_data, f, indent=4)
-            log_message(f"Saved JSON model to {save_path}")
-        except Exception as e:
-            log_message(f"Error saving JSON: {str(e)}", level=Qgis.Critical)
+    def flush_json_to_working_directory(self):
+        """Write any pending save of the JSON model and wait until it is on disk."""
+        self.model_json_writer.flush()
 
     def load_json(self):
         """Load the JSON data from the file."""
@@ -637,6 +661,7 @@ class TreePanel(QWidget):
             )
             return
 
+        self.flush_json_to_working_directory()
         model_path = os.path.join(self.working_directory, "model.json")
         if not os.path.exists(model_path):
             log_message(
@@ -995,6 +1020,7 @@ class TreePanel(QWidget):
         self.overall_progress_bar.setFormat("Generating analysis report...")
 
         # Start report generation in background
+        self.flush_json_to_working_directory()
         model_path = os.path.join(self.working_directory, "model.json")
         self.analysis_report_task = AnalysisReportTask(self.working_directory, model_path)
         self.analysis_report_task.taskCompleted.connect(self.on_analysis_report_completed)
@@ -1770,6 +1796,27 @@ class TreePanel(QWidget):
         log_message(f"GHSL layer path: {ghsl_layer_path}")
         return ghsl_layer_path
 
+    def _queued_descendant_jobs(self, item):
+        """Find the queued jobs an aggregation of the item has to wait for.
+
+        These are the jobs of its nearest queued descendants: its children, or
+        their children where a child is not being run.
+
+        Args:
+            item: The factor, dimension or analysis item.
+
+        Returns:
+            list: The queued WorkflowJobs.
+        """
+        jobs = []
+        for child in item.childItems:
+            job = self._queued_jobs.get(child.guid)
+            if job is not None:
+                jobs.append(job)
+            else:
+                jobs.extend(self._queued_descendant_jobs(child))
+        return jobs
+
     def queue_workflow_task(self, item, role):
         """Queue a workflow task based on the role of the item.
 
@@ -1779,6 +1826,9 @@ class TreePanel(QWidget):
         Args:
             item: The tree item to queue workflow for.
             role: The role of the item (indicator, factor, dimension, analysis).
+
+        Returns:
+            WorkflowJob: The queued job, or None if the item was not queued.
         """
         task = None
 
@@ -1799,23 +1849,29 @@ class TreePanel(QWidget):
                 is_valid, error_msg = validate_network_layer(road_network_path, expected_crs)
                 if not is_valid:
                     self.show_validation_error("Road Network Issue", error_msg)
-                    return
+                    return None
         attributes["road_network_layer_path"] = road_network_path
 
         # Include the GHSL layer in the attributes by default
         attributes["ghsl_layer_path"] = self.ghsl_layer_path()
 
         if attributes.get("result_file", None) and self.run_only_incomplete:
-            return
+            return None
         if role == item.role and role == "factor":
             attributes["analysis_mode"] = "factor_aggregation"
         if role == item.role and role == "dimension":
             attributes["analysis_mode"] = "dimension_aggregation"
         if role == item.role and role == "analysis":
             attributes["analysis_mode"] = "analysis_aggregation"
-        task = self.queue_manager.add_workflow(item, self.cell_size_m(), self.analysis_scale())
+        task = self.queue_manager.add_workflow(
+            item,
+            self.cell_size_m(),
+            self.analysis_scale(),
+            dependencies=self._queued_descendant_jobs(item),
+        )
         if task is None:
-            return
+            return None
+        self._queued_jobs[item.guid] = task
 
         self.hide_validation_warning()
 
@@ -1828,6 +1884,7 @@ class TreePanel(QWidget):
         task.progressChanged.connect(self.task_progress_updated)
         # Hook up the status message signal to the status label
         task.status_message.connect(self.task_status_updated)
+        return task
 
     def run_item(self, item, shift_pressed):
         """Run the item and the ones below it.
@@ -2235,10 +2292,17 @@ class TreePanel(QWidget):
             self.help_button.setVisible(True)
             self.project_button.setVisible(True)
             self.workflow_scope_item = None
+            self._queued_jobs = {}
             return
-        # pop the first item from the queue
-        next_workflow = self.workflow_queue.pop(0)
-        self.start_workflows(workflow_type=next_workflow)
+        self._queued_jobs = {}
+        if int(setting(key="workflow_dag_scheduling", default=1)):
+            # Queue every group at once, each aggregation waits only on its own children
+            next_workflows, self.workflow_queue = self.workflow_queue, []
+        else:
+            # pop the first item from the queue
+            next_workflows = [self.workflow_queue.pop(0)]
+        for next_workflow in next_workflows:
+            self.start_workflows(workflow_type=next_workflow)
 
         debug_env = int(os.getenv("GEOE3_DEBUG") or os.getenv("GEEST_DEBUG", 0))
         if debug_env:
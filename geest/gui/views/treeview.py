@@ -634,7 +634,7 @@ class JsonTreeModel(QAbstractItemModel):
         """
         parent = item.parent()
         if parent:
-            parent.childItems.remove(item)
+            parent.removeChild(item)
         self.layoutChanged.emit()
 
     def rowCount(self, parent=QModelIndex()):
@@ -669,7 +669,7 @@ class JsonTreeModel(QAbstractItemModel):
 
     def itemIndex(self, item: JsonTreeItem):
         """
-        Searches for the item and returns its QModelIndex.
+        Returns the QModelIndex of an item.
 
         Args:
             item (JsonTreeItem): The JsonTreeItem to search for.
@@ -677,11 +677,14 @@ class JsonTreeModel(QAbstractItemModel):
         Returns:
             QModelIndex: The QModelIndex of the item with the given UUID, or an invalid QModelIndex if not found.
         """
-        return self._findIndexByGuid(self.rootItem, item.guid)
+        return self.guidIndex(item.guid)
 
     def guidIndex(self, guid):
         """
-        Searches for the item with the given guid and returns its QModelIndex.
+        Returns the QModelIndex of the item with the given guid.
+
+        Items are found through the guid index of the tree, so this takes
+        constant time regardless of the size of the model.
 
         Args:
             guid (str): The guid of the item to search for.
@@ -689,33 +692,10 @@ class JsonTreeModel(QAbstractItemModel):
         Returns:
             QModelIndex: The QModelIndex of the item with the given guid, or an invalid QModelIndex if not found.
         """
-        return self._findIndexByGuid(self.rootItem, guid)
-
-    def _findIndexByGuid(self, parent_item, target_guid, parent_index=QModelIndex()):
-        """
-        Recursively searches for the target guid within the children of the given parent item.
-
-        Args:
-            parent_item (JsonTreeItem): The parent item to start searching from.
-            target_guid (str): The GUID of the item to search for.
-            parent_index (QModelIndex): The QModelIndex of the parent item.
-
-        Returns:
-            QModelIndex: The QModelIndex of the target item, or an invalid QModelIndex if not found.
-        """
-        for row in range(parent_item.childCount()):
-            child_item = parent_item.child(row)
-
-            # If the item's UUID matches, return its QModelIndex
-            if child_item.guid == target_guid:
-                return self.createIndex(row, 0, child_item)
-
-            # Recursively search children
-            child_index = self._findIndexByGuid(child_item, target_guid, self.createIndex(row, 0, parent_item))
-            if child_index.isValid():
-                return child_index
-
-        return QModelIndex()  # Return invalid QModelIndex if not found
+        item = self.rootItem.getItemByGuid(guid)
+        if item is None or item is self.rootItem:
+            return QModelIndex()
+        return self.createIndex(item.row(), 0, item)
 
     def index(self, row, column, parent=QModelIndex()):
         """
@@ -799,7 +779,7 @@ class JsonTreeModel(QAbstractItemModel):
             parent: The parent index.
         """
         parentItem = self.rootItem if not parent.isValid() else parent.internalPointer()
-        parentItem.childItems.pop(row)
+        parentItem.removeChild(parentItem.child(row))
         self.layoutChanged.emit()
 
 
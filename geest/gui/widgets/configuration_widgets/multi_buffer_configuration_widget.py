@@ -12,6 +12,7 @@ from qgis.core import Qgis
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtWidgets import QGroupBox, QHBoxLayout, QLabel, QLineEdit, QRadioButton
 
+from geest.core.model_json_writer import ModelJsonWriter
 from geest.core.settings import setting
 from geest.core.workflows.mappings import MAPPING_REGISTRY
 from geest.utilities import log_message
@@ -39,6 +40,8 @@ class MultiBufferConfigurationWidget(BaseConfigurationWidget):
             # Get working directory and model path
             working_dir = setting("last_working_directory", "")
             model_path = os.path.join(working_dir, "model.json")
+            # Write any pending tree save first so we do not read a stale model.json
+            ModelJsonWriter.flush_all()
 
             # Get factor ID from attributes (injected by FactorConfigurationWidget)
             # Indicators have their own ID, but we need the parent factor's ID.
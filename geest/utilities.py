@@ -18,12 +18,15 @@ __revision__ = "$Format:%H$"
 # (at your option) any later version.
 # ---------------------------------------------------------------------
 
-import inspect
+import atexit
 import logging
+import logging.handlers
 import os
 import platform
+import queue
 import re
 import subprocess  # nosec B404
+import sys
 import tempfile
 from datetime import datetime
 
@@ -380,25 +383,104 @@ def get_ui_class(ui_file: str):
     return uic.loadUiType(ui_file_path)[0]
 
 
+# Cached verbose_mode setting so log_message does not read QSettings on every call
+_verbose_mode = None
+# Root logger handler and queue listener installed by start_file_logging
+_log_handler = None
+_log_listener = None
+
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+
+def refresh_log_settings() -> bool:
+    """
+    Re-read the verbose_mode setting used by log_message.
+
+    log_message caches the verbosity so that calls in hot loops cost next to
+    nothing when verbose mode is off. Call this after changing verbose_mode.
+
+    Returns:
+        bool: The current verbose mode.
+    """
+    global _verbose_mode
+    value = setting(key="verbose_mode", default=0)
+    try:
+        _verbose_mode = bool(int(value))
+    except (TypeError, ValueError):
+        _verbose_mode = str(value).lower() == "true"
+    return _verbose_mode
+
+
+def start_file_logging(log_file_path: str) -> None:
+    """
+    Send log_message output to a log file.
+
+    When the async_logging setting is enabled (the default) records are put on
+    a queue by the calling thread and written to disk by a background
+    QueueListener, so workflows never block on file IO.
+
+    Args:
+        log_file_path (str): Path of the log file to append to.
+    """
+    global _log_handler, _log_listener
+    stop_file_logging()
+    file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    if setting(key="async_logging", default=True) in (True, "true", 1, "1"):
+        log_queue = queue.SimpleQueue()
+        _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _log_listener.start()
+        _log_handler = logging.handlers.QueueHandler(log_queue)
+    else:
+        _log_handler = file_handler
+    root_logger = logging.getLogger()
+    root_logger.addHandler(_log_handler)
+    root_logger.setLevel(logging.DEBUG)
+
+
+def stop_file_logging() -> None:
+    """
+    Flush and detach the handler installed by start_file_logging.
+    """
+    global _log_handler, _log_listener
+    if _log_handler is not None:
+        logging.getLogger().removeHandler(_log_handler)
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+    elif _log_handler is not None:
+        _log_handler.close()
+    _log_handler = None
+    _log_listener = None
+
+
+atexit.register(stop_file_logging)
+
+
 def log_message(message: str, level: int = Qgis.Info, tag: str = "GeoE3", force: bool = False) -> None:
     """
     Logs a message to both QgsMessageLog and a text file,
     including the caller's class or module name and line number.
 
+    The verbosity check uses a cached setting (see refresh_log_settings) and the
+    caller is only looked up once the message is known to be emitted.
+
     Args:
         message (str): The message to log.
         level (int): The logging level (Qgis.Info, Qgis.Warning, Qgis.Critical).
         tag (str): The tag for the message.
         force (bool): If True, log the message even if verbose_mode is off.
     """
-    verbose_mode = setting(key="verbose_mode", default=0)
+    verbose_mode = _verbose_mode
+    if verbose_mode is None:
+        verbose_mode = refresh_log_settings()
     if not verbose_mode and not force and level != Qgis.Critical:
         return
     # Retrieve caller information
-    caller_frame = inspect.stack()[1]
-    caller_module = inspect.getmodule(caller_frame[0])
-    caller_name = caller_module.__name__ if caller_module else "Unknown"
-    line_number = caller_frame.lineno
+    caller_frame = sys._getframe(1)
+    caller_name = caller_frame.f_globals.get("__name__", "Unknown")
+    line_number = caller_frame.f_lineno
 
     # Combine caller information with message
     full_message = f"[{caller_name}: {line_number}] {message}"
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark the NumPy aggregation backend against QgsRasterCalculator.
+
+Usage (from the repository root, in an environment with QGIS available):
+
+    python scripts/benchmarks/benchmark_aggregation.py [size] [inputs]
+
+Synthetic Float32 rasters of size x size pixels are written to a temporary
+folder with a band of nodata along the top rows, then aggregated with both
+backends. The timings and the maximum absolute difference are printed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from osgeo import gdal, osr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from qgis.analysis import QgsRasterCalculator, QgsRasterCalculatorEntry  # noqa: E402
+from qgis.core import QgsApplication, QgsRasterLayer  # noqa: E402
+
+from geest.core.algorithms.weighted_raster_aggregator import aggregate_weighted_rasters  # noqa: E402
+
+
+def write_raster(path, size, seed):
+    """Write a synthetic 0-5 Float32 raster with nodata=255."""
+    rng = np.random.default_rng(seed)
+    data = rng.integers(0, 6, size=(size, size)).astype(np.float32)
+    data[: size // 20, :] = 255
+    dataset = gdal.GetDriverByName("GTiff").Create(path, size, size, 1, gdal.GDT_Float32)
+    dataset.SetGeoTransform((500000.0, 100.0, 0.0, 1000000.0, 0.0, -100.0))
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(32633)
+    dataset.SetProjection(srs.ExportToWkt())
+    band = dataset.GetRasterBand(1)
+    band.SetNoDataValue(255)
+    band.WriteArray(data)
+    dataset = None
+
+
+def run_calculator(input_files, output_path):
+    """Aggregate with QgsRasterCalculator the way AggregationWorkflowBase does."""
+    layers = [QgsRasterLayer(path, f"raster_{i}") for i, path in enumerate(input_files)]
+    entries = []
+    terms = []
+    for i, layer in enumerate(layers):
+        entry = QgsRasterCalculatorEntry()
+        entry.ref = f"layer_{i + 1}@1"
+        entry.raster = layer
+        entry.bandNumber = 1
+        entries.append(entry)
+        terms.append(f"({input_files[layer.source()]} * layer_{i + 1}@1)")
+    calc = QgsRasterCalculator(
+        " + ".join(terms),
+        output_path,
+        "GTiff",
+        layers[0].extent(),
+        layers[0].width(),
+        layers[0].height(),
+        entries,
+    )
+    calc.processCalculation()
+
+
+def read(path):
+    """Read a raster band as a masked array."""
+    dataset = gdal.Open(path)
+    band = dataset.GetRasterBand(1)
+    data = band.ReadAsArray().astype(np.float64)
+    return np.ma.masked_equal(data, band.GetNoDataValue())
+
+
+def main():
+    """Run the benchmark."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    inputs = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    working_directory = tempfile.mkdtemp()
+    try:
+        input_files = {}
+        for i in range(inputs):
+            path = os.path.join(working_directory, f"input_masked_{i}.tif")
+            write_raster(path, size, seed=i)
+            input_files[path] = 1.0 / inputs
+
+        calculator_output = os.path.join(working_directory, "calculator.tif")
+        start = time.perf_counter()
+        run_calculator(input_files, calculator_output)
+        calculator_time = time.perf_counter() - start
+
+        numpy_output = os.path.join(working_directory, "numpy.tif")
+        start = time.perf_counter()
+        aggregate_weighted_rasters(input_files, numpy_output)
+        numpy_time = time.perf_counter() - start
+
+        difference = np.abs(read(calculator_output) - read(numpy_output)).max()
+        print(f"{inputs} inputs of {size}x{size} pixels")
+        print(f"QgsRasterCalculator: {calculator_time:.2f} s")
+        print(f"NumPy aggregator:    {numpy_time:.2f} s ({calculator_time / numpy_time:.1f}x)")
+        print(f"Max absolute difference: {difference}")
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+        app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark per-area latency of geest.core.gdal_ops against processing.run.
+
+Usage (from the repository root, in an environment with QGIS available):
+
+    python scripts/benchmarks/benchmark_gdal_ops.py [areas] [size]
+
+A synthetic source raster of size x size pixels is written to a temporary
+folder and split into a row of square areas. For each area the hot path
+sequence of the raster workflows (warp and fill nodata, clip to the area,
+raster calculator) runs once through processing.run and once through
+gdal_ops. The mean latency per area for each backend is printed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from osgeo import gdal, osr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from qgis import processing  # noqa: E402
+from qgis.core import (  # noqa: E402
+    QgsApplication,
+    QgsCoordinateReferenceSystem,
+    QgsGeometry,
+    QgsProcessingFeedback,
+    QgsRectangle,
+)
+
+from geest.core import gdal_ops  # noqa: E402
+from geest.core.algorithms import geometry_to_memory_layer  # noqa: E402
+
+PIXEL_SIZE = 100.0
+ORIGIN = (500000.0, 1000000.0)
+
+
+def write_raster(path, size):
+    """Write a synthetic Float32 raster with nodata=-9999 holes."""
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 6, size=(size, size)).astype(np.float32)
+    data[rng.random((size, size)) < 0.05] = -9999
+    dataset = gdal.GetDriverByName("GTiff").Create(path, size, size, 1, gdal.GDT_Float32)
+    dataset.SetGeoTransform((ORIGIN[0], PIXEL_SIZE, 0.0, ORIGIN[1], 0.0, -PIXEL_SIZE))
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(32633)
+    dataset.SetProjection(srs.ExportToWkt())
+    band = dataset.GetRasterBand(1)
+    band.SetNoDataValue(-9999)
+    band.WriteArray(data)
+    dataset = None
+
+
+def run_processing(source, area, crs, working_directory, index):
+    """Run the area sequence through processing.run the way the workflows do."""
+    bbox = area.boundingBox()
+    feedback = QgsProcessingFeedback()
+    warped = processing.run(
+        "gdal:warpreproject",
+        {
+            "INPUT": source,
+            "TARGET_CRS": crs,
+            "RESAMPLING": 0,
+            "TARGET_RESOLUTION": PIXEL_SIZE,
+            "NODATA": -9999,
+            "OUTPUT": "TEMPORARY_OUTPUT",
+            "TARGET_EXTENT": f"{bbox.xMinimum()},{bbox.xMaximum()},{bbox.yMinimum()},{bbox.yMaximum()} [{crs.authid()}]",  # noqa E231
+        },
+        feedback=feedback,
+    )["OUTPUT"]
+    filled = os.path.join(working_directory, f"processing_filled_{index}.tif")
+    processing.run("native:fillnodata", {"INPUT": warped, "BAND": 1, "FILL_VALUE": 0, "OUTPUT": filled})
+    masked = os.path.join(working_directory, f"processing_masked_{index}.tif")
+    processing.run(
+        "gdal:cliprasterbymasklayer",
+        {
+            "INPUT": filled,
+            "MASK": geometry_to_memory_layer(area, crs, f"mask_{index}"),
+            "NODATA": 255,
+            "CROP_TO_CUTLINE": True,
+            "DATA_TYPE": 6,
+            "OUTPUT": masked,
+        },
+        feedback=feedback,
+    )
+    processing.run(
+        "gdal:rastercalculator",
+        {
+            "INPUT_A": masked,
+            "BAND_A": 1,
+            "INPUT_B": masked,
+            "BAND_B": 1,
+            "FORMULA": "A * B",
+            "EXTENT_OPT": 3,
+            "RTYPE": 5,
+            "OUTPUT": os.path.join(working_directory, f"processing_calc_{index}.tif"),
+        },
+        feedback=feedback,
+    )
+
+
+def run_gdal_ops(source, area, crs, working_directory, index):
+    """Run the area sequence through gdal_ops."""
+    bbox = area.boundingBox()
+    warped = f"/vsimem/benchmark_warped_{index}.tif"
+    gdal_ops.warp_reproject(
+        source,
+        warped,
+        crs,
+        PIXEL_SIZE,
+        (bbox.xMinimum(), bbox.yMinimum(), bbox.xMaximum(), bbox.yMaximum()),
+        dst_nodata=-9999,
+    )
+    filled = os.path.join(working_directory, f"api_filled_{index}.tif")
+    gdal_ops.fill_nodata(warped, filled)
+    gdal.Unlink(warped)
+    masked = os.path.join(working_directory, f"api_masked_{index}.tif")
+    gdal_ops.clip_raster_by_mask(filled, masked, area, crs, nodata=255, output_type=gdal.GDT_Float32)
+    gdal_ops.calculate(
+        "A * B",
+        {"A": masked, "B": masked},
+        os.path.join(working_directory, f"api_calc_{index}.tif"),
+        output_type=gdal.GDT_Float32,
+    )
+
+
+def main():
+    """Run the benchmark."""
+    areas = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    from processing.core.Processing import Processing
+
+    Processing.initialize()
+    working_directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(working_directory, "source.tif")
+        write_raster(source, size)
+        crs = QgsCoordinateReferenceSystem("EPSG:32633")
+        area_size = size * PIXEL_SIZE / areas
+        area_geometries = [
+            QgsGeometry.fromRect(
+                QgsRectangle(
+                    ORIGIN[0] + i * area_size,
+                    ORIGIN[1] - area_size,
+                    ORIGIN[0] + (i + 1) * area_size,
+                    ORIGIN[1],
+                )
+            ).buffer(-PIXEL_SIZE, 8)
+            for i in range(areas)
+        ]
+
+        timings = {}
+        for name, runner in (("processing.run", run_processing), ("gdal_ops", run_gdal_ops)):
+            start = time.perf_counter()
+            for index, area in enumerate(area_geometries):
+                runner(source, area, crs, working_directory, index)
+            timings[name] = (time.perf_counter() - start) / areas
+
+        print(f"{areas} areas from a {size}x{size} pixel source")
+        print(f"processing.run: {timings['processing.run'] * 1000:.1f} ms per area")
+        print(
+            f"gdal_ops:       {timings['gdal_ops'] * 1000:.1f} ms per area "
+            f"({timings['processing.run'] / timings['gdal_ops']:.1f}x)"
+        )
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+        app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark batched H3 grid generation against per vertex transforms.
+
+Usage (from the repository root, in an environment with QGIS and h3 available):
+
+    python scripts/benchmarks/benchmark_h3_grid.py [size_km] [chunks] [workers]
+
+A size_km x size_km bounding box in UTM zone 33N (central Europe) is filled
+with resolution 6 H3 cells. The cell polygons are built once the way the
+grid task used to, creating a coordinate transformation for every vertex,
+and once with h3_cells_to_polygons. The whole grid task is then run over
+chunks x chunks chunks, sequentially and on a thread pool with the given
+number of workers. The timings are printed.
+"""
+
+import os
+import sys
+import time
+
+from osgeo import ogr, osr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import h3  # noqa: E402
+from qgis.core import QgsApplication  # noqa: E402
+from qgis.PyQt.QtCore import QThreadPool  # noqa: E402
+
+from geest.core.h3_utils import bbox_to_wgs84, generate_h3_indexes, h3_cells_to_polygons  # noqa: E402
+from geest.core.tasks.study_area_processing_task import ChunkRunnable  # noqa: E402
+
+EPSG = 32633
+ORIGIN = (200000.0, 5000000.0)
+RESOLUTION = 6
+
+
+def per_vertex_polygon(h3_index):
+    """Build a cell polygon with a new transformation per vertex, as the grid task used to."""
+    ring = ogr.Geometry(ogr.wkbLinearRing)
+    for lat, lng in h3.cell_to_boundary(h3_index):
+        source_srs = osr.SpatialReference()
+        source_srs.ImportFromEPSG(4326)
+        target_srs = osr.SpatialReference()
+        target_srs.ImportFromEPSG(EPSG)
+        transform = osr.CoordinateTransformation(source_srs, target_srs)
+        x, y, _ = transform.TransformPoint(lat, lng)
+        ring.AddPoint(x, y)
+    ring.CloseRings()
+    polygon = ogr.Geometry(ogr.wkbPolygon)
+    polygon.AddGeometry(ring)
+    return polygon
+
+
+def make_chunks(size, chunks):
+    """Split the bounding box into chunks x chunks chunk dictionaries."""
+    step = size / chunks
+    result = []
+    for row in range(chunks):
+        for column in range(chunks):
+            result.append(
+                {
+                    "index": len(result),
+                    "x_start": ORIGIN[0] + column * step,
+                    "x_end": ORIGIN[0] + (column + 1) * step,
+                    "y_start": ORIGIN[1] + row * step,
+                    "y_end": ORIGIN[1] + (row + 1) * step,
+                }
+            )
+    return result
+
+
+def run_chunks(chunks, geometry, workers):
+    """Run the H3 grid task over the chunks and return the number of cells."""
+    runnables = [ChunkRunnable(chunk, geometry, 0, None, analysis_scale="regional", epsg_code=EPSG) for chunk in chunks]
+    if workers == 1:
+        for runnable in runnables:
+            runnable.run()
+    else:
+        pool = QThreadPool()
+        pool.setMaxThreadCount(workers)
+        for runnable in runnables:
+            pool.start(runnable)
+        pool.waitForDone()
+    return sum(len(runnable.result[0].features_out) for runnable in runnables)
+
+
+def main():
+    """Run the benchmark."""
+    size = float(sys.argv[1]) * 1000 if len(sys.argv) > 1 else 500000.0
+    chunk_count = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    try:
+        xmin, xmax, ymin, ymax = ORIGIN[0], ORIGIN[0] + size, ORIGIN[1], ORIGIN[1] + size
+        geometry = ogr.CreateGeometryFromWkt(
+            f"POLYGON (({xmin} {ymin}, {xmax} {ymin}, {xmax} {ymax}, {xmin} {ymax}, {xmin} {ymin}))"
+        )
+        h3_indexes = generate_h3_indexes(bbox_to_wgs84(xmin, xmax, ymin, ymax, EPSG), RESOLUTION)
+        print(f"{size / 1000:.0f} km bbox, {len(h3_indexes)} resolution {RESOLUTION} cells")
+
+        start = time.perf_counter()
+        for h3_index in h3_indexes:
+            per_vertex_polygon(h3_index)
+        per_vertex_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        h3_cells_to_polygons(h3_indexes, EPSG)
+        batched_time = time.perf_counter() - start
+        print(
+            f"cell polygons: per vertex {per_vertex_time:.2f}s, batched {batched_time:.2f}s "
+            f"({per_vertex_time / batched_time:.1f}x)"
+        )
+
+        chunks = make_chunks(size, chunk_count)
+        start = time.perf_counter()
+        cells = run_chunks(chunks, geometry, 1)
+        sequential_time = time.perf_counter() - start
+        start = time.perf_counter()
+        run_chunks(chunks, geometry, workers)
+        parallel_time = time.perf_counter() - start
+        print(
+            f"grid tasks over {len(chunks)} chunks ({cells} cells): sequential {sequential_time:.2f}s, "
+            f"{workers} workers {parallel_time:.2f}s ({sequential_time / parallel_time:.1f}x)"
+        )
+    finally:
+        app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
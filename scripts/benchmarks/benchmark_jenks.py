@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark Jenks Natural Breaks and streamed raster sampling.
+
+Usage (from the repository root, in an environment with QGIS available):
+
+    python scripts/benchmarks/benchmark_jenks.py [classes]
+
+Breaks are computed for 10k and 100k unique exponentially distributed
+values without sampling, reporting the time and the goodness of variance
+fit. A 4000 x 4000 float raster is then written to a temporary folder and
+sampled block by block with sample_raster_values, and the breaks of the
+sample are compared with the breaks of the full data.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from osgeo import gdal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from geest.core.jenks import (  # noqa: E402
+    calculate_goodness_of_variance_fit,
+    jenks_natural_breaks,
+    sample_raster_values,
+)
+
+RASTER_SIZE = 4000
+
+
+def main():
+    """Run the benchmark."""
+    n_classes = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    rng = np.random.default_rng(0)
+
+    for count in (10000, 100000):
+        data = np.unique(rng.exponential(scale=2.0, size=count * 2))[:count]
+        start = time.perf_counter()
+        breaks = jenks_natural_breaks(data, n_classes, max_unique=count)
+        elapsed = time.perf_counter() - start
+        gvf = calculate_goodness_of_variance_fit(data, breaks)
+        print(f"{count} unique values, {n_classes} classes: {elapsed:.2f}s, GVF {gvf:.4f}")
+
+    working_directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(working_directory, "values.tif")
+        values = rng.exponential(scale=2.0, size=(RASTER_SIZE, RASTER_SIZE)).astype(np.float32)
+        dataset = gdal.GetDriverByName("GTiff").Create(
+            path, RASTER_SIZE, RASTER_SIZE, 1, gdal.GDT_Float32, options=["TILED=YES"]
+        )
+        dataset.GetRasterBand(1).WriteArray(values)
+        dataset = None
+
+        start = time.perf_counter()
+        sample, valid_count = sample_raster_values(path)
+        sample_breaks = jenks_natural_breaks(sample, n_classes)
+        elapsed = time.perf_counter() - start
+        full_breaks = jenks_natural_breaks(values.ravel(), n_classes)
+        print(
+            f"{valid_count} raster values sampled to {len(sample)} and classified in {elapsed:.2f}s, "
+            f"GVF {calculate_goodness_of_variance_fit(values.ravel(), sample_breaks):.4f} "
+            f"(all values {calculate_goodness_of_variance_fit(values.ravel(), full_breaks):.4f})"
+        )
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
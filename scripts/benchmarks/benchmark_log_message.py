@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""Micro-benchmark the per-call cost of geest.utilities.log_message.
+
+Usage (from the repository root, in an environment with QGIS available):
+
+    python scripts/benchmarks/benchmark_log_message.py [calls]
+
+Times log_message with verbose mode off (the common case in hot loops) and on,
+and compares it with the previous implementation that read QSettings and
+walked inspect.stack() on every call.
+"""
+
+import inspect
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from qgis.core import Qgis, QgsApplication  # noqa: E402
+
+from geest.core.settings import set_setting, setting  # noqa: E402
+from geest.utilities import (  # noqa: E402
+    log_message,
+    refresh_log_settings,
+    start_file_logging,
+    stop_file_logging,
+)
+
+
+def legacy_log_message(message, level=Qgis.Info, tag="GeoE3", force=False):
+    """The log_message implementation before verbosity caching."""
+    verbose_mode = setting(key="verbose_mode", default=0)
+    if not verbose_mode and not force and level != Qgis.Critical:
+        return
+    caller_frame = inspect.stack()[1]
+    caller_module = inspect.getmodule(caller_frame[0])
+    caller_name = caller_module.__name__ if caller_module else "Unknown"
+    logging.info(f"[{caller_name}: {caller_frame.lineno}] {message}")
+
+
+def per_call_us(function, calls):
+    """Return the mean cost of one call in microseconds."""
+    return timeit.timeit(lambda: function("benchmark message"), number=calls) / calls * 1e6
+
+
+def main():
+    """Run the benchmark."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    working_directory = tempfile.mkdtemp()
+    previous_verbose_mode = setting(key="verbose_mode", default=0)
+    try:
+        start_file_logging(os.path.join(working_directory, "benchmark.log"))
+        for verbose_mode in (0, 1):
+            set_setting(key="verbose_mode", value=verbose_mode)
+            refresh_log_settings()
+            legacy = per_call_us(legacy_log_message, calls)
+            current = per_call_us(log_message, calls)
+            print(f"verbose_mode={verbose_mode}")
+            print(f"  legacy log_message:  {legacy:8.2f} us/call")
+            print(f"  current log_message: {current:8.2f} us/call ({legacy / current:.1f}x)")
+    finally:
+        set_setting(key="verbose_mode", value=previous_verbose_mode)
+        refresh_log_settings()
+        stop_file_logging()
+        shutil.rmtree(working_directory, ignore_errors=True)
+        app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark raster-native per-cell counting against the grid polygon path.
+
+Usage (from the repository root, in an environment with QGIS available):
+
+    python scripts/benchmarks/benchmark_raster_cell_counting.py [cells] [features]
+
+A regular grid of cells x cells polygons and random point and line layers
+with the given number of features are written to a temporary folder. Each
+layer is scored once through select_grid_cells_and_count_features,
+assign_values_to_grid and rasterize_and_mask, and once through
+count_score_and_mask. The timings and the number of differing cells are
+printed.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from osgeo import gdal, ogr, osr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from qgis.core import (  # noqa: E402
+    QgsApplication,
+    QgsCoordinateReferenceSystem,
+    QgsGeometry,
+    QgsRectangle,
+    QgsVectorLayer,
+)
+
+from geest.core.algorithms.features_per_cell_processor import (  # noqa: E402
+    assign_values_to_grid,
+    select_grid_cells_and_count_features,
+)
+from geest.core.algorithms.raster_cell_counter import count_score_and_mask  # noqa: E402
+from geest.core.algorithms.rasterize_and_mask import rasterize_and_mask  # noqa: E402
+
+CELL_SIZE = 100.0
+ORIGIN = (500000.0, 1000000.0)
+
+
+def spatial_reference():
+    """Return the benchmark CRS."""
+    srs = osr.SpatialReference()
+    srs.ImportFromEPSG(32633)
+    return srs
+
+
+def write_grid(path, cells):
+    """Write a cells x cells grid of square polygons."""
+    datasource = ogr.GetDriverByName("GPKG").CreateDataSource(path)
+    layer = datasource.CreateLayer("study_area_grid", srs=spatial_reference(), geom_type=ogr.wkbPolygon)
+    layer.StartTransaction()
+    for row in range(cells):
+        top = ORIGIN[1] - row * CELL_SIZE
+        for column in range(cells):
+            left = ORIGIN[0] + column * CELL_SIZE
+            right = left + CELL_SIZE
+            bottom = top - CELL_SIZE
+            polygon = ogr.CreateGeometryFromWkt(
+                f"POLYGON (({left} {top}, {right} {top}, {right} {bottom}, {left} {bottom}, {left} {top}))"
+            )
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetGeometry(polygon)
+            layer.CreateFeature(feature)
+    layer.CommitTransaction()
+    datasource = None
+
+
+def write_features(path, cells, count, lines):
+    """Write random points, or short random lines, inside the grid."""
+    rng = np.random.default_rng(0)
+    size = cells * CELL_SIZE
+    datasource = ogr.GetDriverByName("GPKG").CreateDataSource(path)
+    geometry_type = ogr.wkbLineString if lines else ogr.wkbPoint
+    layer = datasource.CreateLayer("features", srs=spatial_reference(), geom_type=geometry_type)
+    layer.StartTransaction()
+    for _ in range(count):
+        x = ORIGIN[0] + rng.random() * size
+        y = ORIGIN[1] - rng.random() * size
+        if lines:
+            dx, dy = rng.normal(0, 3 * CELL_SIZE, 2)
+            end_x = min(max(x + dx, ORIGIN[0]), ORIGIN[0] + size)
+            end_y = min(max(y + dy, ORIGIN[1] - size), ORIGIN[1])
+            geometry = ogr.CreateGeometryFromWkt(f"LINESTRING ({x} {y}, {end_x} {end_y})")
+        else:
+            geometry = ogr.CreateGeometryFromWkt(f"POINT ({x} {y})")
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetGeometry(geometry)
+        layer.CreateFeature(feature)
+    layer.CommitTransaction()
+    datasource = None
+
+
+def main():
+    """Run the benchmark."""
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    working_directory = tempfile.mkdtemp()
+    try:
+        crs = QgsCoordinateReferenceSystem("EPSG:32633")
+        extent = QgsRectangle(ORIGIN[0], ORIGIN[1] - cells * CELL_SIZE, ORIGIN[0] + cells * CELL_SIZE, ORIGIN[1])
+        mask = QgsGeometry.fromRect(extent)
+        grid_path = os.path.join(working_directory, "grid.gpkg")
+        write_grid(grid_path, cells)
+        grid_layer = QgsVectorLayer(f"{grid_path}|layername=study_area_grid", "grid", "ogr")
+
+        print(f"{cells}x{cells} cell grid, {count} features per layer")
+        for name, lines in (("points", False), ("lines", True)):
+            features_path = os.path.join(working_directory, f"{name}.gpkg")
+            write_features(features_path, cells, count, lines)
+            features_layer = QgsVectorLayer(f"{features_path}|layername=features", name, "ogr")
+
+            start = time.perf_counter()
+            counted = select_grid_cells_and_count_features(
+                grid_layer, features_layer, os.path.join(working_directory, f"{name}_grid_cells.gpkg")
+            )
+            scored = assign_values_to_grid(counted)
+            vector_path = os.path.join(working_directory, f"{name}_vector.tif")
+            rasterize_and_mask(scored, "value", mask, extent, CELL_SIZE, CELL_SIZE, crs, vector_path)
+            vector_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            raster_path = os.path.join(working_directory, f"{name}_raster.tif")
+            count_score_and_mask(features_layer, mask, extent, CELL_SIZE, crs, raster_path)
+            raster_time = time.perf_counter() - start
+
+            vector_scores = gdal.Open(vector_path).ReadAsArray()
+            raster_scores = gdal.Open(raster_path).ReadAsArray()
+            differing = int(np.count_nonzero(vector_scores != raster_scores))
+            print(
+                f"{name}: grid polygons {vector_time:.2f}s, raster {raster_time:.2f}s "
+                f"({vector_time / raster_time:.1f}x), {differing} cells differ"
+            )
+    finally:
+        shutil.rmtree(working_directory, ignore_errors=True)
+        app.exitQgis()
+
+
+if __name__ == "__main__":
+    main()
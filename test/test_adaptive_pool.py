@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from geest.core.adaptive_pool import AdaptivePoolSizer, estimate_workflow_memory_mb
+
+
+class TestAdaptivePoolSizer(unittest.TestCase):
+
+    def setUp(self):
+        self.sizer = AdaptivePoolSizer(max_workers=8, reserve_mb=1000, ramp_seconds=60)
+        self.sizer.cpu_count = 8
+
+    def test_worker_limit_follows_external_load(self):
+        """Load from other processes lowers the limit, the pool's own jobs do not."""
+        with mock.patch.object(self.sizer, "cpu_load", return_value=6.0):
+            self.assertEqual(self.sizer.worker_limit(running=0), 2)
+            self.assertEqual(self.sizer.worker_limit(running=4), 6)
+        with mock.patch.object(self.sizer, "cpu_load", return_value=20.0):
+            self.assertEqual(self.sizer.worker_limit(running=0), 1)
+        with mock.patch.object(self.sizer, "cpu_load", return_value=None):
+            self.assertEqual(self.sizer.worker_limit(running=0), 8)
+
+    @mock.patch("geest.core.adaptive_pool.get_free_memory_mb", return_value=4000.0)
+    def test_admission_counts_recently_started_jobs(self, _):
+        """Jobs are held while their memory does not fit, except when nothing is running."""
+        self.assertTrue(self.sizer.admit(2048, running=1))
+        self.sizer.job_started(2048)
+        self.assertFalse(self.sizer.admit(2048, running=1))
+        self.assertTrue(self.sizer.admit(512, running=1))
+        self.assertTrue(self.sizer.admit(8192, running=0))
+
+    @mock.patch("geest.core.adaptive_pool.get_free_memory_mb", return_value=3000.0)
+    def test_recommended_workers(self, _):
+        """Batch workers are limited by memory and never drop below one."""
+        with mock.patch.object(self.sizer, "cpu_load", return_value=0.0):
+            self.assertEqual(self.sizer.recommended_workers(8, 500), 4)
+            self.assertEqual(self.sizer.recommended_workers(8, 5000), 1)
+            self.assertEqual(self.sizer.recommended_workers(2, 100), 2)
+
+    def test_memory_estimates(self):
+        """Memory heavy analysis modes get larger estimates."""
+        self.assertGreater(
+            estimate_workflow_memory_mb("use_csv_to_point_layer"),
+            estimate_workflow_memory_mb("use_index_score"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import ogr, osr
+
+from geest.core.algorithms.area_iterator import AreaIterator
+
+
+class TestAreaIterator(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.gpkg_path = os.path.join(self.working_directory, "study_area.gpkg")
+        AreaIterator.invalidate()
+        driver = ogr.GetDriverByName("GPKG")
+        datasource = driver.CreateDataSource(self.gpkg_path)
+        spatial_ref = osr.SpatialReference()
+        spatial_ref.ImportFromEPSG(3857)
+        # Areas are written largest first so the iterator has to sort them
+        areas = [("large", 10), ("small", 2), ("medium", 5)]
+        for layer_name in ("study_area_polygons", "study_area_clip_polygons", "study_area_bboxes"):
+            layer = datasource.CreateLayer(layer_name, spatial_ref, ogr.wkbPolygon)
+            layer.CreateField(ogr.FieldDefn("area_name", ogr.OFTString))
+            for area_name, size in areas:
+                if layer_name == "study_area_clip_polygons" and area_name == "medium":
+                    continue
+                feature = ogr.Feature(layer.GetLayerDefn())
+                feature.SetField("area_name", area_name)
+                feature.SetGeometry(
+                    ogr.CreateGeometryFromWkt(f"POLYGON((0 0, 0 {size}, {size} {size}, {size} 0, 0 0))")
+                )
+                layer.CreateFeature(feature)
+        datasource = None
+
+    def tearDown(self):
+        AreaIterator.invalidate()
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def test_iteration_order_and_fallback(self):
+        """Areas are yielded smallest first, falling back to the polygon when no clip polygon exists."""
+        iterator = AreaIterator(self.gpkg_path)
+        results = list(iterator)
+        self.assertEqual(len(results), 3)
+        self.assertEqual([round(polygon.area()) for polygon, _, _, _ in results], [4, 25, 100])
+        self.assertEqual(results[1][1].area(), results[1][0].area())
+        self.assertEqual(results[-1][3], 100.0)
+        self.assertEqual([record.area_name for record in iterator.records()], ["small", "medium", "large"])
+
+    def test_table_is_shared(self):
+        """Iterators over the same GeoPackage share one area table."""
+        first = AreaIterator(self.gpkg_path).records()
+        second = AreaIterator(self.gpkg_path).records()
+        self.assertIs(first, second)
+        AreaIterator.invalidate(self.gpkg_path)
+        self.assertIsNot(first, AreaIterator(self.gpkg_path).records())
+
+
+if __name__ == "__main__":
+    unittest.main()
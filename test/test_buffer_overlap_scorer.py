@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from qgis.core import QgsFeature, QgsGeometry, QgsVectorLayer
+
+from geest.core.algorithms.buffer_overlap_scorer import (
+    BufferOverlapScorer,
+    max_buffer_overlap_percent,
+    percentage_band_score,
+)
+
+
+class TestBufferOverlapScorer(unittest.TestCase):
+
+    def _layer(self, wkts):
+        layer = QgsVectorLayer("Polygon?crs=EPSG:3857", "layer", "memory")
+        features = []
+        for wkt in wkts:
+            feature = QgsFeature()
+            feature.setGeometry(QgsGeometry.fromWkt(wkt))
+            features.append(feature)
+        layer.dataProvider().addFeatures(features)
+        return layer
+
+    def _square(self, x, y, size=10):
+        return f"POLYGON(({x} {y}, {x} {y + size}, {x + size} {y + size}, {x + size} {y}, {x} {y}))"
+
+    def test_overlaps(self):
+        """Contained, partial, touching and disjoint cells are handled like a GEOS intersection."""
+        buffers = self._layer([self._square(0, 0, size=20)])
+        scorer = BufferOverlapScorer(buffers)
+        self.assertEqual(scorer.overlaps(QgsGeometry.fromWkt(self._square(5, 5))), [(100.0, 400.0)])
+        self.assertEqual(scorer.overlaps(QgsGeometry.fromWkt(self._square(15, 0))), [(50.0, 400.0)])
+        self.assertEqual(scorer.overlaps(QgsGeometry.fromWkt(self._square(20, 0))), [(0.0, 400.0)])
+        self.assertEqual(scorer.overlaps(QgsGeometry.fromWkt(self._square(30, 30))), [])
+
+    def test_score_cells(self):
+        """Scores are written to a new field for every cell."""
+        buffers = self._layer([self._square(0, 0, size=20)])
+        grid = self._layer([self._square(5, 5), self._square(15, 0), self._square(30, 30)])
+        count = BufferOverlapScorer(buffers).score_cells(grid, "value", lambda cell_area, overlaps: len(overlaps))
+        self.assertEqual(count, 3)
+        self.assertEqual(sorted(feature["value"] for feature in grid.getFeatures()), [0, 1, 1])
+
+    def test_percentage_band_score(self):
+        """Threshold table lookups match the regional percentage ranges."""
+        table = {0: 0, 6: 1, 12: 2, 100: 3}
+        self.assertEqual(percentage_band_score(table, 0), 0)
+        self.assertEqual(percentage_band_score(table, 0.01), 1)
+        self.assertEqual(percentage_band_score(table, 6), 1)
+        self.assertEqual(percentage_band_score(table, 6.01), 2)
+        self.assertEqual(percentage_band_score(table, 50), 3)
+        self.assertEqual(max_buffer_overlap_percent([(0.0, 400.0), (50.0, 400.0), (100.0, 400.0)]), 25.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
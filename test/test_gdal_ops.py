@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from osgeo import gdal, osr
+from qgis.core import QgsCoordinateReferenceSystem, QgsGeometry, QgsRectangle
+
+from geest.core import gdal_ops
+
+
+class TestGdalOps(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.crs = QgsCoordinateReferenceSystem("EPSG:32633")
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write_raster(self, name, data, origin=(0.0, 40.0), nodata=255, data_type=gdal.GDT_Float32):
+        path = os.path.join(self.working_directory, name)
+        rows, cols = data.shape
+        dataset = gdal.GetDriverByName("GTiff").Create(path, cols, rows, 1, data_type)
+        dataset.SetGeoTransform((origin[0], 10.0, 0.0, origin[1], 0.0, -10.0))
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32633)
+        dataset.SetProjection(srs.ExportToWkt())
+        band = dataset.GetRasterBand(1)
+        if nodata is not None:
+            band.SetNoDataValue(nodata)
+        band.WriteArray(data)
+        dataset = None
+        return path
+
+    def _read(self, path):
+        dataset = gdal.Open(path)
+        return dataset.GetRasterBand(1).ReadAsArray(), dataset.GetGeoTransform()
+
+    def test_fill_nodata(self):
+        """Nodata pixels are replaced by the fill value."""
+        data = np.ones((4, 4), dtype=np.float32)
+        data[2, 1] = -9999
+        source = self._write_raster("source.tif", data, nodata=-9999)
+        output = os.path.join(self.working_directory, "filled.tif")
+        gdal_ops.fill_nodata(source, output, fill_value=0)
+        result, _ = self._read(output)
+        self.assertEqual(result[2, 1], 0)
+        self.assertEqual(result[0, 0], 1)
+
+    def test_warp_reproject_extent(self):
+        """The output covers exactly the requested extent at the requested resolution."""
+        source = self._write_raster("source.tif", np.ones((4, 4), dtype=np.float32))
+        output = os.path.join(self.working_directory, "warped.tif")
+        gdal_ops.warp_reproject(source, output, self.crs, 10.0, (10.0, 0.0, 30.0, 20.0), dst_nodata=-9999)
+        result, geotransform = self._read(output)
+        self.assertEqual(result.shape, (2, 2))
+        self.assertEqual(geotransform[0], 10.0)
+        self.assertEqual(geotransform[3], 20.0)
+
+    def test_clip_raster_by_mask(self):
+        """Pixels outside the mask become nodata and the output is cropped to the mask."""
+        source = self._write_raster("source.tif", np.full((4, 4), 3, dtype=np.float32))
+        output = os.path.join(self.working_directory, "masked.tif")
+        mask = QgsGeometry.fromRect(QgsRectangle(0.0, 20.0, 20.0, 40.0))
+        gdal_ops.clip_raster_by_mask(source, output, mask, self.crs, nodata=255, output_type=gdal.GDT_Float32)
+        result, _ = self._read(output)
+        self.assertEqual(result.shape, (2, 2))
+        np.testing.assert_allclose(result, np.full((2, 2), 3))
+
+    def test_calculate_intersects_extents(self):
+        """The calculator output covers the intersection of the inputs and propagates nodata."""
+        first = np.full((4, 4), 2, dtype=np.uint8)
+        first[0, 1] = 255
+        a = self._write_raster("a.tif", first, data_type=gdal.GDT_Byte)
+        b = self._write_raster(
+            "b.tif", np.full((4, 4), 3, dtype=np.uint8), origin=(-10.0, 40.0), data_type=gdal.GDT_Byte
+        )
+        output = os.path.join(self.working_directory, "calc.tif")
+        gdal_ops.calculate("((A - 1) * 3) + B", {"A": a, "B": b}, output, output_type=gdal.GDT_Byte)
+        result, geotransform = self._read(output)
+        self.assertEqual(result.shape, (4, 3))
+        self.assertEqual(geotransform[0], 0.0)
+        self.assertEqual(result[0, 1], 255)
+        self.assertEqual(result[1, 1], 6)
+
+    def test_build_vrt(self):
+        """Adjacent tiles are mosaicked into one VRT."""
+        left = self._write_raster("left.tif", np.ones((4, 4), dtype=np.float32))
+        right = self._write_raster("right.tif", np.full((4, 4), 2, dtype=np.float32), origin=(40.0, 40.0))
+        output = os.path.join(self.working_directory, "combined.vrt")
+        gdal_ops.build_vrt(output, [left, right], output_crs=self.crs)
+        result, _ = self._read(output)
+        self.assertEqual(result.shape, (4, 8))
+        self.assertEqual(result[0, 7], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
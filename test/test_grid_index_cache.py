@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import ogr, osr
+from qgis.core import QgsRectangle, QgsVectorLayer
+
+from geest.core.algorithms.grid_index_cache import GridIndexCache
+
+
+class TestGridIndexCache(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.gpkg_path = os.path.join(self.working_directory, "study_area.gpkg")
+        self._write_grid(self.gpkg_path, cells=3)
+        GridIndexCache.invalidate()
+
+    def tearDown(self):
+        GridIndexCache.invalidate()
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write_grid(self, gpkg_path, cells):
+        """Write a cells x cells grid of unit squares to a GeoPackage."""
+        driver = ogr.GetDriverByName("GPKG")
+        datasource = driver.CreateDataSource(gpkg_path)
+        spatial_ref = osr.SpatialReference()
+        spatial_ref.ImportFromEPSG(3857)
+        layer = datasource.CreateLayer("study_area_grid", spatial_ref, ogr.wkbPolygon)
+        for x in range(cells):
+            for y in range(cells):
+                feature = ogr.Feature(layer.GetLayerDefn())
+                feature.SetGeometry(
+                    ogr.CreateGeometryFromWkt(f"POLYGON(({x} {y}, {x} {y + 1}, {x + 1} {y + 1}, {x + 1} {y}, {x} {y}))")
+                )
+                layer.CreateFeature(feature)
+        datasource = None
+
+    def _grid_layer(self):
+        return QgsVectorLayer(f"{self.gpkg_path}|layername=study_area_grid", "study_area_grid", "ogr")
+
+    def test_index_is_shared(self):
+        """Layers over the same GeoPackage share one index."""
+        first = GridIndexCache.index_for_layer(self._grid_layer())
+        second = GridIndexCache.index_for_layer(self._grid_layer())
+        self.assertIs(first, second)
+
+    def test_index_matches_grid(self):
+        """The persisted index finds the expected cells."""
+        grid_index = GridIndexCache.index_for_layer(self._grid_layer())
+        ids = grid_index.intersects(QgsRectangle(0.25, 0.25, 0.75, 0.75))
+        self.assertEqual(len(ids), 1)
+        ids = grid_index.intersects(QgsRectangle(-10, -10, 10, 10))
+        self.assertEqual(len(ids), 9)
+
+    def test_invalidate(self):
+        """Invalidating or regenerating the GeoPackage rebuilds the index."""
+        first = GridIndexCache.index_for_layer(self._grid_layer())
+        GridIndexCache.invalidate(self.gpkg_path)
+        second = GridIndexCache.index_for_layer(self._grid_layer())
+        self.assertIsNot(first, second)
+
+        os.remove(self.gpkg_path)
+        self._write_grid(self.gpkg_path, cells=2)
+        os.utime(self.gpkg_path, (0, os.path.getmtime(self.gpkg_path) + 10))
+        third = GridIndexCache.index_for_layer(self._grid_layer())
+        self.assertIsNot(second, third)
+        self.assertEqual(len(third.intersects(QgsRectangle(-10, -10, 10, 10))), 4)
+
+    def test_memory_layer_not_cached(self):
+        """Memory layers get a fresh index each time."""
+        layer = QgsVectorLayer("Polygon?crs=EPSG:3857", "grid", "memory")
+        first = GridIndexCache.index_for_layer(layer)
+        second = GridIndexCache.index_for_layer(layer)
+        self.assertIsNot(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
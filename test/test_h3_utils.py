@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+import numpy as np
+from osgeo import ogr
+
+from geest.core.h3_utils import (
+    bbox_to_wgs84,
+    generate_h3_indexes,
+    h3_cell_to_polygon_wkt,
+    h3_cells_to_polygons,
+    polygon_from_coordinates,
+    transform_points,
+    transform_wgs84_to_target,
+)
+
+try:
+    import h3
+except ImportError:
+    h3 = None
+
+UTM_33N = 32633
+
+
+class TestH3Utils(unittest.TestCase):
+
+    def test_transform_points_matches_single_points(self):
+        """Batched transforms use longitude, latitude order like the single point transform."""
+        lons = np.array([15.0, 15.5, 16.0])
+        lats = np.array([45.0, 45.5, 46.0])
+        xs, ys = transform_points(lons, lats, 4326, UTM_33N)
+        for lon, lat, x, y in zip(lons, lats, xs, ys):
+            self.assertEqual(transform_wgs84_to_target(lon, lat, UTM_33N), (x, y))
+        # The central meridian of zone 33 maps to the false easting
+        self.assertAlmostEqual(xs[0], 500000.0, places=3)
+
+    def test_bbox_to_wgs84(self):
+        """A projected bbox comes back as longitude and latitude ranges."""
+        xmin, xmax, ymin, ymax = bbox_to_wgs84(400000, 600000, 4900000, 5100000, UTM_33N)
+        self.assertTrue(13.5 < xmin < xmax < 16.5)
+        self.assertTrue(44 < ymin < ymax < 46.5)
+
+    def test_polygon_from_coordinates(self):
+        """Polygons are closed and built from the coordinate arrays."""
+        polygon = polygon_from_coordinates(np.array([0.0, 10.0, 10.0, 0.0]), np.array([0.0, 0.0, 10.0, 10.0]))
+        self.assertTrue(polygon.IsValid())
+        self.assertEqual(polygon.GetArea(), 100.0)
+        self.assertEqual(polygon.GetGeometryRef(0).GetPointCount(), 5)
+
+    @unittest.skipIf(h3 is None, "h3 is not installed")
+    def test_batched_polygons_match_wkt(self):
+        """Batched cell polygons match the per cell WKT conversion and respect the envelope."""
+        h3_indexes = generate_h3_indexes((15.0, 15.5, 45.0, 45.5), 6)
+        self.assertGreater(len(h3_indexes), 10)
+        polygons = h3_cells_to_polygons(h3_indexes, UTM_33N)
+        self.assertEqual([index for index, _ in polygons], h3_indexes)
+        for h3_index, polygon in polygons[:5]:
+            expected = ogr.CreateGeometryFromWkt(h3_cell_to_polygon_wkt(h3_index, UTM_33N))
+            self.assertAlmostEqual(polygon.GetArea(), expected.GetArea(), places=3)
+            self.assertLess(polygon.SymDifference(expected).GetArea(), 1e-3)
+
+        first = polygons[0][1]
+        envelope = first.GetEnvelope()
+        filtered = h3_cells_to_polygons(h3_indexes, UTM_33N, envelope)
+        self.assertIn(polygons[0][0], [index for index, _ in filtered])
+        self.assertLess(len(filtered), len(polygons))
+
+
+if __name__ == "__main__":
+    unittest.main()
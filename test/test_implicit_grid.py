@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from osgeo import gdal, osr
+from qgis.core import QgsGeometry, QgsRectangle
+
+from geest.core.algorithms.implicit_grid import COVERAGE_FILENAME, ImplicitGrid
+
+
+class TestImplicitGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32633)
+        self.crs_wkt = srs.ExportToWkt()
+        # 4 columns x 3 rows of 100 m cells with the top left corner at (0, 300)
+        self.grid = ImplicitGrid.from_extent((0.0, 400.0, 0.0, 300.0), 100.0, self.crs_wkt)
+
+    def tearDown(self):
+        ImplicitGrid.invalidate()
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write_mask(self, name, data, origin):
+        path = os.path.join(self.working_directory, name)
+        rows, cols = data.shape
+        dataset = gdal.GetDriverByName("GTiff").Create(path, cols, rows, 1, gdal.GDT_Byte, options=["NBITS=1"])
+        dataset.SetGeoTransform((origin[0], 100.0, 0.0, origin[1], 0.0, -100.0))
+        dataset.SetProjection(self.crs_wkt)
+        dataset.GetRasterBand(1).WriteArray(data)
+        dataset = None
+        return path
+
+    def test_cell_id_round_trip(self):
+        """Cell ids are row major and map back to their row and column."""
+        self.assertEqual(self.grid.cell_count, 12)
+        self.assertEqual(self.grid.cell_id(1, 2), 6)
+        self.assertEqual(self.grid.row_column(6), (1, 2))
+        rectangle = self.grid.cell_rectangle(6)
+        self.assertEqual(
+            (rectangle.xMinimum(), rectangle.yMinimum(), rectangle.xMaximum(), rectangle.yMaximum()),
+            (200.0, 100.0, 300.0, 200.0),
+        )
+
+    def test_cell_range_includes_touching_cells(self):
+        """A rectangle edge on a cell edge touches the cells on both sides and is clipped to the grid."""
+        self.assertEqual(self.grid.cell_range(QgsRectangle(150, 150, 200, 180)), (1, 2, 1, 3))
+        self.assertEqual(self.grid.cell_range(QgsRectangle(-50, -50, 10, 10)), (2, 3, 0, 1))
+        _, _, column_start, column_end = self.grid.cell_range(QgsRectangle(500, 500, 600, 600))
+        self.assertEqual(column_start, column_end)
+
+    def test_cells_intersecting(self):
+        """Points, lines and polygons select the cells they touch."""
+        point = QgsGeometry.fromWkt("POINT (100 250)")
+        self.assertEqual(self.grid.cells_intersecting(point), [0, 1])
+        line = QgsGeometry.fromWkt("LINESTRING (50 250, 50 150, 350 150)")
+        self.assertEqual(self.grid.cells_intersecting(line), [0, 4, 5, 6, 7])
+        polygon = QgsGeometry.fromWkt("POLYGON ((10 10, 90 10, 90 90, 10 90, 10 10))")
+        self.assertEqual(self.grid.cells_intersecting(polygon), [8])
+
+    def test_coverage_filters_cells(self):
+        """Only cells set in an area mask are covered and returned."""
+        first = self._write_mask("first.tif", np.array([[1, 1], [0, 1]], dtype=np.uint8), (0.0, 300.0))
+        second = self._write_mask("second.tif", np.array([[1]], dtype=np.uint8), (300.0, 100.0))
+        coverage_path = os.path.join(self.working_directory, COVERAGE_FILENAME)
+        self.assertEqual(self.grid.write_coverage([first, second], coverage_path), 4)
+        self.assertTrue(self.grid.is_covered(0))
+        self.assertFalse(self.grid.is_covered(4))
+        self.assertTrue(self.grid.is_covered(11))
+        line = QgsGeometry.fromWkt("LINESTRING (50 250, 50 150, 350 150)")
+        self.assertEqual(self.grid.cells_intersecting(line), [0, 5])
+        self.assertEqual(self.grid.cells_intersecting(line, covered_only=False), [0, 4, 5, 6, 7])
+
+    def test_definition_round_trip(self):
+        """A saved definition is found for its study area and keeps its coverage."""
+        gpkg_path = os.path.join(self.working_directory, "study_area.gpkg")
+        mask = self._write_mask("mask.tif", np.array([[1]], dtype=np.uint8), (0.0, 300.0))
+        self.grid.write_coverage([mask], os.path.join(self.working_directory, COVERAGE_FILENAME))
+        self.assertIsNone(ImplicitGrid.for_study_area(gpkg_path))
+        self.grid.save(ImplicitGrid.definition_path(gpkg_path))
+        ImplicitGrid.invalidate(gpkg_path)
+        loaded = ImplicitGrid.for_study_area(gpkg_path)
+        self.assertEqual((loaded.columns, loaded.rows, loaded.cell_size), (4, 3, 100.0))
+        self.assertTrue(loaded.is_covered(0))
+        self.assertFalse(loaded.is_covered(1))
+        self.assertIs(ImplicitGrid.for_study_area(gpkg_path), loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
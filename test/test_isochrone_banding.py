@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for raster banding of overlapping isochrones.
+"""
+
+import unittest
+
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsField,
+    QgsGeometry,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtCore import QVariant
+
+from geest.core.algorithms.isochrone_banding import (
+    band_burn_layer,
+    distance_band_scores,
+)
+
+
+class TestIsochroneBanding(unittest.TestCase):
+    """Test scoring and burn ordering of isochrones."""
+
+    def setUp(self):
+        """Create overlapping square isochrones around one point."""
+        self.crs = QgsCoordinateReferenceSystem("EPSG:32632")
+        self.layer = QgsVectorLayer("Polygon?crs=EPSG:32632", "isochrones", "memory")
+        provider = self.layer.dataProvider()
+        provider.addAttributes([QgsField("value", QVariant.Int)])
+        self.layer.updateFields()
+        features = []
+        for distance in (500, 2000, 1000, 750):
+            feature = QgsFeature(self.layer.fields())
+            feature.setGeometry(QgsGeometry.fromWkt(f"POLYGON((0 0, {distance} 0, {distance} {distance}, 0 0))"))
+            feature.setAttributes([distance])
+            features.append(feature)
+        provider.addFeatures(features)
+
+    def test_distance_band_scores(self):
+        """The closest distance scores 5 and scores never drop below 0."""
+        scores = distance_band_scores([500, 1000, 2000, 3000, 4000, 5000, 6000])
+        self.assertEqual(scores[500], 5)
+        self.assertEqual(scores[2000], 3)
+        self.assertEqual(scores[5000], 0)
+        self.assertEqual(scores[6000], 0)
+
+    def test_largest_range_burned_first(self):
+        """Features are ordered from the largest range to the smallest, with their scores."""
+        burn_layer = band_burn_layer(self.layer, distance_band_scores([500, 1000, 2000]), self.crs)
+        ordered = [(feature["distance"], feature["value"]) for feature in burn_layer.getFeatures()]
+        self.assertEqual(ordered, [(2000, 3), (1000, 4), (500, 5)])
+        self.assertEqual(burn_layer.crs(), self.crs)
+
+    def test_float_ranges_match_integer_isochrones(self):
+        """Distances parsed as floats still score integer isochrone ranges."""
+        burn_layer = band_burn_layer(self.layer, distance_band_scores([500.0, 750.0]), self.crs)
+        self.assertEqual([feature["value"] for feature in burn_layer.getFeatures()], [4, 5])
+
+    def test_missing_range_field(self):
+        """A layer without the range field is rejected."""
+        with self.assertRaises(KeyError):
+            band_burn_layer(self.layer, {}, self.crs, range_field="range")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,16 +3,47 @@
 Unit tests for Jenks Natural Breaks classification module.
 """
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import numpy as np
+from osgeo import gdal
 
 from geest.core.jenks import (
+    ReservoirSampler,
     calculate_goodness_of_variance_fit,
     jenks_natural_breaks,
+    sample_raster_values,
 )
 
 
+def _brute_force_cost(data, n_classes):
+    """Minimum within-class sum of squared deviations, by exhaustive O(k × n²) DP."""
+    n = len(data)
+
+    def ssd(start, end):
+        values = data[start : end + 1]
+        return float(np.sum((values - values.mean()) ** 2))
+
+    cost = [ssd(0, j) for j in range(n)]
+    for k in range(2, n_classes + 1):
+        cost = [min(cost[i] + ssd(i + 1, j) for i in range(k - 2, j)) if j >= k - 1 else np.inf for j in range(n)]
+    return cost[-1]
+
+
+def _partition_cost(data, breaks):
+    """Within-class sum of squared deviations of the classes ending at each break."""
+    total = 0.0
+    lower = -np.inf
+    for upper in breaks:
+        values = data[(data > lower) & (data <= upper)]
+        total += float(np.sum((values - values.mean()) ** 2))
+        lower = upper
+    return total
+
+
 class TestJenksNaturalBreaks(unittest.TestCase):
     """Test suite for jenks_natural_breaks function."""
 
@@ -177,6 +208,25 @@ class TestJenksNaturalBreaks(unittest.TestCase):
         self.assertEqual(len(breaks), 2)
         self.assertIsInstance(breaks, list)
 
+    def test_breaks_are_optimal(self):
+        """Breaks minimise the within-class sum of squared deviations."""
+        rng = np.random.default_rng(7)
+        for _ in range(20):
+            data = np.unique(np.round(rng.exponential(scale=3, size=40), 2))
+            for n_classes in (2, 3, 5):
+                breaks = jenks_natural_breaks(data, n_classes=n_classes)
+                self.assertAlmostEqual(_partition_cost(data, breaks), _brute_force_cost(data, n_classes), places=6)
+
+    def test_many_unique_values(self):
+        """Large inputs are classified without sampling when allowed."""
+        rng = np.random.default_rng(11)
+        data = rng.exponential(scale=2, size=20000)
+        breaks = jenks_natural_breaks(data, n_classes=6, max_unique=len(data))
+
+        self.assertEqual(len(breaks), 6)
+        self.assertEqual(breaks[-1], data.max())
+        self.assertTrue(all(breaks[i] < breaks[i + 1] for i in range(5)))
+
     def test_integer_data(self):
         """Test with integer data."""
         data = np.array([1, 2, 3, 10, 11, 12, 20, 21, 22], dtype=np.int32)
@@ -186,6 +236,57 @@ class TestJenksNaturalBreaks(unittest.TestCase):
         self.assertEqual(breaks[-1], 22)
 
 
+class TestReservoirSampling(unittest.TestCase):
+    """Test suite for streamed sampling of values."""
+
+    def test_sampler_keeps_everything_below_sample_size(self):
+        """All finite values are kept until the reservoir is full."""
+        sampler = ReservoirSampler(sample_size=10, seed=0)
+        sampler.update(np.array([1.0, np.nan, 2.0, np.inf]))
+        sampler.update(np.array([[3.0, 4.0]]))
+        np.testing.assert_array_equal(sampler.sample(), [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(sampler.seen, 4)
+
+    def test_sampler_is_uniform(self):
+        """Every value of the stream is equally likely to be sampled."""
+        counts = np.zeros(1000)
+        for seed in range(300):
+            sampler = ReservoirSampler(sample_size=100, seed=seed)
+            for block in np.array_split(np.arange(1000.0), 7):
+                sampler.update(block)
+            sample = sampler.sample()
+            self.assertEqual(len(sample), 100)
+            self.assertEqual(len(np.unique(sample)), 100)
+            counts[sample.astype(int)] += 1
+        # Each value is expected 30 times; early and late values must not be favoured
+        self.assertAlmostEqual(counts[:500].mean(), 30, delta=3)
+        self.assertAlmostEqual(counts[500:].mean(), 30, delta=3)
+
+    def test_sample_raster_values(self):
+        """Raster values are streamed in blocks, skipping nodata."""
+        working_directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(working_directory, "values.tif")
+            data = np.arange(100 * 60, dtype=np.float32).reshape(60, 100)
+            data[:10, :] = -9999
+            dataset = gdal.GetDriverByName("GTiff").Create(
+                path, 100, 60, 1, gdal.GDT_Float32, options=["TILED=YES", "BLOCKXSIZE=16", "BLOCKYSIZE=16"]
+            )
+            band = dataset.GetRasterBand(1)
+            band.SetNoDataValue(-9999)
+            band.WriteArray(data)
+            dataset = None
+
+            sample, valid_count = sample_raster_values(path, sample_size=500)
+            self.assertEqual(valid_count, 50 * 100)
+            self.assertEqual(len(sample), 500)
+            self.assertGreaterEqual(sample.min(), 1000)
+            everything, _ = sample_raster_values(path, sample_size=10000)
+            np.testing.assert_array_equal(np.sort(everything), data[10:].ravel())
+        finally:
+            shutil.rmtree(working_directory, ignore_errors=True)
+
+
 class TestGoodnessOfVarianceFit(unittest.TestCase):
     """Test suite for calculate_goodness_of_variance_fit function."""
 
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import unittest
+from unittest import mock
 from uuid import UUID
 
 from geest.core.json_tree_item import JsonTreeItem
@@ -283,6 +284,74 @@ class TestJsonTreeItem(unittest.TestCase):
         found_item = parent.getItemByGuid(child.guid)
         self.assertIs(found_item, child)
 
+    def test_guid_index(self):
+        """Lookups use the tree's guid index and only return items under the searched item."""
+        analysis, dimension, factor, indicator = self._status_tree()
+        other_factor = JsonTreeItem(["Other", "", "", {}], role="factor", parent=dimension)
+        dimension.appendChild(other_factor)
+
+        self.assertIs(analysis.getItemByGuid(indicator.guid), indicator)
+        self.assertIs(factor.getItemByGuid(indicator.guid), indicator)
+        self.assertIs(factor.getItemByGuid(factor.guid), factor)
+        self.assertIsNone(other_factor.getItemByGuid(indicator.guid))
+        self.assertIsNone(analysis.getItemByGuid("missing"))
+
+        dimension.removeChild(factor)
+        self.assertIsNone(analysis.getItemByGuid(indicator.guid))
+        self.assertIs(factor.getItemByGuid(indicator.guid), indicator)
+        self.assertEqual(dimension.childItems, [other_factor])
+
+    def _status_tree(self):
+        """Build an analysis > dimension > factor > indicator tree with separate attributes."""
+        analysis = JsonTreeItem(["Analysis", "", "", {"result": ""}], role="analysis")
+        dimension = JsonTreeItem(["Dimension", "", "", {"analysis_weighting": 1.0}], role="dimension", parent=analysis)
+        factor = JsonTreeItem(["Factor", "", "", {"dimension_weighting": 1.0}], role="factor", parent=dimension)
+        indicator = JsonTreeItem(
+            ["Indicator", "", "", {"analysis_mode": "use_index_score", "factor_weighting": 1.0, "result": "Not Run"}],
+            role="indicator",
+            parent=factor,
+        )
+        analysis.appendChild(dimension)
+        dimension.appendChild(factor)
+        factor.appendChild(indicator)
+        return analysis, dimension, factor, indicator
+
+    def test_status_is_cached(self):
+        """Repeated getStatus calls reuse the cached status until an attribute changes."""
+        _, _, factor, indicator = self._status_tree()
+        with mock.patch.object(JsonTreeItem, "_computeStatus", autospec=True, side_effect=lambda item: "X") as compute:
+            factor.getStatus()
+            factor.getStatus()
+            indicator.getStatus()
+            self.assertEqual(compute.call_count, 2)
+            indicator.setAttribute("result", "Workflow Completed")
+            factor.getStatus()
+            self.assertEqual(compute.call_count, 3)
+
+    def test_status_invalidation(self):
+        """Changes invalidate the status of ancestors and descendants, including in-place dict edits."""
+        _, dimension, factor, indicator = self._status_tree()
+        self.assertEqual(indicator.getStatus(), "Configured, not run")
+        self.assertEqual(factor.getStatus(), "Configured, not run")
+
+        # Workflows update the dict returned by attributes() in place
+        indicator.attributes()["result"] = "Workflow Failed"
+        self.assertEqual(indicator.getStatus(), "Workflow failed")
+        self.assertEqual(factor.getStatus(), "Workflow failed")
+
+        with dimension.atomicAttributeUpdate() as attributes:
+            attributes["analysis_weighting"] = 0.0
+        self.assertEqual(indicator.getStatus(), "Excluded from analysis")
+
+    def test_attribute_copies_are_plain_dicts(self):
+        """Copies of the attributes do not invalidate the item they came from."""
+        _, _, _, indicator = self._status_tree()
+        snapshot = indicator.attributes().copy()
+        self.assertIs(type(snapshot), dict)
+        self.assertEqual(indicator.getStatus(), "Configured, not run")
+        snapshot["result"] = "Workflow Failed"
+        self.assertEqual(indicator.getStatus(), "Configured, not run")
+
 
 if __name__ == "__main__":
     unittest.main()
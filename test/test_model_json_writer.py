@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from qgis.PyQt.QtCore import QCoreApplication
+
+from geest.core.model_json_writer import ModelJsonWriter
+
+
+class TestModelJsonWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.working_directory, "model.json")
+        self.model = {"name": "GeoE3", "value": 0}
+        self.serialised = 0
+
+        def to_json():
+            self.serialised += 1
+            return dict(self.model)
+
+        self.writer = ModelJsonWriter(to_json, debounce_ms=60000)
+
+    def tearDown(self):
+        self.writer.flush()
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _read(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def test_flush_writes_pending_save(self):
+        """A scheduled save is written on flush without leaving a temporary file."""
+        self.writer.schedule(self.path)
+        self.assertFalse(os.path.exists(self.path))
+        self.writer.flush()
+        self.assertEqual(self._read(), self.model)
+        self.assertFalse(os.path.exists(f"{self.path}.tmp"))
+
+    def test_saves_are_coalesced(self):
+        """Repeated schedules serialise the model once, with its latest state."""
+        for value in range(10):
+            self.model["value"] = value
+            self.writer.schedule(self.path)
+        self.writer.flush()
+        self.assertEqual(self.serialised, 1)
+        self.assertEqual(self._read()["value"], 9)
+
+    def test_unchanged_content_is_not_rewritten(self):
+        """The file is only rewritten when its content changes or it is missing."""
+        self.writer.schedule(self.path)
+        self.writer.flush()
+        os.utime(self.path, (0, 0))
+        self.writer.schedule(self.path)
+        self.writer.flush()
+        self.assertEqual(os.path.getmtime(self.path), 0)
+        self.model["value"] = 1
+        self.writer.schedule(self.path)
+        self.writer.flush()
+        self.assertNotEqual(os.path.getmtime(self.path), 0)
+        os.remove(self.path)
+        self.writer.schedule(self.path)
+        self.writer.flush()
+        self.assertEqual(self._read()["value"], 1)
+
+    def test_debounce_timer_writes(self):
+        """The save is written once the debounce period has passed."""
+        writer = ModelJsonWriter(lambda: self.model, debounce_ms=0)
+        writer.schedule(self.path)
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.path) and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.01)
+        writer.flush()
+        self.assertEqual(self._read(), self.model)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the multi-source network distance engine.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from geest.core.algorithms.network_distance import NetworkGraph, NetworkGraphCache
+
+
+class TestNetworkGraph(unittest.TestCase):
+    """Test snapping, multi-source shortest paths and band extraction on a small line network."""
+
+    def setUp(self):
+        """Build a straight road of ten 100m segments from x=0 to x=1000."""
+        coordinates = [(x * 100.0, 0.0) for x in range(11)]
+        segments = [(i, i + 1) for i in range(10)]
+        self.graph = NetworkGraph(coordinates, segments, [100.0] * 10)
+
+    def _length(self, pieces):
+        """Total length of a list of straight pieces."""
+        return sum(abs(x2 - x1) + abs(y2 - y1) for (x1, y1), (x2, y2) in pieces)
+
+    def test_snap_within_tolerance(self):
+        """Points are snapped onto the nearest segment within tolerance only."""
+        segment, offset = self.graph.snap((250.0, 20.0), 50)
+        self.assertEqual(segment, 2)
+        self.assertAlmostEqual(offset, 50.0)
+        self.assertIsNone(self.graph.snap((250.0, 80.0), 50))
+
+    def test_nearest_facility_distances(self):
+        """Each vertex records the distance to and id of its nearest facility."""
+        snapped = {
+            "a": [self.graph.snap((0.0, 0.0), 10)],
+            "b": [self.graph.snap((850.0, 0.0), 10)],
+        }
+        distances, origins = self.graph.shortest_distances(snapped, cutoff=1000)
+        self.assertAlmostEqual(distances[2], 200.0)
+        self.assertEqual(origins[2], "a")
+        self.assertAlmostEqual(distances[7], 150.0)
+        self.assertEqual(origins[7], "b")
+        self.assertAlmostEqual(distances[10], 150.0)
+
+    def test_cutoff_leaves_far_vertices_unreached(self):
+        """Vertices beyond the cutoff are not explored."""
+        snapped = {"a": [self.graph.snap((0.0, 0.0), 10)]}
+        distances, origins = self.graph.shortest_distances(snapped, cutoff=300)
+        self.assertAlmostEqual(distances[3], 300.0)
+        self.assertNotIn(4, distances)
+        self.assertNotIn(4, origins)
+
+    def test_bands_from_one_traversal(self):
+        """Every band is derived from one pass, including partial segments."""
+        snapped = {"a": [self.graph.snap((0.0, 0.0), 10)]}
+        distances, origins = self.graph.shortest_distances(snapped, cutoff=450)
+        for band in (150, 300, 450):
+            pieces = self.graph.reachable_pieces(distances, origins, snapped, band)
+            self.assertEqual(list(pieces), ["a"])
+            self.assertAlmostEqual(self._length(pieces["a"]), band)
+
+    def test_segments_split_between_facilities(self):
+        """A segment reached from both ends is split where the distances meet."""
+        snapped = {
+            "a": [self.graph.snap((0.0, 0.0), 10)],
+            "b": [self.graph.snap((1000.0, 0.0), 10)],
+        }
+        distances, origins = self.graph.shortest_distances(snapped, cutoff=1000)
+        pieces = self.graph.reachable_pieces(distances, origins, snapped, 1000)
+        self.assertAlmostEqual(self._length(pieces["a"]), 500.0)
+        self.assertAlmostEqual(self._length(pieces["b"]), 500.0)
+
+    def test_facility_on_segment_interior(self):
+        """Short bands around a facility in the middle of a segment are not lost."""
+        snapped = {"a": [self.graph.snap((450.0, 0.0), 10)]}
+        distances, origins = self.graph.shortest_distances(snapped, cutoff=20)
+        pieces = self.graph.reachable_pieces(distances, origins, snapped, 20)
+        self.assertAlmostEqual(self._length(pieces["a"]), 40.0)
+
+    def test_save_and_load(self):
+        """A persisted graph loads with the same adjacency and distances."""
+        working_directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(working_directory, "roads_graph_50.npz")
+            self.graph.save(path)
+            loaded = NetworkGraph.load(path)
+        finally:
+            shutil.rmtree(working_directory, ignore_errors=True)
+        self.assertEqual(loaded.vertex_count, 11)
+        self.assertEqual(loaded.segment_count, 10)
+        self.assertEqual(loaded.offsets.tolist(), self.graph.offsets.tolist())
+        snapped = {"a": [loaded.snap((250.0, 0.0), 10)]}
+        distances, _ = loaded.shortest_distances(snapped, cutoff=1000)
+        self.assertAlmostEqual(distances[10], 750.0)
+
+    def test_remove_stale_keeps_other_sources(self):
+        """Only older graphs of the same source and tolerance are removed."""
+        working_directory = tempfile.mkdtemp()
+        names = {
+            "current": "roads_1a2b3c4d_00000000000000ff_graph_50.npz",
+            "stale": "roads_1a2b3c4d_0000000000000001_graph_50.npz",
+            "other_layer": "roads_5e6f7a8b_0000000000000001_graph_50.npz",
+            "other_tolerance": "roads_1a2b3c4d_0000000000000001_graph_10.npz",
+        }
+        try:
+            for name in names.values():
+                open(os.path.join(working_directory, name), "wb").close()
+            NetworkGraphCache._remove_stale(os.path.join(working_directory, names["current"]))
+            remaining = sorted(os.listdir(working_directory))
+        finally:
+            shutil.rmtree(working_directory, ignore_errors=True)
+        self.assertEqual(remaining, sorted(names[key] for key in ("current", "other_layer", "other_tolerance")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,19 @@
 # -*- coding: utf-8 -*-
 import os
+import struct
 import tempfile
 import unittest
 
 from osgeo import ogr
 from qgis.core import QgsFeedback, QgsRectangle
 
-from geest.core.algorithms.ookla_downloader import OoklaDownloader, OoklaException
+from geest.core.algorithms.ookla_downloader import (
+    OoklaDownloader,
+    OoklaException,
+    polygon_wkb,
+    quadkey_tile_bounds,
+    tile_rings,
+)
 
 
 class DummyFeedback(QgsFeedback):
@@ -40,6 +47,27 @@ class TestOoklaDownloader(unittest.TestCase):
         with self.assertRaises(OoklaException):
             raise OoklaException("Test error")
 
+    def test_quadkey_tile_bounds(self):
+        """Tiles built from quadkeys match the Ookla tile WKT, for keys of any length."""
+        west, south, east, north = quadkey_tile_bounds(["0230131221113313", "0", "3"])
+        # tile = POLYGON((-114.614868164062 34.8273320619816, -114.609375 34.8273320619816, ...))
+        self.assertAlmostEqual(west[0], -114.614868164062)
+        self.assertAlmostEqual(south[0], 34.822822727237)
+        self.assertAlmostEqual(east[0], -114.609375)
+        self.assertAlmostEqual(north[0], 34.8273320619816)
+        self.assertEqual((west[1], east[1]), (-180.0, 0.0))
+        self.assertAlmostEqual(north[1], 85.0511287798)
+        self.assertEqual((west[2], east[2], north[2]), (0.0, 180.0, 0.0))
+
+    def test_polygon_wkb(self):
+        """Bulk encoded tiles are valid OGR polygons."""
+        rings = tile_rings(*quadkey_tile_bounds(["0230131221113313"]))
+        wkb = polygon_wkb(rings)[0]
+        self.assertEqual(struct.unpack("<BIII", wkb[:13]), (1, ogr.wkbPolygon, 1, 5))
+        geometry = ogr.CreateGeometryFromWkb(wkb)
+        self.assertEqual(geometry.GetGeometryType(), ogr.wkbPolygon)
+        self.assertAlmostEqual(geometry.GetEnvelope()[0], -114.614868164062)
+
     def test_cache_dir_creation(self):
         """Test that cache directory is created correctly."""
         # Portugal
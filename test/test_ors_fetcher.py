@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the concurrent ORS isochrone fetcher, run against a local stand-in server.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utilities_for_testing import get_qgis_app
+
+from geest.core.ors_client import ORSClient, ORSRequestError
+from geest.core.ors_fetcher import (
+    ORSIsochroneFetcher,
+    ORSRequestLimits,
+    ORSResponseCache,
+    TokenBucket,
+)
+
+QGIS_APP = get_qgis_app()
+
+
+class StandInORSHandler(BaseHTTPRequestHandler):
+    """Answers isochrone requests, failing the first ones with the server's queued status codes."""
+
+    def do_POST(self):
+        """Record the request and reply with a queued error or a FeatureCollection."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, body))
+            status = server.failures.pop(0) if server.failures else 200
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        features = [
+            {
+                "type": "Feature",
+                "properties": {"value": value},
+                "geometry": {"type": "Polygon", "coordinates": [[[x, y], [x + 0.01, y], [x, y + 0.01], [x, y]]]},
+            }
+            for x, y in body["locations"]
+            for value in body["range"]
+        ]
+        payload = json.dumps({"type": "FeatureCollection", "features": features}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        """Keep the test output quiet."""
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test the rate limiter with a fake clock."""
+
+    def test_waits_for_refill(self):
+        """After the burst is spent each token takes 1 / rate seconds."""
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertEqual(len(waits), 2)
+        self.assertAlmostEqual(now[0], 1.0)
+
+
+class TestORSIsochroneFetcher(unittest.TestCase):
+    """Test concurrency, retries and caching against a local HTTP server."""
+
+    def setUp(self):
+        """Start the stand-in server and create a cache directory."""
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInORSHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.failures = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.cache_directory = tempfile.mkdtemp()
+        self.previous_key = os.environ.get("ORS_API_KEY")
+        os.environ["ORS_API_KEY"] = "test-key"
+        self.client = ORSClient(f"http://127.0.0.1:{self.server.server_address[1]}/v2/isochrones")
+        self.requests = [
+            {"locations": [[8.68 + i / 100.0, 49.41]], "range": [500, 1000], "range_type": "distance"} for i in range(4)
+        ]
+
+    def tearDown(self):
+        """Stop the server and remove the cache."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_directory, ignore_errors=True)
+        if self.previous_key is None:
+            os.environ.pop("ORS_API_KEY", None)
+        else:
+            os.environ["ORS_API_KEY"] = self.previous_key
+
+    def _fetcher(self, **kwargs):
+        """Return a fetcher without rate limiting or backoff delays."""
+        return ORSIsochroneFetcher(
+            self.client,
+            cache_directory=self.cache_directory,
+            max_workers=3,
+            rate_limiter=TokenBucket(rate=1000.0, capacity=10),
+            sleep=lambda seconds: None,
+            **kwargs,
+        )
+
+    def test_responses_in_request_order(self):
+        """Concurrent responses are returned in the order of the requests."""
+        responses, errors = self._fetcher().fetch_all("foot-walking", self.requests)
+        self.assertEqual(errors, [None] * 4)
+        for params, response in zip(self.requests, responses):
+            self.assertEqual(response["features"][0]["geometry"]["coordinates"][0][0], params["locations"][0])
+        self.assertTrue(all(path == "/v2/isochrones/foot-walking" for path, _ in self.server.requests))
+
+    def test_retries_quota_and_server_errors(self):
+        """429 and 5xx replies are retried until the request succeeds."""
+        self.server.failures = [429, 503]
+        response = self._fetcher().fetch("foot-walking", self.requests[0])
+        self.assertEqual(len(response["features"]), 2)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_gives_up_after_retries(self):
+        """A request still failing after the retries raises ORSRequestError."""
+        self.server.failures = [500, 500, 500]
+        with self.assertRaises(ORSRequestError) as context:
+            self._fetcher(max_retries=2).fetch("foot-walking", self.requests[0])
+        self.assertEqual(context.exception.status_code, 500)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_client_errors_are_not_retried(self):
+        """A 404 reply fails at once."""
+        self.server.failures = [404]
+        responses, errors = self._fetcher().fetch_all("foot-walking", self.requests[:1])
+        self.assertIsNone(responses[0])
+        self.assertIsInstance(errors[0], ORSRequestError)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_cached_responses_are_not_requested_again(self):
+        """A re-run with the same points is served from the cache."""
+        self._fetcher().fetch_all("foot-walking", self.requests)
+        self.assertEqual(len(self.server.requests), 4)
+        responses, _ = self._fetcher().fetch_all("foot-walking", self.requests)
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertTrue(all(response is not None for response in responses))
+
+    def test_limits_shared_per_endpoint_and_key(self):
+        """Fetchers of one endpoint and key share one rate limiter and one set of request slots."""
+        first = ORSIsochroneFetcher(self.client, max_workers=2, requests_per_minute=20)
+        second = ORSIsochroneFetcher(self.client, max_workers=2, requests_per_minute=20)
+        self.assertIs(first.rate_limiter, second.rate_limiter)
+        self.assertIs(first._slots, second._slots)
+        other_client = ORSClient("http://127.0.0.1:1/v2/isochrones")
+        other = ORSIsochroneFetcher(other_client, max_workers=2, requests_per_minute=20)
+        self.assertIsNot(other.rate_limiter, first.rate_limiter)
+        limits = ORSRequestLimits.for_client(self.client, requests_per_minute=40, max_concurrent=2)
+        self.assertEqual(limits.requests_per_minute, 40)
+        self.assertIsNot(limits.rate_limiter, first.rate_limiter)
+
+    def test_cache_key(self):
+        """Keys ignore coordinate noise but not the profile, range type or ranges."""
+        params = self.requests[0]
+        key = ORSResponseCache.key("foot-walking", params)
+        noisy = dict(params, locations=[[8.68 + 1e-9, 49.41]])
+        self.assertEqual(ORSResponseCache.key("foot-walking", noisy), key)
+        self.assertNotEqual(ORSResponseCache.key("driving-car", params), key)
+        self.assertNotEqual(ORSResponseCache.key("foot-walking", dict(params, range_type="time")), key)
+        self.assertNotEqual(ORSResponseCache.key("foot-walking", dict(params, range=[500])), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
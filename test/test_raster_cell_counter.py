@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import gdal
+from qgis.core import QgsCoordinateReferenceSystem, QgsFeature, QgsGeometry, QgsRectangle, QgsVectorLayer
+
+from geest.core.algorithms.raster_cell_counter import count_score_and_mask
+
+
+class TestRasterCellCounter(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.crs = QgsCoordinateReferenceSystem("EPSG:32633")
+        # 4 columns x 2 rows of 10 m cells
+        self.extent = QgsRectangle(0, 0, 40, 20)
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _layer(self, geometry_type, wkts):
+        layer = QgsVectorLayer(f"{geometry_type}?crs=EPSG:32633", "features", "memory")
+        features = []
+        for wkt in wkts:
+            feature = QgsFeature()
+            feature.setGeometry(QgsGeometry.fromWkt(wkt))
+            features.append(feature)
+        layer.dataProvider().addFeatures(features)
+        return layer
+
+    def _scores(self, layer, mask, name):
+        output_path = os.path.join(self.working_directory, name)
+        result = count_score_and_mask(layer, mask, self.extent, 10.0, self.crs, output_path)
+        self.assertEqual(result, output_path)
+        return gdal.Open(output_path).GetRasterBand(1).ReadAsArray().tolist()
+
+    def test_points(self):
+        """Points score 3 or 5 per cell, count once per feature and touch both cells on an edge."""
+        layer = self._layer(
+            "MultiPoint",
+            [
+                "MULTIPOINT ((5 15))",
+                "MULTIPOINT ((15 15))",
+                "MULTIPOINT ((17 12))",
+                "MULTIPOINT ((35 10))",
+                "MULTIPOINT ((2 2), (3 3))",
+            ],
+        )
+        scores = self._scores(layer, QgsGeometry.fromRect(self.extent), "points.tif")
+        self.assertEqual(scores, [[3, 5, 0, 3], [3, 0, 0, 3]])
+
+    def test_lines(self):
+        """A line counts once in every cell it touches, even with several vertices in a cell."""
+        layer = self._layer(
+            "LineString",
+            ["LINESTRING (1 5, 9 5, 19 5)", "LINESTRING (15 1, 15 9)"],
+        )
+        scores = self._scores(layer, QgsGeometry.fromRect(self.extent), "lines.tif")
+        self.assertEqual(scores, [[0, 0, 0, 0], [3, 5, 0, 0]])
+
+    def test_mask(self):
+        """Cells outside the mask are nodata and the tile is cropped to the mask."""
+        layer = self._layer("Point", ["POINT (5 5)", "POINT (25 15)"])
+        mask = QgsGeometry.fromWkt("POLYGON ((0 0, 0 20, 10 20, 10 10, 30 10, 30 0, 0 0))")
+        scores = self._scores(layer, mask, "masked.tif")
+        self.assertEqual(scores, [[0, 255, 255], [3, 0, 0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the streaming raster statistics module.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from osgeo import gdal
+
+from geest.core.algorithms.raster_statistics import RasterStatistics
+
+
+class TestRasterStatistics(unittest.TestCase):
+    """Test statistics accumulated block by block against NumPy on the whole band."""
+
+    def setUp(self):
+        """Create a working directory."""
+        self.working_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the working directory."""
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write_raster(self, values, data_type, nodata=None):
+        """Write a tiled single band GeoTIFF and return its path."""
+        path = os.path.join(self.working_directory, "values.tif")
+        height, width = values.shape
+        dataset = gdal.GetDriverByName("GTiff").Create(
+            path, width, height, 1, data_type, options=["TILED=YES", "BLOCKXSIZE=64", "BLOCKYSIZE=64"]
+        )
+        band = dataset.GetRasterBand(1)
+        if nodata is not None:
+            band.SetNoDataValue(nodata)
+        band.WriteArray(values)
+        dataset = None
+        return path
+
+    def test_integer_quantiles_are_exact(self):
+        """Integer bands get one bin per value and the same quantiles as NumPy."""
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 1000, size=(300, 200)).astype(np.int32)
+        values[:20] = -1
+        path = self._write_raster(values, gdal.GDT_Int32, nodata=-1)
+        valid = values[values != -1]
+
+        stats = RasterStatistics.from_raster(path)
+
+        self.assertTrue(stats.exact)
+        self.assertEqual(stats.count, valid.size)
+        self.assertEqual(stats.maximum, valid.max())
+        for q in (0.0, 0.25, 0.5, 0.75, 1.0):
+            self.assertAlmostEqual(stats.quantile(q), float(np.quantile(valid, q)))
+
+    def test_float_quantiles_within_one_bin(self):
+        """Float quantiles are within one histogram bin width of NumPy's."""
+        rng = np.random.default_rng(1)
+        values = rng.exponential(scale=2.0, size=(300, 200)).astype(np.float32)
+        values[0, :50] = -9999.0
+        path = self._write_raster(values, gdal.GDT_Float32, nodata=-9999.0)
+        valid = values[values != -9999.0]
+
+        stats = RasterStatistics.from_raster(path, bins=4096)
+
+        self.assertFalse(stats.exact)
+        self.assertEqual(stats.count, valid.size)
+        self.assertAlmostEqual(stats.maximum, float(valid.max()), places=5)
+        bin_width = (valid.max() - valid.min()) / 4096
+        for q in (0.5, 0.75):
+            self.assertLessEqual(abs(stats.quantile(q) - float(np.quantile(valid, q))), bin_width)
+
+    def test_sample_is_bounded(self):
+        """The sample holds every value of small rasters and is capped for large ones."""
+        values = np.arange(100 * 100, dtype=np.float32).reshape((100, 100))
+        path = self._write_raster(values, gdal.GDT_Float32)
+
+        stats = RasterStatistics.from_raster(path)
+        np.testing.assert_array_equal(np.sort(stats.sample), values.ravel())
+
+        stats = RasterStatistics.from_raster(path, sample_size=500)
+        self.assertEqual(len(stats.sample), 500)
+        self.assertEqual(stats.count, values.size)
+
+    def test_no_valid_values(self):
+        """A raster with only nodata has no statistics."""
+        values = np.full((50, 50), 255, dtype=np.uint8)
+        path = self._write_raster(values, gdal.GDT_Byte, nodata=255)
+        self.assertIsNone(RasterStatistics.from_raster(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import gdal
+from qgis.core import (
+    QgsCoordinateReferenceSystem,
+    QgsFeature,
+    QgsField,
+    QgsGeometry,
+    QgsRectangle,
+    QgsVectorLayer,
+)
+from qgis.PyQt.QtCore import QVariant
+
+from geest.core.algorithms.rasterize_and_mask import rasterize_and_mask
+
+
+class TestRasterizeAndMask(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.layer = QgsVectorLayer("Polygon?crs=EPSG:32633", "cells", "memory")
+        self.layer.dataProvider().addAttributes([QgsField("value", QVariant.Int)])
+        self.layer.updateFields()
+        features = []
+        for x, value in ((1, 3), (12, 5)):
+            feature = QgsFeature(self.layer.fields())
+            feature.setGeometry(QgsGeometry.fromRect(QgsRectangle(x, 1, x + 6, 9)))
+            feature.setAttribute("value", value)
+            features.append(feature)
+        self.layer.dataProvider().addFeatures(features)
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def test_burn_and_mask(self):
+        """Values are burned, the output is cropped to the mask and pixels outside it are nodata."""
+        output_path = os.path.join(self.working_directory, "cells_masked_0.tif")
+        # An L shaped mask covering the first feature and the bottom half of the second
+        mask = QgsGeometry.fromWkt("POLYGON((0 0, 0 10, 10 10, 10 5, 20 5, 20 0, 0 0))")
+        result = rasterize_and_mask(
+            input_layer=self.layer,
+            value_field="value",
+            mask_geometry=mask,
+            extent=QgsRectangle(0, 0, 40, 10),
+            x_res=5.0,
+            y_res=5.0,
+            crs=QgsCoordinateReferenceSystem("EPSG:32633"),
+            output_path=output_path,
+            default_value=0,
+        )
+        self.assertEqual(result, output_path)
+        dataset = gdal.Open(output_path)
+        self.assertEqual((dataset.RasterXSize, dataset.RasterYSize), (4, 2))
+        self.assertEqual(dataset.GetGeoTransform(), (0.0, 5.0, 0.0, 10.0, 0.0, -5.0))
+        band = dataset.GetRasterBand(1)
+        self.assertEqual(band.GetNoDataValue(), 255)
+        self.assertEqual(band.ReadAsArray().tolist(), [[3, 3, 255, 255], [3, 3, 5, 5]])
+
+    def test_mask_outside_extent(self):
+        """A mask that does not overlap the extent produces no raster."""
+        output_path = os.path.join(self.working_directory, "cells_masked_1.tif")
+        result = rasterize_and_mask(
+            input_layer=self.layer,
+            value_field="value",
+            mask_geometry=QgsGeometry.fromRect(QgsRectangle(100, 100, 110, 110)),
+            extent=QgsRectangle(0, 0, 20, 10),
+            x_res=5.0,
+            y_res=5.0,
+            crs=QgsCoordinateReferenceSystem("EPSG:32633"),
+            output_path=output_path,
+        )
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(output_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from osgeo import ogr, osr
+from qgis.core import QgsCoordinateReferenceSystem, QgsGeometry, QgsRectangle, QgsVectorLayer
+
+from geest.core.algorithms.reprojected_layer_cache import ReprojectedLayerCache
+from geest.core.algorithms.utilities import subset_vector_layer
+
+
+class TestReprojectedLayerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.working_directory, "cache")
+        self.crs = QgsCoordinateReferenceSystem("EPSG:32633")
+        self.source_path = os.path.join(self.working_directory, "points.gpkg")
+        datasource = ogr.GetDriverByName("GPKG").CreateDataSource(self.source_path)
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32633)
+        for name, count in (("points", 10), ("more_points", 5)):
+            layer = datasource.CreateLayer(name, srs=srs, geom_type=ogr.wkbPoint)
+            layer.CreateField(ogr.FieldDefn("long_field_name", ogr.OFTInteger))
+            for i in range(count):
+                feature = ogr.Feature(layer.GetLayerDefn())
+                feature.SetGeometry(ogr.CreateGeometryFromWkt(f"POINT ({i * 100} 0)"))
+                feature.SetField("long_field_name", i)
+                layer.CreateFeature(feature)
+        layer = None
+        datasource = None
+        self.layer = QgsVectorLayer(f"{self.source_path}|layername=points", "points", "ogr")
+        self.other_layer = QgsVectorLayer(f"{self.source_path}|layername=more_points", "more_points", "ogr")
+        self.builds = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _build(self, layer, target_crs):
+        self.builds += 1
+        return layer
+
+    def test_cached_copy_is_reused(self):
+        """The second request for an unchanged layer does not rebuild it."""
+        first = ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        second = ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(first.featureCount(), 10)
+        self.assertEqual(second.source(), first.source())
+
+    def test_changed_source_is_rebuilt(self):
+        """Touching the source produces a new cached copy and removes the stale one."""
+        first = ReprojectedLayerCache.cache_path(self.layer, self.crs, self.cache_directory)
+        ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        second = ReprojectedLayerCache.cache_path(self.layer, self.crs, self.cache_directory)
+        self.assertNotEqual(first, second)
+        ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        self.assertEqual(self.builds, 2)
+        self.assertFalse(os.path.exists(first))
+        self.assertTrue(os.path.exists(second))
+
+    def test_layers_of_one_geopackage_keep_their_copies(self):
+        """Building one layer of a GeoPackage does not remove the cached copy of another."""
+        first = ReprojectedLayerCache.cache_path(self.layer, self.crs, self.cache_directory)
+        other = ReprojectedLayerCache.cache_path(self.other_layer, self.crs, self.cache_directory)
+        self.assertNotEqual(first, other)
+        ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        cached_other = ReprojectedLayerCache.layer_for(self.other_layer, self.crs, self.cache_directory, self._build)
+        self.assertTrue(os.path.exists(first))
+        self.assertTrue(os.path.exists(other))
+        self.assertEqual(cached_other.featureCount(), 5)
+        ReprojectedLayerCache.layer_for(self.layer, self.crs, self.cache_directory, self._build)
+        self.assertEqual(self.builds, 2)
+
+    def test_subset_vector_layer_streams_features(self):
+        """Only features in the area's extent are returned, in a memory layer with the original fields."""
+        area = QgsGeometry.fromRect(QgsRectangle(150, -10, 450, 10))
+        subset = subset_vector_layer(self.working_directory, self.layer, area, "area_features_0")
+        self.assertEqual(subset.providerType(), "memory")
+        self.assertEqual(sorted(f["long_field_name"] for f in subset.getFeatures()), [2, 3, 4])
+        self.assertFalse(os.path.exists(os.path.join(self.working_directory, "area_features_0.shp")))
+
+
+if __name__ == "__main__":
+    unittest.main()
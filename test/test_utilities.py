@@ -24,8 +24,11 @@ from geest.utilities import (
     log_layer_count,
     log_message,
     log_window_geometry,
+    refresh_log_settings,
     resource_url,
     resources_path,
+    start_file_logging,
+    stop_file_logging,
     theme_background_image,
     theme_stylesheet,
     vector_layer_type,
@@ -384,6 +387,33 @@ class TestUtilities(unittest.TestCase):
         style = theme_stylesheet()
         self.assertIn("background-color: rgba(255, 255, 255, 255)", style)
 
+    @patch("geest.utilities.setting")
+    def test_log_message_caches_verbose_mode(self, mock_setting):
+        """log_message does not read settings once the verbosity is cached."""
+        mock_setting.return_value = "0"
+        self.assertFalse(refresh_log_settings())
+        mock_setting.reset_mock()
+        for _ in range(10):
+            log_message("Not emitted")
+        mock_setting.assert_not_called()
+        mock_setting.return_value = 1
+        self.assertTrue(refresh_log_settings())
+        mock_setting.return_value = 0
+        refresh_log_settings()
+
+    def test_file_logging_through_queue(self):
+        """Forced messages reach the log file with their caller."""
+        import tempfile
+
+        log_file = os.path.join(tempfile.mkdtemp(), "geoe3_test.log")
+        start_file_logging(log_file)
+        log_message("Queued message", force=True)
+        stop_file_logging()
+        with open(log_file, encoding="utf-8") as f:
+            content = f.read()
+        self.assertIn("Queued message", content)
+        self.assertIn("test_utilities", content)
+
 
 if __name__ == "__main__":
     unittest.main()
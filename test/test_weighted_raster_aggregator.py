@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from osgeo import gdal, osr
+
+from geest.core.algorithms.weighted_raster_aggregator import (
+    AGGREGATION_NODATA,
+    aggregate_weighted_rasters,
+)
+
+
+class TestWeightedRasterAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write_raster(self, name, data, origin=(0.0, 40.0)):
+        path = os.path.join(self.working_directory, name)
+        rows, cols = data.shape
+        dataset = gdal.GetDriverByName("GTiff").Create(path, cols, rows, 1, gdal.GDT_Float32)
+        dataset.SetGeoTransform((origin[0], 10.0, 0.0, origin[1], 0.0, -10.0))
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32633)
+        dataset.SetProjection(srs.ExportToWkt())
+        band = dataset.GetRasterBand(1)
+        band.SetNoDataValue(255)
+        band.WriteArray(data)
+        dataset = None
+        return path
+
+    def _read(self, path):
+        dataset = gdal.Open(path)
+        return dataset.GetRasterBand(1).ReadAsArray()
+
+    def test_weighted_sum(self):
+        """Each output pixel is the weighted sum of the inputs."""
+        first = self._write_raster("a_masked_0.tif", np.full((4, 4), 2, dtype=np.float32))
+        second = self._write_raster("b_masked_0.tif", np.full((4, 4), 4, dtype=np.float32))
+        output = os.path.join(self.working_directory, "out.tif")
+        result = aggregate_weighted_rasters({first: 0.25, second: 0.75}, output, window_rows=3)
+        self.assertEqual(result, output)
+        np.testing.assert_allclose(self._read(output), np.full((4, 4), 3.5))
+
+    def test_nodata_propagates(self):
+        """A pixel that is nodata in any input is nodata in the output."""
+        data = np.full((4, 4), 5, dtype=np.float32)
+        data[1, 2] = 255
+        first = self._write_raster("a_masked_0.tif", data)
+        second = self._write_raster("b_masked_0.tif", np.ones((4, 4), dtype=np.float32))
+        output = os.path.join(self.working_directory, "out.tif")
+        aggregate_weighted_rasters({first: 0.5, second: 0.5}, output)
+        result = self._read(output)
+        self.assertEqual(result[1, 2], np.float32(AGGREGATION_NODATA))
+        self.assertEqual(result[0, 0], 3.0)
+
+    def test_misaligned_input_is_aligned(self):
+        """Inputs on a different extent are resampled onto the first raster's grid."""
+        first = self._write_raster("a_masked_0.tif", np.ones((4, 4), dtype=np.float32))
+        second = self._write_raster("b_masked_0.tif", np.full((4, 5), 2, dtype=np.float32), origin=(-10.0, 40.0))
+        output = os.path.join(self.working_directory, "out.tif")
+        aggregate_weighted_rasters({first: 1.0, second: 1.0}, output)
+        result = self._read(output)
+        self.assertEqual(result.shape, (4, 4))
+        np.testing.assert_allclose(result, np.full((4, 4), 3.0))
+
+    def test_empty_input(self):
+        """Nothing to aggregate returns None."""
+        output = os.path.join(self.working_directory, "out.tif")
+        self.assertIsNone(aggregate_weighted_rasters({}, output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for parallel per-area execution in WorkflowBase.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from osgeo import ogr, osr
+from qgis.core import QgsFeedback, QgsProcessingContext
+from utilities_for_testing import get_qgis_app
+
+from geest.core import JsonTreeItem
+from geest.core.settings import delete_setting, set_setting
+from geest.core.workflows.workflow_base import WorkflowBase
+
+QGIS_APP = get_qgis_app()
+
+# Square study areas of increasing size, so AreaIterator yields them in this order
+AREA_SIZES = (100, 200, 300, 400)
+
+
+class AreaRecordingWorkflow(WorkflowBase):
+    """Aggregate workflow whose per-area output describes the area, without any raster work."""
+
+    def __init__(self, *args, failing_index=None, **kwargs):
+        """🏗️ Initialize the instance.
+
+        Args:
+            failing_index: Index of an area that raises, or None.
+        """
+        super().__init__(*args, **kwargs)
+        self.workflow_name = "area_recording"
+        self.aggregation = True
+        self.failing_index = failing_index
+        self.contexts = {}
+        self.vrt_inputs = None
+
+    def _process_features_for_area(self, *args, **kwargs):
+        """Not used, the workflow is an aggregate."""
+
+    def _process_raster_for_area(self, *args, **kwargs):
+        """Not used, the workflow is an aggregate."""
+
+    def _process_aggregate_for_area(self, current_area, clip_area, current_bbox, index):
+        """Return a description of the area, finishing the first areas last."""
+        if index == self.failing_index:
+            raise RuntimeError(f"Area {index} failed")
+        time.sleep(0.05 * (len(AREA_SIZES) - index))
+        self.contexts[index] = self.context
+        return f"{index}:{current_area.area():.0f}"
+
+    def _mask_raster(self, raster_path, area_geometry, index):
+        """Append the clip area to the description instead of masking a raster."""
+        return f"{raster_path}:{area_geometry.area():.0f}"
+
+    def _combine_rasters_to_vrt(self, rasters):
+        """Record the per-area outputs in the order they are combined."""
+        self.vrt_inputs = list(rasters)
+        return os.path.join(self.workflow_directory, "area_recording.vrt")
+
+
+class TestWorkflowBaseParallelAreas(unittest.TestCase):
+    """Compare sequential and parallel area processing on a small study area."""
+
+    def setUp(self):
+        """Create a study area GeoPackage with four areas."""
+        self.working_directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.working_directory, "study_area"))
+        gpkg_path = os.path.join(self.working_directory, "study_area", "study_area.gpkg")
+        srs = osr.SpatialReference()
+        srs.ImportFromEPSG(32633)
+        datasource = ogr.GetDriverByName("GPKG").CreateDataSource(gpkg_path)
+        for name in ("study_area_polygons", "study_area_clip_polygons", "study_area_bboxes", "study_area_grid"):
+            layer = datasource.CreateLayer(name, srs=srs, geom_type=ogr.wkbPolygon)
+            layer.CreateField(ogr.FieldDefn("area_name", ogr.OFTString))
+            for index, size in enumerate(AREA_SIZES):
+                x = index * 1000
+                feature = ogr.Feature(layer.GetLayerDefn())
+                feature.SetGeometry(
+                    ogr.CreateGeometryFromWkt(f"POLYGON(({x} 0, {x + size} 0, {x + size} {size}, {x} {size}, {x} 0))")
+                )
+                feature.SetField("area_name", f"area_{index}")
+                layer.CreateFeature(feature)
+        layer = datasource.CreateLayer("study_area_bbox", srs=srs, geom_type=ogr.wkbPolygon)
+        feature = ogr.Feature(layer.GetLayerDefn())
+        feature.SetGeometry(ogr.CreateGeometryFromWkt("POLYGON((0 0, 3400 0, 3400 400, 0 400, 0 0))"))
+        layer.CreateFeature(feature)
+        layer = None
+        datasource = None
+        self.addCleanup(delete_setting, "area_workers")
+
+    def tearDown(self):
+        """Remove the working directory."""
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _workflow(self, area_workers, failing_index=None):
+        """Return a workflow processing areas with the given number of workers."""
+        set_setting(key="area_workers", value=area_workers)
+        item = JsonTreeItem(["Recording", "Configured", 1.0, {"id": "Recording"}], role="dimension")
+        return AreaRecordingWorkflow(
+            item,
+            cell_size_m=100.0,
+            analysis_scale="national",
+            feedback=QgsFeedback(),
+            context=QgsProcessingContext(),
+            working_directory=self.working_directory,
+            failing_index=failing_index,
+        )
+
+    def _execute(self, workflow):
+        """Run a workflow as if the machine had four cores."""
+        with patch("geest.core.workflows.workflow_base.QThread") as thread:
+            thread.idealThreadCount.return_value = 4
+            return workflow.execute()
+
+    def test_parallel_outputs_match_sequential(self):
+        """Parallel areas produce the same outputs as sequential ones, in area index order."""
+        sequential = self._workflow(area_workers=1)
+        self.assertTrue(self._execute(sequential))
+        parallel = self._workflow(area_workers=3)
+        self.assertTrue(self._execute(parallel))
+
+        self.assertEqual(parallel.vrt_inputs, sequential.vrt_inputs)
+        self.assertEqual([int(output.split(":")[0]) for output in parallel.vrt_inputs], [0, 1, 2, 3])
+        self.assertEqual(parallel.item.attribute("result"), "area_recording Workflow Completed")
+
+    def test_parallel_areas_get_their_own_context(self):
+        """Each area worker uses its own processing context, not the workflow's."""
+        workflow = self._workflow(area_workers=3)
+        shared_context = workflow.context
+        self.assertTrue(self._execute(workflow))
+        contexts = list(workflow.contexts.values())
+        self.assertEqual(len(contexts), len(AREA_SIZES))
+        self.assertTrue(all(context is not shared_context for context in contexts))
+        self.assertEqual(len({id(context) for context in contexts}), len(AREA_SIZES))
+        self.assertIs(workflow.context, shared_context)
+
+    def test_failing_area_is_reported(self):
+        """An exception in an area worker fails the workflow with an error."""
+        workflow = self._workflow(area_workers=3, failing_index=2)
+        self.assertFalse(self._execute(workflow))
+        self.assertEqual(workflow.item.attribute("result"), "area_recording Workflow Error")
+        self.assertIn("Area 2 failed", workflow.item.attribute("error"))
+        self.assertTrue(os.path.exists(os.path.join(workflow.workflow_directory, "error.txt")))
+        self.assertIsNone(workflow.vrt_inputs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from qgis.core import QgsTask
+
+from geest.core.workflow_queue import WorkflowQueue
+
+
+class _Job(QgsTask):
+    """Task that is never started, standing in for a WorkflowJob."""
+
+    def run(self):
+        return True
+
+
+class TestWorkflowQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.queue = WorkflowQueue(pool_size=2)
+        # indicator_a -> factor_a, indicator_b -> factor_b, both factors -> dimension
+        self.indicator_a = _Job("indicator_a")
+        self.indicator_b = _Job("indicator_b")
+        self.factor_a = _Job("factor_a")
+        self.factor_b = _Job("factor_b")
+        self.dimension = _Job("dimension")
+        self.queue.add_job(self.indicator_a, cost=5.0)
+        self.queue.add_job(self.indicator_b, cost=50.0)
+        self.queue.add_job(self.factor_a, dependencies=[self.indicator_a])
+        self.queue.add_job(self.factor_b, dependencies=[self.indicator_b])
+        self.queue.add_job(self.dimension, dependencies=[self.factor_a, self.factor_b])
+
+    def _finish(self, job):
+        """Move a job through the active tasks and finalize it without starting anything else."""
+        self.queue.job_queue.remove(job)
+        self.queue.active_tasks[job.description()] = job
+        with mock.patch.object(self.queue, "process_queue"):
+            self.queue.finalize_task(job.description())
+
+    def test_longest_chain_starts_first(self):
+        """Only jobs without pending dependencies are ready, ordered by their remaining chain cost."""
+        self.assertEqual(self.queue._ready_jobs(), [self.indicator_b, self.indicator_a])
+        self.assertEqual(self.queue._priority(self.indicator_b), 52.0)
+        self.assertEqual(self.queue._priority(self.indicator_a), 7.0)
+
+    def test_aggregation_released_by_its_own_children(self):
+        """A factor starts when its indicator finishes, the dimension waits for both factors."""
+        self._finish(self.indicator_a)
+        self.assertEqual(self.queue._ready_jobs(), [self.indicator_b, self.factor_a])
+        self._finish(self.factor_a)
+        self.assertNotIn(self.dimension, self.queue._ready_jobs())
+        self._finish(self.indicator_b)
+        self._finish(self.factor_b)
+        self.assertEqual(self.queue._ready_jobs(), [self.dimension])
+
+    def test_unqueued_dependencies_are_ignored(self):
+        """Dependencies that are neither queued nor running do not block a job."""
+        job = _Job("independent")
+        self.queue.add_job(job, dependencies=[_Job("not_queued")])
+        self.assertIn(job, self.queue._ready_jobs())
+
+    def test_reset_clears_dependencies(self):
+        """Resetting the queue drops the dependency graph."""
+        self.queue.reset()
+        self.assertEqual(self.queue.job_queue, [])
+        self.assertEqual(self.queue._pending_dependencies, {})
+        self.assertEqual(self.queue._dependents, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
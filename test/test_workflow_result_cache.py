@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from geest.core.json_tree_item import JsonTreeItem
+from geest.core.settings import delete_setting, set_setting, setting
+from geest.core.workflow_result_cache import WorkflowResultCache
+
+
+class TestWorkflowResultCache(unittest.TestCase):
+    """Tests for the persistent indicator result cache."""
+
+    def setUp(self):
+        self.working_directory = tempfile.mkdtemp()
+        self.gpkg_path = os.path.join(self.working_directory, "study_area.gpkg")
+        self.input_path = os.path.join(self.working_directory, "points.csv")
+        self._write(self.gpkg_path, "gpkg")
+        self._write(self.input_path, "x,y\n1,2\n")
+        self.item = JsonTreeItem(
+            [
+                "Indicator",
+                "Configured",
+                1.0,
+                {
+                    "id": "Test_Indicator",
+                    "analysis_mode": "use_csv_to_point_layer",
+                    "csv_file": self.input_path,
+                    "factor_weighting": 0.5,
+                    "result": "Not Run",
+                },
+            ],
+            role="indicator",
+        )
+        self.workflow = SimpleNamespace(
+            item=self.item,
+            workflow_directory=self.working_directory,
+            workflow_name="use_csv_to_point_layer",
+            gpkg_path=self.gpkg_path,
+            cell_size_m=100.0,
+            analysis_scale="national",
+            aggregation=False,
+            layer_id="test_indicator",
+            result_key="result",
+            result_file_key="result_file",
+            cache_settings=("raster_cell_counting",),
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.working_directory, ignore_errors=True)
+
+    def _write(self, path, content):
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _run(self, cache):
+        """Simulate a successful workflow run and store its outputs."""
+        content_hash = cache.content_hash()
+        vrt_path = os.path.join(self.working_directory, "test_indicator_combined.vrt")
+        self._write(os.path.join(self.working_directory, "test_indicator_masked_0.tif"), "tif")
+        self._write(vrt_path, "vrt")
+        with self.item.atomicAttributeUpdate() as attrs:
+            attrs["result_file"] = vrt_path
+            attrs["result"] = "use_csv_to_point_layer Workflow Completed"
+        cache.store(content_hash)
+        return vrt_path
+
+    def test_restore_unchanged_inputs(self):
+        """Outputs are reused when nothing changed, even if a weight did."""
+        cache = WorkflowResultCache(self.workflow)
+        vrt_path = self._run(cache)
+        with self.item.atomicAttributeUpdate() as attrs:
+            attrs["result_file"] = ""
+            attrs["factor_weighting"] = 0.25
+        self.assertTrue(cache.restore(cache.content_hash()))
+        self.assertEqual(self.item.attribute("result_file"), vrt_path)
+
+    def test_changed_input_file_invalidates(self):
+        """Modifying an input file changes the hash."""
+        cache = WorkflowResultCache(self.workflow)
+        self._run(cache)
+        self._write(self.input_path, "x,y\n1,2\n3,4\n")
+        self.assertFalse(cache.restore(cache.content_hash()))
+
+    def test_changed_attribute_invalidates(self):
+        """Changing the configuration changes the hash."""
+        cache = WorkflowResultCache(self.workflow)
+        self._run(cache)
+        with self.item.atomicAttributeUpdate() as attrs:
+            attrs["analysis_mode"] = "use_index_score"
+        self.assertFalse(cache.restore(cache.content_hash()))
+
+    def test_missing_output_invalidates(self):
+        """Deleted outputs are never reused."""
+        cache = WorkflowResultCache(self.workflow)
+        self._run(cache)
+        os.remove(os.path.join(self.working_directory, "test_indicator_masked_0.tif"))
+        self.assertFalse(cache.restore(cache.content_hash()))
+
+    def test_changed_setting_invalidates(self):
+        """Changing a setting listed in cache_settings changes the hash."""
+        cache = WorkflowResultCache(self.workflow)
+        self._run(cache)
+        previous = int(setting(key="raster_cell_counting", default=1))
+        self.addCleanup(delete_setting, "raster_cell_counting")
+        set_setting(key="raster_cell_counting", value=1 - previous)
+        self.assertFalse(cache.restore(cache.content_hash()))
+        set_setting(key="raster_cell_counting", value=previous)
+        self.assertTrue(cache.restore(cache.content_hash()))
+
+
+if __name__ == "__main__":
+    unittest.main()